@@ -15,6 +15,7 @@ from groq import Groq
 from api.models import PlannerOutput
 from config.settings import get_settings
 from schema.models import SchemaContext
+from schema.serializer import serialize_schema
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +113,12 @@ class PlannerAgent:
         ]
 
         if schema and not schema.is_empty:
-            parts.append(schema.to_prompt_string())
+            serialized = serialize_schema(schema, get_settings().planner_schema_token_budget)
+            logger.info(
+                f"PlannerAgent schema: {serialized.detail}, {serialized.table_count} table(s), "
+                f"~{serialized.estimated_tokens} tokens"
+            )
+            parts.append(serialized.text)
         else:
             parts.append("(No schema provided)")
 
@@ -17,6 +17,7 @@ from groq import Groq
 from api.models import Placeholder, PlannerOutput, SqlWriterOutput
 from config.settings import get_settings
 from schema.models import SchemaContext
+from schema.serializer import serialize_schema
 
 logger = logging.getLogger(__name__)
 
@@ -51,8 +52,11 @@ class SqlWriterAgent:
         schema: SchemaContext | None,
         planner_output: PlannerOutput,
         dialect: str = "postgres",
+        join_hints: list[str] | None = None,
     ) -> SqlWriterOutput:
-        user_message = self._build_user_message(question, schema, planner_output, dialect)
+        user_message = self._build_user_message(
+            question, schema, planner_output, dialect, join_hints
+        )
         logger.debug(f"SqlWriterAgent input: {user_message[:500]}...")
 
         try:
@@ -86,6 +90,7 @@ class SqlWriterAgent:
         schema: SchemaContext | None,
         planner_output: PlannerOutput,
         dialect: str,
+        join_hints: list[str] | None = None,
     ) -> str:
         parts = [
             f"Question: {question}",
@@ -95,10 +100,21 @@ class SqlWriterAgent:
         ]
 
         if schema and not schema.is_empty:
-            parts.append(schema.to_compact_string())
+            serialized = serialize_schema(schema, get_settings().sql_writer_schema_token_budget)
+            logger.info(
+                f"SqlWriterAgent schema: {serialized.detail}, {serialized.table_count} table(s), "
+                f"~{serialized.estimated_tokens} tokens"
+            )
+            parts.append(serialized.text)
         else:
             parts.append("(No schema provided - use placeholders)")
 
+        if join_hints:
+            parts.append("")
+            parts.append("Join paths (use these join conditions):")
+            for hint in join_hints:
+                parts.append(f"- {hint}")
+
         if planner_output.assumptions:
             parts.append("")
             parts.append("Assumptions to apply:")
@@ -176,8 +192,9 @@ class OllamaSqlWriterAgent:
         schema: SchemaContext | None,
         planner_output: PlannerOutput,
         dialect: str = "postgres",
+        join_hints: list[str] | None = None,
     ) -> SqlWriterOutput:
-        prompt = self._build_prompt(question, schema, planner_output, dialect)
+        prompt = self._build_prompt(question, schema, planner_output, dialect, join_hints)
         logger.debug(f"OllamaSqlWriterAgent prompt: {prompt[:500]}...")
 
         try:
@@ -231,17 +248,22 @@ class OllamaSqlWriterAgent:
         schema: SchemaContext | None,
         planner_output: PlannerOutput,
         dialect: str,
+        join_hints: list[str] | None = None,
     ) -> str:
         """Build prompt in SQLCoder's expected format."""
         # Build detailed schema representation
         if schema and not schema.is_empty:
-            schema_lines = []
-            for table in schema.tables:
-                cols = ", ".join([
-                    f"{c.name} {c.type or 'TEXT'}" + (" PRIMARY KEY" if c.primary_key else "")
-                    for c in table.columns
-                ])
-                schema_lines.append(f"CREATE TABLE {table.name} ({cols});")
+            serialized = serialize_schema(
+                schema, get_settings().sql_writer_schema_token_budget, ddl=True
+            )
+            logger.info(
+                f"OllamaSqlWriterAgent schema: {serialized.detail}, "
+                f"{serialized.table_count} table(s), ~{serialized.estimated_tokens} tokens"
+            )
+            schema_lines = [serialized.text]
+            if join_hints:
+                schema_lines.append("")
+                schema_lines.extend(f"-- {hint}" for hint in join_hints)
             schema_str = "\n".join(schema_lines)
         else:
             schema_str = "-- No schema provided. Use <TABLE_NAME> and <COLUMN_NAME> placeholders for unknown identifiers."
@@ -1,14 +1,24 @@
 """API module containing routes and models."""
 
 from api.models import (
+    BatchValidationResult,
+    CacheStatsResponse,
     ColumnSchema,
+    GateCacheStatsResponse,
     HealthResponse,
+    IndexSchema,
+    IndexSuggestion,
+    PerfWarning,
     Placeholder,
     QueryRequest,
     QueryResponse,
     QueryStatus,
     SchemaMetadata,
+    SchemaPatchRequest,
+    SchemaRegisterResponse,
     TableSchema,
+    ValidateBatchRequest,
+    ValidateRequest,
 )
 from api.routes import router
 
@@ -18,8 +28,18 @@ __all__ = [
     "QueryResponse",
     "QueryStatus",
     "Placeholder",
+    "PerfWarning",
+    "IndexSuggestion",
     "SchemaMetadata",
+    "SchemaRegisterResponse",
+    "SchemaPatchRequest",
     "TableSchema",
     "ColumnSchema",
+    "IndexSchema",
     "HealthResponse",
+    "CacheStatsResponse",
+    "GateCacheStatsResponse",
+    "ValidateRequest",
+    "ValidateBatchRequest",
+    "BatchValidationResult",
 ]
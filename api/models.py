@@ -5,8 +5,12 @@ These Pydantic models define the contract between frontend and backend.
 """
 
 from enum import Enum
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+# Dialects the lexer and policy gate know (schema.ddl.DIALECTS)
+SqlDialect = Literal["postgres", "mysql", "sqlite"]
 
 
 class QueryStatus(str, Enum):
@@ -25,6 +29,25 @@ class Placeholder(BaseModel):
     meaning: str = Field(..., description="Human-readable explanation of what this placeholder represents")
 
 
+class PerfWarning(BaseModel):
+    """A likely performance problem found by a lint rule (immutable, so outputs can share it)."""
+
+    model_config = ConfigDict(frozen=True)
+
+    rule: str = Field(..., description="Id of the rule, e.g. 'leading-wildcard'")
+    message: str = Field(..., description="What was found and how to avoid it")
+    position: int = Field(..., description="Character offset in the SQL where it was found")
+
+
+class IndexSuggestion(BaseModel):
+    """An index that would serve a query, from the index advisor."""
+
+    table: str = Field(..., description="Table to index")
+    columns: list[str] = Field(..., description="Index columns, in order")
+    statement: str = Field(..., description="CREATE INDEX statement for the index")
+    reason: str = Field(..., description="Which parts of the query the index serves")
+
+
 class ColumnSchema(BaseModel):
     """Schema definition for a database column."""
 
@@ -36,6 +59,17 @@ class ColumnSchema(BaseModel):
         default=None,
         description="Foreign key reference in format 'table.column'"
     )
+    distinct_count: int | None = Field(
+        default=None, ge=0, description="Number of distinct values, if known"
+    )
+
+
+class IndexSchema(BaseModel):
+    """Schema definition for a table index."""
+
+    name: str | None = Field(default=None, description="Index name")
+    columns: list[str] = Field(..., min_length=1, description="Indexed columns, in order")
+    unique: bool = Field(default=False, description="Whether this is a unique index")
 
 
 class TableSchema(BaseModel):
@@ -47,6 +81,17 @@ class TableSchema(BaseModel):
         default_factory=list,
         description="List of columns in this table"
     )
+    row_count: int | None = Field(
+        default=None, ge=0, description="Approximate number of rows, if known"
+    )
+    indexes: list[IndexSchema] = Field(
+        default_factory=list,
+        description="Indexes on this table (besides its primary key)"
+    )
+    partition_keys: list[str] = Field(
+        default_factory=list,
+        description="Columns the table is partitioned on"
+    )
 
 
 class SchemaMetadata(BaseModel):
@@ -58,6 +103,44 @@ class SchemaMetadata(BaseModel):
     )
 
 
+class SchemaRegisterResponse(BaseModel):
+    """Response from the /schemas endpoint."""
+
+    schema_id: str = Field(..., description="Fingerprint to pass as 'schema_id' in later queries")
+    table_count: int = Field(..., description="Number of tables in the registered schema")
+    warnings: list[str] = Field(
+        default_factory=list,
+        description="Potential issues found in the schema"
+    )
+
+
+class SchemaPatchRequest(BaseModel):
+    """Request payload for PATCH /schemas/{schema_id}."""
+
+    operations: list[dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        description=(
+            "Operations applied in order: add_table, drop_table, alter_table, "
+            "add_column, drop_column, alter_column"
+        ),
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "operations": [
+                        {"op": "add_column", "table": "orders", "column": {"name": "channel", "type": "varchar"}},
+                        {"op": "alter_column", "table": "orders", "column": "total", "changes": {"type": "numeric"}},
+                        {"op": "drop_table", "table": "legacy_orders"},
+                    ]
+                }
+            ]
+        }
+    }
+
+
 class QueryRequest(BaseModel):
     """Request payload for the /query endpoint."""
 
@@ -67,7 +150,7 @@ class QueryRequest(BaseModel):
         min_length=1,
         max_length=2000,
     )
-    dialect: str = Field(
+    dialect: SqlDialect = Field(
         default="postgres",
         description="SQL dialect to generate (postgres, mysql, sqlite)"
     )
@@ -75,6 +158,17 @@ class QueryRequest(BaseModel):
         default=None,
         description="Optional database schema for validation"
     )
+    schema_id: str | None = Field(
+        default=None,
+        description="Id of a schema registered via /schemas, instead of 'schema_metadata'"
+    )
+
+    @model_validator(mode="after")
+    def check_single_schema_source(self) -> "QueryRequest":
+        """Reject requests that send both an inline schema and a schema id."""
+        if self.schema_metadata is not None and self.schema_id is not None:
+            raise ValueError("Provide either 'schema_metadata' or 'schema_id', not both")
+        return self
 
     model_config = {
         "json_schema_extra": {
@@ -131,6 +225,14 @@ class QueryResponse(BaseModel):
         default_factory=list,
         description="Policy violations that caused errors"
     )
+    perf_warnings: list[PerfWarning] = Field(
+        default_factory=list,
+        description="Likely performance problems in the SQL"
+    )
+    index_suggestions: list[IndexSuggestion] = Field(
+        default_factory=list,
+        description="Indexes that would serve the SQL, when the schema declares indexes"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -149,6 +251,89 @@ class QueryResponse(BaseModel):
     }
 
 
+class ValidateRequest(BaseModel):
+    """Request payload for the /validate endpoint."""
+
+    sql: str = Field(..., description="SQL statement to validate", min_length=1)
+    dialect: SqlDialect | None = Field(
+        default=None,
+        description="SQL dialect of the SQL (postgres, mysql, sqlite); decides how strings "
+                    "are read and how a row limit is added"
+    )
+    schema_metadata: SchemaMetadata | None = Field(
+        default=None,
+        description="Optional database schema to check references against"
+    )
+    schema_id: str | None = Field(
+        default=None,
+        description="Id of a schema registered via /schemas, instead of 'schema_metadata'"
+    )
+
+    @model_validator(mode="after")
+    def check_single_schema_source(self) -> "ValidateRequest":
+        """Reject requests that send both an inline schema and a schema id."""
+        if self.schema_metadata is not None and self.schema_id is not None:
+            raise ValueError("Provide either 'schema_metadata' or 'schema_id', not both")
+        return self
+
+
+class ValidateBatchRequest(BaseModel):
+    """Request payload for the /validate/batch endpoint."""
+
+    statements: list[str] = Field(
+        ...,
+        description="SQL statements to validate, all against the same schema",
+        min_length=1,
+        max_length=100_000,
+    )
+    dialect: SqlDialect | None = Field(
+        default=None,
+        description="SQL dialect of the SQL (postgres, mysql, sqlite); decides how strings "
+                    "are read and how a row limit is added"
+    )
+    schema_metadata: SchemaMetadata | None = Field(
+        default=None,
+        description="Optional database schema to check references against"
+    )
+    schema_id: str | None = Field(
+        default=None,
+        description="Id of a schema registered via /schemas, instead of 'schema_metadata'"
+    )
+
+    @model_validator(mode="after")
+    def check_single_schema_source(self) -> "ValidateBatchRequest":
+        """Reject requests that send both an inline schema and a schema id."""
+        if self.schema_metadata is not None and self.schema_id is not None:
+            raise ValueError("Provide either 'schema_metadata' or 'schema_id', not both")
+        return self
+
+
+class CacheStatsResponse(BaseModel):
+    """Counters of the parsed schema cache."""
+
+    hits: int = Field(..., description="Lookups answered from the cache")
+    misses: int = Field(..., description="Lookups that had to parse the schema")
+    evictions: int = Field(..., description="Entries dropped to stay within the byte budget")
+    entries: int = Field(..., description="Schemas currently cached")
+    current_bytes: int = Field(..., description="Estimated size of the cached schemas")
+    max_bytes: int = Field(..., description="Configured byte budget")
+
+
+class GateCacheStatsResponse(BaseModel):
+    """Counters of the policy gate result cache."""
+
+    hits: int = Field(..., description="Validations answered from the cache")
+    misses: int = Field(..., description="Validations that ran the gate")
+    hit_rate: float = Field(..., description="hits / (hits + misses), 0 before any validation")
+    evictions: int = Field(
+        ..., description="Entries dropped to stay within max_entries and max_bytes"
+    )
+    entries: int = Field(..., description="Results currently cached")
+    max_entries: int = Field(..., description="Configured entry limit")
+    current_bytes: int = Field(..., description="Estimated size of the cached results")
+    max_bytes: int = Field(..., description="Configured byte budget")
+
+
 class HealthResponse(BaseModel):
     """Response for health check endpoint."""
 
@@ -194,6 +379,26 @@ class PolicyGateOutput(BaseModel):
     status: QueryStatus = Field(..., description="Determined status for the query")
     warnings: list[str] = Field(default_factory=list, description="Warnings from policy checks")
     policy_errors: list[str] = Field(default_factory=list, description="Hard policy violations")
+    perf_warnings: list[PerfWarning] = Field(
+        default_factory=list, description="Likely performance problems (see validation.perf_rules)"
+    )
+
+
+class IndexAdvisorOutput(BaseModel):
+    """Output from the deterministic index advisor."""
+
+    suggestions: list[IndexSuggestion] = Field(
+        default_factory=list, description="Indexes that would serve the query"
+    )
+    notes: list[str] = Field(
+        default_factory=list, description="Tables the query reads without any usable index"
+    )
+
+
+class BatchValidationResult(PolicyGateOutput):
+    """One line of the /validate/batch NDJSON stream."""
+
+    index: int = Field(..., description="Position of the statement in the request")
 
 
 
@@ -1,20 +1,106 @@
 """
 API route handlers for text-ql.
 
-Provides the /query endpoint and health checks.
+Provides the /query, /validate and /schemas endpoints, cache statistics and
+health checks.
 """
 
+import asyncio
 import logging
+from dataclasses import asdict
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
-from api.models import HealthResponse, QueryRequest, QueryResponse, QueryStatus
+from api.models import (
+    BatchValidationResult,
+    CacheStatsResponse,
+    GateCacheStatsResponse,
+    HealthResponse,
+    PolicyGateOutput,
+    QueryRequest,
+    QueryResponse,
+    QueryStatus,
+    SchemaMetadata,
+    SchemaPatchRequest,
+    SchemaRegisterResponse,
+    ValidateBatchRequest,
+    ValidateRequest,
+)
+from config.settings import get_settings
+from schema.cache import get_parsed_schema_cache, parse_schema_cached
+from schema.ddl import DdlParseError, parse_ddl
+from schema.introspect import IntrospectionError, introspect_sqlite_cached
+from schema.models import SchemaContext
+from schema.parser import SchemaParseError, validate_schema
+from schema.patch import SchemaPatchError, apply_patch
+from schema.registry import get_schema_registry
+from schema.snapshot import SnapshotError
+from schema.streaming import parse_schema_chunks
+from validation.gate_cache import get_policy_gate_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Response header carrying the id of an inline schema, to send as schema_id next time
+SCHEMA_ID_HEADER = "X-Schema-Id"
+
+
+def _registered_schema(schema_id: str) -> SchemaContext:
+    """Look up a registered schema, or fail the request with 404 (500 if it can't be loaded)."""
+    try:
+        schema = get_schema_registry().get(schema_id)
+    except SnapshotError as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    if schema is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown schema_id '{schema_id}'. Register it via /schemas first.",
+        )
+    return schema
+
+
+def _inline_schema(schema_json: dict[str, Any]) -> SchemaContext:
+    """
+    Parse an inline schema (through the cache) and register it.
+
+    Every inline request still pays for validating and hashing its payload;
+    clients that resend a catalog should pass the id returned in the
+    X-Schema-Id header as schema_id instead, which skips both.
+    """
+    schema = parse_schema_cached(schema_json)
+    get_schema_registry().register(schema)
+    return schema
+
+
+def _schema_id_headers(
+    schema_metadata: SchemaMetadata | None, schema: SchemaContext | None
+) -> dict[str, str]:
+    """The X-Schema-Id header for a response to a request with an inline schema."""
+    if schema_metadata is None or schema is None:
+        return {}
+    return {SCHEMA_ID_HEADER: schema.fingerprint}
+
+
+def _validation_schema(request: ValidateRequest | ValidateBatchRequest) -> SchemaContext | None:
+    """The schema a validation request refers to, by id, inline, or the configured SQLite file."""
+    if request.schema_id:
+        return _registered_schema(request.schema_id)
+    if request.schema_metadata:
+        try:
+            return _inline_schema(request.schema_metadata.model_dump())
+        except SchemaParseError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid schema format: {e}") from e
+    if get_settings().sqlite_database:
+        try:
+            return introspect_sqlite_cached(get_settings().sqlite_database)
+        except IntrospectionError as e:
+            logger.error(f"SQLite introspection failed: {e}")
+            raise HTTPException(status_code=503, detail="Configured SQLite database is unavailable") from e
+    return None
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
@@ -29,8 +115,121 @@ async def health_check() -> HealthResponse:
     return HealthResponse(status="healthy", version=version)
 
 
+@router.get("/stats/cache", response_model=CacheStatsResponse)
+async def cache_stats() -> CacheStatsResponse:
+    """Hit, miss and eviction counters of the parsed schema cache."""
+    return CacheStatsResponse(**asdict(get_parsed_schema_cache().stats()))
+
+
+@router.get("/stats/policy-gate-cache", response_model=GateCacheStatsResponse)
+async def policy_gate_cache_stats() -> GateCacheStatsResponse:
+    """Hit, miss and eviction counters of the policy gate result cache."""
+    stats = get_policy_gate_cache().stats()
+    return GateCacheStatsResponse(**asdict(stats), hit_rate=stats.hit_rate)
+
+
+@router.post(
+    "/schemas",
+    response_model=SchemaRegisterResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": SchemaMetadata.model_json_schema()}},
+        }
+    },
+)
+async def register_schema(request: Request) -> SchemaRegisterResponse:
+    """
+    Parse and store a schema so later queries can refer to it by id.
+
+    The body (a SchemaMetadata document) is parsed incrementally as it is
+    received, so large schemas are never held in memory as raw JSON.
+    """
+    try:
+        schema = await parse_schema_chunks(request.stream())
+    except SchemaParseError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid schema format: {e}") from e
+
+    schema_id = get_schema_registry().register(schema)
+    logger.info(f"Registered schema {schema_id[:12]} with {len(schema.tables)} table(s)")
+
+    return SchemaRegisterResponse(
+        schema_id=schema_id,
+        table_count=len(schema.tables),
+        warnings=validate_schema(schema),
+    )
+
+
+@router.post(
+    "/schemas/ddl",
+    response_model=SchemaRegisterResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/plain": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def register_schema_ddl(request: Request, dialect: str | None = None) -> SchemaRegisterResponse:
+    """
+    Register a schema from a CREATE TABLE dump (pg_dump, mysqldump, sqlite).
+
+    The body is the raw SQL text. The dialect ("postgres", "mysql" or
+    "sqlite") is detected from the dump when not given.
+    """
+    try:
+        text = (await request.body()).decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail="DDL must be UTF-8 text") from e
+
+    try:
+        schema = parse_ddl(text, dialect)
+    except DdlParseError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid DDL: {e}") from e
+    if schema.is_empty:
+        raise HTTPException(status_code=400, detail="No CREATE TABLE statements found")
+
+    schema_id = get_schema_registry().register(schema)
+    logger.info(f"Registered schema {schema_id[:12]} with {len(schema.tables)} table(s) from DDL")
+
+    return SchemaRegisterResponse(
+        schema_id=schema_id,
+        table_count=len(schema.tables),
+        warnings=validate_schema(schema),
+    )
+
+
+@router.patch("/schemas/{schema_id}", response_model=SchemaRegisterResponse)
+async def patch_schema(schema_id: str, request: SchemaPatchRequest) -> SchemaRegisterResponse:
+    """
+    Apply incremental changes to a registered schema.
+
+    The patched schema is registered as a new version with its own id; the
+    original stays available under its id. Unchanged tables are shared
+    between the two versions rather than re-parsed.
+    """
+    base = _registered_schema(schema_id)
+
+    try:
+        schema = apply_patch(base, request.operations)
+    except SchemaPatchError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid schema patch: {e}") from e
+
+    new_id = get_schema_registry().register(schema)
+    logger.info(
+        f"Patched schema {schema_id[:12]} -> {new_id[:12]} "
+        f"with {len(request.operations)} operation(s)"
+    )
+
+    return SchemaRegisterResponse(
+        schema_id=new_id,
+        table_count=len(schema.tables),
+        warnings=validate_schema(schema),
+    )
+
+
 @router.post("/query", response_model=QueryResponse)
-async def query(request: QueryRequest) -> QueryResponse:
+async def query(request: QueryRequest, response: Response) -> QueryResponse:
     """
     Convert natural language to SQL.
     """
@@ -43,17 +242,33 @@ async def query(request: QueryRequest) -> QueryResponse:
         raise HTTPException(status_code=400, detail="Question cannot be empty")
 
     schema_json: dict[str, Any] | None = None
-    if request.schema_metadata:
+    schema: SchemaContext | None = None
+    if request.schema_id:
+        schema = _registered_schema(request.schema_id)
+    elif request.schema_metadata:
         schema_json = request.schema_metadata.model_dump()
+        try:
+            schema = await asyncio.to_thread(_inline_schema, schema_json)
+        except SchemaParseError:
+            pass  # The pipeline parses it again and reports the error
+    elif get_settings().sqlite_database:
+        try:
+            schema = introspect_sqlite_cached(get_settings().sqlite_database)
+        except IntrospectionError as e:
+            logger.error(f"SQLite introspection failed: {e}")
+            raise HTTPException(status_code=503, detail="Configured SQLite database is unavailable") from e
+
+    response.headers.update(_schema_id_headers(request.schema_metadata, schema))
 
     try:
-        response = await run_pipeline_async(
+        result = await run_pipeline_async(
             question=request.question,
             dialect=request.dialect,
             schema_json=schema_json,
+            schema=schema,
         )
-        logger.info(f"Query completed with status: {response.status}")
-        return response
+        logger.info(f"Query completed with status: {result.status}")
+        return result
 
     except Exception as e:
         logger.exception(f"Pipeline error: {e}")
@@ -68,6 +283,61 @@ async def query(request: QueryRequest) -> QueryResponse:
         )
 
 
+@router.post("/validate", response_model=PolicyGateOutput)
+async def validate(request: ValidateRequest, response: Response) -> PolicyGateOutput:
+    """
+    Run the deterministic policy gate on one SQL statement, without any LLM.
+
+    The statement is checked against the schema given by id or inline, or
+    the configured SQLite database, like /query; an inline schema's id is
+    returned in the X-Schema-Id header. Both the schema lookup
+    (which may introspect SQLite) and the gate run in a worker thread, so a
+    long statement does not hold up other requests.
+    """
+    from validation.policy_gate import run_policy_gate
+
+    schema = await asyncio.to_thread(_validation_schema, request)
+    response.headers.update(_schema_id_headers(request.schema_metadata, schema))
+    return await asyncio.to_thread(run_policy_gate, request.sql, schema, dialect=request.dialect)
+
+
+@router.post(
+    "/validate/batch",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One BatchValidationResult per line, in request order",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+async def validate_batch(request: ValidateBatchRequest) -> StreamingResponse:
+    """
+    Run the policy gate on many statements against one schema.
+
+    Results are streamed back as NDJSON, in request order, as they become
+    available; large batches are checked in parallel across worker processes
+    (see validation_workers).
+    """
+    from validation.batch import validate_batch as run_batch
+
+    schema = await asyncio.to_thread(_validation_schema, request)
+    logger.info(f"Validating batch of {len(request.statements)} statement(s)")
+
+    async def lines():
+        index = 0
+        async for output in run_batch(request.statements, schema, request.dialect):
+            result = BatchValidationResult(index=index, **output.model_dump())
+            yield result.model_dump_json() + "\n"
+            index += 1
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers=_schema_id_headers(request.schema_metadata, schema),
+    )
+
+
 @router.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint with API information."""
@@ -12,6 +12,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes import router
 from config.settings import get_settings
+from schema.registry import get_schema_registry
+from schema.snapshot import preload_snapshots
+from validation.batch import shutdown_validation_pool
+from validation.engine import get_validation_engine
 
 # Configure logging
 logging.basicConfig(
@@ -35,10 +39,19 @@ async def lifespan(app: FastAPI):
     if not settings.groq_api_key:
         logger.warning("GROQ_API_KEY not set - API calls will fail!")
 
+    # Register schema snapshots; each is only loaded when first queried
+    if settings.schema_snapshot_dir:
+        count = preload_snapshots(settings.schema_snapshot_dir, get_schema_registry())
+        logger.info(f"Registered {count} schema snapshot(s) from {settings.schema_snapshot_dir}")
+
+    # Build the validation engine now rather than on the first request
+    get_validation_engine()
+
     yield
 
     # Shutdown
     logger.info("Shutting down text-ql API...")
+    shutdown_validation_pool()
 
 
 def create_app() -> FastAPI:
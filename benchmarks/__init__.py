@@ -0,0 +1 @@
+"""Micro-benchmarks for text-ql's deterministic stages. Run with `python -m benchmarks.<name>`."""
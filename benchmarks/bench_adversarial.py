@@ -0,0 +1,104 @@
+"""
+Benchmark the policy gate on pathological and very large SQL.
+
+Each family of inputs targets a part of the validation path: unterminated
+strings and comments for the lexer, deep nesting and long lists for the
+scope parser, unknown names for the suggestions. DDL_ADVERSARIAL_INPUTS
+does the same for the DDL importer, with malformed CREATE and ALTER TABLE
+statements. Every family is run at two sizes. Time and peak memory should
+both grow about 4x when the input does, that is, linearly.
+
+    python -m benchmarks.bench_adversarial
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from benchmarks.common import best_of, make_schema
+from config.settings import get_settings
+from schema.ddl import parse_ddl
+from validation.engine import get_validation_engine
+from validation.gate_cache import get_policy_gate_cache
+from validation.policy_gate import run_policy_gate
+
+# name -> function building an input of about n characters
+ADVERSARIAL_INPUTS: dict[str, Callable[[int], str]] = {
+    "trailing whitespace": lambda n: "SELECT 1" + " " * n,
+    "unterminated string": lambda n: "SELECT '" + "a" * n,
+    "unterminated comment": lambda n: "SELECT 1 /*" + "*" * n,
+    "unterminated identifier": lambda n: 'SELECT "' + "a" * n,
+    "unterminated dollar quotes": lambda n: "SELECT " + "$a$" * (n // 3),
+    "escaped quotes": lambda n: "SELECT " + "E'\\" * (n // 3),
+    "open placeholders": lambda n: "SELECT " + "<A" * (n // 2),
+    "empty statements": lambda n: "SELECT 1" + ";" * n,
+    "nested parentheses": lambda n: "SELECT " + "(" * (n // 2) + "1" + ")" * (n // 2),
+    "nested subqueries": lambda n: "SELECT * FROM " + "(SELECT * FROM " * (n // 15) + "t" + ")" * (n // 15),
+    "nested CASE": lambda n: "SELECT " + "CASE WHEN 1 THEN " * (n // 17) + "1" + " END" * (n // 17),
+    "dotted name": lambda n: "SELECT " + ".".join(["a"] * (n // 2)) + " FROM t",
+    "repeated LIMIT": lambda n: "SELECT 1 " + "LIMIT 1 " * (n // 8),
+    "unknown columns": lambda n: "SELECT " + ", ".join(f"c{i}" for i in range(n // 6)) + " FROM table_1",
+    "many CTEs": lambda n: "WITH " + ", ".join(f"c{i} AS (SELECT 1)" for i in range(n // 20)) + " SELECT 1",
+    "many joins": lambda n: "SELECT 1 FROM table_1 t0 " + " ".join(
+        f"JOIN table_2 t{i} ON t{i}.id = t{i - 1}.id" for i in range(1, n // 40)
+    ),
+    "long IN list": lambda n: "SELECT id FROM table_1 WHERE id IN (" + ",".join("1" * (n // 2)) + ")",
+    "many UNIONs": lambda n: "SELECT 1" + " UNION SELECT 1" * (n // 15),
+}
+
+# name -> function building a DDL dump of about n characters
+DDL_ADVERSARIAL_INPUTS: dict[str, Callable[[int], str]] = {
+    "unclosed column types": lambda n: "CREATE TABLE t (a int" + ", b numeric(" * (n // 12) + ");",
+    "stray closing parens": lambda n: "CREATE TABLE t (a int" + "), b int" * (n // 8) + ";",
+    "nested open parens": lambda n: "CREATE TABLE t (a int" + "(" * n + ";",
+    "unclosed index lists": lambda n: "CREATE TABLE t (" + "KEY k (a, " * (n // 10) + ");",
+    "unclosed REFERENCES": lambda n: "CREATE TABLE t (a int REFERENCES u (" + "x, " * (n // 3) + ";",
+    "keys without column lists": lambda n: "ALTER TABLE t " + "ADD CONSTRAINT c PRIMARY KEY x, " * (n // 32) + ";",
+    "unclosed ALTER actions": lambda n: "ALTER TABLE t " + "ADD COLUMN a int DEFAULT f(, " * (n // 29) + ";",
+    "unbalanced ALTER groups": lambda n: "ALTER TABLE t " + "ADD COLUMN a int DEFAULT ) ((, " * (n // 32) + ";",
+}
+
+
+def measure(sql: str, schema) -> tuple[float, int]:
+    """Seconds for one uncached gate run, and peak bytes allocated during a second run."""
+    get_policy_gate_cache().clear()
+    start = time.perf_counter()
+    run_policy_gate(sql, schema)
+    seconds = time.perf_counter() - start
+
+    get_policy_gate_cache().clear()
+    tracemalloc.start()
+    run_policy_gate(sql, schema)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main() -> None:
+    schema = make_schema(n_tables=50)
+    get_settings().max_sql_length = 0  # Measure past the limit
+    get_validation_engine.cache_clear()
+    small, large = 25_000, 100_000
+    run_policy_gate("SELECT id FROM table_1", schema)  # Build the schema's indexes
+    print(f"{'input':<28} {small // 1000}K chars {large // 1000}K chars   growth   peak memory")
+    for name, build in ADVERSARIAL_INPUTS.items():
+        small_seconds, _ = measure(build(small), schema)
+        large_seconds, peak = measure(build(large), schema)
+        print(
+            f"{name:<28} {small_seconds * 1000:>7.1f} ms {large_seconds * 1000:>8.1f} ms"
+            f" {large_seconds / small_seconds:>7.1f}x {peak / 1e6:>9.1f} MB"
+        )
+
+    print(f"\n{'DDL input':<28} {small // 1000}K chars {large // 1000}K chars   growth")
+    for name, build in DDL_ADVERSARIAL_INPUTS.items():
+        small_dump, large_dump = build(small), build(large)
+        small_seconds = best_of(lambda: parse_ddl(small_dump, "postgres"), repeat=3)
+        large_seconds = best_of(lambda: parse_ddl(large_dump, "postgres"), repeat=3)
+        print(
+            f"{name:<28} {small_seconds * 1000:>7.1f} ms {large_seconds * 1000:>8.1f} ms"
+            f" {large_seconds / small_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
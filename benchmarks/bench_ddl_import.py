@@ -0,0 +1,51 @@
+"""
+Benchmark the DDL importer on a large generated dump, against parsing the
+same schema from JSON.
+
+    python -m benchmarks.bench_ddl_import
+"""
+
+import json
+
+from benchmarks.common import best_of, report
+from schema.ddl import parse_ddl
+from schema.parser import parse_schema
+
+
+def make_dump(n_tables: int, n_columns: int) -> str:
+    """A pg_dump-style dump: CREATE TABLEs with comments, then PK/FK ALTERs."""
+    lines = []
+    for t in range(n_tables):
+        lines.append(f"CREATE TABLE public.table_{t} (")
+        lines.append("    id bigint NOT NULL,")
+        if t:
+            lines.append(f"    parent_id bigint, -- references table_{t - 1}")
+        for c in range(n_columns):
+            lines.append(f"    column_{c} character varying(255) DEFAULT 'n/a'::character varying,")
+        lines.append("    created_at timestamp with time zone DEFAULT now() NOT NULL")
+        lines.append(");")
+        lines.append(f"COMMENT ON TABLE public.table_{t} IS 'Entity {t}';")
+        lines.append("")
+    for t in range(n_tables):
+        lines.append(f"ALTER TABLE ONLY public.table_{t} ADD CONSTRAINT table_{t}_pkey PRIMARY KEY (id);")
+        if t:
+            lines.append(
+                f"ALTER TABLE ONLY public.table_{t} ADD CONSTRAINT table_{t}_fk "
+                f"FOREIGN KEY (parent_id) REFERENCES public.table_{t - 1}(id);"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    for n_tables in (500, 3000):
+        dump = make_dump(n_tables, n_columns=25)
+        n_lines = dump.count("\n")
+        print(f"\n{n_tables} tables, {n_lines:,} lines, {len(dump) / 2**20:.1f} MiB")
+        payload = json.dumps(parse_ddl(dump, "postgres").to_dict())
+        json_time = best_of(lambda: parse_schema(json.loads(payload)), repeat=3)
+        report("parse_schema (equivalent JSON)", json_time)
+        report("parse_ddl", best_of(lambda: parse_ddl(dump, "postgres"), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
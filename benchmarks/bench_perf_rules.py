@@ -0,0 +1,43 @@
+"""
+Benchmark the performance lint rules on typical generated queries.
+
+The rules share one pass over the tokens, so they should add a few tens of
+microseconds to a query of a few hundred characters, next to the time it
+takes to lex it.
+
+    python -m benchmarks.bench_perf_rules
+"""
+
+from benchmarks.common import best_of, report
+from validation.lexer import tokenize
+from validation.perf_rules import lint_performance
+
+QUERIES = {
+    "clean join": (
+        "SELECT c.id, c.name, SUM(o.total) FROM customers c JOIN orders o ON o.customer_id = c.id "
+        "WHERE c.state = 'CA' AND o.status IN ('paid', 'shipped') GROUP BY c.id, c.name "
+        "ORDER BY 3 DESC LIMIT 50"
+    ),
+    "every rule fires": (
+        "SELECT * FROM customers c, orders o WHERE LOWER(c.email) LIKE '%@example.com' "
+        "OR o.created_at::date = '2024-01-01' LIMIT 50"
+    ),
+    "nested subqueries": (
+        "WITH recent AS (SELECT * FROM orders WHERE order_date > CURRENT_DATE - 30) "
+        "SELECT * FROM customers WHERE id IN (SELECT customer_id FROM recent WHERE total > "
+        "(SELECT AVG(total) FROM recent)) LIMIT 50"
+    ),
+}
+
+
+def main() -> None:
+    for name, sql in QUERIES.items():
+        tokens = tokenize(sql)
+        print(f"\n{name}: {len(sql)} characters, {len(tokens)} tokens")
+        lex = best_of(lambda: tokenize(sql), number=1000)
+        report("tokenize", lex)
+        report("lint_performance", best_of(lambda: lint_performance(tokens), number=1000))
+
+
+if __name__ == "__main__":
+    main()
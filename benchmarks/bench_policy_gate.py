@@ -0,0 +1,51 @@
+"""
+Benchmark the policy gate on generated queries of increasing size.
+
+The gate lexes the SQL once and runs every check over the shared tokens, so
+its cost should grow linearly with the query length. Repeated SQL is answered
+from the result cache.
+
+    python -m benchmarks.bench_policy_gate
+"""
+
+from benchmarks.common import best_of, make_schema, report
+from config.settings import get_settings
+from validation.engine import get_validation_engine
+from validation.gate_cache import get_policy_gate_cache
+from validation.lexer import tokenize
+from validation.policy_gate import run_policy_gate
+
+
+def make_query(n_columns: int) -> str:
+    """A SELECT with n_columns items, a join and as many WHERE predicates."""
+    items = ", ".join(f"t.column_{c % 24 + 1}" for c in range(n_columns))
+    predicates = " AND ".join(
+        f"t.column_{c % 24 + 1} <> 'it''s -- not a comment; {c}'" for c in range(n_columns)
+    )
+    return (
+        f"-- generated\nSELECT {items}\nFROM table_1 t JOIN table_0 p ON p.id = t.column_1\n"
+        f"WHERE {predicates}\nORDER BY t.id"
+    )
+
+
+def main() -> None:
+    schema = make_schema(n_tables=50)
+    get_settings().max_sql_length = 0  # The largest query is over the limit
+    get_validation_engine.cache_clear()
+    cache = get_policy_gate_cache()
+    for n_columns in (10, 100, 1000, 10000):
+        sql = make_query(n_columns)
+        print(f"\n{n_columns} select items, {len(sql):,} characters")
+        report("tokenize", best_of(lambda: tokenize(sql), number=10))
+
+        def uncached() -> None:
+            cache.clear()
+            run_policy_gate(sql, schema)
+
+        gate = best_of(uncached, number=10)
+        report("run_policy_gate", gate)
+        report("run_policy_gate (cached)", best_of(lambda: run_policy_gate(sql, schema), number=1000), gate)
+
+
+if __name__ == "__main__":
+    main()
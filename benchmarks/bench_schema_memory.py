@@ -0,0 +1,58 @@
+"""
+Measure the resident size of a parsed catalog.
+
+Parses a synthetic catalog from JSON (so no strings are shared by
+construction) and reports traced allocations per table and per column,
+once parsed and again after building the derived indexes and renderings
+a cached schema accumulates (see schema.cache.estimate_schema_bytes).
+
+    python -m benchmarks.bench_schema_memory
+"""
+
+import gc
+import json
+import tracemalloc
+
+from benchmarks.common import make_schema
+from orchestrator.retrieval import select_relevant_schema
+from schema.models import SchemaContext
+from schema.parser import parse_schema
+from schema.serializer import serialize_schema
+
+
+def build_derived(schema: SchemaContext) -> None:
+    """Build everything requests derive from, and cache on, a schema."""
+    schema.fingerprint
+    schema.join_graph
+    select_relevant_schema("column attribute entity", schema)
+    for ddl in (False, True):
+        for budget in (None, 1):
+            serialize_schema(schema, budget, ddl=ddl)
+    for table in schema.tables:
+        table.to_prompt_string(include_descriptions=False)
+
+
+def main() -> None:
+    for n_tables, n_columns in ((1000, 25), (5000, 40)):
+        payload = json.loads(json.dumps(make_schema(n_tables, n_columns).to_dict()))
+        gc.collect()
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        schema = parse_schema(payload)
+        parsed = tracemalloc.get_traced_memory()[0] - before
+        build_derived(schema)
+        derived = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        n_total = n_tables * n_columns
+        for label, size in (("parsed", parsed), ("derived", derived)):
+            print(
+                f"{n_tables} tables x {n_columns} columns, {label:<7}: {size / 2**20:8.1f} MiB   "
+                f"{size / n_tables:8.0f} B/table   {size / n_total:6.0f} B/column"
+            )
+        del schema
+
+
+if __name__ == "__main__":
+    main()
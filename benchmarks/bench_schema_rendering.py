@@ -0,0 +1,51 @@
+"""
+Benchmark prompt rendering of large schemas, with and without memoization.
+
+A request renders the schema once for the planner (to_prompt_string) and
+once for the writer (to_compact_string). Uncached numbers call the render
+implementations directly; cached numbers go through the public methods.
+
+    python -m benchmarks.bench_schema_rendering
+"""
+
+from benchmarks.common import best_of, make_schema, report
+from schema.models import SchemaContext
+
+
+def render_uncached(schema: SchemaContext) -> None:
+    """Render both prompt forms from scratch, bypassing every cache."""
+    lines = ["DATABASE SCHEMA:", ""]
+    for table in schema.tables:
+        lines.append(table._render_prompt_string())
+        lines.append("")
+    "\n".join(lines)
+    "Tables: " + "; ".join(f"{t.name}({', '.join(t.get_column_names())})" for t in schema.tables)
+
+
+def render_cached(schema: SchemaContext) -> None:
+    schema.to_prompt_string()
+    schema.to_compact_string()
+
+
+def main() -> None:
+    for n_tables in (1000, 4000):
+        schema = make_schema(n_tables=n_tables)
+        print(f"\n{n_tables} tables x 25 columns")
+
+        uncached = best_of(lambda: render_uncached(schema))
+        report("uncached (per request)", uncached)
+
+        render_cached(schema)
+        report("cached, same schema instance", best_of(lambda: render_cached(schema), number=1000), uncached)
+
+        # Retrieval hands the agents a new SchemaContext per request that
+        # shares Table objects, so only the table-level caches are warm.
+        subset = schema.tables[:: max(1, n_tables // 12)]
+        uncached_subset = best_of(lambda: render_uncached(SchemaContext(tables=subset)), number=100)
+        report(f"uncached, {len(subset)}-table pruned schema", uncached_subset)
+        cached_subset = best_of(lambda: render_cached(SchemaContext(tables=subset)), number=100)
+        report(f"cached tables, {len(subset)}-table pruned schema", cached_subset, uncached_subset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Compare loading a catalog from JSON with loading it from a binary snapshot.
+
+    python -m benchmarks.bench_schema_snapshot
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import best_of, make_schema, report
+from schema.parser import parse_schema
+from schema.snapshot import SchemaSnapshot, load_snapshot, write_snapshot
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for n_tables in (1000, 3000):
+            schema = make_schema(n_tables=n_tables, n_columns=30)
+            json_path = Path(directory) / f"schema_{n_tables}.json"
+            snapshot_path = Path(directory) / f"schema_{n_tables}.tqls"
+            json_path.write_text(json.dumps(schema.to_dict()))
+            write_snapshot(schema, snapshot_path)
+
+            print(
+                f"\n{n_tables} tables x 30 columns "
+                f"(JSON {json_path.stat().st_size / 2**20:.1f} MiB, "
+                f"snapshot {snapshot_path.stat().st_size / 2**20:.1f} MiB)"
+            )
+            baseline = best_of(lambda: parse_schema(json.loads(json_path.read_text())), repeat=3)
+            report("json.loads + parse_schema", baseline)
+            report("load_snapshot (mmap)", best_of(lambda: load_snapshot(snapshot_path), repeat=3), baseline)
+            report("SchemaSnapshot header (lazy preload)", best_of(lambda: SchemaSnapshot(snapshot_path)), baseline)
+
+
+if __name__ == "__main__":
+    main()
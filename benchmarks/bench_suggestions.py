@@ -0,0 +1,74 @@
+"""
+Benchmark "did you mean" lookups against a full scan.
+
+Column names are built from a small vocabulary of common words, so many of
+them share bigrams: a worst case for the index's filters.
+
+    python -m benchmarks.bench_suggestions
+"""
+
+import random
+import time
+
+from benchmarks.common import best_of, report
+from validation.schema_checker import find_similar_identifiers
+from validation.suggestions import IdentifierIndex
+
+WORDS = (
+    "customer", "id", "name", "created_at", "order", "total", "status", "product", "price",
+    "amount", "user", "email", "updated", "date", "type", "code", "region", "account",
+    "balance", "invoice",
+)
+
+
+def make_names(n: int, seed: int = 0) -> list[str]:
+    """n distinct identifiers such as 'order_total' or 'customer_email_12'."""
+    rng = random.Random(seed)
+    names: set[str] = set()
+    while len(names) < n:
+        name = "_".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        if rng.random() < 0.5:
+            name += str(rng.randint(0, 99))
+        names.add(name)
+    return sorted(names)
+
+
+def make_typos(names: list[str], n: int, seed: int = 1) -> list[str]:
+    """n names with one character deleted, inserted or replaced."""
+    rng = random.Random(seed)
+    typos = []
+    for name in rng.sample(names, n):
+        i = rng.randrange(len(name))
+        typos.append(rng.choice((
+            name[:i] + name[i + 1:],
+            name[:i] + "x" + name[i:],
+            name[:i] + "q" + name[i + 1:],
+        )))
+    return typos
+
+
+def main() -> None:
+    for n_names in (1_000, 20_000, 200_000):
+        names = make_names(n_names)
+        typos = make_typos(names, 50)
+        print(f"\n{n_names:,} column names")
+
+        start = time.perf_counter()
+        index = IdentifierIndex(names)
+        report("build index", time.perf_counter() - start)
+
+        def scan() -> None:
+            for typo in typos:
+                find_similar_identifiers(typo, names)
+
+        def lookup() -> None:
+            for typo in typos:
+                index.suggest(typo)
+
+        baseline = best_of(scan, repeat=1) / len(typos)
+        report("find_similar_identifiers (per name)", baseline)
+        report("IdentifierIndex.suggest (per name)", best_of(lookup, repeat=3) / len(typos), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark batch validation in-process and across the validation pool.
+
+The pool should scale with the number of CPUs, less the cost of shipping
+each chunk and its schema snapshot to a worker.
+
+    python -m benchmarks.bench_validate_batch
+"""
+
+import asyncio
+import os
+
+from benchmarks.bench_policy_gate import make_query
+from benchmarks.common import best_of, make_schema, report
+from config.settings import get_settings
+from validation.batch import shutdown_validation_pool, validate_batch, validate_statements
+from validation.gate_cache import get_policy_gate_cache
+
+
+def main() -> None:
+    schema = make_schema(n_tables=200)
+    # Distinct statements, so the gate cache doesn't answer them
+    statements = [make_query(20 + i % 7) + f" OFFSET {i}" for i in range(4000)]
+    print(f"\n{len(statements):,} statements, {len(schema.tables)} tables")
+
+    def in_process() -> None:
+        get_policy_gate_cache().clear()
+        validate_statements(statements, schema)
+
+    async def consume() -> None:
+        async for _ in validate_batch(statements, schema):
+            pass
+
+    baseline = best_of(in_process, repeat=3)
+    report("validate_statements (in-process)", baseline)
+
+    settings = get_settings()
+    for workers in sorted({2, os.cpu_count() or 1}):
+        settings.validation_workers = workers
+        shutdown_validation_pool()
+        asyncio.run(consume())  # Start the workers
+        # New SQL text, so the workers' gate caches can't answer it
+        statements = [sql + " " for sql in statements]
+        report(f"validate_batch ({workers} workers)", best_of(lambda: asyncio.run(consume()), repeat=1), baseline)
+    shutdown_validation_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Shared helpers for the benchmarks.
+"""
+
+import time
+from collections.abc import Callable
+
+from schema.models import Column, SchemaContext, Table
+
+COLUMN_TYPES = ("integer", "varchar", "timestamp", "decimal", "boolean", "text", "date")
+
+
+def make_schema(n_tables: int = 1000, n_columns: int = 25) -> SchemaContext:
+    """Build a synthetic warehouse-style schema with descriptions and foreign keys."""
+    tables = []
+    for t in range(n_tables):
+        columns = [Column(name="id", type="integer", primary_key=True)]
+        for c in range(1, n_columns):
+            foreign_key = f"table_{t - 1}.id" if c == 1 and t > 0 else None
+            columns.append(Column(
+                name=f"column_{c}",
+                type=COLUMN_TYPES[c % len(COLUMN_TYPES)],
+                description=f"Attribute {c} of entity {t}" if c % 3 == 0 else None,
+                foreign_key=foreign_key,
+            ))
+        tables.append(Table(name=f"table_{t}", columns=tuple(columns), description=f"Entity {t}"))
+    return SchemaContext(tables=tuple(tables))
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """Best wall-clock time in seconds of `number` calls, over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def report(name: str, seconds: float, baseline: float | None = None) -> None:
+    """Print one benchmark line, with speedup relative to a baseline if given."""
+    line = f"{name:<48} {seconds * 1000:>10.3f} ms"
+    if baseline is not None and seconds > 0:
+        line += f"   ({baseline / seconds:,.0f}x)"
+    print(line)
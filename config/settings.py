@@ -43,8 +43,53 @@ class Settings(BaseSettings):
     default_dialect: str = "postgres"
     max_row_limit: int = 50
 
+    # Schema Retrieval Settings (number of tables sent to the LLM agents; 0 disables pruning)
+    schema_retrieval_top_k: int = 8
+    # Join hints are only generated when the agents see at most this many tables
+    join_hint_max_tables: int = 16
+
+    # Schema Prompt Budgets (estimated tokens of schema text per agent; 0 means unlimited)
+    planner_schema_token_budget: int = 4000
+    sql_writer_schema_token_budget: int = 1500
+
+    # Schema Registry Settings
+    schema_registry_max_entries: int = 1000
+    # Directory of *.tqls schema snapshots registered (lazily) at startup; empty disables
+    schema_snapshot_dir: str = ""
+
+    # SQLite database introspected for queries that send neither schema_metadata nor
+    # schema_id; re-read only when its schema changes. Empty disables
+    sqlite_database: str = ""
+
+    # Parsed Schema Cache Settings (estimated bytes of parsed inline schemas kept; 0 disables)
+    parsed_schema_cache_max_bytes: int = 256 * 1024 * 1024
+
     # Validation Settings
     placeholder_pattern: str = r"<[A-Z][A-Z0-9_]*>"
+    # Longer SQL is rejected before any check runs (characters; 0 disables). Validation is
+    # linear in the length: at most a few ms per KB (benchmarks/bench_adversarial.py)
+    max_sql_length: int = 100_000
+    # Deepest row a read query may page to: OFFSET + LIMIT above this is rejected
+    # (rows; 0 disables). Deep OFFSETs scan and discard every row before the page
+    max_result_window: int = 100_000
+    # Performance lint rules (validation/perf_rules.py) add perf_warnings to results
+    perf_rules_enabled: bool = True
+    # Queries with a cartesian join (FROM a, b with no join condition) need review
+    cartesian_join_review: bool = False
+    # Tables with at least this many rows (schema row_count) get a warning when a
+    # query reads them without filtering on an indexed or partition column
+    large_table_rows: int = 100_000_000
+    # SELECT * over more columns than this gets a proportionally lower row limit
+    # (columns; 0 disables)
+    wide_table_columns: int = 50
+    # Suggest indexes for generated SQL on tables whose schema declares indexes
+    index_advisor_enabled: bool = True
+    # Policy gate results memoized per SQL, schema and settings (entries; 0 disables)
+    policy_gate_cache_max_entries: int = 10_000
+    # Estimated bytes of policy gate results kept (0 disables); long SQL fills it first
+    policy_gate_cache_max_bytes: int = 64 * 1024 * 1024
+    # Worker processes for /validate/batch (0 uses one per CPU; 1 validates in-process)
+    validation_workers: int = 0
 
     @property
     def forbidden_keywords(self) -> list[str]:
@@ -32,12 +32,18 @@ from google.genai import types
 from pydantic import Field
 
 from api.models import (
+    IndexAdvisorOutput,
     Placeholder,
     QueryResponse,
     QueryStatus,
 )
+from orchestrator.retrieval import build_join_hints, select_relevant_schema
+from schema.cache import parse_schema_cached
 from schema.models import SchemaContext
-from schema.parser import parse_schema
+from schema.parser import SchemaParseError
+from schema.serializer import serialize_schema
+from validation.engine import get_validation_engine
+from validation.index_advisor import advise_indexes
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +54,8 @@ logger = logging.getLogger(__name__)
 GEMINI_MODEL = "gemini-2.0-flash"  # Free tier model
 APP_NAME = "text_ql_hybrid"
 USER_ID = "default_user"
+# Session state key for the schema rendered within the SQL writer budget
+SQL_WRITER_SCHEMA_KEY = "sql_writer_schema"
 
 
 # ============================================================================
@@ -103,7 +111,9 @@ class OllamaSqlCoderAgent(BaseAgent):
             assumptions = []
         
         # Build the prompt for SQLCoder
-        prompt = self._build_sqlcoder_prompt(user_message, assumptions)
+        prompt = self._build_sqlcoder_prompt(
+            user_message, assumptions, ctx.session.state.get(SQL_WRITER_SCHEMA_KEY)
+        )
         
         logger.debug(f"[{self.name}] Prompt: {prompt[:500]}...")
         
@@ -164,28 +174,36 @@ class OllamaSqlCoderAgent(BaseAgent):
                         return part.text
         return ""
     
-    def _build_sqlcoder_prompt(self, user_message: str, assumptions: list[str]) -> str:
-        """Build prompt in SQLCoder's expected format."""
-        # Extract schema from user message if present
-        schema_match = re.search(r'Database Schema:\s*(\{.*?\}|\[.*?\]|CREATE TABLE.*?(?=\n\n|$))', 
-                                  user_message, re.DOTALL | re.IGNORECASE)
+    def _build_sqlcoder_prompt(
+        self,
+        user_message: str,
+        assumptions: list[str],
+        schema_text: str | None = None,
+    ) -> str:
+        """
+        Build prompt in SQLCoder's expected format.
+
+        schema_text is the schema as CREATE TABLE statements, rendered within
+        sql_writer_schema_token_budget; without it the schema is taken from the
+        user message as is.
+        """
+        schema_str = schema_text
+        if not schema_str:
+            # The schema in the user message ends before the hints or the request
+            schema_match = re.search(
+                r'Database Schema:\s*(.*?)(?=\n\nJoin Hints:|\n\nGenerate a SQL query|$)',
+                user_message,
+                re.DOTALL,
+            )
+            if schema_match and schema_match.group(1).strip() != "No schema provided":
+                schema_str = schema_match.group(1).strip()
         
-        if schema_match:
-            schema_str = schema_match.group(1).strip()
-            # Try to convert JSON schema to CREATE TABLE format
-            try:
-                schema_data = json.loads(schema_str)
-                if isinstance(schema_data, dict) and "tables" in schema_data:
-                    schema_lines = []
-                    for table in schema_data["tables"]:
-                        cols = ", ".join([
-                            f"{c['name']} {c.get('type', 'TEXT')}"
-                            for c in table.get("columns", [])
-                        ])
-                        schema_lines.append(f"CREATE TABLE {table['name']} ({cols});")
-                    schema_str = "\n".join(schema_lines)
-            except (json.JSONDecodeError, KeyError, TypeError):
-                pass
+        if schema_str:
+            # Append join hints as SQL comments next to the table definitions
+            hints_match = re.search(r'Join Hints:\n((?:- [^\n]*\n?)+)', user_message)
+            if hints_match:
+                hints = [line[2:] for line in hints_match.group(1).splitlines() if line.startswith("- ")]
+                schema_str += "\n\n" + "\n".join(f"-- {h}" for h in hints)
         else:
             schema_str = "-- No schema provided. Use <TABLE_NAME> and <COLUMN_NAME> placeholders."
         
@@ -277,54 +295,29 @@ def validate_sql(sql: str) -> dict:
     """
     Validate SQL query and enforce policies.
     
+    Runs the shared validation engine, the same checks as every other
+    pipeline.
+    
     Args:
         sql: The SQL query to validate.
         
     Returns:
         Dictionary with validation results.
     """
-    settings = get_settings()
-    
-    if not sql or not sql.strip():
-        return {"valid": False, "sql": sql, "status": "error", "warnings": [], "errors": ["Empty SQL"]}
-    
-    warnings = []
-    modified_sql = sql.strip()
-    upper_sql = modified_sql.upper()
-    
-    # Enforce LIMIT
-    is_select = upper_sql.startswith("SELECT") or upper_sql.startswith("WITH")
-    if is_select and "LIMIT" not in upper_sql:
-        modified_sql = modified_sql.rstrip(";") + f" LIMIT {settings.max_row_limit}"
-        warnings.append(f"LIMIT {settings.max_row_limit} was enforced")
-    
-    # Detect placeholders
-    if re.search(r"<[A-Z][A-Z0-9_]*>", modified_sql):
-        warnings.append("SQL contains placeholders that need to be replaced")
-        status = "draft"
-    elif not is_select:
-        status = "review_required"
-    else:
-        status = "validated"
-    
-    return {"valid": True, "sql": modified_sql, "status": status, "warnings": warnings, "errors": []}
+    output = get_validation_engine().validate(sql)
+    return {
+        "valid": output.passed,
+        "sql": output.sql,
+        "status": output.status.value,
+        "warnings": output.warnings,
+        "errors": output.policy_errors,
+        "perf_warnings": [warning.message for warning in output.perf_warnings],
+    }
 
 
 def extract_placeholders(sql: str) -> list[dict]:
     """Extract placeholder tokens from SQL."""
-    matches = re.findall(r"<[A-Z][A-Z0-9_]*>", sql)
-    placeholders = []
-    seen = set()
-    
-    for token in matches:
-        if token in seen:
-            continue
-        seen.add(token)
-        inner = token[1:-1].lower().replace("_", " ")
-        meaning = f"Value or identifier for {inner}"
-        placeholders.append({"token": token, "meaning": meaning})
-    
-    return placeholders
+    return get_validation_engine().placeholders(sql)
 
 
 # ============================================================================
@@ -440,6 +433,7 @@ async def run_hybrid_pipeline(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """
     Run the hybrid text-ql pipeline.
@@ -450,6 +444,7 @@ async def run_hybrid_pipeline(
         question: Natural language question
         dialect: SQL dialect (postgres, mysql, sqlite)
         schema_json: Optional database schema
+        schema: Optional pre-parsed schema, used when schema_json is not given
         
     Returns:
         QueryResponse with generated SQL and metadata
@@ -459,24 +454,53 @@ async def run_hybrid_pipeline(
     runner = get_runner()
     session_service = get_session_service()
     
-    session_id = str(uuid.uuid4())
-    session = await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=USER_ID,
-        session_id=session_id
-    )
-    
     # Build input message
+    # Only send the tables relevant to the question
+    if schema is None and schema_json:
+        try:
+            schema = parse_schema_cached(schema_json)
+        except SchemaParseError:
+            schema = None
+    # The Gemini agents share the user message, rendered within the planner's
+    # token budget; SQLCoder gets its own, smaller rendering through the
+    # session state (see OllamaSqlCoderAgent)
     schema_str = json.dumps(schema_json, indent=2) if schema_json else "No schema provided"
+    initial_state: dict[str, Any] = {}
+    join_hints: list[str] = []
+    if schema is not None and not schema.is_empty:
+        prompt_schema = select_relevant_schema(question, schema)
+        settings = get_settings()
+        serialized = serialize_schema(prompt_schema, settings.planner_schema_token_budget)
+        writer_schema = serialize_schema(
+            prompt_schema, settings.sql_writer_schema_token_budget, ddl=True
+        )
+        logger.info(
+            f"Hybrid schema: {serialized.detail} for Gemini, {writer_schema.detail} for "
+            f"SQLCoder, {serialized.table_count} table(s)"
+        )
+        schema_str = serialized.text
+        initial_state[SQL_WRITER_SCHEMA_KEY] = writer_schema.text
+        join_hints = build_join_hints(schema, prompt_schema)
+    join_hints_str = ""
+    if join_hints:
+        join_hints_str = "\n\nJoin Hints:\n" + "\n".join(f"- {h}" for h in join_hints)
     
     user_message = f"""Question: {question}
 SQL Dialect: {dialect}
 
 Database Schema:
-{schema_str}
+{schema_str}{join_hints_str}
 
 Generate a SQL query to answer this question."""
     
+    session_id = str(uuid.uuid4())
+    session = await session_service.create_session(
+        app_name=APP_NAME,
+        user_id=USER_ID,
+        session_id=session_id,
+        state=initial_state,
+    )
+    
     content = types.Content(
         role="user",
         parts=[types.Part(text=user_message)]
@@ -515,18 +539,24 @@ Generate a SQL query to answer this question."""
         # Parse planner output
         parsed_planner = _parse_planner_output(planner_output)
         
-        # Validate final SQL
-        validation = validate_sql(final_sql or "")
-        placeholders = extract_placeholders(validation["sql"])
+        # Validate final SQL, against the schema when there is one
+        engine = get_validation_engine()
+        validation = engine.validate(final_sql or "", schema, dialect=dialect)
+        placeholders = engine.placeholders(validation.sql, dialect)
+        advice = IndexAdvisorOutput()
+        if get_settings().index_advisor_enabled and validation.passed:
+            advice = advise_indexes(validation.sql, schema, dialect)
         
         return QueryResponse(
-            sql=validation["sql"],
-            status=QueryStatus(validation["status"]),
+            sql=validation.sql,
+            status=validation.status,
             placeholders=[Placeholder(**p) for p in placeholders],
-            warnings=validation["warnings"],
+            warnings=validation.warnings + advice.notes,
             clarifying_questions=parsed_planner.get("clarifying_questions", []),
             assumptions=parsed_planner.get("assumptions", []),
-            policy_errors=validation.get("errors", [])
+            policy_errors=validation.policy_errors,
+            perf_warnings=validation.perf_warnings,
+            index_suggestions=advice.suggestions,
         )
         
     except Exception as e:
@@ -544,7 +574,7 @@ Generate a SQL query to answer this question."""
             logger.warning(f"Gemini rate limited, falling back to Groq: {e}")
             try:
                 # Fall back to Groq-based pipeline
-                return await _run_groq_fallback(question, dialect, schema_json)
+                return await _run_groq_fallback(question, dialect, schema_json, schema)
             except Exception as fallback_error:
                 logger.exception(f"Groq fallback also failed: {fallback_error}")
                 return QueryResponse(
@@ -582,6 +612,7 @@ async def _run_groq_fallback(
     question: str,
     dialect: str,
     schema_json: dict[str, Any] | None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """
     Fallback to Groq when Gemini is rate limited.
@@ -599,7 +630,7 @@ async def _run_groq_fallback(
     
     response = await loop.run_in_executor(
         None,
-        lambda: run_basic_pipeline(question, dialect, schema_json)
+        lambda: run_basic_pipeline(question, dialect, schema_json, schema)
     )
     
     # Add a warning that we used the fallback
@@ -613,7 +644,9 @@ async def _run_groq_fallback(
         warnings=warnings,
         clarifying_questions=response.clarifying_questions,
         assumptions=response.assumptions,
-        policy_errors=response.policy_errors
+        policy_errors=response.policy_errors,
+        perf_warnings=response.perf_warnings,
+        index_suggestions=response.index_suggestions,
     )
 
 
@@ -640,24 +673,26 @@ def run_pipeline(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """Synchronous wrapper for the hybrid pipeline."""
     try:
         loop = asyncio.get_running_loop()
         # Already in async context - use fallback
         from orchestrator.root import run_pipeline as run_basic
-        return run_basic(question, dialect, schema_json)
+        return run_basic(question, dialect, schema_json, schema)
     except RuntimeError:
-        return asyncio.run(run_hybrid_pipeline(question, dialect, schema_json))
+        return asyncio.run(run_hybrid_pipeline(question, dialect, schema_json, schema))
 
 
 async def run_pipeline_async(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """Async entry point for the hybrid pipeline."""
-    return await run_hybrid_pipeline(question, dialect, schema_json)
+    return await run_hybrid_pipeline(question, dialect, schema_json, schema)
 
 
 # Export the pipeline creator for external use
@@ -23,15 +23,21 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 from api.models import (
+    IndexAdvisorOutput,
     Placeholder,
     PlannerOutput,
+    PolicyGateOutput,
     QueryResponse,
     QueryStatus,
     SqlWriterOutput,
 )
+from orchestrator.retrieval import build_join_hints, select_relevant_schema
+from schema.cache import parse_schema_cached
 from schema.models import SchemaContext
-from schema.parser import parse_schema
-from validation.policy_gate import run_policy_gate
+from schema.parser import SchemaParseError
+from schema.serializer import serialize_schema
+from validation.engine import get_validation_engine
+from validation.index_advisor import advise_indexes
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +70,7 @@ def parse_schema_tool(schema_json: str) -> dict:
     
     try:
         data = json.loads(schema_json) if isinstance(schema_json, str) else schema_json
-        schema = parse_schema(data)
+        schema = parse_schema_cached(data)
         
         tables_info = []
         for table in schema.tables:
@@ -84,6 +90,9 @@ def validate_sql_tool(sql: str, has_placeholders: bool = False) -> dict:
     """
     Validate SQL query against security policies.
     
+    Runs the shared validation engine, the same checks as every other
+    pipeline.
+    
     Args:
         sql: The SQL query to validate.
         has_placeholders: Whether the SQL contains placeholder tokens.
@@ -91,59 +100,17 @@ def validate_sql_tool(sql: str, has_placeholders: bool = False) -> dict:
     Returns:
         Dictionary with validation results, warnings, and modified SQL.
     """
-    settings = get_settings()
-    
-    # Basic validation
-    if not sql or not sql.strip():
-        return {
-            "valid": False,
-            "sql": sql,
-            "status": "error",
-            "warnings": [],
-            "errors": ["Empty SQL query"]
-        }
-    
-    warnings = []
-    errors = []
-    modified_sql = sql.strip()
-    
-    # Check statement type
-    upper_sql = modified_sql.upper()
-    is_select = upper_sql.startswith("SELECT") or upper_sql.startswith("WITH")
-    
-    # Enforce LIMIT on SELECT
-    if is_select and "LIMIT" not in upper_sql:
-        modified_sql = modified_sql.rstrip(";") + f" LIMIT {settings.max_row_limit}"
-        warnings.append(f"LIMIT {settings.max_row_limit} was enforced on the query")
-    
-    # Detect dangerous operations
-    dangerous_ops = ["DROP", "TRUNCATE", "DELETE", "UPDATE", "INSERT"]
-    for op in dangerous_ops:
-        if upper_sql.startswith(op):
-            warnings.append(f"⚠️ This is a {op} statement - review carefully before executing")
-    
-    # Detect placeholders
-    placeholder_pattern = r"<[A-Z][A-Z0-9_]*>"
-    if re.search(placeholder_pattern, modified_sql):
-        has_placeholders = True
-        warnings.append("SQL contains placeholders that need to be replaced")
-    
-    # Determine status
-    if errors:
-        status = "error"
-    elif has_placeholders:
-        status = "draft"
-    elif not is_select:
-        status = "review_required"
-    else:
-        status = "validated"
-    
+    return _validation_dict(get_validation_engine().validate(sql, None, has_placeholders))
+
+
+def _validation_dict(output: PolicyGateOutput) -> dict:
     return {
-        "valid": len(errors) == 0,
-        "sql": modified_sql,
-        "status": status,
-        "warnings": warnings,
-        "errors": errors
+        "valid": output.passed,
+        "sql": output.sql,
+        "status": output.status.value,
+        "warnings": output.warnings,
+        "errors": output.policy_errors,
+        "perf_warnings": [warning.message for warning in output.perf_warnings],
     }
 
 
@@ -157,28 +124,7 @@ def extract_placeholders_tool(sql: str) -> list[dict]:
     Returns:
         List of placeholder dictionaries with token and meaning.
     """
-    pattern = r"<[A-Z][A-Z0-9_]*>"
-    matches = re.findall(pattern, sql)
-    
-    placeholders = []
-    seen = set()
-    
-    for token in matches:
-        if token in seen:
-            continue
-        seen.add(token)
-        
-        inner = token[1:-1].lower().replace("_", " ")
-        if "table" in inner:
-            meaning = f"Table name for {inner.replace('table', '').strip()}"
-        elif "column" in inner:
-            meaning = f"Column name for {inner.replace('column', '').strip()}"
-        else:
-            meaning = f"Value or identifier for {inner}"
-        
-        placeholders.append({"token": token, "meaning": meaning})
-    
-    return placeholders
+    return get_validation_engine().placeholders(sql)
 
 
 # ============================================================================
@@ -316,6 +262,7 @@ async def run_pipeline_adk(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """
     Run the text-ql pipeline using Google ADK.
@@ -324,6 +271,7 @@ async def run_pipeline_adk(
         question: Natural language question
         dialect: SQL dialect (postgres, mysql, sqlite)
         schema_json: Optional database schema
+        schema: Optional pre-parsed schema, used when schema_json is not given
         
     Returns:
         QueryResponse with generated SQL and metadata
@@ -343,14 +291,35 @@ async def run_pipeline_adk(
     )
     
     # Build the input message
+    # Only send the tables relevant to the question
+    if schema is None and schema_json:
+        try:
+            schema = parse_schema_cached(schema_json)
+        except SchemaParseError:
+            schema = None
+    # One message feeds every agent, so the schema is rendered once, within the
+    # planner's token budget (the larger one)
     schema_str = json.dumps(schema_json, indent=2) if schema_json else "No schema provided"
+    join_hints: list[str] = []
+    if schema is not None and not schema.is_empty:
+        prompt_schema = select_relevant_schema(question, schema)
+        serialized = serialize_schema(prompt_schema, get_settings().planner_schema_token_budget)
+        logger.info(
+            f"ADK schema: {serialized.detail}, {serialized.table_count} table(s), "
+            f"~{serialized.estimated_tokens} tokens"
+        )
+        schema_str = serialized.text
+        join_hints = build_join_hints(schema, prompt_schema)
+    join_hints_str = ""
+    if join_hints:
+        join_hints_str = "\n\nJoin Hints:\n" + "\n".join(f"- {h}" for h in join_hints)
     
     user_message = f"""
 Question: {question}
 SQL Dialect: {dialect}
 
 Database Schema:
-{schema_str}
+{schema_str}{join_hints_str}
 
 Generate a SQL query to answer this question.
 """
@@ -397,19 +366,25 @@ Generate a SQL query to answer this question.
         sql = final_response or generated_sql or ""
         sql = _clean_sql(sql)
         
-        # Validate the SQL
-        validation = validate_sql_tool(sql, has_placeholders=False)
-        placeholders = extract_placeholders_tool(sql)
+        # Validate the SQL, against the schema when there is one
+        engine = get_validation_engine()
+        validation = engine.validate(sql, schema, dialect=dialect)
+        placeholders = engine.placeholders(sql, dialect)
+        advice = IndexAdvisorOutput()
+        if get_settings().index_advisor_enabled and validation.passed:
+            advice = advise_indexes(validation.sql, schema, dialect)
         
         # Build response
         return QueryResponse(
-            sql=validation["sql"],
-            status=QueryStatus(validation["status"]),
+            sql=validation.sql,
+            status=validation.status,
             placeholders=[Placeholder(**p) for p in placeholders],
-            warnings=validation["warnings"],
+            warnings=validation.warnings + advice.notes,
             clarifying_questions=parsed_planner.get("clarifying_questions", []),
             assumptions=parsed_planner.get("assumptions", []),
-            policy_errors=validation["errors"]
+            policy_errors=validation.policy_errors,
+            perf_warnings=validation.perf_warnings,
+            index_suggestions=advice.suggestions,
         )
         
     except Exception as e:
@@ -481,6 +456,7 @@ def run_pipeline(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """Synchronous wrapper for the ADK pipeline."""
     try:
@@ -489,16 +465,17 @@ def run_pipeline(
         # If we're here, we're in an async context - this shouldn't happen
         # Fall back to the basic pipeline
         from orchestrator.root import run_pipeline as run_basic_pipeline
-        return run_basic_pipeline(question, dialect, schema_json)
+        return run_basic_pipeline(question, dialect, schema_json, schema)
     except RuntimeError:
         # No running loop, safe to use asyncio.run()
-        return asyncio.run(run_pipeline_adk(question, dialect, schema_json))
+        return asyncio.run(run_pipeline_adk(question, dialect, schema_json, schema))
 
 
 async def run_pipeline_async(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """Async entry point for the ADK pipeline."""
-    return await run_pipeline_adk(question, dialect, schema_json)
+    return await run_pipeline_adk(question, dialect, schema_json, schema)
@@ -0,0 +1,258 @@
+"""
+Relevance-based schema pruning.
+
+Large catalogs make the schema the dominant part of every prompt. This module
+scores tables against the question and keeps only the most relevant ones
+(plus their foreign-key neighbours) for the planner and writer. The full
+schema is still used by the policy gate.
+
+Scoring combines BM25 over word tokens from table/column names and
+descriptions with character trigram overlap on identifiers, which catches
+partial and misspelled names ("cust", "ordr"). Both are stored as sparse
+postings lists and evaluated with NumPy.
+"""
+
+import logging
+import re
+from collections import Counter
+
+import numpy as np
+
+from config.settings import get_settings
+from schema.models import SchemaContext, Table
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term frequency multiplier for words from the table name itself
+TABLE_NAME_BOOST = 3
+
+# Weight of the trigram similarity relative to the (max-normalized) BM25 score
+NGRAM_WEIGHT = 0.5
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "get", "give",
+    "has", "have", "how", "i", "in", "is", "it", "list", "many", "me", "much", "of",
+    "on", "or", "per", "show", "that", "the", "their", "them", "there", "they",
+    "this", "to", "was", "were", "what", "which", "who", "with", "all", "each",
+    "find", "our", "my", "do", "does", "did",
+})
+
+
+def _stem(word: str) -> str:
+    """Very light plural stemming so 'orders' matches 'order'."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize_text(text: str) -> list[str]:
+    """
+    Split free text or identifiers into lowercase, stemmed word tokens.
+
+    snake_case and camelCase identifiers are split into their parts.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text.replace("_", " ")):
+        for part in _CAMEL_RE.findall(word) or [word]:
+            part = part.lower()
+            if part not in _STOPWORDS:
+                tokens.append(_stem(part))
+    return tokens
+
+
+def char_ngrams(word: str, n: int = 3) -> set[str]:
+    """Character n-grams of a word, padded so short words still produce grams."""
+    padded = f" {word.lower()} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class TableRetrievalIndex:
+    """
+    Inverted index over the tables of one schema.
+
+    Build once per schema (see get_retrieval_index) and query per question.
+    """
+
+    def __init__(self, schema: SchemaContext):
+        # Duplicate table names resolve to the first definition, as in SchemaContext
+        self.tables: tuple[Table, ...] = tuple(
+            t for t in schema.tables if schema.get_table(t.name) is t
+        )
+        self._position = {t.name.lower(): i for i, t in enumerate(self.tables)}
+
+        word_docs: list[Counter[str]] = []
+        gram_docs: list[set[str]] = []
+        for table in self.tables:
+            words: Counter[str] = Counter()
+            for token in tokenize_text(table.name):
+                words[token] += TABLE_NAME_BOOST
+            words.update(tokenize_text(table.description or ""))
+            grams = set()
+            for word in _WORD_RE.findall(table.name):
+                grams |= char_ngrams(word)
+            for col in table.columns:
+                words.update(tokenize_text(col.name))
+                words.update(tokenize_text(col.description or ""))
+                for word in _WORD_RE.findall(col.name):
+                    grams |= char_ngrams(word)
+            word_docs.append(words)
+            gram_docs.append(grams)
+
+        self._word_postings = self._build_bm25_postings(word_docs)
+        self._gram_postings = self._build_postings({g: 1.0 for g in doc} for doc in gram_docs)
+        self._gram_norms = np.sqrt(np.array([max(len(d), 1) for d in gram_docs], dtype=np.float64))
+
+        # Foreign-key adjacency in both directions, by table position
+        self._join_graph = schema.join_graph
+        self._neighbours: list[set[int]] = [
+            {self._position[n.lower()] for n in self._join_graph.neighbours(t.name)}
+            for t in self.tables
+        ]
+
+    @staticmethod
+    def _build_postings(docs) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Build term -> (doc ids, weights) arrays from per-document weight maps."""
+        raw: dict[str, tuple[list[int], list[float]]] = {}
+        for doc_id, weights in enumerate(docs):
+            for term, weight in weights.items():
+                ids, values = raw.setdefault(term, ([], []))
+                ids.append(doc_id)
+                values.append(weight)
+        return {
+            term: (np.array(ids, dtype=np.int32), np.array(values, dtype=np.float64))
+            for term, (ids, values) in raw.items()
+        }
+
+    def _build_bm25_postings(
+        self, docs: list[Counter[str]]
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Postings whose weights are the full, query-independent BM25 term scores."""
+        n_docs = len(docs)
+        lengths = np.array([sum(d.values()) for d in docs], dtype=np.float64)
+        avg_length = float(lengths.mean()) if n_docs else 0.0
+        postings = self._build_postings(docs)
+
+        for term, (ids, tf) in postings.items():
+            idf = np.log(1.0 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths[ids] / max(avg_length, 1e-9))
+            postings[term] = (ids, idf * tf * (BM25_K1 + 1.0) / (tf + norm))
+        return postings
+
+    def score(self, question: str) -> np.ndarray:
+        """Relevance score of every table for the question."""
+        scores = np.zeros(len(self.tables), dtype=np.float64)
+        if not self.tables:
+            return scores
+
+        for term in set(tokenize_text(question)):
+            posting = self._word_postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        if scores.max() > 0:
+            scores /= scores.max()
+
+        query_grams: set[str] = set()
+        for word in _WORD_RE.findall(question):
+            if word.lower() not in _STOPWORDS:
+                query_grams |= char_ngrams(word)
+        if query_grams:
+            overlap = np.zeros(len(self.tables), dtype=np.float64)
+            for gram in query_grams:
+                posting = self._gram_postings.get(gram)
+                if posting is not None:
+                    overlap[posting[0]] += posting[1]
+            scores += NGRAM_WEIGHT * overlap / (self._gram_norms * np.sqrt(len(query_grams)))
+
+        return scores
+
+    def top_tables(self, question: str, top_k: int) -> list[Table]:
+        """
+        Select the top_k most relevant tables plus their foreign-key neighbours.
+
+        Tables on the join paths between the selected tables are always
+        included. Other neighbours are added in order of their own relevance,
+        at most top_k of them. Returns an empty list if nothing in the schema
+        matches.
+        """
+        scores = self.score(question)
+        if len(scores) == 0 or scores.max() <= 0:
+            return []
+
+        k = min(top_k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = [int(i) for i in candidates[np.argsort(-scores[candidates], kind="stable")]]
+        selected = [i for i in ranked if scores[i] > 0]
+
+        bridges: list[int] = []
+        for edge in self._join_graph.connect(self.tables[i].name for i in selected):
+            for name in (edge.from_table, edge.to_table):
+                position = self._position[name.lower()]
+                if position not in selected and position not in bridges:
+                    bridges.append(position)
+
+        chosen = set(selected) | set(bridges)
+        neighbours = {n for i in selected for n in self._neighbours[i]} - chosen
+        extra = sorted(neighbours, key=lambda i: -scores[i])[:top_k]
+
+        return [self.tables[i] for i in selected + bridges + extra]
+
+
+def get_retrieval_index(schema: SchemaContext) -> TableRetrievalIndex:
+    """Get the retrieval index for a schema, building it on first use."""
+    return schema.cached("retrieval_index", lambda: TableRetrievalIndex(schema))
+
+
+def select_relevant_schema(
+    question: str,
+    schema: SchemaContext,
+    top_k: int | None = None,
+) -> SchemaContext:
+    """
+    Reduce a schema to the tables relevant to the question.
+
+    Args:
+        question: Natural language question
+        schema: Full parsed schema
+        top_k: Number of tables to select (defaults to settings;
+            0 disables pruning)
+
+    Returns:
+        A SchemaContext with the selected tables, most relevant first, or the
+        original schema if it is already small enough or nothing matched
+    """
+    if top_k is None:
+        top_k = get_settings().schema_retrieval_top_k
+
+    if top_k <= 0 or len(schema.tables) <= top_k:
+        return schema
+
+    tables = get_retrieval_index(schema).top_tables(question, top_k)
+    if not tables:
+        logger.info("Schema retrieval found no relevant tables, using full schema")
+        return schema
+
+    logger.info(f"Schema retrieval selected {len(tables)} of {len(schema.tables)} tables")
+    return SchemaContext(tables=tuple(tables))
+
+
+def build_join_hints(schema: SchemaContext, prompt_schema: SchemaContext) -> list[str]:
+    """
+    JOIN ... ON hints connecting the tables selected for the prompt.
+
+    Paths come from the full schema's cached join graph. No hints are built
+    when the prompt shows more than join_hint_max_tables tables.
+    """
+    if prompt_schema.is_empty or len(prompt_schema.tables) > get_settings().join_hint_max_tables:
+        return []
+    return schema.join_graph.join_hints(prompt_schema.get_table_names())
@@ -1,7 +1,8 @@
 """
 Orchestrator for the text-ql pipeline.
 
-Pipeline: Planner (Groq/LLaMA 3.3) → SqlWriter (Ollama/SQLCoder 7b) → PolicyGate → Response
+Pipeline: Retrieval → Planner (Groq/LLaMA 3.3) → SqlWriter (Ollama/SQLCoder 7b) → PolicyGate
+→ IndexAdvisor → Response
 
 Fully synchronous implementation - no async complexity.
 """
@@ -10,6 +11,7 @@ import logging
 from typing import Any
 
 from api.models import (
+    IndexAdvisorOutput,
     Placeholder,
     PlannerOutput,
     QueryResponse,
@@ -19,9 +21,11 @@ from api.models import (
 from agents.planner import create_planner_agent
 from agents.sql_writer import create_sql_writer_agent
 from config.settings import get_settings
+from orchestrator.retrieval import build_join_hints, select_relevant_schema
+from schema.cache import parse_schema_cached
 from schema.models import SchemaContext
-from schema.parser import parse_schema
-from validation.policy_gate import run_policy_gate
+from validation.engine import get_validation_engine
+from validation.index_advisor import advise_indexes
 
 logger = logging.getLogger(__name__)
 
@@ -31,18 +35,42 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 
 def parse_schema_fn(schema_json: dict | None) -> tuple[SchemaContext | None, str | None]:
-    """Parse JSON schema into internal representation."""
+    """Parse JSON schema into internal representation (cached across requests)."""
     if schema_json is None:
         return SchemaContext(tables=tuple()), None
     
     try:
-        schema = parse_schema(schema_json)
+        schema = parse_schema_cached(schema_json)
         return schema, None
     except Exception as e:
         logger.error(f"Schema parsing error: {e}")
         return SchemaContext(tables=tuple()), str(e)
 
 
+def select_schema_fn(question: str, schema: SchemaContext | None) -> SchemaContext | None:
+    """Prune the schema to the tables relevant to the question."""
+    if schema is None or schema.is_empty:
+        return schema
+
+    try:
+        return select_relevant_schema(question, schema)
+    except Exception as e:
+        logger.error(f"Schema retrieval error: {e}")
+        return schema
+
+
+def join_hints_fn(schema: SchemaContext | None, prompt_schema: SchemaContext | None) -> list[str]:
+    """Build JOIN ... ON hints connecting the tables shown to the agents."""
+    if schema is None or prompt_schema is None:
+        return []
+
+    try:
+        return build_join_hints(schema, prompt_schema)
+    except Exception as e:
+        logger.error(f"Join hint error: {e}")
+        return []
+
+
 def run_planner_fn(question: str, schema: SchemaContext | None, dialect: str) -> PlannerOutput:
     """Run the PlannerAgent (Groq/LLaMA 3.3)."""
     planner = create_planner_agent()
@@ -61,7 +89,8 @@ def run_sql_writer_fn(
     question: str,
     schema: SchemaContext | None,
     planner_output: PlannerOutput,
-    dialect: str
+    dialect: str,
+    join_hints: list[str] | None = None,
 ) -> SqlWriterOutput:
     """Run the SqlWriterAgent (Ollama/SQLCoder)."""
     settings = get_settings()
@@ -72,6 +101,7 @@ def run_sql_writer_fn(
             schema=schema,
             planner_output=planner_output,
             dialect=dialect,
+            join_hints=join_hints,
         )
     except Exception as e:
         logger.error(f"SQL Writer error: {e}")
@@ -81,20 +111,42 @@ def run_sql_writer_fn(
         )
 
 
-def run_policy_gate_fn(sql: str, schema: SchemaContext | None, has_placeholders: bool):
+def run_policy_gate_fn(
+    sql: str,
+    schema: SchemaContext | None,
+    has_placeholders: bool,
+    dialect: str | None = None,
+):
     """Run deterministic policy validation."""
-    return run_policy_gate(
+    return get_validation_engine().validate(
         sql=sql,
         schema=schema,
         has_placeholders_from_writer=has_placeholders,
+        dialect=dialect,
     )
 
 
+def advise_indexes_fn(
+    gate_output: Any,
+    schema: SchemaContext | None,
+    dialect: str | None = None,
+) -> IndexAdvisorOutput:
+    """Suggest indexes for SQL that passed the policy gate."""
+    if not get_settings().index_advisor_enabled or not gate_output.passed:
+        return IndexAdvisorOutput()
+    try:
+        return advise_indexes(gate_output.sql, schema, dialect)
+    except Exception as e:
+        logger.exception(f"Index advisor error: {e}")
+        return IndexAdvisorOutput()
+
+
 def build_response_fn(
     planner_output: PlannerOutput,
     writer_output: SqlWriterOutput,
     gate_output: Any,
     schema_error: str | None = None,
+    advice: IndexAdvisorOutput | None = None,
 ) -> QueryResponse:
     """Build the final QueryResponse."""
     if schema_error:
@@ -108,7 +160,8 @@ def build_response_fn(
             policy_errors=[f"Invalid schema format: {schema_error}"],
         )
 
-    all_warnings = list(gate_output.warnings)
+    advice = advice or IndexAdvisorOutput()
+    all_warnings = list(gate_output.warnings) + advice.notes
     all_questions = list(planner_output.clarifying_questions)
 
     if gate_output.status == QueryStatus.DRAFT:
@@ -123,6 +176,8 @@ def build_response_fn(
         clarifying_questions=all_questions,
         assumptions=planner_output.assumptions,
         policy_errors=gate_output.policy_errors,
+        perf_warnings=gate_output.perf_warnings,
+        index_suggestions=advice.suggestions,
     )
 
 
@@ -134,20 +189,27 @@ def run_pipeline(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """
     Run the text-ql pipeline.
 
     Stages:
-    1. Schema parsing (deterministic)
+    1. Schema parsing (deterministic, skipped if an already parsed schema is given)
+       and relevant-table retrieval for the agent prompts
     2. Planner (Groq/LLaMA 3.3)
     3. SQL Writer (Ollama/SQLCoder)
     4. Policy Gate (deterministic)
-    5. Response Builder
+    5. Index Advisor (deterministic)
+    6. Response Builder
     """
     # Stage 1: Parse schema
-    logger.info("Stage 1: Parsing schema")
-    schema, schema_error = parse_schema_fn(schema_json)
+    if schema is not None:
+        logger.info("Stage 1: Using pre-parsed schema")
+        schema_error = None
+    else:
+        logger.info("Stage 1: Parsing schema")
+        schema, schema_error = parse_schema_fn(schema_json)
     
     if schema_error:
         return build_response_fn(
@@ -159,25 +221,34 @@ def run_pipeline(
             schema_error=schema_error,
         )
 
+    # Agents only see the relevant tables; the policy gate checks the full schema
+    prompt_schema = select_schema_fn(question, schema)
+    join_hints = join_hints_fn(schema, prompt_schema)
+
     # Stage 2: Run planner
     logger.info("Stage 2: Running Planner (Groq/LLaMA 3.3)")
-    planner_output = run_planner_fn(question, schema, dialect)
+    planner_output = run_planner_fn(question, prompt_schema, dialect)
     logger.debug(f"Planner: schema_sufficient={planner_output.schema_sufficient}")
 
     # Stage 3: Run SQL writer
     logger.info("Stage 3: Running SQL Writer (Ollama/SQLCoder)")
-    writer_output = run_sql_writer_fn(question, schema, planner_output, dialect)
+    writer_output = run_sql_writer_fn(question, prompt_schema, planner_output, dialect, join_hints)
     logger.debug(f"Writer: sql={writer_output.sql[:100] if writer_output.sql else 'None'}...")
 
     # Stage 4: Policy gate
     logger.info("Stage 4: Running Policy Gate")
     has_placeholders = len(writer_output.placeholders) > 0
-    gate_output = run_policy_gate_fn(writer_output.sql, schema, has_placeholders)
+    gate_output = run_policy_gate_fn(writer_output.sql, schema, has_placeholders, dialect)
     logger.debug(f"Gate: status={gate_output.status}")
 
-    # Stage 5: Build response
-    logger.info("Stage 5: Building response")
-    response = build_response_fn(planner_output, writer_output, gate_output)
+    # Stage 5: Index advisor
+    logger.info("Stage 5: Running Index Advisor")
+    advice = advise_indexes_fn(gate_output, schema, dialect)
+    logger.debug(f"Advisor: {len(advice.suggestions)} suggestion(s)")
+
+    # Stage 6: Build response
+    logger.info("Stage 6: Building response")
+    response = build_response_fn(planner_output, writer_output, gate_output, advice=advice)
 
     return response
 
@@ -187,6 +258,7 @@ async def run_pipeline_async(
     question: str,
     dialect: str = "postgres",
     schema_json: dict[str, Any] | None = None,
+    schema: SchemaContext | None = None,
 ) -> QueryResponse:
     """Async wrapper that just calls the sync pipeline."""
-    return run_pipeline(question, dialect, schema_json)
+    return run_pipeline(question, dialect, schema_json, schema)
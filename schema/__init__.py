@@ -1,13 +1,69 @@
 """Schema parsing and representation module."""
 
-from schema.models import Column, SchemaContext, Table
+from schema.cache import ParsedSchemaCache, get_parsed_schema_cache, parse_schema_cached
+from schema.ddl import DdlParseError, parse_ddl
+from schema.introspect import (
+    IntrospectionError,
+    SqliteSchemaCache,
+    get_sqlite_schema_cache,
+    introspect_sqlite,
+    introspect_sqlite_cached,
+)
+from schema.join_graph import JoinEdge, JoinGraph
+from schema.models import Column, Index, SchemaContext, SchemaContextBuilder, Table
 from schema.parser import SchemaParseError, parse_schema, validate_schema
+from schema.patch import SchemaPatchError, apply_patch
+from schema.registry import SchemaRegistry, get_schema_registry
+from schema.snapshot import (
+    SchemaSnapshot,
+    SnapshotError,
+    dump_snapshot,
+    load_snapshot,
+    loads_snapshot,
+    preload_snapshots,
+    write_snapshot,
+)
+from schema.streaming import (
+    IncrementalSchemaParser,
+    iter_schema_tables,
+    parse_schema_file,
+    parse_schema_stream,
+)
 
 __all__ = [
     "Column",
+    "Index",
     "Table",
     "SchemaContext",
+    "SchemaContextBuilder",
+    "JoinEdge",
+    "JoinGraph",
     "parse_schema",
     "validate_schema",
     "SchemaParseError",
+    "parse_ddl",
+    "DdlParseError",
+    "introspect_sqlite",
+    "introspect_sqlite_cached",
+    "IntrospectionError",
+    "SqliteSchemaCache",
+    "get_sqlite_schema_cache",
+    "SchemaPatchError",
+    "apply_patch",
+    "SchemaRegistry",
+    "get_schema_registry",
+    "ParsedSchemaCache",
+    "get_parsed_schema_cache",
+    "parse_schema_cached",
+    "IncrementalSchemaParser",
+    "iter_schema_tables",
+    "parse_schema_stream",
+    "parse_schema_file",
+    "SchemaSnapshot",
+    "SnapshotError",
+    "dump_snapshot",
+    "loads_snapshot",
+    "load_snapshot",
+    "write_snapshot",
+    "preload_snapshots",
 ]
@@ -0,0 +1,157 @@
+"""
+Process-wide cache of parsed schemas.
+
+The same schema JSON arrives with request after request, often from many
+tenants. This cache maps a canonical hash of the raw payload to the parsed
+SchemaContext, so a hot catalog is parsed once and its derived indexes
+(lookup tables, join graph, retrieval index, rendered prompts) are built
+once and shared. Hashing still costs a pass over the payload on every
+request; the API returns each inline schema's id (X-Schema-Id), and
+clients that pass it back as schema_id skip that pass as well.
+
+Entries are evicted least recently used first once their estimated total
+size exceeds a byte budget.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from config.settings import get_settings
+from schema.models import SchemaContext
+from schema.parser import parse_schema
+
+# Estimated resident bytes of a parsed schema once its derived indexes and
+# renderings are built: per table, per column and per description character
+# (measured with benchmarks/bench_schema_memory.py, rounded up)
+TABLE_OVERHEAD_BYTES = 2560
+COLUMN_OVERHEAD_BYTES = 384
+DESCRIPTION_BYTES_PER_CHAR = 3
+
+
+def payload_key(schema_json: dict[str, Any]) -> str:
+    """Canonical hash of a raw schema payload; key order and whitespace don't matter."""
+    canonical = json.dumps(schema_json, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def estimate_schema_bytes(schema: SchemaContext) -> int:
+    """Rough resident size of a parsed schema, its derived indexes and its renderings."""
+    size = 0
+    for table in schema.tables:
+        size += TABLE_OVERHEAD_BYTES + DESCRIPTION_BYTES_PER_CHAR * len(table.description or "")
+        for col in table.columns:
+            size += COLUMN_OVERHEAD_BYTES + DESCRIPTION_BYTES_PER_CHAR * len(col.description or "")
+    return size
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of a cache's counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    current_bytes: int
+    max_bytes: int
+
+
+class ParsedSchemaCache:
+    """
+    LRU cache of parsed schemas bounded by estimated memory use.
+
+    A schema larger than the whole budget is returned but not stored.
+    Safe to share between request handlers; parsing happens outside the lock.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[SchemaContext, int]] = OrderedDict()
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_parse(self, schema_json: dict[str, Any]) -> SchemaContext:
+        """
+        Return the parsed schema for a payload, parsing it on a miss.
+
+        Raises:
+            SchemaParseError: If the payload is invalid (failures are not cached)
+        """
+        key = payload_key(schema_json)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        schema = parse_schema(schema_json)
+        self._store(key, schema)
+        return schema
+
+    def _store(self, key: str, schema: SchemaContext) -> None:
+        size = estimate_schema_bytes(schema)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                # Parsed concurrently by another request
+                return
+            self._entries[key] = (schema, size)
+            self._current_bytes += size
+            while self._current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Current counters and size."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                current_bytes=self._current_bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+@lru_cache
+def get_parsed_schema_cache() -> ParsedSchemaCache:
+    """Get the process-wide parsed schema cache."""
+    return ParsedSchemaCache(max_bytes=get_settings().parsed_schema_cache_max_bytes)
+
+
+def parse_schema_cached(schema_json: dict[str, Any] | None) -> SchemaContext:
+    """
+    parse_schema() backed by the process-wide cache.
+
+    Returns an empty schema for None, like parse_schema. Caching is skipped
+    when parsed_schema_cache_max_bytes is 0.
+    """
+    if not schema_json:
+        return parse_schema(schema_json)
+    cache = get_parsed_schema_cache()
+    if cache.max_bytes <= 0:
+        return parse_schema(schema_json)
+    return cache.get_or_parse(schema_json)
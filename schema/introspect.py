@@ -0,0 +1,252 @@
+"""
+SQLite catalog introspection.
+
+Derives a SchemaContext from a SQLite database file: tables from
+sqlite_master, columns and primary keys from PRAGMA table_info, foreign keys
+from PRAGMA foreign_key_list, indexes from PRAGMA index_list. Column
+descriptions are taken from comments in the CREATE TABLE statements SQLite
+stores verbatim (see schema.ddl).
+
+Introspected schemas are cached per file. A lookup only stats the database
+file (and its -wal file); when either changed, PRAGMA schema_version tells
+data writes apart from DDL changes, and only the latter re-introspect.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from schema.ddl import DdlParseError, parse_ddl
+from schema.models import Column, Index, SchemaContext, Table
+from schema.parser import SchemaParseError
+
+logger = logging.getLogger(__name__)
+
+# (mtime_ns, size) of the database file and of its write-ahead log, if any
+FileState = tuple[int, int, int | None, int | None]
+
+
+class IntrospectionError(SchemaParseError):
+    """Raised when a database cannot be opened or introspected."""
+
+    pass
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    """Open a database read-only, without creating it if it is missing."""
+    connection = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, isolation_level=None)
+    connection.execute("PRAGMA query_only = ON")
+    return connection
+
+
+def _schema_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def _read_indexes(connection: sqlite3.Connection, table: str) -> tuple[Index, ...]:
+    """
+    Indexes of a table, other than its primary key's.
+
+    Partial indexes are left out, and an index on expressions is cut at the
+    first expression, since only named leading columns tell which filters
+    it serves.
+    """
+    indexes = []
+    for name, unique, origin, partial in connection.execute(
+        "SELECT name, \"unique\", origin, partial FROM pragma_index_list(?) ORDER BY seq DESC",
+        (table,),
+    ).fetchall():
+        if origin == "pk" or partial:
+            continue
+        columns = []
+        for (column,) in connection.execute(
+            "SELECT name FROM pragma_index_info(?) ORDER BY seqno", (name,)
+        ).fetchall():
+            if column is None:
+                break
+            columns.append(column)
+        if columns:
+            indexes.append(Index(tuple(columns), name, bool(unique)))
+    return tuple(indexes)
+
+
+def _read_schema(connection: sqlite3.Connection) -> SchemaContext:
+    """Build a SchemaContext from an open connection's main database."""
+    rows = connection.execute(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' ORDER BY rowid"
+    ).fetchall()
+
+    # Comments in the stored DDL become descriptions
+    try:
+        described = parse_ddl(";\n".join(sql for _, sql in rows if sql), "sqlite")
+    except DdlParseError as e:
+        logger.warning(f"Ignoring column comments, stored DDL could not be parsed: {e}")
+        described = SchemaContext()
+
+    tables: list[dict[str, Any]] = []
+    primary_keys: dict[str, list[str]] = {}
+    for name, _ in rows:
+        columns = connection.execute(
+            "SELECT name, type, pk FROM pragma_table_info(?) ORDER BY cid", (name,)
+        ).fetchall()
+        foreign_keys = connection.execute(
+            'SELECT "table", "from", "to" FROM pragma_foreign_key_list(?) ORDER BY id, seq', (name,)
+        ).fetchall()
+        primary_keys[name.lower()] = [col for col, _, pk in sorted(columns, key=lambda c: c[2]) if pk]
+        tables.append({
+            "name": name,
+            "columns": columns,
+            "foreign_keys": foreign_keys,
+            "indexes": _read_indexes(connection, name),
+        })
+
+    result = []
+    for table in tables:
+        name = table["name"]
+        references: dict[str, str] = {}
+        for ref_table, from_column, to_column in table["foreign_keys"]:
+            if to_column is None:
+                # REFERENCES t without a column list means t's primary key
+                ref_pk = primary_keys.get(ref_table.lower(), [])
+                to_column = ref_pk[0] if len(ref_pk) == 1 else None
+            if to_column is not None:
+                references.setdefault(from_column.lower(), f"{ref_table}.{to_column}")
+
+        ddl_table = described.get_table(name)
+        columns = []
+        for col_name, col_type, pk in table["columns"]:
+            ddl_column = ddl_table.get_column(col_name) if ddl_table is not None else None
+            columns.append(Column(
+                name=col_name,
+                type=col_type or None,
+                description=ddl_column.description if ddl_column is not None else None,
+                primary_key=pk > 0,
+                foreign_key=references.get(col_name.lower()),
+            ))
+        result.append(Table(
+            name=name,
+            columns=tuple(columns),
+            description=ddl_table.description if ddl_table is not None else None,
+            indexes=table["indexes"],
+        ))
+    return SchemaContext(tables=tuple(result))
+
+
+def introspect_sqlite(path: str | Path) -> SchemaContext:
+    """
+    Derive the schema of a SQLite database file.
+
+    Args:
+        path: Path to the database file; it is opened read-only
+
+    Returns:
+        SchemaContext with one table per user table, in creation order
+
+    Raises:
+        IntrospectionError: If the file is missing or not a SQLite database
+    """
+    try:
+        connection = _connect(Path(path).resolve())
+        try:
+            return _read_schema(connection)
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        raise IntrospectionError(f"Cannot introspect SQLite database {path}: {e}") from e
+
+
+@dataclass(frozen=True)
+class _Introspection:
+    file_state: FileState
+    schema_version: int
+    schema: SchemaContext
+
+
+def _file_state(path: Path) -> FileState:
+    stat = os.stat(path)
+    try:
+        wal = os.stat(f"{path}-wal")
+    except FileNotFoundError:
+        return (stat.st_mtime_ns, stat.st_size, None, None)
+    return (stat.st_mtime_ns, stat.st_size, wal.st_mtime_ns, wal.st_size)
+
+
+class SqliteSchemaCache:
+    """
+    Introspected schemas keyed by database path, file state and schema version.
+
+    Safe to share between request handlers; introspection happens outside
+    the lock.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Path, _Introspection] = {}
+        self._lock = threading.Lock()
+        # Number of full introspections performed, for monitoring and tests
+        self.introspections = 0
+
+    def get(self, path: str | Path) -> SchemaContext:
+        """
+        Return the schema of a database, re-introspecting only after DDL changes.
+
+        Raises:
+            IntrospectionError: If the file is missing or not a SQLite database
+        """
+        path = Path(path).resolve()
+        try:
+            file_state = _file_state(path)
+        except OSError as e:
+            raise IntrospectionError(f"Cannot introspect SQLite database {path}: {e}") from e
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry.file_state == file_state:
+            return entry.schema
+
+        try:
+            connection = _connect(path)
+            try:
+                # One read transaction, so the version matches what is read
+                connection.execute("BEGIN")
+                schema_version = _schema_version(connection)
+                if entry is not None and entry.schema_version == schema_version:
+                    schema = entry.schema  # Only data changed
+                else:
+                    schema = _read_schema(connection)
+                    with self._lock:
+                        self.introspections += 1
+                    logger.info(
+                        f"Introspected {path} (schema_version {schema_version}): "
+                        f"{len(schema.tables)} table(s)"
+                    )
+                connection.execute("COMMIT")
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            raise IntrospectionError(f"Cannot introspect SQLite database {path}: {e}") from e
+
+        with self._lock:
+            self._entries[path] = _Introspection(file_state, schema_version, schema)
+        return schema
+
+    def clear(self) -> None:
+        """Forget all introspected schemas."""
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache
+def get_sqlite_schema_cache() -> SqliteSchemaCache:
+    """Get the process-wide SQLite schema cache."""
+    return SqliteSchemaCache()
+
+
+def introspect_sqlite_cached(path: str | Path) -> SchemaContext:
+    """introspect_sqlite() backed by the process-wide cache."""
+    return get_sqlite_schema_cache().get(path)
@@ -0,0 +1,174 @@
+"""
+Foreign-key join graph.
+
+Turns the 'table.column' foreign key references of a schema into an
+undirected graph of tables, so the shortest join path between any two
+tables can be looked up and rendered as explicit JOIN ... ON hints for
+the SQL writer.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from schema.models import SchemaContext
+
+
+@dataclass(frozen=True)
+class JoinEdge:
+    """A join between two tables along one foreign key."""
+
+    from_table: str
+    from_column: str
+    to_table: str
+    to_column: str
+
+    @property
+    def condition(self) -> str:
+        """The join predicate, e.g. 'orders.customer_id = customers.id'."""
+        return f"{self.from_table}.{self.from_column} = {self.to_table}.{self.to_column}"
+
+    def reversed(self) -> "JoinEdge":
+        """The same join, traversed in the opposite direction."""
+        return JoinEdge(self.to_table, self.to_column, self.from_table, self.from_column)
+
+
+class JoinGraph:
+    """
+    Undirected graph of tables connected by foreign keys.
+
+    Connected components are computed up front, so unreachable pairs are
+    answered immediately. Shortest paths come from one breadth-first search
+    per source table, memoized, so repeated lookups are dictionary walks.
+
+    Use SchemaContext.join_graph rather than constructing this directly, so
+    the graph is built once per schema.
+    """
+
+    def __init__(self, schema: SchemaContext):
+        # Lowercase table name -> edges leaving that table
+        self._edges: dict[str, list[JoinEdge]] = {
+            name.lower(): [] for name in schema.get_table_names()
+        }
+
+        for table in schema.tables:
+            for col in table.columns:
+                if not col.foreign_key or col.foreign_key.count(".") != 1:
+                    continue
+                ref_table_name, ref_col_name = col.foreign_key.split(".")
+                ref_table = schema.get_table(ref_table_name)
+                if ref_table is None or ref_table.name.lower() == table.name.lower():
+                    continue
+                ref_col = ref_table.get_column(ref_col_name)
+                edge = JoinEdge(
+                    table.name,
+                    col.name,
+                    ref_table.name,
+                    ref_col.name if ref_col else ref_col_name,
+                )
+                self._edges[table.name.lower()].append(edge)
+                self._edges[ref_table.name.lower()].append(edge.reversed())
+
+        self._component: dict[str, int] = {}
+        for start in self._edges:
+            if start not in self._component:
+                component_id = len(self._component)
+                for name in self._bfs(start):
+                    self._component[name] = component_id
+
+        # Source table -> {reached table: edge used to reach it}
+        self._parents: dict[str, dict[str, JoinEdge | None]] = {}
+
+    def _bfs(self, source: str) -> dict[str, JoinEdge | None]:
+        parents: dict[str, JoinEdge | None] = {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            for edge in self._edges[current]:
+                target = edge.to_table.lower()
+                if target not in parents:
+                    parents[target] = edge
+                    queue.append(target)
+        return parents
+
+    def neighbours(self, table_name: str) -> set[str]:
+        """Names of tables directly joined to the given table by a foreign key."""
+        return {e.to_table for e in self._edges.get(table_name.lower(), [])}
+
+    def is_connected(self, source: str, target: str) -> bool:
+        """Check whether two tables can be joined through foreign keys."""
+        a = self._component.get(source.lower())
+        return a is not None and a == self._component.get(target.lower())
+
+    def join_path(self, source: str, target: str) -> list[JoinEdge] | None:
+        """
+        Shortest chain of joins leading from source to target.
+
+        Returns an empty list if source and target are the same table, and
+        None if they are not connected.
+        """
+        source, target = source.lower(), target.lower()
+        if not self.is_connected(source, target):
+            return None
+
+        parents = self._parents.get(source)
+        if parents is None:
+            parents = self._bfs(source)
+            self._parents[source] = parents
+
+        path: list[JoinEdge] = []
+        current = target
+        while current != source:
+            edge = parents[current]
+            assert edge is not None
+            path.append(edge)
+            current = edge.from_table.lower()
+        path.reverse()
+        return path
+
+    def connect(self, table_names: Iterable[str]) -> list[JoinEdge]:
+        """
+        Joins that connect the given tables, in an order they can be written.
+
+        Greedily grows a tree from the first table by repeatedly adding the
+        shortest path to the nearest table not yet joined. Paths may pass
+        through intermediate tables that were not requested. Tables that
+        cannot be reached from the first one are skipped.
+        """
+        names = [n.lower() for n in table_names if n.lower() in self._edges]
+        if len(names) < 2:
+            return []
+
+        joined = {names[0]}
+        edges: list[JoinEdge] = []
+        remaining = [n for n in dict.fromkeys(names[1:]) if self.is_connected(names[0], n)]
+
+        while remaining:
+            best: list[JoinEdge] | None = None
+            for target in remaining:
+                if target in joined:
+                    continue
+                for source in joined:
+                    path = self.join_path(source, target)
+                    if path is not None and (best is None or len(path) < len(best)):
+                        best = path
+            if best is None:
+                break
+            for edge in best:
+                if edge.to_table.lower() not in joined:
+                    edges.append(edge)
+                    joined.add(edge.to_table.lower())
+            remaining = [n for n in remaining if n not in joined]
+
+        return edges
+
+    def join_hints(self, table_names: Iterable[str]) -> list[str]:
+        """
+        Render the joins connecting the given tables as prompt hints.
+
+        Example: ['orders JOIN customers ON orders.customer_id = customers.id']
+        """
+        return [
+            f"{edge.from_table} JOIN {edge.to_table} ON {edge.condition}"
+            for edge in self.connect(table_names)
+        ]
@@ -3,12 +3,58 @@ Internal schema representation models.
 
 These dataclasses represent the canonical internal form of database schemas,
 used throughout the application for validation and prompt generation.
+
+Workers keep many large catalogs resident at once, so the models are slotted
+and the identifier and type strings they hold are interned: the thousands of
+"id", "created_at" or "varchar" strings in a catalog share one object each.
 """
 
+import hashlib
+import json
+import sys
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from schema.join_graph import JoinGraph
+
+T = TypeVar("T")
+
+
+def _intern(value: str | None) -> str | None:
+    """Intern a string so equal names and types share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Memoized:
+    """Mixin for frozen models that cache values derived from their contents."""
 
+    __slots__ = ()
 
-@dataclass(frozen=True)
+    # Created on first use, so objects that are never rendered don't carry a dict
+    _derived: dict[str, Any] | None
+
+    def cached(self, key: str, factory: Callable[[], T]) -> T:
+        """
+        Return a value derived from this object, computing it at most once.
+
+        Since the object is immutable, anything computed from it stays valid
+        for the lifetime of the instance.
+        """
+        derived = self._derived
+        if derived is None:
+            derived = {}
+            object.__setattr__(self, "_derived", derived)
+        try:
+            return derived[key]  # type: ignore[no-any-return]
+        except KeyError:
+            value = factory()
+            derived[key] = value
+            return value
+
+
+@dataclass(frozen=True, slots=True)
 class Column:
     """Represents a database column."""
 
@@ -17,8 +63,34 @@ class Column:
     description: str | None = None
     primary_key: bool = False
     foreign_key: str | None = None  # Format: "table.column"
+    distinct_count: int | None = None  # Number of distinct values, if known
 
-    def to_prompt_string(self) -> str:
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "name", _intern(self.name))
+        object.__setattr__(self, "type", _intern(self.type))
+        object.__setattr__(self, "foreign_key", _intern(self.foreign_key))
+
+    @classmethod
+    def _from_interned(
+        cls,
+        name: str,
+        type: str | None,
+        description: str | None,
+        primary_key: bool,
+        foreign_key: str | None,
+        distinct_count: int | None = None,
+    ) -> "Column":
+        """Create a column from already interned strings, skipping __post_init__."""
+        column = object.__new__(cls)
+        object.__setattr__(column, "name", name)
+        object.__setattr__(column, "type", type)
+        object.__setattr__(column, "description", description)
+        object.__setattr__(column, "primary_key", primary_key)
+        object.__setattr__(column, "foreign_key", foreign_key)
+        object.__setattr__(column, "distinct_count", distinct_count)
+        return column
+
+    def to_prompt_string(self, include_description: bool = True) -> str:
         """Format column for LLM prompt."""
         parts = [self.name]
 
@@ -34,57 +106,205 @@ class Column:
         if annotations:
             parts.append(f"[{', '.join(annotations)}]")
 
-        if self.description:
+        if self.description and include_description:
             parts.append(f"-- {self.description}")
 
         return " ".join(parts)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert column to its JSON input form."""
+        data = {
+            "name": self.name,
+            "type": self.type,
+            "description": self.description,
+            "primary_key": self.primary_key,
+            "foreign_key": self.foreign_key,
+        }
+        # Statistics only when known, so schemas without them keep their fingerprints
+        if self.distinct_count is not None:
+            data["distinct_count"] = self.distinct_count
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class Index:
+    """An index on a table, by the names of its columns in order."""
+
+    columns: tuple[str, ...]
+    name: str | None = None
+    unique: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "columns", tuple(_intern(c) for c in self.columns))
+        object.__setattr__(self, "name", _intern(self.name))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert index to its JSON input form."""
+        return {"name": self.name, "columns": list(self.columns), "unique": self.unique}
 
-@dataclass(frozen=True)
-class Table:
-    """Represents a database table."""
+
+@dataclass(frozen=True, slots=True)
+class Table(_Memoized):
+    """
+    Represents a database table.
+
+    row_count, indexes and partition_keys are optional statistics; the
+    policy gate uses them to spot queries that scan a large table.
+    """
 
     name: str
     columns: tuple[Column, ...] = field(default_factory=tuple)
     description: str | None = None
+    row_count: int | None = None
+    indexes: tuple[Index, ...] = field(default_factory=tuple)
+    partition_keys: tuple[str, ...] = field(default_factory=tuple)
+
+    # Lowercase column name -> Column, built once in __post_init__
+    _column_index: dict[str, Column] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Lazily computed renderings, see cached()
+    _derived: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
+        object.__setattr__(self, "name", _intern(self.name))
         # Convert list to tuple if needed (for immutability)
         if isinstance(self.columns, list):
             object.__setattr__(self, "columns", tuple(self.columns))
+        if isinstance(self.indexes, list):
+            object.__setattr__(self, "indexes", tuple(self.indexes))
+        object.__setattr__(self, "partition_keys", tuple(_intern(k) for k in self.partition_keys))
+
+        # First definition wins on duplicates, matching the old linear scan
+        index: dict[str, Column] = {}
+        for col in self.columns:
+            index.setdefault(sys.intern(col.name.lower()), col)
+        object.__setattr__(self, "_column_index", index)
+
+    @classmethod
+    def _from_index(
+        cls,
+        name: str,
+        columns: tuple[Column, ...],
+        description: str | None,
+        column_index: dict[str, Column],
+        row_count: int | None = None,
+        indexes: tuple[Index, ...] = (),
+        partition_keys: tuple[str, ...] = (),
+    ) -> "Table":
+        """Create a table around a prebuilt column index, skipping __post_init__."""
+        table = object.__new__(cls)
+        object.__setattr__(table, "name", name)
+        object.__setattr__(table, "columns", columns)
+        object.__setattr__(table, "description", description)
+        object.__setattr__(table, "row_count", row_count)
+        object.__setattr__(table, "indexes", indexes)
+        object.__setattr__(table, "partition_keys", partition_keys)
+        object.__setattr__(table, "_column_index", column_index)
+        object.__setattr__(table, "_derived", None)
+        return table
 
     def has_column(self, column_name: str) -> bool:
         """Check if table has a column with the given name (case-insensitive)."""
-        return any(c.name.lower() == column_name.lower() for c in self.columns)
+        return column_name.lower() in self._column_index
 
     def get_column(self, column_name: str) -> Column | None:
         """Get column by name (case-insensitive)."""
-        for col in self.columns:
-            if col.name.lower() == column_name.lower():
-                return col
-        return None
+        return self._column_index.get(column_name.lower())
 
     def get_column_names(self) -> list[str]:
         """Get list of all column names."""
         return [c.name for c in self.columns]
 
-    def to_prompt_string(self) -> str:
-        """Format table for LLM prompt."""
+    def is_seekable(self, column_name: str) -> bool:
+        """Whether a filter on the column can use an index (a primary key or leading column)."""
+        return column_name.lower() in self.cached("seek_columns", self._seek_columns)
+
+    def is_partition_key(self, column_name: str) -> bool:
+        """Check if the table is partitioned on the column (case-insensitive)."""
+        return column_name.lower() in self.cached(
+            "partition_columns", lambda: frozenset(k.lower() for k in self.partition_keys)
+        )
+
+    def _seek_columns(self) -> frozenset[str]:
+        columns = {c.name.lower() for c in self.columns if c.primary_key}
+        columns.update(index.columns[0].lower() for index in self.indexes if index.columns)
+        return frozenset(columns)
+
+    def to_prompt_string(self, include_descriptions: bool = True) -> str:
+        """Format table for LLM prompt (computed once per instance)."""
+        if not include_descriptions:
+            return self.cached(
+                "prompt_string_no_descriptions",
+                lambda: self._render_prompt_string(include_descriptions=False),
+            )
+        return self.cached("prompt_string", self._render_prompt_string)
+
+    def to_compact_string(self) -> str:
+        """Format table as 'name(col1, col2, ...)' (computed once per instance)."""
+        return self.cached("compact_string", lambda: f"{self.name}({', '.join(self.get_column_names())})")
+
+    def to_create_statement(self) -> str:
+        """Format table as a CREATE TABLE statement (computed once per instance)."""
+        return self.cached("create_statement", self._render_create_statement)
+
+    def to_compact_create_statement(self) -> str:
+        """Format table as a CREATE TABLE statement without column types (computed once)."""
+        return self.cached(
+            "compact_create_statement",
+            lambda: f"CREATE TABLE {self.name} ({', '.join(self.get_column_names())});",
+        )
+
+    def _render_prompt_string(self, include_descriptions: bool = True) -> str:
         lines = []
 
         header = f"TABLE: {self.name}"
-        if self.description:
+        if self.description and include_descriptions:
             header += f" -- {self.description}"
         lines.append(header)
 
         for col in self.columns:
-            lines.append(f"  - {col.to_prompt_string()}")
+            lines.append(f"  - {col.to_prompt_string(include_descriptions)}")
 
         return "\n".join(lines)
 
+    def _render_create_statement(self) -> str:
+        cols = ", ".join(
+            f"{c.name} {c.type or 'TEXT'}" + (" PRIMARY KEY" if c.primary_key else "")
+            for c in self.columns
+        )
+        return f"CREATE TABLE {self.name} ({cols});"
 
-@dataclass(frozen=True)
-class SchemaContext:
+    @property
+    def digest(self) -> str:
+        """Content hash of the table, the building block of SchemaContext.fingerprint."""
+        return self.cached("digest", self._compute_digest)
+
+    def _compute_digest(self) -> str:
+        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert table to its JSON input form."""
+        data = {
+            "name": self.name,
+            "description": self.description,
+            "columns": [c.to_dict() for c in self.columns],
+        }
+        # Statistics only when known, so schemas without them keep their fingerprints
+        if self.row_count is not None:
+            data["row_count"] = self.row_count
+        if self.indexes:
+            data["indexes"] = [index.to_dict() for index in self.indexes]
+        if self.partition_keys:
+            data["partition_keys"] = list(self.partition_keys)
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class SchemaContext(_Memoized):
     """
     Represents the complete database schema context.
     
@@ -93,26 +313,153 @@ class SchemaContext:
 
     tables: tuple[Table, ...] = field(default_factory=tuple)
 
+    # Lookup indexes, built once in __post_init__
+    _table_index: dict[str, Table] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _column_tables: dict[str, tuple[str, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Lazily computed values derived from the (immutable) tables, see cached()
+    _derived: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         # Convert list to tuple if needed (for immutability)
         if isinstance(self.tables, list):
             object.__setattr__(self, "tables", tuple(self.tables))
 
+        table_index: dict[str, Table] = {}
+        column_tables: dict[str, list[str]] = {}
+        for table in self.tables:
+            key = sys.intern(table.name.lower())
+            if key in table_index:
+                # First definition wins on duplicates, matching the old linear scan
+                continue
+            table_index[key] = table
+            for col_name in table._column_index:
+                column_tables.setdefault(col_name, []).append(table.name)
+
+        object.__setattr__(self, "_table_index", table_index)
+        object.__setattr__(
+            self,
+            "_column_tables",
+            {name: tuple(owners) for name, owners in column_tables.items()},
+        )
+
     @property
     def is_empty(self) -> bool:
         """Check if schema has no tables."""
         return len(self.tables) == 0
 
+    @property
+    def fingerprint(self) -> str:
+        """Stable content hash of the schema, identical for equal schemas."""
+        return self.cached("fingerprint", self._compute_fingerprint)
+
+    @property
+    def join_graph(self) -> "JoinGraph":
+        """Foreign-key join graph of the schema, built on first access."""
+        from schema.join_graph import JoinGraph
+
+        return self.cached("join_graph", lambda: JoinGraph(self))
+
+    def _compute_fingerprint(self) -> str:
+        # Hash of the per-table digests, so a patched schema only rehashes the
+        # tables that changed
+        digests = "\n".join(table.digest for table in self.tables)
+        return hashlib.sha256(digests.encode("ascii")).hexdigest()
+
+    def with_tables(self, tables: tuple[Table, ...], changed: set[str]) -> "SchemaContext":
+        """
+        Create a new schema that shares this one's lookup indexes where possible.
+
+        Used to apply patches: only the entries for the tables named in
+        ``changed`` (lowercase) are rebuilt, instead of re-indexing every
+        column of every table.
+
+        Args:
+            tables: Complete table tuple of the new schema
+            changed: Lowercase names of tables that were added, dropped or
+                replaced relative to this schema
+
+        Returns:
+            A SchemaContext equal to SchemaContext(tables=tables)
+        """
+        if not changed:
+            return self
+
+        # First position of every table name, in one pass over names only
+        positions: dict[str, int] = {}
+        for position, table in enumerate(tables):
+            positions.setdefault(table.name.lower(), position)
+        new_tables = {key: tables[positions[key]] for key in changed if key in positions}
+
+        table_index = dict(self._table_index)
+        column_tables = dict(self._column_tables)
+        affected_columns: set[str] = set()
+        for key in changed:
+            old = table_index.pop(key, None)
+            new = new_tables.get(key)
+            if new is not None:
+                table_index[sys.intern(key)] = new
+            if old is None or new is None or old.name != new.name:
+                affected_columns.update(old._column_index if old is not None else ())
+                affected_columns.update(new._column_index if new is not None else ())
+                continue
+            # Same table edited in place: only columns it gained or lost change
+            # owners, unless the table also moved relative to the other owners
+            affected_columns.update(old._column_index.keys() ^ new._column_index.keys())
+            for col_name in old._column_index.keys() & new._column_index.keys():
+                owners = column_tables[col_name]
+                i = owners.index(old.name)
+                before = positions.get(owners[i - 1].lower(), -1) if i > 0 else -1
+                after = positions.get(owners[i + 1].lower(), len(tables)) if i + 1 < len(owners) else len(tables)
+                if not before < positions[key] < after:
+                    affected_columns.add(col_name)
+
+        for col_name in affected_columns:
+            owners = [
+                (positions[owner.lower()], owner)
+                for owner in column_tables.get(col_name, ())
+                if owner.lower() not in changed
+            ]
+            owners += [
+                (positions[key], table.name)
+                for key, table in new_tables.items()
+                if col_name in table._column_index
+            ]
+            if owners:
+                owners.sort()
+                column_tables[col_name] = tuple(name for _, name in owners)
+            else:
+                column_tables.pop(col_name, None)
+
+        return SchemaContext._from_index(tables, table_index, column_tables)
+
+    @classmethod
+    def _from_index(
+        cls,
+        tables: tuple[Table, ...],
+        table_index: dict[str, Table],
+        column_tables: dict[str, tuple[str, ...]],
+    ) -> "SchemaContext":
+        """Create a schema around prebuilt lookup indexes, skipping __post_init__."""
+        schema = object.__new__(cls)
+        object.__setattr__(schema, "tables", tables)
+        object.__setattr__(schema, "_table_index", table_index)
+        object.__setattr__(schema, "_column_tables", column_tables)
+        object.__setattr__(schema, "_derived", None)
+        return schema
+
     def has_table(self, table_name: str) -> bool:
         """Check if schema has a table with the given name (case-insensitive)."""
-        return any(t.name.lower() == table_name.lower() for t in self.tables)
+        return table_name.lower() in self._table_index
 
     def get_table(self, table_name: str) -> Table | None:
         """Get table by name (case-insensitive)."""
-        for table in self.tables:
-            if table.name.lower() == table_name.lower():
-                return table
-        return None
+        return self._table_index.get(table_name.lower())
 
     def has_column(self, table_name: str, column_name: str) -> bool:
         """Check if a specific table has a specific column."""
@@ -121,6 +468,14 @@ class SchemaContext:
             return False
         return table.has_column(column_name)
 
+    def has_any_column(self, column_name: str) -> bool:
+        """Check if any table in the schema has a column with the given name."""
+        return column_name.lower() in self._column_tables
+
+    def get_tables_with_column(self, column_name: str) -> tuple[str, ...]:
+        """Get names of all tables that define the given column (case-insensitive)."""
+        return self._column_tables.get(column_name.lower(), ())
+
     def get_table_names(self) -> list[str]:
         """Get list of all table names."""
         return [t.name for t in self.tables]
@@ -133,8 +488,23 @@ class SchemaContext:
                 result.append((table.name, col.name))
         return result
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert schema to its JSON input form (inverse of parse_schema)."""
+        return {"tables": [t.to_dict() for t in self.tables]}
+
     def to_prompt_string(self) -> str:
-        """Format entire schema for LLM prompt."""
+        """Format entire schema for LLM prompt (computed once per instance)."""
+        return self.cached("prompt_string", self._render_prompt_string)
+
+    def to_compact_string(self) -> str:
+        """Format schema in compact form for shorter prompts (computed once per instance)."""
+        return self.cached("compact_string", self._render_compact_string)
+
+    def to_ddl_string(self) -> str:
+        """Format schema as CREATE TABLE statements (computed once per instance)."""
+        return self.cached("ddl_string", self._render_ddl_string)
+
+    def _render_prompt_string(self) -> str:
         if self.is_empty:
             return "No schema provided."
 
@@ -145,14 +515,34 @@ class SchemaContext:
 
         return "\n".join(lines)
 
-    def to_compact_string(self) -> str:
-        """Format schema in compact form for shorter prompts."""
+    def _render_compact_string(self) -> str:
         if self.is_empty:
             return "No schema provided."
 
-        parts = []
-        for table in self.tables:
-            cols = ", ".join(table.get_column_names())
-            parts.append(f"{table.name}({cols})")
+        return "Tables: " + "; ".join(table.to_compact_string() for table in self.tables)
+
+    def _render_ddl_string(self) -> str:
+        return "\n".join(table.to_create_statement() for table in self.tables)
+
+
+class SchemaContextBuilder:
+    """
+    Collects tables one at a time and produces a SchemaContext.
+
+    Used by the streaming parser so tables can be added as soon as they are
+    parsed, without first materialising the whole schema document.
+    """
+
+    def __init__(self) -> None:
+        self._tables: list[Table] = []
+
+    def add_table(self, table: Table) -> None:
+        """Append a parsed table."""
+        self._tables.append(table)
+
+    def __len__(self) -> int:
+        return len(self._tables)
 
-        return "Tables: " + "; ".join(parts)
+    def build(self) -> SchemaContext:
+        """Create the immutable SchemaContext from the tables added so far."""
+        return SchemaContext(tables=tuple(self._tables))
@@ -6,7 +6,7 @@ Supports structured JSON format as the single input format.
 
 from typing import Any
 
-from schema.models import Column, SchemaContext, Table
+from schema.models import Column, Index, SchemaContext, Table
 
 
 class SchemaParseError(Exception):
@@ -25,7 +25,8 @@ def parse_column(data: dict[str, Any]) -> Column:
         "type": "varchar",              # optional
         "description": "...",           # optional
         "primary_key": true,            # optional
-        "foreign_key": "table.column"   # optional
+        "foreign_key": "table.column",  # optional
+        "distinct_count": 1200          # optional
     }
     """
     if not isinstance(data, dict):
@@ -37,10 +38,74 @@ def parse_column(data: dict[str, Any]) -> Column:
 
     return Column(
         name=name.strip(),
-        type=data.get("type"),
-        description=data.get("description"),
-        primary_key=bool(data.get("primary_key", False)),
-        foreign_key=data.get("foreign_key"),
+        type=_parse_text(data, "type", "Column"),
+        description=_parse_text(data, "description", "Column"),
+        primary_key=_parse_flag(data, "primary_key", "Column"),
+        foreign_key=_parse_text(data, "foreign_key", "Column"),
+        distinct_count=_parse_count(data, "distinct_count", "Column"),
+    )
+
+
+def _parse_text(data: dict[str, Any], key: str, owner: str) -> str | None:
+    """Read an optional string field."""
+    value = data.get(key)
+    if value is not None and not isinstance(value, str):
+        raise SchemaParseError(f"{owner} '{key}' must be a string, got {type(value).__name__}")
+    return value
+
+
+def _parse_flag(data: dict[str, Any], key: str, owner: str) -> bool:
+    """Read an optional boolean field (false when absent)."""
+    value = data.get(key)
+    if value is None:
+        return False
+    if not isinstance(value, bool):
+        raise SchemaParseError(f"{owner} '{key}' must be a boolean, got {type(value).__name__}")
+    return value
+
+
+def _parse_count(data: dict[str, Any], key: str, owner: str) -> int | None:
+    """Read an optional non-negative integer statistic."""
+    value = data.get(key)
+    if value is None:
+        return None
+    if type(value) is not int or value < 0:
+        raise SchemaParseError(f"{owner} '{key}' must be a non-negative integer")
+    return value
+
+
+def _parse_names(data: dict[str, Any], key: str, owner: str) -> tuple[str, ...]:
+    """Read an optional list of column names."""
+    names = data.get(key)
+    if names is None:
+        return ()
+    if not isinstance(names, list) or not all(isinstance(n, str) and n for n in names):
+        raise SchemaParseError(f"{owner} '{key}' must be an array of column names")
+    return tuple(n.strip() for n in names)
+
+
+def parse_index(data: dict[str, Any]) -> Index:
+    """
+    Parse an index definition from JSON.
+
+    Expected format:
+    {
+        "columns": ["col1", "col2"],    # required
+        "name": "idx_name",             # optional
+        "unique": false                 # optional
+    }
+    """
+    if not isinstance(data, dict):
+        raise SchemaParseError(f"Index must be an object, got {type(data).__name__}")
+
+    columns = _parse_names(data, "columns", "Index")
+    if not columns:
+        raise SchemaParseError("Index must have a non-empty 'columns' array")
+
+    return Index(
+        columns=columns,
+        name=_parse_text(data, "name", "Index"),
+        unique=_parse_flag(data, "unique", "Index"),
     )
 
 
@@ -52,7 +117,10 @@ def parse_table(data: dict[str, Any]) -> Table:
     {
         "name": "table_name",           # required
         "description": "...",           # optional
-        "columns": [...]                # required, array of column objects
+        "columns": [...],               # required, array of column objects
+        "row_count": 1000000,           # optional
+        "indexes": [...],               # optional, array of index objects
+        "partition_keys": ["col"]       # optional
     }
     """
     if not isinstance(data, dict):
@@ -73,10 +141,26 @@ def parse_table(data: dict[str, Any]) -> Table:
         except SchemaParseError as e:
             raise SchemaParseError(f"Error parsing column {i} in table '{name}': {e}") from e
 
+    indexes_data = data.get("indexes")
+    if indexes_data is None:
+        indexes_data = []
+    if not isinstance(indexes_data, list):
+        raise SchemaParseError(f"Table 'indexes' must be an array, got {type(indexes_data).__name__}")
+
+    indexes = []
+    for i, index_data in enumerate(indexes_data):
+        try:
+            indexes.append(parse_index(index_data))
+        except SchemaParseError as e:
+            raise SchemaParseError(f"Error parsing index {i} in table '{name}': {e}") from e
+
     return Table(
         name=name.strip(),
         columns=tuple(columns),
-        description=data.get("description"),
+        description=_parse_text(data, "description", "Table"),
+        row_count=_parse_count(data, "row_count", "Table"),
+        indexes=tuple(indexes),
+        partition_keys=_parse_names(data, "partition_keys", "Table"),
     )
 
 
@@ -151,6 +235,16 @@ def validate_schema(schema: SchemaContext) -> list[str]:
                 warnings.append(f"Duplicate column name '{col_name}' in table '{table.name}'")
             col_seen.add(col_name)
 
+    # Check that indexes and partition keys name existing columns
+    for table in schema.tables:
+        for index in table.indexes:
+            for col_name in index.columns:
+                if not table.has_column(col_name):
+                    warnings.append(f"Index on non-existent column '{col_name}' in table '{table.name}'")
+        for col_name in table.partition_keys:
+            if not table.has_column(col_name):
+                warnings.append(f"Partition key '{col_name}' is not a column of table '{table.name}'")
+
     # Validate foreign key references
     for table in schema.tables:
         for col in table.columns:
@@ -0,0 +1,183 @@
+"""
+Incremental schema updates.
+
+A patch is a list of operations applied to an existing SchemaContext:
+
+    [
+        {"op": "add_table", "table": {"name": "refunds", "columns": [...]}},
+        {"op": "drop_table", "table": "legacy_orders"},
+        {"op": "alter_table", "table": "orders", "changes": {"row_count": 120000}},
+        {"op": "add_column", "table": "orders", "column": {"name": "channel", "type": "varchar"}},
+        {"op": "drop_column", "table": "orders", "column": "fax"},
+        {"op": "alter_column", "table": "orders", "column": "total",
+         "changes": {"type": "decimal(12,2)"}}
+    ]
+
+The result is a new SchemaContext that reuses every untouched Table object,
+together with its column index and cached renderings. Only the changed
+tables are rebuilt and re-indexed.
+"""
+
+from dataclasses import replace
+from typing import Any
+
+from schema.models import Column, SchemaContext, Table
+from schema.parser import SchemaParseError, parse_column, parse_table
+
+OPERATIONS = (
+    "add_table",
+    "drop_table",
+    "alter_table",
+    "add_column",
+    "drop_column",
+    "alter_column",
+)
+
+
+class SchemaPatchError(SchemaParseError):
+    """Raised when a patch is malformed or does not apply to the schema."""
+
+    pass
+
+
+class _PatchState:
+    """Mutable working copy of a schema's table list while a patch is applied."""
+
+    def __init__(self, schema: SchemaContext):
+        self.tables: list[Table | None] = list(schema.tables)
+        self.positions: dict[str, int] = {}
+        for position, table in enumerate(schema.tables):
+            self.positions.setdefault(table.name.lower(), position)
+        self.changed: set[str] = set()
+
+    def get(self, name: Any) -> tuple[int, Table]:
+        if not isinstance(name, str) or not name.strip():
+            raise SchemaPatchError("Operation must name a 'table'")
+        position = self.positions.get(name.strip().lower())
+        if position is None:
+            raise SchemaPatchError(f"Table '{name}' does not exist")
+        table = self.tables[position]
+        assert table is not None
+        return position, table
+
+    def replace(self, position: int, table: Table) -> None:
+        old = self.tables[position]
+        assert old is not None
+        self.tables[position] = table
+        self.changed.add(old.name.lower())
+
+    def add(self, table: Table) -> None:
+        key = table.name.lower()
+        if key in self.positions:
+            raise SchemaPatchError(f"Table '{table.name}' already exists")
+        self.positions[key] = len(self.tables)
+        self.tables.append(table)
+        self.changed.add(key)
+
+    def drop(self, position: int) -> None:
+        table = self.tables[position]
+        assert table is not None
+        key = table.name.lower()
+        self.tables[position] = None
+        del self.positions[key]
+        self.changed.add(key)
+
+
+def _find_column(table: Table, name: Any) -> tuple[int, Column]:
+    if not isinstance(name, str) or not name.strip():
+        raise SchemaPatchError("Operation must name a 'column'")
+    column = table.get_column(name.strip())
+    if column is None:
+        raise SchemaPatchError(f"Column '{name}' does not exist in table '{table.name}'")
+    return table.columns.index(column), column
+
+
+def _get_changes(operation: dict[str, Any], allowed: set[str]) -> dict[str, Any]:
+    changes = operation.get("changes")
+    if not isinstance(changes, dict) or not changes:
+        raise SchemaPatchError("Operation must have a non-empty 'changes' object")
+    unknown = set(changes) - allowed
+    if unknown:
+        raise SchemaPatchError(f"Cannot change {', '.join(sorted(unknown))}")
+    return changes
+
+
+def _apply_operation(state: _PatchState, operation: Any) -> None:
+    if not isinstance(operation, dict):
+        raise SchemaPatchError(f"Operation must be an object, got {type(operation).__name__}")
+
+    op = operation.get("op")
+    if op not in OPERATIONS:
+        raise SchemaPatchError(f"Unknown operation '{op}', expected one of: {', '.join(OPERATIONS)}")
+
+    if op == "add_table":
+        state.add(parse_table(operation.get("table")))
+        return
+
+    position, table = state.get(operation.get("table"))
+
+    if op == "drop_table":
+        state.drop(position)
+
+    elif op == "alter_table":
+        changes = _get_changes(operation, {"description", "row_count", "indexes", "partition_keys"})
+        description = changes.get("description")
+        if description is not None and not isinstance(description, str):
+            raise SchemaPatchError("Table 'description' must be a string or null")
+        fields = {key: value for key, value in table.to_dict().items() if key != "columns"}
+        altered = parse_table({**fields, **changes})
+        state.replace(position, replace(altered, columns=table.columns))
+
+    elif op == "add_column":
+        column = parse_column(operation.get("column"))
+        if table.has_column(column.name):
+            raise SchemaPatchError(f"Column '{column.name}' already exists in table '{table.name}'")
+        state.replace(position, replace(table, columns=table.columns + (column,)))
+
+    elif op == "drop_column":
+        index, _ = _find_column(table, operation.get("column"))
+        columns = table.columns[:index] + table.columns[index + 1:]
+        state.replace(position, replace(table, columns=columns))
+
+    else:  # alter_column
+        index, column = _find_column(table, operation.get("column"))
+        changes = _get_changes(
+            operation, {"name", "type", "description", "primary_key", "foreign_key", "distinct_count"}
+        )
+        altered = parse_column({**column.to_dict(), **changes})
+        other = table.get_column(altered.name)
+        if other is not None and other is not column:
+            raise SchemaPatchError(f"Column '{altered.name}' already exists in table '{table.name}'")
+        columns = table.columns[:index] + (altered,) + table.columns[index + 1:]
+        state.replace(position, replace(table, columns=columns))
+
+
+def apply_patch(schema: SchemaContext, operations: list[dict[str, Any]]) -> SchemaContext:
+    """
+    Apply a list of patch operations to a schema.
+
+    Operations are applied in order and the patch is all-or-nothing: the
+    input schema is never modified.
+
+    Args:
+        schema: Schema to patch
+        operations: Patch operations (see module docstring)
+
+    Returns:
+        New SchemaContext sharing all unchanged Table objects with ``schema``
+
+    Raises:
+        SchemaPatchError: If an operation is malformed or does not apply
+    """
+    if not isinstance(operations, list):
+        raise SchemaPatchError(f"Patch must be an array of operations, got {type(operations).__name__}")
+
+    state = _PatchState(schema)
+    for i, operation in enumerate(operations):
+        try:
+            _apply_operation(state, operation)
+        except SchemaParseError as e:
+            raise SchemaPatchError(f"Error applying operation {i}: {e}") from e
+
+    tables = tuple(t for t in state.tables if t is not None)
+    return schema.with_tables(tables, state.changed)
@@ -0,0 +1,112 @@
+"""
+Content-addressed registry of parsed schemas.
+
+Clients register a schema once and then refer to it by its fingerprint,
+so the payload is uploaded and parsed once per schema version rather than
+once per question.
+
+Schemas can also be registered from binary snapshots without loading them;
+they are materialized on first lookup. Snapshot entries are pinned: they
+don't count against max_entries and are never evicted, as they can't be
+registered again without a restart.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from config.settings import get_settings
+from schema.models import SchemaContext
+from schema.snapshot import SchemaSnapshot, SnapshotError
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaRegistry:
+    """
+    In-memory store of parsed schemas keyed by their fingerprint.
+
+    The least recently used registered schema is dropped once ``max_entries``
+    is exceeded; snapshot entries are kept apart and never dropped. Safe to
+    share between request handlers.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._schemas: OrderedDict[str, SchemaContext] = OrderedDict()
+        self._pinned: dict[str, SchemaContext | SchemaSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def register(self, schema: SchemaContext) -> str:
+        """
+        Store a parsed schema and return its id.
+
+        Registering an identical schema again returns the same id.
+        """
+        schema_id = schema.fingerprint
+        with self._lock:
+            pinned = self._pinned.get(schema_id)
+            if pinned is not None:
+                if isinstance(pinned, SchemaSnapshot):
+                    self._pinned[schema_id] = schema
+                return schema_id
+            self._schemas[schema_id] = self._schemas.get(schema_id, schema)
+            self._schemas.move_to_end(schema_id)
+            while len(self._schemas) > self.max_entries:
+                self._schemas.popitem(last=False)
+        return schema_id
+
+    def register_snapshot(self, snapshot: SchemaSnapshot) -> str:
+        """
+        Register a schema snapshot without loading it, returning its id.
+
+        The schema is read from the snapshot file on its first get(). The
+        entry is pinned: it stays registered whatever else is registered.
+        """
+        schema_id = snapshot.fingerprint
+        with self._lock:
+            if schema_id not in self._pinned:
+                self._pinned[schema_id] = self._schemas.pop(schema_id, snapshot)
+        return schema_id
+
+    def get(self, schema_id: str) -> SchemaContext | None:
+        """
+        Look up a registered schema, or None if unknown or evicted.
+
+        Raises:
+            SnapshotError: If the schema's snapshot can't be loaded
+        """
+        with self._lock:
+            entry = self._pinned.get(schema_id)
+            if entry is None:
+                entry = self._schemas.get(schema_id)
+                if entry is not None:
+                    self._schemas.move_to_end(schema_id)
+        if entry is None or isinstance(entry, SchemaContext):
+            return entry
+
+        # Load outside the lock; a concurrent first lookup may load it twice
+        try:
+            schema = entry.load()
+        except (OSError, SnapshotError) as e:
+            logger.error(f"Failed to load schema snapshot {entry.path}: {e}")
+            raise SnapshotError(f"Schema snapshot {entry.path.name} could not be loaded: {e}") from e
+        with self._lock:
+            if self._pinned.get(schema_id) is entry:
+                self._pinned[schema_id] = schema
+        return schema
+
+    def __contains__(self, schema_id: object) -> bool:
+        with self._lock:
+            return schema_id in self._pinned or schema_id in self._schemas
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pinned) + len(self._schemas)
+
+
+@lru_cache
+def get_schema_registry() -> SchemaRegistry:
+    """Get the process-wide schema registry."""
+    return SchemaRegistry(max_entries=get_settings().schema_registry_max_entries)
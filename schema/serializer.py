@@ -0,0 +1,130 @@
+"""
+Token-budget-aware schema rendering.
+
+Picks the richest schema rendering that fits a prompt budget, degrading
+step by step:
+
+1. full            - to_prompt_string(): types, keys and descriptions
+2. no_descriptions - the same layout without table and column descriptions
+3. compact         - to_compact_string(): table and column names only
+4. compact, with tables dropped from the end until the rest fits
+
+With ddl=True the same steps apply to CREATE TABLE statements, the layout
+SQLCoder is trained on: to_create_statement() (types and primary keys), then
+to_compact_create_statement() (column names only), then dropped tables.
+
+Schemas from select_relevant_schema are ordered most relevant first, so
+step 4 drops the least relevant tables. Token counts are estimated from the
+character count (CHARS_PER_TOKEN), which is close enough for budgeting
+without depending on a model tokenizer.
+"""
+
+from dataclasses import dataclass
+
+from schema.models import SchemaContext, Table
+
+CHARS_PER_TOKEN = 4
+
+DETAIL_FULL = "full"
+DETAIL_NO_DESCRIPTIONS = "no_descriptions"
+DETAIL_COMPACT = "compact"
+
+EMPTY_SCHEMA_TEXT = "No schema provided."
+
+
+@dataclass(frozen=True)
+class SerializedSchema:
+    """A schema rendering together with its estimated size."""
+
+    text: str
+    estimated_tokens: int
+    detail: str
+    table_count: int
+    omitted_tables: int = 0
+
+    @property
+    def is_truncated(self) -> bool:
+        """Whether tables had to be left out to meet the budget."""
+        return self.omitted_tables > 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a piece of text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _tokens_for_chars(n_chars: int) -> int:
+    return -(-n_chars // CHARS_PER_TOKEN)
+
+
+# Each layout: (table renderer, prefix, separator, suffix). The verbose
+# layouts reproduce SchemaContext.to_prompt_string() and to_ddl_string() exactly.
+_LAYOUTS = {
+    DETAIL_FULL: (lambda t: t.to_prompt_string(), "DATABASE SCHEMA:\n\n", "\n\n", "\n"),
+    DETAIL_NO_DESCRIPTIONS: (
+        lambda t: t.to_prompt_string(include_descriptions=False), "DATABASE SCHEMA:\n\n", "\n\n", "\n"
+    ),
+    DETAIL_COMPACT: (Table.to_compact_string, "Tables: ", "; ", ""),
+}
+
+_DDL_LAYOUTS = {
+    DETAIL_FULL: (Table.to_create_statement, "", "\n", ""),
+    DETAIL_COMPACT: (Table.to_compact_create_statement, "", "\n", ""),
+}
+
+
+def _omitted_note(count: int, ddl: bool = False) -> str:
+    note = f"{count} less relevant table{'s' if count != 1 else ''} omitted"
+    return f"\n-- {note}" if ddl else f"\n({note})"
+
+
+def serialize_schema(
+    schema: SchemaContext, token_budget: int | None = None, ddl: bool = False
+) -> SerializedSchema:
+    """
+    Render a schema as richly as a token budget allows.
+
+    Args:
+        schema: Schema to render, most relevant tables first
+        token_budget: Maximum estimated tokens; None or 0 means unlimited
+        ddl: Render CREATE TABLE statements instead of the prompt layout
+
+    Returns:
+        SerializedSchema with the text, its estimated token count and the
+        detail level used. If even a single table in compact form exceeds the
+        budget, that table is returned anyway.
+    """
+    if schema.is_empty:
+        return SerializedSchema(EMPTY_SCHEMA_TEXT, estimate_tokens(EMPTY_SCHEMA_TEXT), DETAIL_FULL, 0)
+
+    n_tables = len(schema.tables)
+    if not token_budget or token_budget <= 0:
+        text = schema.to_ddl_string() if ddl else schema.to_prompt_string()
+        return SerializedSchema(text, estimate_tokens(text), DETAIL_FULL, n_tables)
+
+    # Per-table renderings are cached on the Table objects, so sizing each
+    # level is a sum of string lengths; only the chosen level is joined
+    for detail, (render, prefix, separator, suffix) in (_DDL_LAYOUTS if ddl else _LAYOUTS).items():
+        pieces = [render(table) for table in schema.tables]
+        n_chars = (
+            len(prefix) + sum(len(p) for p in pieces) + len(separator) * (n_tables - 1) + len(suffix)
+        )
+        if _tokens_for_chars(n_chars) <= token_budget:
+            text = prefix + separator.join(pieces) + suffix
+            return SerializedSchema(text, estimate_tokens(text), detail, n_tables)
+
+    # Compact form of the most relevant tables that fit, noting what was left out
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    kept = 1
+    n_chars = len(prefix) + len(pieces[0])
+    while kept < n_tables:
+        extra = len(separator) + len(pieces[kept])
+        if n_chars + extra + len(_omitted_note(n_tables - kept - 1, ddl)) > budget_chars:
+            break
+        n_chars += extra
+        kept += 1
+
+    text = prefix + separator.join(pieces[:kept]) + _omitted_note(n_tables - kept, ddl)
+    return SerializedSchema(
+        text, estimate_tokens(text), DETAIL_COMPACT, kept, omitted_tables=n_tables - kept
+    )
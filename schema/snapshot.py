@@ -0,0 +1,372 @@
+"""
+Binary schema snapshots.
+
+Parsing thousands of preloaded JSON catalogs in every worker makes cold
+starts slow. A snapshot stores a parsed SchemaContext, including its lookup
+indexes and fingerprint, in a compact framed binary file that is loaded
+through mmap without any JSON decoding.
+
+Layout (little-endian, sections 4-byte aligned):
+
+    header   magic, version, section sizes, CRC32 of the body, fingerprint,
+             CRC32 of the header fields before it
+    strings  every distinct string, UTF-8, NUL-separated
+    columns  every distinct column: name, type, description, foreign key,
+             flags, lowercase name, distinct count
+    tables   per table: name, description, first column ref, column count,
+             lowercase name, row count
+    refs     per table column, in order: id of its distinct column
+    index    table name index: (lowercase name, table) pairs
+    owners   column -> tables index: lowercase name, count, table ids...
+    stats    per table, in order: partition key count, key names...,
+             index count, then per index: name, flags, column count,
+             column names...
+
+All fields are u32. String ids are 1-based; 0 means None. Counts (row and
+distinct counts) can exceed 32 bits, so they are stored as decimal strings.
+Identical columns
+(e.g. "id integer PK" in every table) are stored once and loaded as one
+shared, immutable Column object.
+
+Workers preload a directory of snapshots lazily: only the headers are read
+at startup (see preload_snapshots), and each schema is materialized from
+its file the first time it is requested.
+"""
+
+import argparse
+import logging
+import mmap
+import re
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from schema.models import Column, Index, SchemaContext, Table
+from schema.parser import SchemaParseError
+
+if TYPE_CHECKING:
+    from schema.registry import SchemaRegistry
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TQLSNAP\x00"
+VERSION = 3
+SNAPSHOT_SUFFIX = ".tqls"
+
+# magic, version, reserved, strings bytes, distinct columns, tables,
+# column refs, index pairs, owner words, stats words, body CRC32,
+# fingerprint (hex), header CRC32
+_HEADER = struct.Struct("<8sHHIIIIIIII64sI")
+_HEADER_CRC_OFFSET = _HEADER.size - 4
+_FINGERPRINT = re.compile(rb"[0-9a-f]{64}")
+
+NONE = 0
+_FLAG_PRIMARY_KEY = 1
+_FLAG_UNIQUE = 1
+
+_COLUMN_FIELDS = 7
+_TABLE_FIELDS = 6
+
+
+class SnapshotError(SchemaParseError):
+    """Raised when a snapshot cannot be written or is invalid."""
+
+    pass
+
+
+def _u32_array(values: list[int]) -> bytes:
+    data = array("I", values)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_u32(buffer: memoryview, offset: int, count: int) -> tuple[array, int]:
+    end = offset + 4 * count
+    if end > len(buffer):
+        raise SnapshotError("Snapshot is truncated")
+    data = array("I")
+    data.frombytes(buffer[offset:end])
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data, end
+
+
+def _pad(n: int) -> int:
+    return (4 - n % 4) % 4
+
+
+def dump_snapshot(schema: SchemaContext) -> bytes:
+    """
+    Serialize a schema to snapshot bytes.
+
+    Raises:
+        SnapshotError: If a string contains a NUL character
+    """
+    string_ids: dict[str, int] = {}
+    strings: list[str] = []
+
+    def sid(value: str | None) -> int:
+        if value is None:
+            return NONE
+        if type(value) is not str:
+            value = str(value)
+        found = string_ids.get(value)
+        if found is None:
+            if "\x00" in value:
+                raise SnapshotError(f"Cannot snapshot string containing NUL: {value!r}")
+            strings.append(value)
+            found = string_ids[value] = len(strings)
+        return found
+
+    column_ids: dict[Column, int] = {}
+    column_words: list[int] = []
+    table_words: list[int] = []
+    refs: list[int] = []
+    stats_words: list[int] = []
+    for table in schema.tables:
+        table_words += [
+            sid(table.name), sid(table.description), len(refs), len(table.columns),
+            sid(table.name.lower()), sid(table.row_count),
+        ]
+        stats_words += [len(table.partition_keys), *map(sid, table.partition_keys)]
+        stats_words.append(len(table.indexes))
+        for index in table.indexes:
+            stats_words += [
+                sid(index.name), _FLAG_UNIQUE if index.unique else 0, len(index.columns),
+                *map(sid, index.columns),
+            ]
+        for col in table.columns:
+            column_id = column_ids.get(col)
+            if column_id is None:
+                column_id = column_ids[col] = len(column_ids)
+                column_words += [
+                    sid(col.name), sid(col.type), sid(col.description), sid(col.foreign_key),
+                    _FLAG_PRIMARY_KEY if col.primary_key else 0, sid(col.name.lower()),
+                    sid(col.distinct_count),
+                ]
+            refs.append(column_id)
+
+    positions = {id(table): i for i, table in enumerate(schema.tables)}
+    index_words: list[int] = []
+    for key, table in schema._table_index.items():
+        index_words += [sid(key), positions[id(table)]]
+
+    owner_words: list[int] = []
+    for col_name, owners in schema._column_tables.items():
+        owner_words += [sid(col_name), len(owners)]
+        owner_words += [positions[id(schema._table_index[o.lower()])] for o in owners]
+
+    blob = "\x00".join(strings).encode("utf-8")
+    body = b"".join([
+        blob,
+        b"\x00" * _pad(len(blob)),
+        _u32_array(column_words),
+        _u32_array(table_words),
+        _u32_array(refs),
+        _u32_array(index_words),
+        _u32_array(owner_words),
+        _u32_array(stats_words),
+    ])
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, len(blob), len(column_ids), len(schema.tables), len(refs),
+        len(index_words) // 2, len(owner_words), len(stats_words), zlib.crc32(body),
+        schema.fingerprint.encode("ascii"), 0,
+    )[:_HEADER_CRC_OFFSET]
+    return header + struct.pack("<I", zlib.crc32(header)) + body
+
+
+def write_snapshot(schema: SchemaContext, path: str | Path) -> None:
+    """Write a schema snapshot to a file (atomically, via a temporary file)."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(dump_snapshot(schema))
+    tmp.replace(path)
+
+
+def _read_header(data: bytes | memoryview) -> tuple:
+    """Unpack and check a snapshot header; the fingerprint is returned decoded."""
+    if len(data) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    fields = _HEADER.unpack_from(data)
+    if fields[0] != MAGIC:
+        raise SnapshotError("Not a schema snapshot")
+    if fields[1] != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {fields[1]}, expected {VERSION}")
+    if zlib.crc32(data[:_HEADER_CRC_OFFSET]) != fields[12]:
+        raise SnapshotError("Snapshot header checksum mismatch")
+    if not _FINGERPRINT.fullmatch(fields[11]):
+        raise SnapshotError("Snapshot fingerprint is not a SHA-256 hex digest")
+    return fields[:11] + (fields[11].decode("ascii"),)
+
+
+def loads_snapshot(data: bytes | memoryview | mmap.mmap) -> SchemaContext:
+    """
+    Rebuild a SchemaContext from snapshot bytes.
+
+    Raises:
+        SnapshotError: If the data is not a valid snapshot
+    """
+    buffer = memoryview(data)
+    try:
+        (_, _, _, blob_size, n_columns, n_tables, n_refs, n_index, n_owner_words,
+         n_stats_words, crc, fingerprint) = _read_header(buffer)
+        if zlib.crc32(buffer[_HEADER.size:]) != crc:
+            raise SnapshotError("Snapshot checksum mismatch")
+
+        offset = _HEADER.size
+        blob = bytes(buffer[offset:offset + blob_size])
+        offset += blob_size + _pad(blob_size)
+        column_words, offset = _read_u32(buffer, offset, n_columns * _COLUMN_FIELDS)
+        table_words, offset = _read_u32(buffer, offset, n_tables * _TABLE_FIELDS)
+        refs, offset = _read_u32(buffer, offset, n_refs)
+        index_words, offset = _read_u32(buffer, offset, n_index * 2)
+        owner_words, offset = _read_u32(buffer, offset, n_owner_words)
+        stats_words, offset = _read_u32(buffer, offset, n_stats_words)
+    finally:
+        buffer.release()
+
+    # Index 0 is None, so string ids can be used directly
+    strings: list[str | None] = [None]
+    if blob_size:
+        strings += map(sys.intern, blob.decode("utf-8").split("\x00"))
+
+    try:
+        columns = [
+            Column._from_interned(
+                strings[name], strings[type_], strings[description],
+                bool(flags & _FLAG_PRIMARY_KEY), strings[foreign_key],
+                int(strings[distinct]) if distinct else None,
+            )
+            for name, type_, description, foreign_key, flags, _, distinct
+            in _records(column_words, _COLUMN_FIELDS)
+        ]
+        column_keys = [strings[record[5]] for record in _records(column_words, _COLUMN_FIELDS)]
+
+        tables: list[Table] = []
+        stats = iter(stats_words)
+        for name, description, first, count, _, row_count in _records(table_words, _TABLE_FIELDS):
+            table_refs = refs[first:first + count]
+            column_index: dict[str, Column] = {}
+            for ref in table_refs:
+                column_index.setdefault(column_keys[ref], columns[ref])
+            partition_keys = tuple([strings[next(stats)] for _ in range(next(stats))])
+            indexes = []
+            for _ in range(next(stats)):
+                index_name, flags, n_index_columns = next(stats), next(stats), next(stats)
+                indexes.append(Index(
+                    tuple([strings[next(stats)] for _ in range(n_index_columns)]),
+                    strings[index_name], bool(flags & _FLAG_UNIQUE),
+                ))
+            tables.append(Table._from_index(
+                strings[name], tuple([columns[ref] for ref in table_refs]),
+                strings[description], column_index,
+                int(strings[row_count]) if row_count else None, tuple(indexes), partition_keys,
+            ))
+
+        table_index = {
+            strings[key]: tables[position] for key, position in _records(index_words, 2)
+        }
+
+        column_tables: dict[str, tuple[str, ...]] = {}
+        i = 0
+        while i < len(owner_words):
+            key, count = owner_words[i], owner_words[i + 1]
+            column_tables[strings[key]] = tuple(
+                [tables[t].name for t in owner_words[i + 2:i + 2 + count]]
+            )
+            i += 2 + count
+    except (IndexError, StopIteration, TypeError, ValueError) as e:
+        raise SnapshotError(f"Corrupt snapshot: {e}") from e
+
+    schema = SchemaContext._from_index(tuple(tables), table_index, column_tables)
+    schema.cached("fingerprint", lambda: fingerprint)
+    return schema
+
+
+def _records(words: array, size: int):
+    """Group a flat u32 array into fixed-size records."""
+    return zip(*[iter(words)] * size)
+
+
+def load_snapshot(path: str | Path) -> SchemaContext:
+    """Load a schema snapshot from disk through a read-only memory map."""
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # Empty file
+            raise SnapshotError(f"Snapshot {path} is empty") from e
+    with mapped:
+        return loads_snapshot(mapped)
+
+
+class SchemaSnapshot:
+    """
+    A snapshot file whose header has been read but whose tables have not.
+
+    Reading the header is enough to know the schema's fingerprint (its
+    registry id) and size; load() maps the file and builds the schema.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            header = _read_header(f.read(_HEADER.size))
+        self.table_count: int = header[5]
+        self.column_count: int = header[6]
+        self.fingerprint: str = header[11]
+
+    def load(self) -> SchemaContext:
+        """Materialize the schema from disk."""
+        return load_snapshot(self.path)
+
+    def __repr__(self) -> str:
+        return f"SchemaSnapshot({str(self.path)!r}, tables={self.table_count})"
+
+
+def preload_snapshots(directory: str | Path, registry: "SchemaRegistry") -> int:
+    """
+    Register every snapshot in a directory with a schema registry, lazily.
+
+    Only file headers are read here; each schema is loaded on first use.
+    Unreadable files are logged and skipped.
+
+    Args:
+        directory: Directory containing *.tqls snapshot files
+        registry: SchemaRegistry to register the snapshots with
+
+    Returns:
+        Number of snapshots registered
+    """
+    count = 0
+    for path in sorted(Path(directory).glob(f"*{SNAPSHOT_SUFFIX}")):
+        try:
+            registry.register_snapshot(SchemaSnapshot(path))
+            count += 1
+        except (OSError, SnapshotError) as e:
+            logger.warning(f"Skipping schema snapshot {path}: {e}")
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Convert schema JSON files to snapshots: python -m schema.snapshot in.json... -o DIR"""
+    from schema.streaming import parse_schema_file
+
+    arg_parser = argparse.ArgumentParser(description="Build binary schema snapshots from JSON.")
+    arg_parser.add_argument("schemas", nargs="+", type=Path, help="Schema JSON files")
+    arg_parser.add_argument("-o", "--output-dir", type=Path, default=Path("."))
+    args = arg_parser.parse_args(argv)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for source in args.schemas:
+        schema = parse_schema_file(source)
+        target = args.output_dir / f"{source.stem}{SNAPSHOT_SUFFIX}"
+        write_snapshot(schema, target)
+        print(f"{source} -> {target} ({len(schema.tables)} tables, id {schema.fingerprint[:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Streaming schema parser for very large schema payloads.
+
+parse_schema needs the whole document already decoded into Python objects.
+For multi-megabyte introspection dumps this module parses the same JSON
+format incrementally: input is fed in chunks (from a request body or a
+file) and each entry of the "tables" array is decoded, converted to a
+Table and handed on as soon as it is complete. Only one table's raw JSON
+is held in memory at a time.
+
+A value that spans several chunks is not re-decoded as each chunk arrives:
+the chunks are collected and scanned once for the value's closing bracket
+or quote, keeping the bracket depth and string state between feeds, and
+the value is decoded once it is complete. Streaming a table therefore
+takes time linear in its size, however small the chunks.
+
+Errors are reported with the same messages as parse_schema.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import AsyncIterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from schema.models import SchemaContext, SchemaContextBuilder, Table
+from schema.parser import SchemaParseError, parse_table
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that matter when scanning for the end of a value, outside and inside strings
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+# Values whose end is found by scanning rather than by decoding
+_SCANNED_STARTS = '{["'
+
+# Parser states
+_START = "start"                # before the top-level '{'
+_FIRST_KEY = "first_key"        # after '{', expecting a key or '}'
+_KEY = "key"                    # after ',', expecting a key
+_COLON = "colon"                # after a key
+_VALUE = "value"                # after ':'
+_FIRST_TABLE = "first_table"    # after '[' of "tables", expecting a table or ']'
+_TABLE = "table"                # after ',' inside "tables"
+_TABLE_SEP = "table_sep"        # after a table, expecting ',' or ']'
+_AFTER_VALUE = "after_value"    # after a top-level value, expecting ',' or '}'
+_DONE = "done"                  # after the top-level '}'
+
+# Returned by _decode_value when the buffer ends before the value does
+_INCOMPLETE = object()
+
+
+class IncrementalSchemaParser:
+    """
+    Push parser for the JSON schema format.
+
+    Call feed() with successive chunks of the document (bytes are decoded
+    as UTF-8) and finish() once the input is exhausted. Both return the
+    tables completed by that call, in document order.
+    """
+
+    def __init__(self) -> None:
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # Absolute position of the buffer start, for error messages
+        self._state = _START
+        self._key: str | None = None
+        self._table_count = 0
+        self._finished = False
+        # Scan of an incomplete object, array or string at _pos (see _scan)
+        self._scanning = False
+        self._complete = False  # The value at _pos is known to be complete
+        self._pending: list[str] = []  # Chunks received since the scan started
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, data: bytes | str) -> list[Table]:
+        """Add the next chunk of input and return any tables it completed."""
+        if self._finished:
+            raise SchemaParseError("Cannot feed data after finish()")
+        if isinstance(data, bytes):
+            try:
+                data = self._utf8.decode(data)
+            except UnicodeDecodeError as e:
+                raise SchemaParseError(f"Schema is not valid UTF-8: {e}") from e
+
+        if self._scanning:
+            # Only the new chunk is scanned; decoding waits for the end of the value
+            self._pending.append(data)
+            if self._scan(data, 0) < 0:
+                return []
+            self._scanning = False
+            self._complete = True
+            data = ""
+        self._take(data)
+        return self._advance(final=False)
+
+    def finish(self) -> list[Table]:
+        """Signal end of input, returning the last tables and checking completeness."""
+        if self._finished:
+            return []
+        try:
+            self._take(self._utf8.decode(b"", final=True))
+        except UnicodeDecodeError as e:
+            raise SchemaParseError(f"Schema is not valid UTF-8: {e}") from e
+
+        tables = self._advance(final=True)
+        self._finished = True
+        if self._state not in (_START, _DONE):
+            raise SchemaParseError(
+                f"Invalid schema JSON: unexpected end of input at offset {self._offset + self._pos}"
+            )
+        return tables
+
+    def _take(self, data: str) -> None:
+        """Make the unparsed input, pending chunks and data the buffer."""
+        self._offset += self._pos
+        self._buffer = "".join([self._buffer[self._pos:], *self._pending, data])
+        self._pending.clear()
+        self._pos = 0
+
+    def _scan(self, text: str, i: int) -> int:
+        """
+        Continue scanning for the end of the value being read.
+
+        Returns the index in text just past the value, or -1 if text ends
+        first; the bracket depth and string state are kept for the next call.
+        """
+        depth, in_string = self._depth, self._in_string
+        if self._escape:
+            if i >= len(text):
+                return -1
+            i += 1
+            self._escape = False
+        while True:
+            if in_string:
+                match = _STRING_SPECIAL.search(text, i)
+                if match is None:
+                    break
+                i = match.end()
+                if match.group() == "\\":
+                    if i >= len(text):
+                        self._escape = True
+                        break
+                    i += 1
+                    continue
+                in_string = False
+                if depth == 0:
+                    return i
+            else:
+                match = _STRUCTURE.search(text, i)
+                if match is None:
+                    break
+                i = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return i
+        self._depth, self._in_string = depth, in_string
+        return -1
+
+    def _error(self, expected: str) -> SchemaParseError:
+        found = self._buffer[self._pos]
+        return SchemaParseError(
+            f"Invalid schema JSON at offset {self._offset + self._pos}: "
+            f"expected {expected}, found {found!r}"
+        )
+
+    def _decode_value(self, final: bool) -> Any:
+        """Decode the JSON value at the current position, or return _INCOMPLETE."""
+        if self._complete:
+            self._complete = False
+        elif not final and self._buffer[self._pos] in _SCANNED_STARTS:
+            self._depth, self._in_string, self._escape = 0, False, False
+            if self._scan(self._buffer, self._pos) < 0:
+                self._scanning = True
+                return _INCOMPLETE
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as e:
+            if not final:
+                return _INCOMPLETE
+            raise SchemaParseError(
+                f"Invalid schema JSON at offset {self._offset + e.pos}: {e.msg}"
+            ) from e
+
+        # A number at the end of the buffer may continue in the next chunk
+        if end == len(self._buffer) and not final and isinstance(value, (int, float)):
+            return _INCOMPLETE
+
+        self._pos = end
+        return value
+
+    def _advance(self, final: bool) -> list[Table]:
+        tables: list[Table] = []
+        buffer = self._buffer
+
+        while True:
+            self._pos = _WHITESPACE.match(buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos >= len(buffer):
+                return tables
+            char = buffer[self._pos]
+            state = self._state
+
+            if state == _START:
+                if char != "{":
+                    value = self._decode_value(final)
+                    if value is _INCOMPLETE:
+                        return tables
+                    raise SchemaParseError(f"Schema must be an object, got {type(value).__name__}")
+                self._pos += 1
+                self._state = _FIRST_KEY
+
+            elif state in (_FIRST_KEY, _KEY):
+                if char == "}" and state == _FIRST_KEY:
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                if char != '"':
+                    raise self._error("a property name")
+                key = self._decode_value(final)
+                if key is _INCOMPLETE:
+                    return tables
+                self._key = key
+                self._state = _COLON
+
+            elif state == _COLON:
+                if char != ":":
+                    raise self._error("':'")
+                self._pos += 1
+                self._state = _VALUE
+
+            elif state == _VALUE:
+                if self._key == "tables" and char == "[":
+                    self._pos += 1
+                    self._state = _FIRST_TABLE
+                    continue
+                value = self._decode_value(final)
+                if value is _INCOMPLETE:
+                    return tables
+                if self._key == "tables":
+                    raise SchemaParseError(
+                        f"Schema 'tables' must be an array, got {type(value).__name__}"
+                    )
+                # Other top-level keys are ignored, as in parse_schema
+                self._state = _AFTER_VALUE
+
+            elif state in (_FIRST_TABLE, _TABLE):
+                if char == "]" and state == _FIRST_TABLE:
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                value = self._decode_value(final)
+                if value is _INCOMPLETE:
+                    return tables
+                try:
+                    tables.append(parse_table(value))
+                except SchemaParseError as e:
+                    raise SchemaParseError(f"Error parsing table {self._table_count}: {e}") from e
+                self._table_count += 1
+                self._state = _TABLE_SEP
+
+            elif state == _TABLE_SEP:
+                if char == ",":
+                    self._state = _TABLE
+                elif char == "]":
+                    self._state = _AFTER_VALUE
+                else:
+                    raise self._error("',' or ']'")
+                self._pos += 1
+
+            elif state == _AFTER_VALUE:
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._state = _DONE
+                else:
+                    raise self._error("',' or '}'")
+                self._pos += 1
+
+            else:  # _DONE
+                raise self._error("end of input")
+
+
+def iter_schema_tables(
+    stream: IO[bytes] | IO[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Table]:
+    """
+    Parse tables from a file-like object, yielding each as soon as it is read.
+
+    Args:
+        stream: Binary (UTF-8) or text stream containing the schema JSON
+        chunk_size: Number of bytes or characters read per call
+
+    Raises:
+        SchemaParseError: On invalid JSON or an invalid table definition
+    """
+    parser = IncrementalSchemaParser()
+    while chunk := stream.read(chunk_size):
+        yield from parser.feed(chunk)
+    yield from parser.finish()
+
+
+def parse_schema_stream(
+    stream: IO[bytes] | IO[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> SchemaContext:
+    """Parse a complete schema from a file-like object without loading it whole."""
+    builder = SchemaContextBuilder()
+    for table in iter_schema_tables(stream, chunk_size):
+        builder.add_table(table)
+    return builder.build()
+
+
+def parse_schema_file(path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> SchemaContext:
+    """Parse a schema JSON file incrementally."""
+    with open(path, "rb") as f:
+        return parse_schema_stream(f, chunk_size)
+
+
+async def parse_schema_chunks(chunks: AsyncIterable[bytes]) -> SchemaContext:
+    """
+    Parse a schema from an async stream of byte chunks, e.g. a request body.
+
+    An empty body yields an empty schema, like parse_schema(None).
+    """
+    parser = IncrementalSchemaParser()
+    builder = SchemaContextBuilder()
+    async for chunk in chunks:
+        for table in parser.feed(chunk):
+            builder.add_table(table)
+    for table in parser.finish():
+        builder.add_table(table)
+    return builder.build()
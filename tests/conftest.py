@@ -10,6 +10,8 @@ import pytest
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from schema.parser import parse_schema  # noqa: E402
+
 
 @pytest.fixture
 def sample_schema_json():
@@ -51,6 +53,12 @@ def sample_schema_json():
     }
 
 
+@pytest.fixture
+def schema(sample_schema_json):
+    """sample_schema_json, parsed (modules with their own catalog override this)."""
+    return parse_schema(sample_schema_json)
+
+
 @pytest.fixture
 def minimal_schema_json():
     """Minimal schema for simple tests."""
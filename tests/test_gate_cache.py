@@ -0,0 +1,174 @@
+"""
+Tests for the policy gate result cache.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from api.models import PerfWarning, PolicyGateOutput, QueryStatus
+from app.main import app
+from config.settings import get_settings
+from schema.parser import parse_schema
+from validation.engine import get_validation_engine
+from validation.gate_cache import (
+    ENTRY_OVERHEAD_BYTES,
+    PolicyGateCache,
+    get_policy_gate_cache,
+    sql_key,
+)
+from validation.policy_gate import run_policy_gate
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    get_policy_gate_cache.cache_clear()
+    get_validation_engine.cache_clear()
+    yield
+    get_policy_gate_cache.cache_clear()
+    get_validation_engine.cache_clear()
+
+
+def make_output(sql: str) -> PolicyGateOutput:
+    return PolicyGateOutput(passed=True, sql=sql, status=QueryStatus.VALIDATED, warnings=["w"])
+
+
+class TestPolicyGateCache:
+    """Tests for PolicyGateCache."""
+
+    def test_hit_does_not_rerun(self):
+        cache = PolicyGateCache()
+        calls = []
+
+        def run():
+            calls.append(1)
+            return make_output("SELECT 1")
+
+        first = cache.get_or_run("k", run)
+        second = cache.get_or_run("k", run)
+
+        assert first == second
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_hits_are_copies(self):
+        cache = PolicyGateCache()
+        cache.get_or_run("k", lambda: make_output("SELECT 1")).warnings.append("mutated")
+
+        assert cache.get_or_run("k", lambda: make_output("SELECT 1")).warnings == ["w"]
+
+    def test_perf_warnings_are_copies(self):
+        cache = PolicyGateCache()
+
+        def run():
+            output = make_output("SELECT 1")
+            output.perf_warnings.append(PerfWarning(rule="r", message="m", position=0))
+            return output
+
+        cache.get_or_run("k", run).perf_warnings.clear()
+        cache.get_or_run("k", run).perf_warnings.append(PerfWarning(rule="x", message="y", position=0))
+
+        assert [w.rule for w in cache.get_or_run("k", run).perf_warnings] == ["r"]
+
+    def test_perf_warnings_are_immutable(self):
+        warning = PerfWarning(rule="r", message="m", position=0)
+
+        with pytest.raises(ValidationError):
+            warning.message = "mutated"
+
+    def test_evicts_least_recently_used(self):
+        cache = PolicyGateCache(max_entries=2)
+        cache.get_or_run("a", lambda: make_output("a"))
+        cache.get_or_run("b", lambda: make_output("b"))
+        cache.get_or_run("a", lambda: make_output("a"))
+        cache.get_or_run("c", lambda: make_output("c"))
+
+        assert cache.get_or_run("a", lambda: make_output("other")).sql == "a"
+        assert cache.get_or_run("b", lambda: make_output("rerun")).sql == "rerun"
+        assert cache.stats().evictions == 2
+
+    def test_bounded_by_bytes(self):
+        cache = PolicyGateCache(max_bytes=2 * ENTRY_OVERHEAD_BYTES + 100)
+        cache.get_or_run("a", lambda: make_output("a"))
+        cache.get_or_run("b", lambda: make_output("b"))
+        cache.get_or_run("c", lambda: make_output("c" * 90))
+
+        stats = cache.stats()
+        assert (stats.entries, stats.evictions) == (2, 1)
+        assert stats.current_bytes <= stats.max_bytes
+
+    def test_output_over_the_budget_not_stored(self):
+        cache = PolicyGateCache(max_bytes=ENTRY_OVERHEAD_BYTES)
+
+        assert cache.get_or_run("k", lambda: make_output("x" * 10)).sql == "x" * 10
+        assert len(cache) == 0
+
+    def test_hit_rate_before_lookups(self):
+        assert PolicyGateCache().stats().hit_rate == 0.0
+
+
+class TestCachedPolicyGate:
+    """Tests for the cache in run_policy_gate."""
+
+    def test_repeated_sql_is_a_hit(self):
+        first = run_policy_gate("SELECT id FROM users")
+        second = run_policy_gate("SELECT id FROM users")
+
+        assert first == second
+        assert get_policy_gate_cache().stats().hits == 1
+
+    def test_schema_is_part_of_the_key(self, sample_schema_json, minimal_schema_json):
+        sql = "SELECT name, price FROM products LIMIT 5"
+        with_products = run_policy_gate(sql, parse_schema(sample_schema_json))
+        without_products = run_policy_gate(sql, parse_schema(minimal_schema_json))
+
+        assert with_products.warnings == []
+        assert without_products.warnings != []
+        # An equal schema parsed again has the same fingerprint
+        run_policy_gate(sql, parse_schema(sample_schema_json))
+        assert get_policy_gate_cache().stats().hits == 1
+
+    def test_settings_are_part_of_the_key(self, monkeypatch):
+        sql = "SELECT id FROM users"
+        assert run_policy_gate(sql).sql.endswith("LIMIT 50")
+
+        monkeypatch.setattr(get_settings(), "max_row_limit", 10)
+        get_validation_engine.cache_clear()
+
+        assert run_policy_gate(sql).sql.endswith("LIMIT 10")
+
+    def test_writer_placeholder_flag_is_part_of_the_key(self):
+        sql = "SELECT id FROM users"
+
+        assert run_policy_gate(sql).status == QueryStatus.VALIDATED
+        assert run_policy_gate(sql, has_placeholders_from_writer=True).status == QueryStatus.DRAFT
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "policy_gate_cache_max_entries", 0)
+        get_policy_gate_cache.cache_clear()
+
+        run_policy_gate("SELECT id FROM users")
+        run_policy_gate("SELECT id FROM users")
+
+        assert get_policy_gate_cache().stats().misses == 0
+
+    def test_sql_is_keyed_by_digest(self):
+        sql = "SELECT id FROM users WHERE name = '" + "x" * 50_000 + "'"
+
+        assert sql_key(sql) == (len(sql), sql_key(sql)[1])
+        assert len(sql_key(sql)[1]) == 16
+        assert sql_key(sql) != sql_key(sql + " ")
+        assert sql_key("\ud800") != sql_key("")  # Lone surrogates from JSON still hash
+
+    def test_stats_endpoint(self):
+        run_policy_gate("SELECT id FROM users")
+        run_policy_gate("SELECT id FROM users")
+
+        response = TestClient(app).get("/api/stats/policy-gate-cache")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["hits"], body["misses"], body["entries"]) == (1, 1, 1)
+        assert body["hit_rate"] == 0.5
@@ -0,0 +1,171 @@
+"""
+Tests for the index advisor.
+"""
+
+import pytest
+
+from api.models import PlannerOutput, SqlWriterOutput
+from config.settings import get_settings
+from orchestrator.root import advise_indexes_fn, build_response_fn
+from schema.parser import parse_schema
+from validation.engine import get_validation_engine
+from validation.index_advisor import advise_indexes
+from validation.scope import ColumnRef, parse_scopes
+
+
+@pytest.fixture
+def schema():
+    return parse_schema({"tables": [
+        {
+            "name": "events",
+            "columns": [
+                {"name": "id", "primary_key": True},
+                {"name": "user_id"},
+                {"name": "kind"},
+                {"name": "day"},
+                {"name": "Score"},
+            ],
+            "row_count": 1_000_000,
+            "indexes": [{"columns": ["user_id", "day"]}],
+        },
+        {"name": "plain", "columns": [{"name": "a"}]},
+    ]})
+
+
+def suggested(sql: str, schema) -> list[list[str]]:
+    return [s.columns for s in advise_indexes(sql, schema).suggestions]
+
+
+class TestScopeConditions:
+    """Tests for Scope.equalities, Scope.sort_keys and Scope.disjunctive."""
+
+    def test_equalities_and_sort_keys(self):
+        [scope] = parse_scopes(
+            "SELECT * FROM t WHERE a = 1 AND b IN (1, 2) AND c > 3 AND d IS NULL "
+            "ORDER BY e DESC, t.f"
+        )
+
+        assert scope.equalities == [ColumnRef("a"), ColumnRef("b"), ColumnRef("d")]
+        assert scope.sort_keys == [ColumnRef("e"), ColumnRef("f", "t")]
+        assert not scope.disjunctive
+
+    def test_disjunctive(self):
+        assert parse_scopes("SELECT * FROM t WHERE a = 1 OR b = 2")[0].disjunctive
+        assert not parse_scopes("SELECT a OR b FROM t WHERE c = 1")[0].disjunctive
+
+
+class TestAdviseIndexes:
+    """Tests for advise_indexes."""
+
+    def test_equality_then_sort_then_range(self, schema):
+        [suggestion] = advise_indexes(
+            "SELECT * FROM events WHERE day > '2024-01-01' AND kind = 'x' ORDER BY score",
+            schema,
+        ).suggestions
+
+        assert suggestion.columns == ["kind", "Score", "day"]
+        assert suggestion.statement == (
+            "CREATE INDEX idx_events_kind_score_day ON events (kind, Score, day);"
+        )
+        assert suggestion.reason == (
+            "Serves the equality on 'kind', then ORDER BY 'Score', then range on 'day'"
+        )
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM events WHERE user_id = 3 AND day > '2024-01-01'",  # Existing index
+        "SELECT * FROM events WHERE id = 3 AND kind = 'x'",  # Unique key lookup
+        "SELECT * FROM events WHERE kind = 'x' OR score > 3",  # Disjunctive
+        "SELECT * FROM events",
+        "SELECT * FROM plain WHERE a = 1",  # Nothing known about its indexes
+    ])
+    def test_no_suggestion(self, schema, sql):
+        assert suggested(sql, schema) == []
+
+    def test_range_on_the_sort_column(self, schema):
+        result = advise_indexes(
+            "SELECT * FROM events WHERE kind = 'x' AND day > '2024-01-01' ORDER BY day", schema
+        )
+
+        assert [s.statement for s in result.suggestions] == [
+            "CREATE INDEX idx_events_kind_day ON events (kind, day);"
+        ]
+        assert result.notes == [
+            "No existing index on 'events' serves the conditions or sort on 'kind' and "
+            "'day'; the query scans the table"
+        ]
+
+    @pytest.mark.parametrize("dialect, statement", [
+        (None, 'CREATE INDEX idx_sales_line_items_order ON "sales.line items" ("order");'),
+        ("mysql", "CREATE INDEX idx_sales_line_items_order ON `sales.line items` (`order`);"),
+    ])
+    def test_identifiers_are_quoted(self, dialect, statement):
+        schema = parse_schema({"tables": [
+            {"name": "sales.line items", "columns": [{"name": "order"}], "row_count": 10},
+        ]})
+        sql = 'SELECT * FROM "sales.line items" WHERE "order" = 1'
+
+        [suggestion] = advise_indexes(sql, schema, dialect).suggestions
+        assert suggestion.statement == statement
+
+    def test_sort_only_for_single_table(self, schema):
+        sql = "SELECT * FROM events e JOIN plain p ON p.a = e.kind WHERE e.kind = 'x' ORDER BY day"
+
+        assert suggested(sql, schema) == [["kind"]]
+
+    def test_subqueries_listed_once(self, schema):
+        sql = (
+            "SELECT * FROM events WHERE kind = 'x' "
+            "AND id IN (SELECT id FROM events WHERE kind = 'x')"
+        )
+
+        assert suggested(sql, schema) == [["kind"]]
+
+    def test_note_when_no_index_is_usable(self, schema):
+        result = advise_indexes("SELECT * FROM events WHERE kind = 'x' OR score > 3", schema)
+
+        assert result.notes == [
+            "No existing index on 'events' serves the conditions or sort on 'kind' and "
+            "'Score'; the query scans the table"
+        ]
+        assert advise_indexes("SELECT * FROM events WHERE user_id = 3", schema).notes == []
+
+    def test_empty_schema(self):
+        assert advise_indexes("SELECT * FROM events WHERE kind = 'x'", None).suggestions == []
+
+
+class TestPipelineStage:
+    """Tests for the index advisor stage of the basic pipeline."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_engine(self):
+        get_validation_engine.cache_clear()
+        yield
+        get_validation_engine.cache_clear()
+
+    def gate(self, sql, schema):
+        return get_validation_engine().validate(sql, schema, has_placeholders_from_writer=False)
+
+    def test_response_has_suggestions_and_notes(self, schema):
+        sql = "SELECT id FROM events WHERE kind = 'x' LIMIT 10"
+        gate_output = self.gate(sql, schema)
+
+        response = build_response_fn(
+            PlannerOutput(schema_sufficient=True),
+            SqlWriterOutput(sql=sql),
+            gate_output,
+            advice=advise_indexes_fn(gate_output, schema),
+        )
+
+        assert [s.columns for s in response.index_suggestions] == [["kind"]]
+        assert response.warnings[-1].startswith("No existing index on 'events'")
+
+    def test_disabled(self, schema, monkeypatch):
+        monkeypatch.setattr(get_settings(), "index_advisor_enabled", False)
+        gate_output = self.gate("SELECT id FROM events WHERE kind = 'x' LIMIT 10", schema)
+
+        assert advise_indexes_fn(gate_output, schema).suggestions == []
+
+    def test_skipped_when_the_gate_fails(self, schema):
+        gate_output = self.gate("SELECT id FROM events WHERE kind = 'x'; SELECT 1", schema)
+
+        assert advise_indexes_fn(gate_output, schema).suggestions == []
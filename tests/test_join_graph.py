@@ -0,0 +1,69 @@
+"""
+Tests for the foreign-key join graph.
+"""
+
+import pytest
+
+from schema.join_graph import JoinEdge
+from schema.models import Column, SchemaContext, Table
+
+
+@pytest.fixture
+def shop_schema():
+    return SchemaContext(tables=(
+        Table(name="customers", columns=(Column(name="id", primary_key=True),)),
+        Table(name="orders", columns=(
+            Column(name="id", primary_key=True),
+            Column(name="customer_id", foreign_key="customers.id"),
+        )),
+        Table(name="order_items", columns=(
+            Column(name="order_id", foreign_key="orders.id"),
+            Column(name="product_id", foreign_key="Products.ID"),
+        )),
+        Table(name="products", columns=(Column(name="id", primary_key=True),)),
+        Table(name="audit_log", columns=(Column(name="event"),)),
+    ))
+
+
+class TestJoinGraph:
+    """Tests for JoinGraph."""
+
+    def test_graph_is_cached_per_schema(self, shop_schema):
+        assert shop_schema.join_graph is shop_schema.join_graph
+
+    def test_neighbours_in_both_directions(self, shop_schema):
+        graph = shop_schema.join_graph
+        assert graph.neighbours("orders") == {"customers", "order_items"}
+        assert graph.neighbours("CUSTOMERS") == {"orders"}
+        assert graph.neighbours("audit_log") == set()
+
+    def test_direct_join_path(self, shop_schema):
+        path = shop_schema.join_graph.join_path("orders", "customers")
+        assert path == [JoinEdge("orders", "customer_id", "customers", "id")]
+
+    def test_reference_uses_declared_names(self, shop_schema):
+        path = shop_schema.join_graph.join_path("order_items", "products")
+        assert path[0].condition == "order_items.product_id = products.id"
+
+    def test_multi_hop_join_path(self, shop_schema):
+        path = shop_schema.join_graph.join_path("customers", "products")
+        assert [e.to_table for e in path] == ["orders", "order_items", "products"]
+
+    def test_same_and_unreachable_tables(self, shop_schema):
+        graph = shop_schema.join_graph
+        assert graph.join_path("orders", "orders") == []
+        assert graph.join_path("orders", "audit_log") is None
+        assert graph.join_path("orders", "missing") is None
+        assert not graph.is_connected("orders", "audit_log")
+
+    def test_join_hints_include_intermediate_tables(self, shop_schema):
+        hints = shop_schema.join_graph.join_hints(["customers", "products"])
+        assert hints == [
+            "customers JOIN orders ON customers.id = orders.customer_id",
+            "orders JOIN order_items ON orders.id = order_items.order_id",
+            "order_items JOIN products ON order_items.product_id = products.id",
+        ]
+
+    def test_join_hints_skip_unconnected_tables(self, shop_schema):
+        assert shop_schema.join_graph.join_hints(["orders", "audit_log"]) == []
+        assert shop_schema.join_graph.join_hints(["orders"]) == []
@@ -0,0 +1,169 @@
+"""
+Tests for the performance lint rules.
+"""
+
+import pytest
+
+from api.models import QueryStatus
+from config.settings import get_settings
+from validation.engine import get_validation_engine
+from validation.lexer import tokenize
+from validation.perf_rules import DEFAULT_RULES, lint_performance
+from validation.policy_gate import run_policy_gate
+
+
+def rules(sql: str) -> list[str]:
+    return [warning.rule for warning in lint_performance(tokenize(sql))]
+
+
+class TestLeadingWildcard:
+    """Tests for the leading-wildcard rule."""
+
+    @pytest.mark.parametrize("pattern", ["'%gmail.com'", "'_bc'", "E'%x'"])
+    def test_flagged(self, pattern):
+        [warning] = lint_performance(tokenize(f"SELECT * FROM users WHERE email LIKE {pattern}"))
+
+        assert warning.rule == "leading-wildcard"
+        assert f"LIKE {pattern} on 'email'" in warning.message
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM users WHERE email LIKE 'bob%'",
+        "SELECT email LIKE '%x' AS is_x FROM users",  # Not a filter
+        "SELECT * FROM users WHERE email = '%x'",
+    ])
+    def test_not_flagged(self, sql):
+        assert rules(sql) == []
+
+    def test_position(self):
+        sql = "SELECT * FROM users WHERE name ILIKE '%ann%'"
+
+        [warning] = lint_performance(tokenize(sql))
+
+        assert sql[warning.position:] == "'%ann%'"
+
+
+class TestWrappedColumn:
+    """Tests for the wrapped-column rule."""
+
+    @pytest.mark.parametrize("sql, column", [
+        ("SELECT * FROM users WHERE LOWER(email) = 'a@b.c'", "email"),
+        ("SELECT * FROM orders o WHERE DATE(o.created_at) >= '2024-01-01'", "o.created_at"),
+        ("SELECT * FROM orders WHERE '2024' = EXTRACT(YEAR FROM order_date)", "order_date"),
+        ("SELECT * FROM orders WHERE created_at::date = '2024-01-01'", "created_at"),
+        ("SELECT * FROM users WHERE UPPER(TRIM(name)) LIKE 'A%'", "name"),
+        ("SELECT * FROM a JOIN b ON CAST(a.id AS TEXT) = b.ref", "a.id"),
+    ])
+    def test_flagged(self, sql, column):
+        [warning] = lint_performance(tokenize(sql))
+
+        assert warning.rule == "wrapped-column"
+        assert f"Column '{column}'" in warning.message
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM orders WHERE created_at > NOW() - INTERVAL '1 day'",
+        "SELECT * FROM users WHERE email = LOWER(:email)",
+        "SELECT LOWER(email) FROM users WHERE id = 1",
+        "SELECT * FROM orders WHERE id IN (SELECT order_id FROM items)",
+    ])
+    def test_not_flagged(self, sql):
+        assert rules(sql) == []
+
+
+class TestOrAcrossColumns:
+    """Tests for the or-across-columns rule."""
+
+    def test_flagged(self):
+        [warning] = lint_performance(tokenize("SELECT * FROM users WHERE state = 'CA' OR city = 'NY'"))
+
+        assert warning.rule == "or-across-columns"
+        assert "'state' and 'city'" in warning.message
+
+    def test_parenthesized(self):
+        assert rules("SELECT * FROM users WHERE (a = 1 OR b = 2) AND c = 3") == ["or-across-columns"]
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM users WHERE state = 'CA' OR state = 'NY'",
+        "SELECT * FROM users WHERE a = 1 AND b = 2",
+        "SELECT a = 1 OR b = 2 FROM users",
+    ])
+    def test_not_flagged(self, sql):
+        assert rules(sql) == []
+
+
+class TestCartesianJoin:
+    """Tests for the cartesian-join rule."""
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM users u, orders o",
+        "SELECT * FROM users u, orders o WHERE u.state = 'CA'",
+        "SELECT * FROM users u JOIN orders o ON u.id = o.user_id, items i",
+        "SELECT * FROM (SELECT * FROM a) x, (SELECT * FROM b) y",
+        "SELECT * FROM users WHERE id IN (SELECT user_id FROM a, b)",
+    ])
+    def test_flagged(self, sql):
+        assert rules(sql) == ["cartesian-join"]
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM users u, orders o WHERE u.id = o.user_id",
+        "SELECT * FROM users u CROSS JOIN orders o",
+        "SELECT * FROM users, orders WHERE id = user_id",  # Might join them
+        "SELECT * FROM a, b, c WHERE a.id = b.a_id AND c.b_id = b.id",
+        "SELECT * FROM users u JOIN orders o ON u.id = o.user_id",
+        "SELECT * FROM a, LATERAL (SELECT * FROM b WHERE b.a = a.id) l",
+        "SELECT * FROM a CROSS JOIN LATERAL (SELECT a.x * 2 AS y) l",
+        "SELECT * FROM a JOIN LATERAL unnest(a.tags) t ON true",
+        "SELECT * FROM a, (SELECT * FROM b WHERE b.a = a.id) l",  # Correlated derived table
+        "SELECT * FROM a, (SELECT * FROM b WHERE EXISTS (SELECT 1 FROM c WHERE c.id = a.id)) l",
+    ])
+    def test_not_flagged(self, sql):
+        assert rules(sql) == []
+
+    def test_lateral_does_not_join_earlier_items(self):
+        sql = "SELECT * FROM a, b, LATERAL (SELECT * FROM c WHERE c.b = b.id) l"
+
+        [warning] = lint_performance(tokenize(sql))
+        assert "between 'a' and ('b' and 'l')" in warning.message
+
+    def test_names_unjoined_groups(self):
+        [warning] = lint_performance(tokenize("SELECT 1 FROM a, b JOIN c ON b.id = c.id, d"))
+
+        assert "between 'a', ('b' and 'c') and 'd'" in warning.message
+
+
+class TestPolicyGateIntegration:
+    """Tests for perf warnings in the policy gate."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_engine(self):
+        get_validation_engine.cache_clear()
+        yield
+        get_validation_engine.cache_clear()
+
+    def test_structured_warnings(self):
+        result = run_policy_gate("SELECT * FROM users WHERE name LIKE '%x'")
+
+        assert result.status == QueryStatus.VALIDATED
+        assert [w.rule for w in result.perf_warnings] == ["leading-wildcard"]
+        assert result.warnings == ["LIMIT 50 was enforced on the query"]
+
+    def test_cartesian_join_review(self, monkeypatch):
+        sql = "SELECT * FROM users, orders LIMIT 5"
+        assert run_policy_gate(sql).status == QueryStatus.VALIDATED
+
+        monkeypatch.setattr(get_settings(), "cartesian_join_review", True)
+        get_validation_engine.cache_clear()
+
+        assert run_policy_gate(sql).status == QueryStatus.REVIEW_REQUIRED
+        lateral = "SELECT * FROM users u, LATERAL (SELECT * FROM orders o WHERE o.user_id = u.id) l"
+        assert run_policy_gate(lateral + " LIMIT 5").status == QueryStatus.VALIDATED
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "perf_rules_enabled", False)
+
+        assert run_policy_gate("SELECT * FROM users, orders").perf_warnings == []
+
+    def test_custom_rules(self):
+        [wildcard] = [rule for rule in DEFAULT_RULES if rule.name == "leading-wildcard"]
+        sql = "SELECT * FROM a, b WHERE LOWER(a.x) LIKE '%y'"
+
+        assert [w.rule for w in lint_performance(tokenize(sql), (wildcard,))] == ["leading-wildcard"]
@@ -5,6 +5,7 @@ Tests for the policy gate validation module.
 import pytest
 
 from api.models import QueryStatus
+from validation.lexer import tokenize
 from validation.policy_gate import (
     StatementType,
     check_multiple_statements,
@@ -12,6 +13,7 @@ from validation.policy_gate import (
     detect_placeholders,
     determine_status,
     enforce_limit,
+    find_row_limit,
     run_policy_gate,
 )
 
@@ -61,6 +63,10 @@ class TestClassifyStatement:
         assert classify_statement("   SELECT * FROM users") == StatementType.SELECT
         assert classify_statement("\n\nSELECT * FROM users") == StatementType.SELECT
 
+    def test_leading_comment_and_parenthesis(self):
+        assert classify_statement("-- top customers\n(SELECT * FROM users)") == StatementType.SELECT
+        assert classify_statement("SELECTED FROM users") == StatementType.UNKNOWN
+
 
 class TestCheckMultipleStatements:
     """Tests for multiple statement detection."""
@@ -80,6 +86,14 @@ class TestCheckMultipleStatements:
     def test_trailing_semicolon(self):
         assert check_multiple_statements("SELECT * FROM users;") is False
 
+    def test_semicolon_after_escaped_quote(self):
+        assert check_multiple_statements("SELECT * FROM users WHERE name = 'O''Brien; Pat'") is False
+
+    def test_semicolon_in_comment(self):
+        assert check_multiple_statements("SELECT 1 -- one; two\n") is False
+        assert check_multiple_statements("SELECT 1; /* done */") is False
+        assert check_multiple_statements("SELECT 1 -- note\n; DROP TABLE users") is True
+
 
 class TestDetectPlaceholders:
     """Tests for placeholder detection."""
@@ -104,6 +118,14 @@ class TestDetectPlaceholders:
         result = detect_placeholders("SELECT <COL>, <COL> FROM <TABLE>")
         assert len(result) == 2  # Should dedupe
 
+    def test_placeholder_in_string_literal(self):
+        result = detect_placeholders("SELECT * FROM users WHERE state = '<STATE_VALUE>'")
+        assert [p["token"] for p in result] == ["<STATE_VALUE>"]
+
+    def test_placeholder_in_comment_ignored(self):
+        result = detect_placeholders("SELECT * FROM users -- replace <USERS_TABLE> if needed")
+        assert result == []
+
     def test_placeholder_meaning(self):
         result = detect_placeholders("SELECT * FROM <CUSTOMERS_TABLE>")
         assert "table" in result[0]["meaning"].lower()
@@ -132,6 +154,16 @@ class TestEnforceLimit:
         assert sql.endswith(";")
         assert "LIMIT 50" in sql
 
+    def test_trailing_comment_does_not_swallow_limit(self):
+        sql, modified = enforce_limit("SELECT * FROM users -- everyone", 50, StatementType.SELECT)
+        assert sql == "SELECT * FROM users LIMIT 50 -- everyone"
+        assert modified is True
+
+    def test_limit_in_string_ignored(self):
+        sql, modified = enforce_limit("SELECT * FROM logs WHERE msg = 'LIMIT 500'", 50, StatementType.SELECT)
+        assert sql == "SELECT * FROM logs WHERE msg = 'LIMIT 500' LIMIT 50"
+        assert modified is True
+
     def test_non_select_not_modified(self):
         sql, modified = enforce_limit("INSERT INTO users (name) VALUES ('test')", 50, StatementType.INSERT)
         assert "LIMIT" not in sql
@@ -141,6 +173,95 @@ class TestEnforceLimit:
         sql, modified = enforce_limit("WITH cte AS (SELECT 1) SELECT * FROM cte", 50, StatementType.WITH)
         assert "LIMIT 50" in sql
 
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM (SELECT * FROM users LIMIT 5) u",
+        "WITH recent AS (SELECT * FROM users LIMIT 5) SELECT * FROM recent",
+        "SELECT * FROM users WHERE id IN (SELECT user_id FROM orders LIMIT 5)",
+    ])
+    def test_inner_limit_does_not_bound_outer_query(self, sql):
+        assert enforce_limit(sql, 50, StatementType.SELECT) == (f"{sql} LIMIT 50", True)
+
+    def test_only_outer_limit_lowered(self):
+        sql, modified = enforce_limit(
+            "SELECT * FROM (SELECT * FROM users LIMIT 500) u LIMIT 100", 50, StatementType.SELECT
+        )
+        assert sql == "SELECT * FROM (SELECT * FROM users LIMIT 500) u LIMIT 50"
+
+    def test_limit_of_last_union_branch_applies(self):
+        sql, _ = enforce_limit("SELECT 1 UNION ALL SELECT 2 LIMIT 10", 50, StatementType.SELECT)
+        assert sql == "SELECT 1 UNION ALL SELECT 2 LIMIT 10"
+
+        sql, _ = enforce_limit("(SELECT 1 LIMIT 5) UNION (SELECT 2 LIMIT 5)", 50, StatementType.SELECT)
+        assert sql == "(SELECT 1 LIMIT 5) UNION (SELECT 2 LIMIT 5) LIMIT 50"
+
+    @pytest.mark.parametrize("sql, expected", [
+        ("SELECT * FROM users LIMIT ALL", "SELECT * FROM users LIMIT 50"),
+        ("SELECT * FROM users LIMIT 10, 500", "SELECT * FROM users LIMIT 10, 50"),
+        ("SELECT * FROM users OFFSET 20", "SELECT * FROM users LIMIT 50 OFFSET 20"),
+        ("SELECT * FROM users LIMIT 500 OFFSET 20", "SELECT * FROM users LIMIT 50 OFFSET 20"),
+        ("SELECT * FROM users FOR UPDATE", "SELECT * FROM users LIMIT 50 FOR UPDATE"),
+        (
+            "SELECT * FROM users ORDER BY id OFFSET 20 ROWS",
+            "SELECT * FROM users ORDER BY id OFFSET 20 ROWS FETCH FIRST 50 ROWS ONLY",
+        ),
+        (
+            "SELECT * FROM users FETCH FIRST 500 ROWS ONLY",
+            "SELECT * FROM users FETCH FIRST 50 ROWS ONLY",
+        ),
+    ])
+    def test_row_limit_forms(self, sql, expected):
+        assert enforce_limit(sql, 50, StatementType.SELECT) == (expected, True)
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM users LIMIT $1",
+        "SELECT * FROM users LIMIT :n OFFSET :m",
+        "SELECT * FROM users FETCH FIRST 10 PERCENT ROWS ONLY",
+        "SELECT * FROM users ORDER BY age FETCH FIRST 5 ROWS WITH TIES",
+    ])
+    def test_unchecked_count_is_wrapped(self, sql):
+        result, modified = enforce_limit(f"{sql};", 50, StatementType.SELECT)
+        assert result == f"SELECT * FROM ({sql}) AS limited_rows LIMIT 50;"
+        assert modified is True
+
+    def test_fetch_first_row_within_bounds(self):
+        sql = "SELECT * FROM users FETCH NEXT ROW ONLY"
+        assert enforce_limit(sql, 50, StatementType.SELECT) == (sql, False)
+
+    def test_mysql_adds_limit_not_fetch(self):
+        sql, _ = enforce_limit(
+            "SELECT * FROM users ORDER BY id OFFSET 20 ROWS", 50, StatementType.SELECT, dialect="mysql"
+        )
+        assert sql == "SELECT * FROM users ORDER BY id LIMIT 50 OFFSET 20"
+
+    def test_mysql_offset_rows_before_locking_clause(self):
+        sql, _ = enforce_limit(
+            "SELECT * FROM t OFFSET (2 * 5) ROW FOR UPDATE;", 50, StatementType.SELECT,
+            dialect="mysql",
+        )
+        assert sql == "SELECT * FROM t LIMIT 50 OFFSET (2 * 5) FOR UPDATE;"
+
+    def test_mysql_string_escapes(self):
+        sql = r"SELECT * FROM logs WHERE msg = 'it\'s LIMIT 5'"
+        result, _ = enforce_limit(sql, 50, StatementType.SELECT, dialect="mysql")
+        assert result == f"{sql} LIMIT 50"
+
+
+class TestFindRowLimit:
+    """Tests for find_row_limit."""
+
+    def test_clauses(self):
+        row_limit = find_row_limit(tokenize("SELECT * FROM t LIMIT 10 OFFSET 20 FOR UPDATE"))
+        assert (row_limit.count_value, row_limit.offset_value) == (10, 20)
+        assert row_limit.end == len("SELECT * FROM t LIMIT 10 OFFSET 20")
+
+    def test_mysql_offset_comma_count(self):
+        row_limit = find_row_limit(tokenize("SELECT * FROM t LIMIT 20, 10"))
+        assert (row_limit.count_value, row_limit.offset_value) == (10, 20)
+
+    def test_no_clauses(self):
+        row_limit = find_row_limit(tokenize("SELECT a, b FROM (SELECT * FROM t LIMIT 1 OFFSET 2) s"))
+        assert row_limit.count is None and row_limit.offset is None
+
 
 class TestDetermineStatus:
     """Tests for status determination."""
@@ -223,6 +344,21 @@ class TestRunPolicyGate:
         assert result.passed is False
         assert result.status == QueryStatus.ERROR
 
+    def test_deep_offset_rejected(self):
+        result = run_policy_gate("SELECT * FROM users LIMIT 10 OFFSET 200000")
+        assert result.passed is False
+        assert result.status == QueryStatus.ERROR
+        assert "past the limit of 100,000" in result.policy_errors[0]
+
+    def test_offset_window_uses_enforced_limit(self):
+        assert run_policy_gate("SELECT * FROM users LIMIT 1000 OFFSET 99950").passed
+        assert not run_policy_gate("SELECT * FROM users LIMIT 1000 OFFSET 99951").passed
+
+    def test_dialect_is_part_of_the_result(self):
+        sql = "SELECT * FROM users ORDER BY id OFFSET 5 ROWS"
+        assert run_policy_gate(sql).sql.endswith("FETCH FIRST 50 ROWS ONLY")
+        assert run_policy_gate(sql, dialect="sqlite").sql.endswith("LIMIT 50 OFFSET 5")
+
     def test_drop_has_strong_warning(self):
         result = run_policy_gate("DROP TABLE users")
         assert result.passed is True
@@ -0,0 +1,109 @@
+"""
+Tests for relevance-based schema pruning.
+"""
+
+import pytest
+
+from orchestrator.retrieval import (
+    char_ngrams,
+    get_retrieval_index,
+    select_relevant_schema,
+    tokenize_text,
+)
+from schema.models import Column, SchemaContext, Table
+
+
+@pytest.fixture
+def warehouse_schema():
+    """A schema with a handful of relevant tables hidden among filler tables."""
+    tables = [
+        Table(name="customers", description="Customer accounts", columns=(
+            Column(name="id", primary_key=True),
+            Column(name="name"),
+            Column(name="state"),
+        )),
+        Table(name="orders", description="Customer orders", columns=(
+            Column(name="id", primary_key=True),
+            Column(name="customer_id", foreign_key="customers.id"),
+            Column(name="total"),
+        )),
+        Table(name="order_items", columns=(
+            Column(name="order_id", foreign_key="orders.id"),
+            Column(name="product_id", foreign_key="products.id"),
+            Column(name="quantity"),
+        )),
+        Table(name="products", columns=(
+            Column(name="id", primary_key=True),
+            Column(name="price"),
+            Column(name="category"),
+        )),
+        Table(name="employeeShifts", description="Warehouse staff rota", columns=(
+            Column(name="employee_id"),
+            Column(name="shift_start"),
+        )),
+    ]
+    tables += [
+        Table(name=f"audit_log_{i}", columns=(Column(name="event"), Column(name="payload")))
+        for i in range(30)
+    ]
+    return SchemaContext(tables=tuple(tables))
+
+
+class TestTokenize:
+    """Tests for text and identifier tokenization."""
+
+    def test_splits_identifiers(self):
+        assert tokenize_text("customer_id") == ["customer", "id"]
+        assert tokenize_text("employeeShifts") == ["employee", "shift"]
+
+    def test_drops_stopwords_and_stems(self):
+        assert tokenize_text("Show me all the categories") == ["category"]
+
+    def test_char_ngrams(self):
+        assert char_ngrams("ab") == {" ab", "ab "}
+        assert " cu" in char_ngrams("Cust")
+
+
+class TestSelectRelevantSchema:
+    """Tests for select_relevant_schema."""
+
+    def test_most_relevant_table_first(self, warehouse_schema):
+        result = select_relevant_schema("What is the average product price by category?", warehouse_schema, top_k=2)
+        assert result.tables[0].name == "products"
+
+    def test_adds_foreign_key_neighbours(self, warehouse_schema):
+        result = select_relevant_schema("Total order amount per customer state", warehouse_schema, top_k=2)
+        names = result.get_table_names()
+
+        assert "orders" in names
+        assert "customers" in names
+        assert "order_items" in names  # references orders
+        assert not any(n.startswith("audit_log") for n in names)
+
+    def test_matches_description_words(self, warehouse_schema):
+        result = select_relevant_schema("Who works on the rota tomorrow?", warehouse_schema, top_k=1)
+        assert result.tables[0].name == "employeeShifts"
+
+    def test_partial_names_match_via_ngrams(self, warehouse_schema):
+        result = select_relevant_schema("cust list", warehouse_schema, top_k=1)
+        assert result.tables[0].name == "customers"
+
+    def test_small_schema_unchanged(self, warehouse_schema):
+        assert select_relevant_schema("anything", warehouse_schema, top_k=100) is warehouse_schema
+
+    def test_zero_top_k_disables_pruning(self, warehouse_schema):
+        assert select_relevant_schema("orders", warehouse_schema, top_k=0) is warehouse_schema
+
+    def test_no_match_returns_full_schema(self, warehouse_schema):
+        assert select_relevant_schema("zzz qqq", warehouse_schema, top_k=2) is warehouse_schema
+
+    def test_index_is_cached_per_schema(self, warehouse_schema):
+        assert get_retrieval_index(warehouse_schema) is get_retrieval_index(warehouse_schema)
+
+    def test_includes_bridge_tables_on_join_paths(self, warehouse_schema):
+        result = select_relevant_schema("customer state and product category", warehouse_schema, top_k=2)
+        names = result.get_table_names()
+
+        assert set(names[:2]) == {"customers", "products"}
+        assert "orders" in names
+        assert "order_items" in names
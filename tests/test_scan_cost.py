@@ -0,0 +1,151 @@
+"""
+Tests for the schema-aware scan cost checks.
+"""
+
+import pytest
+
+from config.settings import get_settings
+from schema.parser import parse_schema
+from validation.cost import check_scan_cost, wide_row_limit
+from validation.engine import get_validation_engine
+from validation.policy_gate import run_policy_gate
+from validation.scope import ColumnRef, parse_scopes
+
+LARGE = 100_000_000
+
+
+@pytest.fixture
+def schema():
+    columns = [
+        {"name": "id", "primary_key": True},
+        {"name": "user_id"},
+        {"name": "kind"},
+        {"name": "day"},
+    ]
+    return parse_schema({"tables": [
+        {
+            "name": "events",
+            "columns": columns,
+            "row_count": 2_100_000_000,
+            "indexes": [{"columns": ["user_id", "day"]}],
+        },
+        {"name": "logs", "columns": columns, "partition_keys": ["day"]},
+        {"name": "users", "columns": [{"name": "id", "primary_key": True}, {"name": "name"}], "row_count": 10},
+        {"name": "wide", "columns": [{"name": f"c{i}"} for i in range(200)]},
+    ]})
+
+
+def rules(sql: str, schema) -> list[str]:
+    return [warning.rule for warning in check_scan_cost(parse_scopes(sql), schema, LARGE)]
+
+
+class TestScopeFilters:
+    """Tests for Scope.filters."""
+
+    def test_where_and_on_references(self):
+        [scope] = parse_scopes(
+            "SELECT a.x FROM a JOIN b ON a.id = b.a_id WHERE b.kind IS DISTINCT FROM 'x' "
+            "GROUP BY a.y ORDER BY a.z"
+        )
+
+        assert scope.filters == [ColumnRef("id", "a"), ColumnRef("a_id", "b"), ColumnRef("kind", "b")]
+
+    def test_source_positions(self):
+        sql = "SELECT 1 FROM a JOIN b AS bb ON true"
+
+        assert [sql[s.position:] for s in parse_scopes(sql)[0].sources.values()] == [
+            "a JOIN b AS bb ON true", "b AS bb ON true",
+        ]
+
+
+class TestCheckScanCost:
+    """Tests for check_scan_cost."""
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM events WHERE kind = 'x'",
+        "SELECT * FROM events",
+        "SELECT * FROM events e JOIN users u ON e.kind = u.name",
+        "SELECT * FROM users WHERE id IN (SELECT user_id FROM events)",
+        "SELECT * FROM events WHERE day = '2024-01-01'",  # Not the index's first column
+    ])
+    def test_full_scan(self, schema, sql):
+        assert rules(sql, schema) == ["full-scan"]
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT * FROM events WHERE id = 1",
+        "SELECT * FROM events e WHERE e.user_id = 5 AND kind = 'x'",
+        "SELECT * FROM users u JOIN events e ON e.user_id = u.id",
+        "SELECT * FROM users",  # Small
+        "WITH events AS (SELECT 1 AS kind) SELECT * FROM events",
+    ])
+    def test_no_full_scan(self, schema, sql):
+        assert rules(sql, schema) == []
+
+    def test_message(self, schema):
+        sql = "SELECT * FROM users u, events e WHERE e.kind = 'x'"
+
+        [warning] = check_scan_cost(parse_scopes(sql), schema, LARGE)
+
+        assert warning.message.startswith("'events' has about 2.1B rows")
+        assert warning.message.endswith("filter on 'id' or 'user_id'")
+        assert sql[warning.position:] == "events e WHERE e.kind = 'x'"
+
+    def test_threshold(self, schema):
+        sql = "SELECT * FROM users"
+
+        assert [w.rule for w in check_scan_cost(parse_scopes(sql), schema, 10)] == ["full-scan"]
+        assert check_scan_cost(parse_scopes(sql), schema, 0) == []
+
+    def test_missing_partition_filter(self, schema):
+        [warning] = check_scan_cost(parse_scopes("SELECT id FROM logs WHERE id = 3"), schema, LARGE)
+
+        assert warning.rule == "missing-partition-filter"
+        assert "partition key 'day'" in warning.message
+        assert rules("SELECT id FROM logs l WHERE l.day = '2024-01-01'", schema) == []
+
+
+class TestWideRowLimit:
+    """Tests for wide_row_limit."""
+
+    @pytest.mark.parametrize("sql, limit", [
+        ("SELECT * FROM wide", 12),
+        ("SELECT w.* FROM wide w", 12),
+        ("SELECT c1, c2 FROM wide", 50),
+        ("SELECT * FROM users", 50),
+    ])
+    def test_limit(self, schema, sql, limit):
+        assert wide_row_limit(parse_scopes(sql)[0], schema, 50, 50) == limit
+
+    def test_disabled(self, schema):
+        assert wide_row_limit(parse_scopes("SELECT * FROM wide")[0], schema, 50, 0) == 50
+
+    def test_at_least_one_row(self, schema):
+        assert wide_row_limit(parse_scopes("SELECT * FROM wide")[0], schema, 1, 50) == 1
+
+
+class TestPolicyGateIntegration:
+    """Tests for scan cost in the policy gate."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_engine(self):
+        get_validation_engine.cache_clear()
+        yield
+        get_validation_engine.cache_clear()
+
+    def test_perf_warnings(self, schema):
+        result = run_policy_gate("SELECT id FROM events WHERE kind LIKE '%x'", schema)
+
+        assert [w.rule for w in result.perf_warnings] == ["leading-wildcard", "full-scan"]
+
+    def test_wide_select_star_limit(self, schema):
+        result = run_policy_gate("SELECT * FROM wide", schema)
+
+        assert result.sql == "SELECT * FROM wide LIMIT 12"
+        assert result.warnings == [
+            "LIMIT 12 was enforced on the query (lower than usual, as SELECT * returns many columns)"
+        ]
+
+    def test_disabled_with_perf_rules(self, schema, monkeypatch):
+        monkeypatch.setattr(get_settings(), "perf_rules_enabled", False)
+
+        assert run_policy_gate("SELECT * FROM events", schema).perf_warnings == []
@@ -0,0 +1,102 @@
+"""
+Tests for the process-wide parsed schema cache.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from orchestrator.root import parse_schema_fn
+from schema.cache import (
+    ParsedSchemaCache,
+    estimate_schema_bytes,
+    get_parsed_schema_cache,
+    payload_key,
+)
+from schema.parser import SchemaParseError, parse_schema
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    get_parsed_schema_cache.cache_clear()
+    yield
+    get_parsed_schema_cache.cache_clear()
+
+
+class TestPayloadKey:
+    """Tests for payload_key."""
+
+    def test_key_order_does_not_matter(self):
+        a = {"tables": [{"name": "users", "columns": [{"name": "id", "type": "int"}]}]}
+        b = {"tables": [{"columns": [{"type": "int", "name": "id"}], "name": "users"}]}
+        assert payload_key(a) == payload_key(b)
+
+    def test_content_matters(self, minimal_schema_json, sample_schema_json):
+        assert payload_key(minimal_schema_json) != payload_key(sample_schema_json)
+
+
+class TestParsedSchemaCache:
+    """Tests for ParsedSchemaCache."""
+
+    def test_hit_returns_same_instance(self, sample_schema_json):
+        cache = ParsedSchemaCache()
+        first = cache.get_or_parse(sample_schema_json)
+        second = cache.get_or_parse(sample_schema_json)
+
+        assert first is second
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.current_bytes == estimate_schema_bytes(first)
+
+    def test_evicts_least_recently_used_over_budget(self, sample_schema_json, minimal_schema_json):
+        budget = estimate_schema_bytes(parse_schema(sample_schema_json))
+        cache = ParsedSchemaCache(max_bytes=budget)
+
+        cache.get_or_parse(minimal_schema_json)
+        cache.get_or_parse(sample_schema_json)
+
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.entries == 1
+        assert stats.current_bytes <= budget
+
+    def test_oversized_schema_is_not_stored(self, sample_schema_json):
+        cache = ParsedSchemaCache(max_bytes=10)
+        cache.get_or_parse(sample_schema_json)
+        assert len(cache) == 0
+
+    def test_parse_errors_are_not_cached(self):
+        cache = ParsedSchemaCache()
+        for _ in range(2):
+            with pytest.raises(SchemaParseError):
+                cache.get_or_parse({"tables": "nope"})
+        assert cache.stats().misses == 2
+        assert len(cache) == 0
+
+
+class TestCachedParsing:
+    """Tests for the cache in the pipeline and the stats endpoint."""
+
+    def test_parse_schema_fn_uses_cache(self, sample_schema_json):
+        first, _ = parse_schema_fn(sample_schema_json)
+        second, _ = parse_schema_fn(dict(sample_schema_json))
+
+        assert first is second
+        assert get_parsed_schema_cache().stats().hits == 1
+
+    def test_parse_schema_fn_reports_errors(self):
+        schema, error = parse_schema_fn({"tables": [{"columns": []}]})
+        assert schema.is_empty
+        assert "Error parsing table 0" in error
+
+    def test_stats_endpoint(self, sample_schema_json):
+        parse_schema_fn(sample_schema_json)
+        parse_schema_fn(sample_schema_json)
+
+        response = TestClient(app).get("/api/stats/cache")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["hits"] == 1
+        assert body["misses"] == 1
+        assert body["entries"] == 1
@@ -0,0 +1,115 @@
+"""
+Tests for scope-aware schema reference checks.
+"""
+
+from validation.policy_gate import run_policy_gate
+from validation.schema_checker import check_references
+from validation.scope import parse_scopes
+
+
+class TestParseScopes:
+    """Tests for parse_scopes."""
+
+    def test_aliases_and_qualified_references(self):
+        [scope] = parse_scopes(
+            "SELECT c.name AS customer, o.total FROM public.customers c "
+            "JOIN orders AS o ON o.customer_id = c.id ORDER BY customer"
+        )
+
+        assert {alias: source.name for alias, source in scope.sources.items()} == {
+            "c": "customers",
+            "o": "orders",
+        }
+        assert [str(ref) for ref in scope.references] == [
+            "c.name", "o.total", "o.customer_id", "c.id", "customer",
+        ]
+        assert scope.outputs == {"customer", "total"}
+        assert scope.aliases == {"customer"}
+
+    def test_ctes_and_subqueries_get_their_own_scopes(self):
+        root, cte, subquery = parse_scopes(
+            "WITH big AS (SELECT id, total FROM orders WHERE total > 100) "
+            "SELECT b.id FROM big b WHERE b.total > (SELECT avg(price) FROM products)"
+        )
+
+        assert root.sources["b"].cte is root.ctes["big"]
+        assert cte.outputs == {"id", "total"}
+        assert cte.parent is root and subquery.parent is root
+        assert [ref.name for ref in subquery.references] == ["price"]
+
+    def test_keywords_functions_and_literals_are_not_references(self):
+        [scope] = parse_scopes(
+            "SELECT CASE WHEN total > 1 THEN 'big' END size, EXTRACT(YEAR FROM order_date), "
+            "total::numeric, DATE '2024-01-01', sum(total) OVER w FROM orders "
+            "WHERE order_date > now() - INTERVAL '1' DAY WINDOW w AS (PARTITION BY status)"
+        )
+
+        assert {ref.name for ref in scope.references} == {"total", "order_date", "status"}
+
+
+class TestCheckReferences:
+    """Tests for check_references."""
+
+    def test_valid_query_with_aliases_and_cte(self, schema):
+        warnings = check_references(
+            "WITH spend AS (SELECT customer_id, sum(total) AS spent FROM orders GROUP BY customer_id) "
+            "SELECT c.name, s.spent FROM customers c JOIN spend s ON s.customer_id = c.id "
+            "WHERE s.spent > 100 ORDER BY s.spent DESC",
+            schema,
+        )
+
+        assert warnings == []
+
+    def test_column_from_a_table_not_in_scope(self, schema):
+        # price exists, but only in products
+        warnings = check_references("SELECT name, price FROM customers", schema)
+
+        assert warnings == ["Column 'price' not found in table 'customers'"]
+
+    def test_qualified_column_checked_against_its_table(self, schema):
+        warnings = check_references(
+            "SELECT o.email FROM orders o JOIN customers c ON c.id = o.customer_id", schema
+        )
+
+        assert warnings == ["Column 'o.email' not found in table 'orders'"]
+
+    def test_cte_column_not_output(self, schema):
+        warnings = check_references(
+            "WITH t AS (SELECT id FROM orders) SELECT t.total FROM t", schema
+        )
+
+        assert warnings == ["Column 't.total' not found in CTE 't'"]
+
+    def test_correlated_subquery_sees_outer_aliases(self, schema):
+        warnings = check_references(
+            "SELECT c.name FROM customers c WHERE EXISTS "
+            "(SELECT 1 FROM orders o WHERE o.customer_id = c.id AND state = 'CA')",
+            schema,
+        )
+
+        assert warnings == []
+
+    def test_unknown_table_and_column(self, schema):
+        warnings = check_references("SELECT foo FROM invoices; SELECT bar FROM orders", schema)
+
+        assert warnings == [
+            "Table 'invoices' not found in provided schema",
+            "Column 'bar' not found in provided schema",
+        ]
+
+    def test_recursive_cte(self, schema):
+        warnings = check_references(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 5) "
+            "SELECT i FROM n",
+            schema,
+        )
+
+        assert warnings == []
+
+    def test_policy_gate_validates_aliased_query(self, schema):
+        result = run_policy_gate(
+            "SELECT o.id, o.total AS amount FROM orders o ORDER BY amount DESC", schema
+        )
+
+        assert result.status.value == "validated"
+        assert result.warnings == ["LIMIT 50 was enforced on the query"]
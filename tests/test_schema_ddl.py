@@ -0,0 +1,262 @@
+"""
+Tests for the DDL schema importer.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from benchmarks.bench_adversarial import DDL_ADVERSARIAL_INPUTS
+from schema.ddl import DdlParseError, parse_ddl
+from schema.models import SchemaContext
+from schema.parser import parse_schema
+from schema.registry import get_schema_registry
+
+PG_DUMP = """\
+--
+-- PostgreSQL database dump
+--
+SET statement_timeout = 0;
+SELECT pg_catalog.set_config('search_path', '', false);
+
+CREATE TABLE public.customers (
+    id integer NOT NULL,
+    -- Customer email address
+    email character varying(255) NOT NULL,
+    balance numeric(10,2) DEFAULT 0.00 CHECK ((balance >= (0)::numeric)),
+    created_at timestamp(3) with time zone DEFAULT now()
+);
+
+ALTER TABLE public.customers OWNER TO postgres;
+
+CREATE TABLE public.orders (
+    id bigint NOT NULL,
+    customer_id integer, -- Who placed the order
+    note text DEFAULT 'CREATE TABLE fake (x int);'
+);
+
+COMMENT ON TABLE public.customers IS 'People who buy things';
+COMMENT ON COLUMN public.orders.note IS E'Free text, it\\'s optional';
+
+COPY public.orders (id, customer_id, note) FROM stdin;
+1\t1\tCREATE TABLE not_a_table (x int);
+\\.
+
+ALTER TABLE ONLY public.customers ADD CONSTRAINT customers_pkey PRIMARY KEY (id);
+ALTER TABLE ONLY public.orders ADD CONSTRAINT orders_pkey PRIMARY KEY (id);
+ALTER TABLE ONLY public.orders
+    ADD CONSTRAINT orders_customer_fk FOREIGN KEY (customer_id) REFERENCES public.customers(id) ON DELETE CASCADE;
+CREATE INDEX orders_customer_idx ON public.orders USING btree (customer_id);
+"""
+
+MYSQL_DUMP = """\
+/*!40101 SET NAMES utf8mb4 */;
+DROP TABLE IF EXISTS `users`;
+CREATE TABLE `users` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `name` varchar(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL COMMENT 'Full name',
+  `group_id` int DEFAULT NULL, # Primary group
+  `key` varchar(32),
+  PRIMARY KEY (`id`),
+  KEY `idx_name` (`name`(10)),
+  CONSTRAINT `users_group_fk` FOREIGN KEY (`group_id`) REFERENCES `groups` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Application users';
+INSERT INTO `users` VALUES (1,'O\\'Brien; Pat',NULL,'k');
+CREATE TABLE `groups` (`id` int PRIMARY KEY, `label` enum('a','b,c'));
+"""
+
+SQLITE_SCHEMA = """\
+CREATE TABLE artists (ArtistId INTEGER PRIMARY KEY AUTOINCREMENT, Name NVARCHAR(120));
+CREATE TABLE IF NOT EXISTS "albums"
+(
+    [AlbumId] INTEGER NOT NULL,
+    [Title] NVARCHAR(160) NOT NULL,
+    [ArtistId] INTEGER NOT NULL REFERENCES artists,
+    CONSTRAINT [PK_Album] PRIMARY KEY ([AlbumId])
+);
+CREATE INDEX IFK_AlbumArtistId ON albums (ArtistId);
+"""
+
+
+@pytest.fixture
+def client():
+    get_schema_registry.cache_clear()
+    yield TestClient(app)
+    get_schema_registry.cache_clear()
+
+
+class TestPostgresDump:
+    """Tests for pg_dump output."""
+
+    @pytest.fixture
+    def schema(self) -> SchemaContext:
+        return parse_ddl(PG_DUMP, "postgres")
+
+    def test_tables_and_types(self, schema):
+        assert schema.get_table_names() == ["customers", "orders"]
+        customers = schema.get_table("customers")
+        assert [c.type for c in customers.columns] == [
+            "integer",
+            "character varying(255)",
+            "numeric(10, 2)",
+            "timestamp(3) with time zone",
+        ]
+
+    def test_keys_from_alter_table(self, schema):
+        assert schema.get_table("customers").get_column("id").primary_key
+        assert schema.get_table("orders").get_column("customer_id").foreign_key == "customers.id"
+
+    def test_descriptions(self, schema):
+        customers = schema.get_table("customers")
+        orders = schema.get_table("orders")
+        assert customers.description == "People who buy things"
+        assert customers.get_column("email").description == "Customer email address"
+        assert orders.get_column("customer_id").description == "Who placed the order"
+        assert orders.get_column("note").description == "Free text, it's optional"
+
+    def test_statements_in_strings_and_copy_data_are_skipped(self, schema):
+        assert not schema.has_table("fake")
+        assert not schema.has_table("not_a_table")
+
+
+class TestMysqlDump:
+    """Tests for mysqldump output."""
+
+    @pytest.fixture
+    def schema(self) -> SchemaContext:
+        return parse_ddl(MYSQL_DUMP)
+
+    def test_dialect_is_detected(self, schema):
+        assert schema.get_table_names() == ["users", "groups"]
+
+    def test_columns_and_constraints(self, schema):
+        users = schema.get_table("users")
+        assert [c.name for c in users.columns] == ["id", "name", "group_id", "key"]
+        assert users.get_column("name").type == "varchar(255)"
+        assert users.get_column("id").primary_key
+        assert users.get_column("group_id").foreign_key == "groups.id"
+        assert schema.get_table("groups").get_column("label").type == "enum('a', 'b,c')"
+
+    def test_comments(self, schema):
+        users = schema.get_table("users")
+        assert users.description == "Application users"
+        assert users.get_column("name").description == "Full name"
+        assert users.get_column("group_id").description == "Primary group"
+
+
+class TestSqliteSchema:
+    """Tests for sqlite .schema output."""
+
+    def test_bracket_identifiers_and_implicit_reference(self):
+        schema = parse_ddl(SQLITE_SCHEMA, "sqlite")
+
+        albums = schema.get_table("albums")
+        assert [c.name for c in albums.columns] == ["AlbumId", "Title", "ArtistId"]
+        assert albums.get_column("AlbumId").primary_key
+        # REFERENCES without a column list points at the primary key
+        assert albums.get_column("ArtistId").foreign_key == "artists.ArtistId"
+        assert schema.get_table("artists").get_column("ArtistId").primary_key
+
+
+class TestParseDdl:
+    """Tests for general parse_ddl behaviour."""
+
+    def test_column_comment_clause_wins_over_line_comment(self):
+        schema = parse_ddl(
+            "CREATE TABLE t (\n"
+            "  -- above\n"
+            "  a int COMMENT 'explicit', -- same line\n"
+            "  b int, -- same line\n"
+            "  -- above c\n"
+            "  c int\n"
+            ");",
+            "mysql",
+        )
+
+        table = schema.get_table("t")
+        assert [c.description for c in table.columns] == ["explicit", "same line", "above c"]
+
+    def test_duplicate_definitions_first_wins(self):
+        schema = parse_ddl("CREATE TABLE t (a int, a text); CREATE TABLE T (b int);")
+
+        assert len(schema.tables) == 1
+        assert [(c.name, c.type) for c in schema.get_table("t").columns] == [("a", "int")]
+
+    def test_round_trips_create_statements(self, sample_schema_json):
+        expected = parse_schema(sample_schema_json)
+        ddl = ";\n".join(table.to_create_statement() for table in expected.tables)
+        schema = parse_ddl(ddl)
+
+        assert schema.get_table_names() == expected.get_table_names()
+        for table in expected.tables:
+            parsed = schema.get_table(table.name)
+            assert [(c.name, c.type, c.primary_key) for c in parsed.columns] == [
+                (c.name, c.type, c.primary_key) for c in table.columns
+            ]
+
+    def test_unterminated_string_reports_line(self):
+        with pytest.raises(DdlParseError, match="line 2"):
+            parse_ddl("CREATE TABLE t (a int);\nCREATE TABLE u (b text DEFAULT 'oops);")
+
+    def test_unknown_dialect(self):
+        with pytest.raises(DdlParseError, match="Unsupported dialect"):
+            parse_ddl("CREATE TABLE t (a int);", "oracle")
+
+
+class TestDdlEndpoint:
+    """Tests for POST /schemas/ddl."""
+
+    def test_register_ddl(self, client):
+        response = client.post(
+            "/schemas/ddl",
+            content=PG_DUMP,
+            headers={"Content-Type": "text/plain"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["table_count"] == 2
+        assert get_schema_registry().get(data["schema_id"]) == parse_ddl(PG_DUMP, "postgres")
+
+    def test_invalid_ddl(self, client):
+        response = client.post("/schemas/ddl?dialect=postgres", content="CREATE TABLE t (a 'x);")
+
+        assert response.status_code == 400
+        assert "Invalid DDL" in response.json()["detail"]
+
+    def test_no_tables(self, client):
+        response = client.post("/schemas/ddl", content="SELECT 1;")
+
+        assert response.status_code == 400
+
+
+class TestPathologicalDdl:
+    """Malformed DDL is read in time linear in its size."""
+
+    @staticmethod
+    def best_time(dump: str) -> float:
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            parse_ddl(dump, "postgres")
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    @pytest.mark.parametrize("family", list(DDL_ADVERSARIAL_INPUTS))
+    def test_linear_time(self, family):
+        build = DDL_ADVERSARIAL_INPUTS[family]
+        small = self.best_time(build(10_000))
+        large = self.best_time(build(40_000))
+
+        # 4x the input; quadratic behaviour would take ~16x
+        assert large < 8 * small + 0.02, f"{family}: {small * 1000:.1f} ms -> {large * 1000:.1f} ms"
+
+    def test_key_without_column_list(self):
+        schema = parse_ddl(
+            "CREATE TABLE t (a int, b int);\n"
+            "ALTER TABLE t ADD CONSTRAINT c PRIMARY KEY x, ADD CONSTRAINT d PRIMARY KEY (b);"
+        )
+
+        assert [c.name for c in schema.tables[0].columns if c.primary_key] == ["b"]
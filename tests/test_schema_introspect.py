@@ -0,0 +1,161 @@
+"""
+Tests for SQLite catalog introspection.
+"""
+
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from config.settings import get_settings
+from schema.introspect import IntrospectionError, SqliteSchemaCache, introspect_sqlite
+
+CHINOOK_DDL = """
+CREATE TABLE artists (
+    ArtistId INTEGER PRIMARY KEY,
+    Name NVARCHAR(120) -- Display name
+);
+CREATE TABLE albums (
+    AlbumId INTEGER PRIMARY KEY,
+    Title NVARCHAR(160) NOT NULL,
+    ArtistId INTEGER NOT NULL REFERENCES artists
+);
+CREATE TABLE tracks (
+    AlbumId INTEGER,
+    Position INTEGER,
+    Name TEXT,
+    PRIMARY KEY (AlbumId, Position),
+    FOREIGN KEY (AlbumId) REFERENCES albums (AlbumId)
+);
+CREATE INDEX tracks_name ON tracks (Name);
+"""
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "chinook.db"
+    connection = sqlite3.connect(path)
+    connection.executescript(CHINOOK_DDL)
+    connection.commit()
+    yield path, connection
+    connection.close()
+
+
+def touch(path) -> None:
+    """Move a file's mtime forward, as a later write would."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestIntrospectSqlite:
+    """Tests for introspect_sqlite."""
+
+    def test_tables_columns_and_keys(self, database):
+        path, _ = database
+        schema = introspect_sqlite(path)
+
+        assert schema.get_table_names() == ["artists", "albums", "tracks"]
+        albums = schema.get_table("albums")
+        assert [(c.name, c.type) for c in albums.columns] == [
+            ("AlbumId", "INTEGER"),
+            ("Title", "NVARCHAR(160)"),
+            ("ArtistId", "INTEGER"),
+        ]
+        assert albums.get_column("AlbumId").primary_key
+        # REFERENCES without a column list points at the primary key
+        assert albums.get_column("ArtistId").foreign_key == "artists.ArtistId"
+
+        tracks = schema.get_table("tracks")
+        assert [c.name for c in tracks.columns if c.primary_key] == ["AlbumId", "Position"]
+        assert tracks.get_column("AlbumId").foreign_key == "albums.AlbumId"
+
+    def test_indexes(self, database):
+        path, _ = database
+        schema = introspect_sqlite(path)
+
+        [index] = schema.get_table("tracks").indexes
+        assert (index.name, index.columns, index.unique) == ("tracks_name", ("Name",), False)
+        # The primary key's own index isn't listed
+        assert schema.get_table("albums").indexes == ()
+
+    def test_comments_in_stored_ddl_become_descriptions(self, database):
+        path, _ = database
+        schema = introspect_sqlite(path)
+
+        assert schema.get_table("artists").get_column("Name").description == "Display name"
+
+    def test_missing_file_is_not_created(self, tmp_path):
+        path = tmp_path / "missing.db"
+
+        with pytest.raises(IntrospectionError):
+            introspect_sqlite(path)
+        assert not path.exists()
+
+    def test_not_a_database(self, tmp_path):
+        path = tmp_path / "notes.db"
+        path.write_text("not a database " * 100)
+
+        with pytest.raises(IntrospectionError):
+            introspect_sqlite(path)
+
+
+class TestSqliteSchemaCache:
+    """Tests for SqliteSchemaCache."""
+
+    def test_unchanged_file_is_not_reopened(self, database):
+        path, _ = database
+        cache = SqliteSchemaCache()
+
+        first = cache.get(path)
+        assert cache.get(path) is first
+        assert cache.introspections == 1
+
+    def test_data_writes_keep_the_schema(self, database):
+        path, connection = database
+        cache = SqliteSchemaCache()
+        first = cache.get(path)
+
+        connection.execute("INSERT INTO artists (Name) VALUES ('AC/DC')")
+        connection.commit()
+        touch(path)
+
+        assert cache.get(path) is first
+        assert cache.introspections == 1
+
+    def test_ddl_changes_reintrospect(self, database):
+        path, connection = database
+        cache = SqliteSchemaCache()
+        cache.get(path)
+
+        connection.execute("ALTER TABLE artists ADD COLUMN Country TEXT")
+        connection.commit()
+        touch(path)
+
+        schema = cache.get(path)
+        assert schema.has_column("artists", "Country")
+        assert cache.introspections == 2
+
+    def test_ddl_changes_in_wal_mode(self, database):
+        path, connection = database
+        connection.execute("PRAGMA journal_mode = WAL")
+        cache = SqliteSchemaCache()
+        cache.get(path)
+
+        # Stays in the -wal file until a checkpoint; the main file is untouched
+        connection.execute("CREATE TABLE genres (GenreId INTEGER PRIMARY KEY)")
+        connection.commit()
+
+        assert cache.get(path).has_table("genres")
+
+
+class TestQueryFallback:
+    """Tests for the sqlite_database setting in /query."""
+
+    def test_unavailable_database(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_settings(), "sqlite_database", str(tmp_path / "missing.db"))
+
+        response = TestClient(app).post("/query", json={"question": "How many artists?"})
+
+        assert response.status_code == 503
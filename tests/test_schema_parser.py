@@ -4,7 +4,7 @@ Tests for the schema parser module.
 
 import pytest
 
-from schema.models import Column, SchemaContext, Table
+from schema.models import Column, Index, SchemaContext, Table
 from schema.parser import SchemaParseError, parse_schema, validate_schema
 
 
@@ -92,6 +92,61 @@ class TestParseSchema:
         assert col.primary_key is False
         assert col.foreign_key == "customers.id"
 
+    def test_table_statistics(self):
+        data = {
+            "tables": [
+                {
+                    "name": "events",
+                    "columns": [{"name": "id", "distinct_count": 1000}, {"name": "day"}],
+                    "row_count": 1000,
+                    "indexes": [{"name": "events_day", "columns": ["day", "id"], "unique": True}],
+                    "partition_keys": ["day"],
+                }
+            ]
+        }
+        table = parse_schema(data).tables[0]
+
+        assert table.row_count == 1000
+        assert table.indexes == (Index(columns=("day", "id"), name="events_day", unique=True),)
+        assert table.partition_keys == ("day",)
+        assert table.columns[0].distinct_count == 1000
+        assert table.is_seekable("DAY") and not table.is_seekable("id")
+        assert table.to_dict()["indexes"] == data["tables"][0]["indexes"]
+
+    def test_statistics_do_not_change_fingerprint_when_absent(self):
+        plain = parse_schema({"tables": [{"name": "t", "columns": [{"name": "id"}]}]})
+        empty = parse_schema({"tables": [{
+            "name": "t", "columns": [{"name": "id", "distinct_count": None}],
+            "row_count": None, "indexes": [], "partition_keys": [],
+        }]})
+
+        assert "row_count" not in plain.tables[0].to_dict()
+        assert empty.fingerprint == plain.fingerprint
+
+    @pytest.mark.parametrize("table, message", [
+        ({"row_count": -1}, "'row_count' must be a non-negative integer"),
+        ({"row_count": True}, "'row_count' must be a non-negative integer"),
+        ({"indexes": {}}, "'indexes' must be an array"),
+        ({"indexes": [{"columns": []}]}, "non-empty 'columns'"),
+        ({"partition_keys": "day"}, "'partition_keys' must be an array of column names"),
+    ])
+    def test_invalid_statistics(self, table, message):
+        with pytest.raises(SchemaParseError, match=message):
+            parse_schema({"tables": [{"name": "t", "columns": [{"name": "day"}], **table}]})
+
+    @pytest.mark.parametrize("table, message", [
+        ({"description": 5}, "Table 'description' must be a string, got int"),
+        ({"columns": [{"name": "a", "type": 5}]}, "Column 'type' must be a string"),
+        ({"columns": [{"name": "a", "description": ["x"]}]}, "Column 'description' must be"),
+        ({"columns": [{"name": "a", "foreign_key": {}}]}, "Column 'foreign_key' must be"),
+        ({"columns": [{"name": "a", "primary_key": "yes"}]}, "Column 'primary_key' must be a bool"),
+        ({"indexes": [{"columns": ["a"], "unique": 1}]}, "Index 'unique' must be a boolean"),
+        ({"indexes": [{"columns": ["a"], "name": 7}]}, "Index 'name' must be a string"),
+    ])
+    def test_invalid_field_types(self, table, message):
+        with pytest.raises(SchemaParseError, match=message):
+            parse_schema({"tables": [{"name": "t", "columns": [{"name": "a"}], **table}]})
+
     def test_invalid_schema_not_dict(self):
         with pytest.raises(SchemaParseError) as exc_info:
             parse_schema("not a dict")
@@ -189,6 +244,19 @@ class TestValidateSchema:
         warnings = validate_schema(schema)
         assert len(warnings) == 0
 
+    def test_index_and_partition_key_columns_must_exist(self):
+        schema = SchemaContext(tables=(
+            Table(
+                name="users", columns=(Column(name="id"),),
+                indexes=(Index(columns=("email",)),), partition_keys=("region",),
+            ),
+        ))
+
+        assert validate_schema(schema) == [
+            "Index on non-existent column 'email' in table 'users'",
+            "Partition key 'region' is not a column of table 'users'",
+        ]
+
     def test_duplicate_table_names(self):
         schema = SchemaContext(tables=(
             Table(name="users", columns=(Column(name="id"),)),
@@ -309,3 +377,118 @@ class TestColumn:
     def test_to_prompt_string_with_description(self):
         col = Column(name="id", description="Primary identifier")
         assert "Primary identifier" in col.to_prompt_string()
+
+
+class TestSchemaIndexes:
+    """Tests for the lookup indexes built on SchemaContext and Table."""
+
+    def test_duplicate_table_first_definition_wins(self):
+        first = Table(name="users", columns=(Column(name="id"),))
+        second = Table(name="USERS", columns=(Column(name="email"),))
+        schema = SchemaContext(tables=(first, second))
+
+        assert schema.get_table("Users") is first
+        assert not schema.has_column("users", "email")
+
+    def test_get_tables_with_column(self):
+        schema = SchemaContext(tables=(
+            Table(name="customers", columns=(Column(name="id"), Column(name="Name"))),
+            Table(name="orders", columns=(Column(name="id"), Column(name="customer_id"))),
+        ))
+
+        assert schema.get_tables_with_column("ID") == ("customers", "orders")
+        assert schema.get_tables_with_column("name") == ("customers",)
+        assert schema.get_tables_with_column("missing") == ()
+        assert schema.has_any_column("CUSTOMER_ID")
+        assert not schema.has_any_column("total")
+
+    def test_list_input_is_indexed(self):
+        schema = SchemaContext(tables=[Table(name="users", columns=[Column(name="id")])])
+
+        assert isinstance(schema.tables, tuple)
+        assert isinstance(schema.tables[0].columns, tuple)
+        assert schema.has_column("USERS", "ID")
+
+    def test_indexes_do_not_affect_equality(self):
+        a = SchemaContext(tables=(Table(name="users", columns=(Column(name="id"),)),))
+        b = SchemaContext(tables=(Table(name="users", columns=(Column(name="id"),)),))
+
+        assert a == b
+        assert hash(a) == hash(b)
+        assert "_table_index" not in repr(a)
+
+    def test_schema_is_still_frozen(self):
+        schema = SchemaContext(tables=(Table(name="users", columns=(Column(name="id"),)),))
+
+        with pytest.raises(AttributeError):
+            schema.tables = ()
+
+
+class TestMemoizedRendering:
+    """Tests for cached prompt renderings."""
+
+    def test_renderings_are_computed_once(self, sample_schema_json):
+        schema = parse_schema(sample_schema_json)
+
+        assert schema.to_prompt_string() is schema.to_prompt_string()
+        assert schema.to_compact_string() is schema.to_compact_string()
+        assert schema.tables[0].to_prompt_string() is schema.tables[0].to_prompt_string()
+
+    def test_cached_matches_uncached(self, sample_schema_json):
+        schema = parse_schema(sample_schema_json)
+
+        assert schema.to_prompt_string() == schema._render_prompt_string()
+        assert schema.to_compact_string() == schema._render_compact_string()
+
+    def test_create_statement(self):
+        table = Table(name="users", columns=(
+            Column(name="id", type="integer", primary_key=True),
+            Column(name="email"),
+        ))
+
+        assert table.to_create_statement() == "CREATE TABLE users (id integer PRIMARY KEY, email TEXT);"
+
+    def test_ddl_string(self, minimal_schema_json):
+        schema = parse_schema(minimal_schema_json)
+        assert schema.to_ddl_string() == schema.tables[0].to_create_statement()
+
+    def test_cache_does_not_affect_equality(self, sample_schema_json):
+        warm = parse_schema(sample_schema_json)
+        warm.to_prompt_string()
+
+        assert warm == parse_schema(sample_schema_json)
+
+
+class TestCompactRepresentation:
+    """Tests for the slotted, interned schema models."""
+
+    def test_models_have_no_instance_dict(self, sample_schema_json):
+        schema = parse_schema(sample_schema_json)
+
+        assert not hasattr(schema, "__dict__")
+        assert not hasattr(schema.tables[0], "__dict__")
+        assert not hasattr(schema.tables[0].columns[0], "__dict__")
+
+    def test_names_and_types_are_interned(self):
+        # Build the strings at runtime so the compiler cannot share the constants
+        a = Column(name="".join(["created", "_at"]), type="".join(["time", "stamp"]))
+        b = Column(name="".join(["created", "_", "at"]), type="".join(["times", "tamp"]))
+
+        assert a.name is b.name
+        assert a.type is b.type
+
+    def test_render_cache_is_created_lazily(self, minimal_schema_json):
+        schema = parse_schema(minimal_schema_json)
+        assert schema.tables[0]._derived is None
+
+        schema.to_prompt_string()
+        assert schema.tables[0]._derived is not None
+
+    def test_pickle_round_trip(self, sample_schema_json):
+        import pickle
+
+        schema = parse_schema(sample_schema_json)
+        restored = pickle.loads(pickle.dumps(schema))
+
+        assert restored == schema
+        assert restored.has_column("CUSTOMERS", "EMAIL")
@@ -0,0 +1,174 @@
+"""
+Tests for incremental schema patches.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from schema.models import SchemaContext
+from schema.parser import parse_schema
+from schema.patch import SchemaPatchError, apply_patch
+from schema.registry import get_schema_registry
+
+
+@pytest.fixture
+def client():
+    get_schema_registry.cache_clear()
+    yield TestClient(app)
+    get_schema_registry.cache_clear()
+
+
+def assert_matches_full_rebuild(patched: SchemaContext) -> None:
+    """The incrementally indexed schema must behave like a freshly built one."""
+    rebuilt = SchemaContext(tables=patched.tables)
+    assert patched == rebuilt
+    assert patched.fingerprint == rebuilt.fingerprint
+    assert patched._table_index == rebuilt._table_index
+    assert patched._column_tables == rebuilt._column_tables
+
+
+class TestApplyPatch:
+    """Tests for apply_patch."""
+
+    def test_add_column_shares_unchanged_tables(self, schema):
+        patched = apply_patch(schema, [
+            {"op": "add_column", "table": "orders", "column": {"name": "channel", "type": "varchar"}},
+        ])
+
+        assert patched.has_column("orders", "channel")
+        assert not schema.has_column("orders", "channel")
+        assert patched.tables[0] is schema.tables[0]
+        assert patched.tables[2] is schema.tables[2]
+        assert patched.get_tables_with_column("channel") == ("orders",)
+        assert_matches_full_rebuild(patched)
+
+    def test_add_and_drop_table(self, schema):
+        patched = apply_patch(schema, [
+            {"op": "add_table", "table": {"name": "refunds", "columns": [{"name": "id"}, {"name": "order_id"}]}},
+            {"op": "drop_table", "table": "Products"},
+        ])
+
+        assert patched.get_table_names() == ["customers", "orders", "refunds"]
+        assert patched.get_tables_with_column("id") == ("customers", "orders", "refunds")
+        assert not patched.has_any_column("price")
+        assert_matches_full_rebuild(patched)
+
+    def test_alter_and_drop_column(self, schema):
+        patched = apply_patch(schema, [
+            {"op": "alter_column", "table": "customers", "column": "state", "changes": {"name": "region"}},
+            {"op": "drop_column", "table": "customers", "column": "email"},
+        ])
+
+        customers = patched.get_table("customers")
+        assert customers.get_column_names() == ["id", "name", "region", "created_at"]
+        assert patched.get_tables_with_column("region") == ("customers",)
+        assert not patched.has_any_column("state")
+        assert_matches_full_rebuild(patched)
+
+    def test_readded_table_moves_to_end(self, schema, sample_schema_json):
+        patched = apply_patch(schema, [
+            {"op": "drop_table", "table": "customers"},
+            {"op": "add_table", "table": sample_schema_json["tables"][0]},
+        ])
+
+        assert patched.get_table_names() == ["orders", "products", "customers"]
+        assert patched.get_tables_with_column("id") == ("orders", "products", "customers")
+        assert_matches_full_rebuild(patched)
+
+    def test_alter_column_keeps_other_fields(self, schema):
+        patched = apply_patch(schema, [
+            {"op": "alter_column", "table": "orders", "column": "total", "changes": {"type": "numeric"}},
+        ])
+
+        column = patched.get_table("orders").get_column("total")
+        assert column.type == "numeric"
+        assert column.name == "total"
+
+    def test_alter_table_description(self, schema):
+        patched = apply_patch(schema, [
+            {"op": "alter_table", "table": "products", "changes": {"description": "Catalog"}},
+        ])
+        assert patched.get_table("products").description == "Catalog"
+
+    def test_alter_table_statistics(self, schema):
+        patched = apply_patch(schema, [
+            {"op": "alter_table", "table": "orders", "changes": {
+                "row_count": 10**9, "indexes": [{"columns": ["customer_id"]}],
+            }},
+            {"op": "alter_column", "table": "orders", "column": "total", "changes": {"distinct_count": 7}},
+            {"op": "add_column", "table": "orders", "column": {"name": "channel"}},
+        ])
+
+        orders = patched.get_table("orders")
+        assert orders.row_count == 10**9
+        assert orders.is_seekable("customer_id")
+        assert orders.get_column("total").distinct_count == 7
+        assert orders.has_column("channel")
+        assert_matches_full_rebuild(patched)
+
+    def test_patched_schema_equals_parsed_equivalent(self, schema, sample_schema_json):
+        sample_schema_json["tables"][2]["columns"].append({"name": "sku", "type": "varchar"})
+        patched = apply_patch(schema, [
+            {"op": "add_column", "table": "products", "column": {"name": "sku", "type": "varchar"}},
+        ])
+
+        assert patched.fingerprint == parse_schema(sample_schema_json).fingerprint
+
+    def test_empty_patch_returns_same_schema(self, schema):
+        assert apply_patch(schema, []) is schema
+
+    @pytest.mark.parametrize("operation, message", [
+        ({"op": "rename"}, "Unknown operation"),
+        ({"op": "drop_table", "table": "missing"}, "does not exist"),
+        ({"op": "add_table", "table": {"name": "orders", "columns": []}}, "already exists"),
+        ({"op": "add_column", "table": "orders", "column": {"name": "TOTAL"}}, "already exists"),
+        ({"op": "drop_column", "table": "orders", "column": "missing"}, "does not exist"),
+        ({"op": "alter_column", "table": "orders", "column": "total", "changes": {"size": 4}}, "Cannot change"),
+        ({"op": "alter_column", "table": "orders", "column": "total", "changes": {"name": "id"}}, "already exists"),
+        ({"op": "add_column", "table": "orders", "column": {}}, "'name'"),
+    ])
+    def test_invalid_operations(self, schema, operation, message):
+        with pytest.raises(SchemaPatchError, match=message) as exc_info:
+            apply_patch(schema, [operation])
+        assert "Error applying operation 0" in str(exc_info.value)
+
+    def test_failed_patch_leaves_schema_untouched(self, schema):
+        with pytest.raises(SchemaPatchError):
+            apply_patch(schema, [
+                {"op": "drop_table", "table": "orders"},
+                {"op": "drop_table", "table": "orders"},
+            ])
+        assert schema.has_table("orders")
+
+
+class TestPatchRoute:
+    """Tests for PATCH /schemas/{schema_id}."""
+
+    def test_patch_registers_new_version(self, client, sample_schema_json):
+        base_id = client.post("/api/schemas", json=sample_schema_json).json()["schema_id"]
+
+        response = client.patch(f"/api/schemas/{base_id}", json={"operations": [
+            {"op": "drop_table", "table": "products"},
+        ]})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["table_count"] == 2
+        assert body["schema_id"] != base_id
+        assert base_id in get_schema_registry()
+        assert body["schema_id"] in get_schema_registry()
+
+    def test_patch_unknown_schema(self, client):
+        response = client.patch("/api/schemas/nope", json={"operations": [{"op": "drop_table", "table": "x"}]})
+        assert response.status_code == 404
+
+    def test_invalid_patch(self, client, minimal_schema_json):
+        base_id = client.post("/api/schemas", json=minimal_schema_json).json()["schema_id"]
+
+        response = client.patch(f"/api/schemas/{base_id}", json={"operations": [
+            {"op": "drop_table", "table": "missing"},
+        ]})
+
+        assert response.status_code == 400
+        assert "does not exist" in response.json()["detail"]
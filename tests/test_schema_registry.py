@@ -0,0 +1,103 @@
+"""
+Tests for the content-addressed schema registry.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from schema.parser import parse_schema
+from schema.registry import SchemaRegistry, get_schema_registry
+
+
+@pytest.fixture
+def client():
+    get_schema_registry.cache_clear()
+    yield TestClient(app)
+    get_schema_registry.cache_clear()
+
+
+class TestFingerprint:
+    """Tests for SchemaContext.fingerprint."""
+
+    def test_equal_schemas_share_fingerprint(self, sample_schema_json):
+        assert parse_schema(sample_schema_json).fingerprint == parse_schema(sample_schema_json).fingerprint
+
+    def test_whitespace_in_names_is_normalized(self, minimal_schema_json):
+        padded = {"tables": [{"name": " users ", "columns": [{"name": "id "}, {"name": "name"}]}]}
+        assert parse_schema(padded).fingerprint == parse_schema(minimal_schema_json).fingerprint
+
+    def test_different_schemas_differ(self, sample_schema_json, minimal_schema_json):
+        assert parse_schema(sample_schema_json).fingerprint != parse_schema(minimal_schema_json).fingerprint
+
+    def test_to_dict_round_trips(self, sample_schema_json):
+        schema = parse_schema(sample_schema_json)
+        assert parse_schema(schema.to_dict()) == schema
+
+
+class TestSchemaRegistry:
+    """Tests for SchemaRegistry."""
+
+    def test_register_and_get(self, sample_schema_json):
+        registry = SchemaRegistry()
+        schema = parse_schema(sample_schema_json)
+
+        schema_id = registry.register(schema)
+
+        assert schema_id == schema.fingerprint
+        assert registry.get(schema_id) is schema
+        assert schema_id in registry
+        assert registry.get("unknown") is None
+
+    def test_register_is_idempotent(self, sample_schema_json):
+        registry = SchemaRegistry()
+        first = registry.register(parse_schema(sample_schema_json))
+        second = registry.register(parse_schema(sample_schema_json))
+
+        assert first == second
+        assert len(registry) == 1
+
+    def test_least_recently_used_is_evicted(self, sample_schema_json, minimal_schema_json):
+        registry = SchemaRegistry(max_entries=1)
+        old_id = registry.register(parse_schema(minimal_schema_json))
+        new_id = registry.register(parse_schema(sample_schema_json))
+
+        assert old_id not in registry
+        assert new_id in registry
+
+
+class TestSchemaRoutes:
+    """Tests for the /schemas endpoint and schema_id on /query."""
+
+    def test_register_schema(self, client, sample_schema_json):
+        response = client.post("/api/schemas", json=sample_schema_json)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["table_count"] == 3
+        assert body["schema_id"] in get_schema_registry()
+
+    def test_query_with_unknown_schema_id(self, client):
+        response = client.post("/api/query", json={"question": "Count users", "schema_id": "nope"})
+        assert response.status_code == 404
+
+    def test_query_rejects_both_schema_sources(self, client, minimal_schema_json):
+        response = client.post(
+            "/api/query",
+            json={"question": "Count users", "schema_id": "x", "schema_metadata": minimal_schema_json},
+        )
+        assert response.status_code == 422
+
+    def test_register_invalid_schema(self, client):
+        response = client.post("/api/schemas", content=b'{"tables": [{"columns": []}]}')
+
+        assert response.status_code == 400
+        assert "Error parsing table 0" in response.json()["detail"]
+
+    def test_register_rejects_non_string_fields(self, client):
+        body = b'{"tables": [{"name": "t", "columns": [{"name": "a", "type": 5}]}]}'
+
+        response = client.post("/api/schemas", content=body)
+
+        assert response.status_code == 400
+        assert "Column 'type' must be a string, got int" in response.json()["detail"]
@@ -0,0 +1,114 @@
+"""
+Tests for the token-budget-aware schema serializer.
+"""
+
+from schema.models import Column, SchemaContext, Table
+from schema.serializer import (
+    DETAIL_COMPACT,
+    DETAIL_FULL,
+    DETAIL_NO_DESCRIPTIONS,
+    estimate_tokens,
+    serialize_schema,
+)
+
+
+def budget_for(text: str) -> int:
+    return estimate_tokens(text)
+
+
+class TestSerializeSchema:
+    """Tests for serialize_schema."""
+
+    def test_unlimited_budget_uses_full_rendering(self, schema):
+        result = serialize_schema(schema, None)
+
+        assert result.detail == DETAIL_FULL
+        assert result.text == schema.to_prompt_string()
+        assert result.estimated_tokens == estimate_tokens(result.text)
+
+    def test_full_rendering_when_it_fits(self, schema):
+        result = serialize_schema(schema, budget_for(schema.to_prompt_string()))
+
+        assert result.detail == DETAIL_FULL
+        assert result.text == schema.to_prompt_string()
+
+    def test_drops_descriptions_first(self, schema):
+        result = serialize_schema(schema, budget_for(schema.to_prompt_string()) - 1)
+
+        assert result.detail == DETAIL_NO_DESCRIPTIONS
+        assert "Customer accounts" not in result.text
+        assert "id (integer) [PK]" in result.text
+        assert "FK->customers.id" in result.text
+
+    def test_then_drops_types(self, schema):
+        result = serialize_schema(schema, budget_for(schema.to_compact_string()))
+
+        assert result.detail == DETAIL_COMPACT
+        assert result.text == schema.to_compact_string()
+        assert not result.is_truncated
+
+    def test_then_drops_trailing_tables(self, schema):
+        two_tables = "Tables: " + "; ".join(t.to_compact_string() for t in schema.tables[:2])
+        budget = budget_for(two_tables + "\n(1 less relevant table omitted)")
+        result = serialize_schema(schema, budget)
+
+        assert result.detail == DETAIL_COMPACT
+        assert result.table_count == 2
+        assert result.omitted_tables == 1
+        assert "products" not in result.text
+        assert "1 less relevant table omitted" in result.text
+        assert result.estimated_tokens <= budget
+
+    def test_keeps_one_table_even_over_budget(self, schema):
+        result = serialize_schema(schema, 1)
+
+        assert result.table_count == 1
+        assert result.text.startswith("Tables: customers(")
+        assert result.estimated_tokens > 1
+
+    def test_stays_within_budget_for_large_schema(self):
+        tables = tuple(
+            Table(name=f"t{i}", description="x" * 40, columns=tuple(
+                Column(name=f"c{j}", type="varchar", description="y" * 30) for j in range(20)
+            ))
+            for i in range(500)
+        )
+        result = serialize_schema(SchemaContext(tables=tables), 2000)
+
+        assert result.estimated_tokens <= 2000
+        assert result.is_truncated
+
+    def test_empty_schema(self):
+        result = serialize_schema(SchemaContext(tables=()), 100)
+        assert result.text == "No schema provided."
+        assert result.table_count == 0
+
+
+class TestSerializeSchemaDdl:
+    """Tests for serialize_schema with ddl=True."""
+
+    def test_unlimited_budget_uses_create_statements(self, schema):
+        result = serialize_schema(schema, None, ddl=True)
+
+        assert result.detail == DETAIL_FULL
+        assert result.text == schema.to_ddl_string()
+
+    def test_full_rendering_when_it_fits(self, schema):
+        result = serialize_schema(schema, budget_for(schema.to_ddl_string()), ddl=True)
+
+        assert result.text == schema.to_ddl_string()
+
+    def test_then_drops_types(self, schema):
+        result = serialize_schema(schema, budget_for(schema.to_ddl_string()) - 1, ddl=True)
+
+        assert result.detail == DETAIL_COMPACT
+        assert result.text.splitlines()[0] == (
+            "CREATE TABLE customers (id, name, email, state, created_at);"
+        )
+
+    def test_then_drops_trailing_tables(self, schema):
+        result = serialize_schema(schema, 1, ddl=True)
+
+        assert result.table_count == 1
+        assert result.text.startswith("CREATE TABLE customers (")
+        assert result.text.endswith("\n-- 2 less relevant tables omitted")
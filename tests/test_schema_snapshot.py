@@ -0,0 +1,210 @@
+"""
+Tests for binary schema snapshots.
+"""
+
+import struct
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from schema.models import Column, Index, SchemaContext, Table
+from schema.parser import parse_schema
+from schema.registry import SchemaRegistry, get_schema_registry
+from schema.snapshot import (
+    _HEADER,
+    SchemaSnapshot,
+    SnapshotError,
+    dump_snapshot,
+    load_snapshot,
+    loads_snapshot,
+    main,
+    preload_snapshots,
+    write_snapshot,
+)
+
+
+class TestSnapshotRoundTrip:
+    """Tests for dump_snapshot / loads_snapshot."""
+
+    def test_round_trip_preserves_schema(self, schema):
+        restored = loads_snapshot(dump_snapshot(schema))
+
+        assert restored == schema
+        assert restored.fingerprint == schema.fingerprint
+        assert restored.to_prompt_string() == schema.to_prompt_string()
+
+    def test_indexes_are_restored(self, schema):
+        restored = loads_snapshot(dump_snapshot(schema))
+
+        assert restored.get_table("ORDERS").name == "orders"
+        assert restored.get_tables_with_column("ID") == ("customers", "orders", "products")
+        assert restored.has_column("customers", "EMAIL")
+        assert restored.join_graph.join_path("orders", "customers")
+
+    def test_identical_columns_are_shared(self):
+        tables = tuple(
+            Table(name=f"t{i}", columns=(Column(name="id", type="integer", primary_key=True),))
+            for i in range(3)
+        )
+        restored = loads_snapshot(dump_snapshot(SchemaContext(tables=tables)))
+
+        assert restored.tables[0].columns[0] is restored.tables[2].columns[0]
+
+    def test_duplicate_table_names_keep_first_definition(self):
+        schema = SchemaContext(tables=(
+            Table(name="users", columns=(Column(name="id"),)),
+            Table(name="USERS", columns=(Column(name="email"),)),
+        ))
+        restored = loads_snapshot(dump_snapshot(schema))
+
+        assert restored.get_table("users") is restored.tables[0]
+        assert restored._column_tables == schema._column_tables
+
+    def test_empty_schema(self):
+        restored = loads_snapshot(dump_snapshot(SchemaContext(tables=())))
+        assert restored.is_empty
+
+    def test_unicode_and_none_values(self):
+        schema = SchemaContext(tables=(
+            Table(name="café", description=None, columns=(Column(name="naïve", description="日本"),)),
+        ))
+        restored = loads_snapshot(dump_snapshot(schema))
+
+        assert restored == schema
+        assert restored.tables[0].columns[0].type is None
+
+    def test_statistics(self):
+        schema = SchemaContext(tables=(
+            Table(
+                name="events",
+                columns=(Column(name="id", primary_key=True), Column(name="day", distinct_count=2**40)),
+                row_count=5 * 10**9,
+                indexes=(Index(columns=("day", "id"), name="by_day", unique=True), Index(columns=("day",))),
+                partition_keys=("day",),
+            ),
+            Table(name="users", columns=(Column(name="id"),)),
+        ))
+        restored = loads_snapshot(dump_snapshot(schema))
+
+        assert restored == schema
+        assert restored.fingerprint == schema.fingerprint
+        assert restored.tables[0].is_seekable("day")
+
+
+class TestSnapshotErrors:
+    """Tests for invalid snapshots."""
+
+    def test_bad_magic(self):
+        with pytest.raises(SnapshotError, match="Not a schema snapshot"):
+            loads_snapshot(b"x" * 200)
+
+    def test_corrupted_body(self, schema):
+        data = bytearray(dump_snapshot(schema))
+        data[-1] ^= 0xFF
+        with pytest.raises(SnapshotError, match="checksum"):
+            loads_snapshot(bytes(data))
+
+    @pytest.mark.parametrize("position", [20, 60])  # A section size, the fingerprint
+    def test_corrupted_header(self, schema, position):
+        data = bytearray(dump_snapshot(schema)[:_HEADER.size])
+        data[position] ^= 0xFF
+        with pytest.raises(SnapshotError, match="header checksum"):
+            loads_snapshot(bytes(data))
+
+    def test_invalid_fingerprint(self, schema, tmp_path):
+        data = bytearray(dump_snapshot(schema))
+        data[_HEADER.size - 5] = 0xFF
+        data[_HEADER.size - 4:_HEADER.size] = struct.pack(
+            "<I", zlib.crc32(data[:_HEADER.size - 4])
+        )
+        path = tmp_path / "shop.tqls"
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="fingerprint"):
+            SchemaSnapshot(path)
+        assert preload_snapshots(tmp_path, SchemaRegistry()) == 0
+
+    def test_truncated(self, schema):
+        with pytest.raises(SnapshotError):
+            loads_snapshot(dump_snapshot(schema)[:20])
+
+    def test_nul_in_string(self):
+        schema = SchemaContext(tables=(Table(name="a\x00b", columns=()),))
+        with pytest.raises(SnapshotError, match="NUL"):
+            dump_snapshot(schema)
+
+
+class TestSnapshotFiles:
+    """Tests for snapshot files and lazy registry preloading."""
+
+    def test_write_and_load(self, schema, tmp_path):
+        path = tmp_path / "shop.tqls"
+        write_snapshot(schema, path)
+
+        assert load_snapshot(path) == schema
+        header = SchemaSnapshot(path)
+        assert header.fingerprint == schema.fingerprint
+        assert header.table_count == 3
+
+    def test_preload_registers_lazily(self, schema, tmp_path):
+        write_snapshot(schema, tmp_path / "shop.tqls")
+        (tmp_path / "broken.tqls").write_bytes(b"not a snapshot")
+        registry = SchemaRegistry()
+
+        assert preload_snapshots(tmp_path, registry) == 1
+        assert schema.fingerprint in registry
+        assert isinstance(registry._pinned[schema.fingerprint], SchemaSnapshot)
+
+        loaded = registry.get(schema.fingerprint)
+        assert loaded == schema
+        assert registry.get(schema.fingerprint) is loaded
+
+    def test_missing_snapshot_file_raises(self, schema, tmp_path):
+        path = tmp_path / "shop.tqls"
+        write_snapshot(schema, path)
+        registry = SchemaRegistry()
+        registry.register_snapshot(SchemaSnapshot(path))
+        path.unlink()
+
+        with pytest.raises(SnapshotError, match="shop.tqls could not be loaded"):
+            registry.get(schema.fingerprint)
+
+    def test_snapshots_are_not_evicted(self, schema, minimal_schema_json, tmp_path):
+        write_snapshot(schema, tmp_path / "shop.tqls")
+        registry = SchemaRegistry(max_entries=1)
+        preload_snapshots(tmp_path, registry)
+
+        registry.register(parse_schema(minimal_schema_json))
+        registry.register(parse_schema({"tables": [{"name": "other", "columns": []}]}))
+        registry.register(schema)
+
+        assert registry.get(schema.fingerprint) == schema
+        assert len(registry) == 2
+
+    def test_unloadable_snapshot_is_a_server_error(self, schema, tmp_path):
+        path = tmp_path / "shop.tqls"
+        write_snapshot(schema, path)
+        get_schema_registry.cache_clear()
+        try:
+            get_schema_registry().register_snapshot(SchemaSnapshot(path))
+            path.unlink()
+
+            response = TestClient(app).post(
+                "/api/validate", json={"sql": "SELECT 1", "schema_id": schema.fingerprint}
+            )
+        finally:
+            get_schema_registry.cache_clear()
+
+        assert response.status_code == 500
+        assert "could not be loaded" in response.json()["detail"]
+
+    def test_cli_converts_json(self, sample_schema_json, tmp_path):
+        import json
+
+        source = tmp_path / "shop.json"
+        source.write_text(json.dumps(sample_schema_json))
+        main([str(source), "-o", str(tmp_path / "out")])
+
+        assert load_snapshot(tmp_path / "out" / "shop.tqls") == parse_schema(sample_schema_json)
@@ -0,0 +1,125 @@
+"""
+Tests for the streaming schema parser.
+"""
+
+import io
+import json
+import time
+
+import pytest
+
+from schema.parser import SchemaParseError, parse_schema
+from schema.streaming import (
+    IncrementalSchemaParser,
+    iter_schema_tables,
+    parse_schema_file,
+    parse_schema_stream,
+)
+
+
+def stream_parse(data, chunk_size=7):
+    """Parse JSON-serializable data through the stream parser in small chunks."""
+    raw = json.dumps(data).encode("utf-8")
+    return parse_schema_stream(io.BytesIO(raw), chunk_size=chunk_size)
+
+
+class TestStreamingParser:
+    """Tests for parse_schema_stream and friends."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 16])
+    def test_matches_parse_schema(self, sample_schema_json, chunk_size):
+        assert stream_parse(sample_schema_json, chunk_size) == parse_schema(sample_schema_json)
+
+    def test_other_top_level_keys_ignored(self, minimal_schema_json):
+        data = {"version": 12345, "meta": {"tables": "not these"}, **minimal_schema_json, "z": [1, 2]}
+        assert stream_parse(data, chunk_size=2) == parse_schema(minimal_schema_json)
+
+    def test_empty_input_is_empty_schema(self):
+        assert parse_schema_stream(io.BytesIO(b"  ")).is_empty
+        assert stream_parse({}).is_empty
+        assert stream_parse({"tables": []}).is_empty
+
+    def test_text_stream_and_multibyte_characters(self):
+        data = {"tables": [{"name": "kunden", "description": "Größe €", "columns": [{"name": "id"}]}]}
+        raw = json.dumps(data, ensure_ascii=False)
+
+        assert parse_schema_stream(io.StringIO(raw), chunk_size=3).tables[0].description == "Größe €"
+        assert parse_schema_stream(io.BytesIO(raw.encode("utf-8")), chunk_size=1) == parse_schema(data)
+
+    def test_yields_tables_before_end_of_input(self):
+        parser = IncrementalSchemaParser()
+        tables = parser.feed(b'{"tables": [{"name": "a", "columns": []}, {"name": "b"')
+
+        assert [t.name for t in tables] == ["a"]
+        assert [t.name for t in parser.feed(b', "columns": []}]}')] == ["b"]
+        assert parser.finish() == []
+
+    def test_iter_schema_tables(self, sample_schema_json):
+        raw = io.BytesIO(json.dumps(sample_schema_json).encode())
+        assert [t.name for t in iter_schema_tables(raw, chunk_size=5)] == ["customers", "orders", "products"]
+
+    def test_escapes_split_across_chunks(self):
+        data = {"tables": [{"name": "a", "description": 'x \\" ] } \\\\', "columns": [{"name": "[{"}]}]}
+
+        assert stream_parse(data, chunk_size=1) == parse_schema(data)
+
+    def test_wide_table_streams_in_linear_time(self):
+        def best_time(n_columns: int) -> float:
+            columns = [{"name": f"column_{i}", "type": "text", "description": 'a "b"'}
+                       for i in range(n_columns)]
+            raw = json.dumps({"tables": [{"name": "wide", "columns": columns}]}).encode()
+            best = float("inf")
+            for _ in range(2):
+                start = time.perf_counter()
+                parse_schema_stream(io.BytesIO(raw), chunk_size=1024)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        small = best_time(10_000)
+        large = best_time(40_000)  # About 3 MB
+
+        # 4x the input; re-decoding the partial table on every chunk took ~16x
+        assert large < 8 * small + 0.05, f"{small * 1000:.1f} ms -> {large * 1000:.1f} ms"
+
+    def test_parse_schema_file(self, tmp_path, sample_schema_json):
+        path = tmp_path / "schema.json"
+        path.write_text(json.dumps(sample_schema_json))
+        assert parse_schema_file(path) == parse_schema(sample_schema_json)
+
+
+class TestStreamingErrors:
+    """Error messages should match parse_schema."""
+
+    def test_schema_not_object(self):
+        with pytest.raises(SchemaParseError, match="must be an object, got list"):
+            stream_parse([1, 2])
+
+    def test_tables_not_array(self):
+        with pytest.raises(SchemaParseError, match="must be an array, got str"):
+            stream_parse({"tables": "not a list"})
+
+    def test_table_and_column_indexes_reported(self):
+        data = {"tables": [
+            {"name": "ok", "columns": []},
+            {"name": "users", "columns": [{"name": "id"}, {"type": "int"}]},
+        ]}
+        with pytest.raises(SchemaParseError) as stream_exc:
+            stream_parse(data)
+        with pytest.raises(SchemaParseError) as parse_exc:
+            parse_schema(data)
+
+        assert str(stream_exc.value) == str(parse_exc.value)
+        assert "table 1" in str(stream_exc.value)
+        assert "column 1" in str(stream_exc.value)
+
+    def test_truncated_input(self):
+        with pytest.raises(SchemaParseError, match="unexpected end of input"):
+            parse_schema_stream(io.BytesIO(b'{"tables": [{"name": "a", "columns": []}'))
+
+    def test_invalid_json(self):
+        with pytest.raises(SchemaParseError, match="Invalid schema JSON"):
+            parse_schema_stream(io.BytesIO(b'{"tables": [{"name": "a",, }]}'))
+
+    def test_trailing_garbage(self):
+        with pytest.raises(SchemaParseError, match="expected end of input"):
+            parse_schema_stream(io.BytesIO(b'{"tables": []} x'))
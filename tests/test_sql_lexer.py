@@ -0,0 +1,118 @@
+"""
+Tests for the SQL lexer and the token-based identifier extraction.
+"""
+
+from validation.lexer import TokenKind, split_statements, tokenize
+from validation.schema_checker import extract_identifiers
+
+
+def kinds_and_texts(sql: str, **kwargs) -> list[tuple[TokenKind, str]]:
+    return [(t.kind, t.text) for t in tokenize(sql, **kwargs)]
+
+
+class TestTokenize:
+    """Tests for tokenize."""
+
+    def test_basic_select(self):
+        assert kinds_and_texts("SELECT a, 1.5 FROM t WHERE b <> $1;") == [
+            (TokenKind.WORD, "SELECT"),
+            (TokenKind.WORD, "a"),
+            (TokenKind.PUNCTUATION, ","),
+            (TokenKind.NUMBER, "1.5"),
+            (TokenKind.WORD, "FROM"),
+            (TokenKind.WORD, "t"),
+            (TokenKind.WORD, "WHERE"),
+            (TokenKind.WORD, "b"),
+            (TokenKind.OPERATOR, "<>"),
+            (TokenKind.PARAMETER, "$1"),
+            (TokenKind.SEMICOLON, ";"),
+        ]
+
+    def test_positions(self):
+        sql = "SELECT  name\nFROM users"
+        for token in tokenize(sql):
+            assert sql[token.start:token.end] == token.text
+
+    def test_escaped_quotes(self):
+        assert kinds_and_texts("'it''s; here' E'a\\'b;c' $$x;y$$ $f$z$f$") == [
+            (TokenKind.STRING, "'it''s; here'"),
+            (TokenKind.STRING, "E'a\\'b;c'"),
+            (TokenKind.STRING, "$$x;y$$"),
+            (TokenKind.STRING, "$f$z$f$"),
+        ]
+
+    def test_mysql_backslash_escapes_and_hash_comments(self):
+        assert kinds_and_texts("'a\\'; b' # note;", dialect="mysql", include_comments=True) == [
+            (TokenKind.STRING, "'a\\'; b'"),
+            (TokenKind.COMMENT, "# note;"),
+        ]
+
+    def test_comments(self):
+        sql = "SELECT 1 -- a; b\n/* c; d */ + 2"
+        assert [t.text for t in tokenize(sql)] == ["SELECT", "1", "+", "2"]
+        assert [t.text for t in tokenize(sql, include_comments=True) if t.kind is TokenKind.COMMENT] == [
+            "-- a; b",
+            "/* c; d */",
+        ]
+
+    def test_quoted_identifiers(self):
+        tokens = tokenize('"Order ""Id""" `key`')
+        assert [t.kind for t in tokens] == [TokenKind.QUOTED_IDENTIFIER] * 2
+        assert [t.identifier for t in tokens] == ['Order "Id"', "key"]
+
+    def test_placeholders_are_single_tokens(self):
+        assert kinds_and_texts("WHERE <STATE_COLUMN> < 5") == [
+            (TokenKind.WORD, "WHERE"),
+            (TokenKind.PLACEHOLDER, "<STATE_COLUMN>"),
+            (TokenKind.OPERATOR, "<"),
+            (TokenKind.NUMBER, "5"),
+        ]
+
+    def test_unterminated_tokens_run_to_the_end(self):
+        assert kinds_and_texts("SELECT 'abc; DROP") == [
+            (TokenKind.WORD, "SELECT"),
+            (TokenKind.STRING, "'abc; DROP"),
+        ]
+        assert kinds_and_texts("SELECT 1 /* ; DROP") == [(TokenKind.WORD, "SELECT"), (TokenKind.NUMBER, "1")]
+
+
+class TestSplitStatements:
+    """Tests for split_statements."""
+
+    def test_semicolons_in_strings_and_comments(self):
+        sql = "-- a;\nSELECT ';' /* ; */ FROM t;\n;\nSELECT 2"
+
+        assert split_statements(sql) == [(6, "SELECT ';' /* ; */ FROM t"), (35, "SELECT 2")]
+
+
+class TestExtractIdentifiers:
+    """Tests for extract_identifiers."""
+
+    def test_tables_and_columns(self):
+        identifiers = extract_identifiers(
+            "SELECT DISTINCT u.name, o.total FROM public.users u "
+            "JOIN orders o ON o.user_id = u.id WHERE u.state = 'CA' AND o.total > 10 ORDER BY u.name"
+        )
+
+        assert identifiers["tables"] == ["users", "orders"]
+        assert identifiers["columns"] == ["name", "total", "user_id", "id", "state"]
+
+    def test_strings_and_comments_are_ignored(self):
+        identifiers = extract_identifiers(
+            "SELECT id FROM users -- FROM secrets\nWHERE note = 'x FROM hidden WHERE y = 1'"
+        )
+
+        assert identifiers == {"tables": ["users"], "columns": ["id", "note"]}
+
+    def test_function_calls_are_not_columns_or_tables(self):
+        identifiers = extract_identifiers(
+            "SELECT upper(name), EXTRACT(YEAR FROM created_at) FROM users"
+        )
+
+        assert identifiers["tables"] == ["users"]
+        assert "upper" not in identifiers["columns"]
+
+    def test_placeholders_are_ignored(self):
+        identifiers = extract_identifiers("SELECT * FROM <USERS_TABLE> WHERE <STATE_COLUMN> = 'NY'")
+
+        assert identifiers == {"tables": [], "columns": []}
@@ -0,0 +1,159 @@
+"""
+Tests for "did you mean" suggestions.
+"""
+
+import random
+
+import pytest
+
+from validation.schema_checker import check_identifiers, check_references, levenshtein_distance
+from validation.suggestions import (
+    IdentifierIndex,
+    closest,
+    default_max_distance,
+    did_you_mean,
+    get_identifier_index,
+    listed,
+    myers_distance,
+)
+
+
+def reference_distance(a: str, b: str) -> int:
+    """Textbook dynamic-programming Levenshtein distance."""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class TestMyersDistance:
+    """Tests for myers_distance."""
+
+    @pytest.mark.parametrize("a, b, expected", [
+        ("", "", 0),
+        ("", "abc", 3),
+        ("kitten", "sitting", 3),
+        ("customer_id", "customer_id", 0),
+        ("custmer_id", "customer_id", 1),
+        ("flaw", "lawn", 2),
+    ])
+    def test_known_distances(self, a, b, expected):
+        assert myers_distance(a, b) == expected
+        assert myers_distance(b, a) == expected
+
+    def test_matches_reference_on_random_strings(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            a = "".join(rng.choice("abc_") for _ in range(rng.randint(0, 12)))
+            b = "".join(rng.choice("abc_") for _ in range(rng.randint(0, 12)))
+            assert myers_distance(a, b) == reference_distance(a, b), (a, b)
+
+    def test_long_strings(self):
+        a = "order_total_" * 10
+        b = a.replace("total", "totl")
+        assert myers_distance(a, b) == reference_distance(a, b) == 10
+
+    def test_levenshtein_distance_is_myers(self):
+        assert levenshtein_distance("kitten", "sitting") == 3
+
+
+class TestIdentifierIndex:
+    """Tests for IdentifierIndex."""
+
+    def test_suggestions_ordered_by_distance(self):
+        index = IdentifierIndex(["customer_id", "customers_id", "order_id", "cust_id"])
+
+        assert index.suggest("custmer_id") == ["customer_id", "customers_id"]
+
+    def test_case_insensitive_and_original_case_returned(self):
+        index = IdentifierIndex(["CustomerId", "Email"])
+
+        assert index.suggest("customerid2") == ["CustomerId"]
+        assert index.suggest("EMAL") == ["Email"]
+
+    def test_exact_match_is_not_suggested(self):
+        assert IdentifierIndex(["email"]).suggest("EMAIL") == []
+
+    def test_short_names_allow_one_edit(self):
+        index = IdentifierIndex(["id", "ids", "idx", "name"])
+
+        assert index.suggest("id") == ["ids", "idx"]
+        assert index.suggest("nm") == []
+
+    def test_limit(self):
+        index = IdentifierIndex(["total_1", "total_2", "total_3", "total_4"])
+
+        assert index.suggest("total_", limit=2) == ["total_1", "total_2"]
+
+    def test_matches_brute_force(self):
+        rng = random.Random(1)
+        words = ("order", "total", "id", "name", "status", "price", "user", "date")
+        names = {
+            "_".join(rng.choice(words) for _ in range(rng.randint(1, 3))) + str(rng.randint(0, 9))
+            for _ in range(3000)
+        }
+        index = IdentifierIndex(names)
+
+        for name in rng.sample(sorted(names), 50):
+            i = rng.randrange(len(name))
+            query = name[:i] + rng.choice(("", "x", "xy")) + name[i + 1:]
+            k = default_max_distance(query)
+            expected = {n for n in names if 0 < myers_distance(query, n) <= k}
+            assert set(index.suggest(query, limit=len(names))) == expected, query
+
+
+class TestSchemaSuggestions:
+    """Tests for suggestions in schema warnings."""
+
+    def test_index_cached_on_schema(self, schema):
+        assert get_identifier_index(schema) is get_identifier_index(schema)
+
+    def test_did_you_mean(self):
+        assert did_you_mean([]) == ""
+        assert did_you_mean(["a"]) == "; did you mean 'a'?"
+        assert did_you_mean(["a", "b", "c"]) == "; did you mean 'a', 'b' or 'c'?"
+
+    def test_listed(self):
+        assert listed(["a"]) == "'a'"
+        assert listed(["a", "b", "c"], "or") == "'a', 'b' or 'c'"
+        assert listed(["a", "b", "c", "d"], limit=2) == "'a', 'b' and 2 more"
+        assert listed(["(x)", "y"], quote=False) == "(x) and y"
+
+    def test_closest(self):
+        assert closest("emal", ["id", "email", "name"]) == ["email"]
+
+    def test_unknown_table(self, schema):
+        warnings = check_references("SELECT id FROM ordrs", schema)
+
+        assert warnings == ["Table 'ordrs' not found in provided schema; did you mean 'orders'?"]
+
+    def test_column_suggested_from_tables_in_scope(self, schema):
+        # status exists, but only in orders
+        warnings = check_references("SELECT status FROM customers", schema)
+
+        assert warnings == [
+            "Column 'status' not found in table 'customers'; did you mean 'state'?"
+        ]
+
+    def test_qualified_column(self, schema):
+        warnings = check_references("SELECT o.totl FROM orders o", schema)
+
+        assert warnings == ["Column 'o.totl' not found in table 'orders'; did you mean 'total'?"]
+
+    def test_unknown_column_suggested_from_schema(self, schema):
+        warnings = check_references("SELECT categry FROM orders", schema)
+
+        assert warnings == [
+            "Column 'categry' not found in provided schema; did you mean 'category'?"
+        ]
+
+    def test_check_identifiers(self, schema):
+        warnings = check_identifiers({"tables": ["prodcts"], "columns": ["emial"]}, schema)
+
+        assert warnings == [
+            "Table 'prodcts' not found in provided schema; did you mean 'products'?",
+            "Column 'emial' not found in provided schema; did you mean 'email'?",
+        ]
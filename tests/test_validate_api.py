@@ -0,0 +1,157 @@
+"""
+Tests for the /validate and /validate/batch endpoints.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from config.settings import get_settings
+from schema.parser import parse_schema
+from schema.registry import get_schema_registry
+from validation.batch import MIN_CHUNK_SIZE, shutdown_validation_pool, validate_statements
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    """Run batches on a two-process pool."""
+    monkeypatch.setattr(get_settings(), "validation_workers", 2)
+    shutdown_validation_pool()
+    yield
+    shutdown_validation_pool()
+
+
+def read_ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestValidate:
+    """Tests for POST /validate."""
+
+    def test_validates_against_inline_schema(self, client, sample_schema_json):
+        response = client.post(
+            "/api/validate",
+            json={"sql": "SELECT name, price FROM customers", "schema_metadata": sample_schema_json},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["passed"]
+        assert body["status"] == "draft"
+        assert body["sql"] == "SELECT name, price FROM customers LIMIT 50"
+        assert "Column 'price' not found in table 'customers'" in body["warnings"]
+
+    def test_registered_schema(self, client, sample_schema_json):
+        schema_id = get_schema_registry().register(parse_schema(sample_schema_json))
+
+        response = client.post(
+            "/api/validate", json={"sql": "SELECT id FROM orders LIMIT 5", "schema_id": schema_id}
+        )
+
+        assert response.json()["status"] == "validated"
+        assert "X-Schema-Id" not in response.headers
+
+    def test_inline_schema_id_can_be_reused(self, client, sample_schema_json):
+        response = client.post(
+            "/api/validate",
+            json={"sql": "SELECT id FROM orders LIMIT 5", "schema_metadata": sample_schema_json},
+        )
+        schema_id = response.headers["X-Schema-Id"]
+
+        assert schema_id == parse_schema(sample_schema_json).fingerprint
+        response = client.post(
+            "/api/validate", json={"sql": "SELECT id FROM orders LIMIT 5", "schema_id": schema_id}
+        )
+        assert response.json()["status"] == "validated"
+
+    def test_policy_errors(self, client):
+        response = client.post("/api/validate", json={"sql": "SELECT 1; DROP TABLE users"})
+
+        body = response.json()
+        assert not body["passed"]
+        assert body["status"] == "error"
+
+    def test_dialect(self, client):
+        sql = r"SELECT * FROM logs WHERE msg = 'it\'s LIMIT 5'"
+
+        response = client.post("/api/validate", json={"sql": sql, "dialect": "mysql"})
+
+        assert response.json()["sql"] == f"{sql} LIMIT 50"
+
+    @pytest.mark.parametrize("dialect", ["MySQL", "postgresql"])
+    def test_unknown_dialect_rejected(self, client, dialect):
+        response = client.post("/api/validate", json={"sql": "SELECT 1", "dialect": dialect})
+
+        assert response.status_code == 422
+
+    def test_unknown_schema_id(self, client):
+        response = client.post("/api/validate", json={"sql": "SELECT 1", "schema_id": "nope"})
+
+        assert response.status_code == 404
+
+    def test_gate_runs_off_the_event_loop(self, client, monkeypatch):
+        import validation.policy_gate
+
+        run_policy_gate = validation.policy_gate.run_policy_gate
+        loops = []
+
+        def record_loop(*args, **kwargs):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return run_policy_gate(*args, **kwargs)
+
+        monkeypatch.setattr(validation.policy_gate, "run_policy_gate", record_loop)
+
+        assert client.post("/api/validate", json={"sql": "SELECT 1"}).status_code == 200
+        assert loops == [None]
+
+
+class TestValidateBatch:
+    """Tests for POST /validate/batch."""
+
+    def test_small_batch_in_process(self, client, sample_schema_json):
+        statements = ["SELECT id FROM orders", "DELETE FROM orders", "SELECT nope FROM orders"]
+
+        response = client.post(
+            "/api/validate/batch",
+            json={"statements": statements, "schema_metadata": sample_schema_json},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert response.headers["X-Schema-Id"] == parse_schema(sample_schema_json).fingerprint
+        results = read_ndjson(response)
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert [r["status"] for r in results] == ["validated", "review_required", "draft"]
+
+    def test_large_batch_on_pool_keeps_order(self, client, sample_schema_json, workers):
+        statements = [
+            f"SELECT id, total FROM orders WHERE id = {i}" if i % 3 else f"SELECT bad_{i} FROM orders"
+            for i in range(5 * MIN_CHUNK_SIZE)
+        ]
+
+        response = client.post(
+            "/api/validate/batch",
+            json={"statements": statements, "schema_metadata": sample_schema_json},
+        )
+
+        results = read_ndjson(response)
+        expected = validate_statements(statements, parse_schema(sample_schema_json))
+        assert [r["index"] for r in results] == list(range(len(statements)))
+        assert [r["sql"] for r in results] == [e.sql for e in expected]
+        assert [r["warnings"] for r in results] == [e.warnings for e in expected]
+
+    def test_empty_batch_rejected(self, client):
+        response = client.post("/api/validate/batch", json={"statements": []})
+
+        assert response.status_code == 422
@@ -0,0 +1,110 @@
+"""
+Tests for the bulk SQL linting CLI.
+"""
+
+import json
+
+import pytest
+
+from validation.cli import find_sql_files, lint_paths, load_schema, main
+
+
+@pytest.fixture
+def project(tmp_path, sample_schema_json):
+    queries = tmp_path / "queries"
+    (queries / "reports").mkdir(parents=True)
+    (queries / "good.sql").write_text("SELECT id, total FROM orders LIMIT 10;\n")
+    (queries / "reports" / "bad.sql").write_text(
+        "-- Monthly revenue\n"
+        "SELECT id FROM orders LIMIT 5;\n"
+        "\n"
+        "SELECT name, price FROM customers LIMIT 5;\n"
+    )
+    (queries / "notes.txt").write_text("not sql")
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps(sample_schema_json))
+    return queries, schema
+
+
+class TestLintPaths:
+    """Tests for find_sql_files and lint_paths."""
+
+    def test_finds_sql_files_recursively(self, project):
+        queries, _ = project
+
+        assert [p.name for p in find_sql_files([queries])] == ["good.sql", "bad.sql"]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_findings_have_statement_positions(self, project, jobs):
+        queries, schema_path = project
+
+        good, bad = lint_paths(find_sql_files([queries]), load_schema(schema_path), jobs)
+
+        assert good.findings == () and good.statements == 1
+        assert bad.statements == 2
+        [finding] = bad.findings
+        assert (finding.line, finding.column, finding.level) == (4, 1, "warning")
+        assert finding.message == "Column 'price' not found in table 'customers'"
+        assert bad.elapsed_ms >= 0
+
+    def test_perf_findings_point_at_the_query(self, tmp_path):
+        path = tmp_path / "join.sql"
+        path.write_text("SELECT 1 LIMIT 1;\n\nSELECT *\nFROM users, orders LIMIT 5;\n")
+
+        [result] = lint_paths([path], None, 1)
+
+        [finding] = result.findings
+        assert finding.rule == "perf-cartesian-join"
+        assert (finding.line, finding.column) == (4, 1)
+
+    def test_ddl_schema(self, tmp_path):
+        ddl = tmp_path / "schema.sql"
+        ddl.write_text("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT);")
+
+        assert load_schema(ddl).has_column("users", "email")
+
+
+class TestMain:
+    """Tests for the command line."""
+
+    def test_jsonl(self, project, capsys):
+        queries, schema = project
+
+        assert main([str(queries), "--schema", str(schema), "--jobs", "1"]) == 0
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line["path"].rsplit("/", 1)[-1] for line in lines] == ["good.sql", "bad.sql"]
+        assert len(lines[1]["findings"]) == 1
+        assert "elapsed_ms" in lines[1]
+
+    def test_sarif(self, project, tmp_path):
+        queries, schema = project
+        output = tmp_path / "lint.sarif"
+
+        main([str(queries), "-s", str(schema), "-f", "sarif", "-o", str(output), "-j", "1"])
+
+        [run] = json.loads(output.read_text())["runs"]
+        [result] = run["results"]
+        assert result["ruleId"] == "policy-warning"
+        assert result["locations"][0]["physicalLocation"]["region"] == {
+            "startLine": 4, "startColumn": 1,
+        }
+        assert [a["properties"]["statements"] for a in run["artifacts"]] == [1, 2]
+
+    def test_errors_set_exit_status(self, tmp_path, capsys):
+        script = tmp_path / "bad.sql"
+        script.write_text("DROP TABLE users")
+        # Modifying statements only need review
+        assert main([str(script)]) == 0
+
+        script.write_text("SELECT 1;\nVACUUM users")
+        assert main([str(script)]) == 1
+        assert "1 error(s)" in capsys.readouterr().err
+
+    def test_unreadable_file(self, tmp_path):
+        script = tmp_path / "binary.sql"
+        script.write_bytes(b"\xff\xfe")
+
+        [report] = lint_paths([script], jobs=1)
+
+        assert report.findings[0].rule == "read-error"
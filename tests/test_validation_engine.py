@@ -0,0 +1,73 @@
+"""
+Tests for the shared validation engine.
+"""
+
+import pytest
+
+from api.models import QueryStatus
+from config.settings import get_settings
+from schema.parser import parse_schema
+from validation.engine import EngineSettings, ValidationEngine, get_validation_engine
+from validation.gate_cache import PolicyGateCache
+from validation.policy_gate import run_policy_gate
+
+
+@pytest.fixture(autouse=True)
+def fresh_engine():
+    get_validation_engine.cache_clear()
+    yield
+    get_validation_engine.cache_clear()
+
+
+def engine_with(**changes) -> ValidationEngine:
+    base = EngineSettings.from_settings(get_settings())
+    return ValidationEngine(EngineSettings(**{**base.__dict__, **changes}))
+
+
+class TestValidationEngine:
+    """Tests for ValidationEngine."""
+
+    def test_settings_are_frozen_when_built(self, monkeypatch):
+        engine = get_validation_engine()
+        monkeypatch.setattr(get_settings(), "max_row_limit", 10)
+
+        assert engine.validate("SELECT id FROM users").sql.endswith("LIMIT 50")
+        assert get_validation_engine() is engine
+
+    def test_own_settings(self):
+        engine = engine_with(max_row_limit=5, placeholder_pattern=r"\{\{[a-z]+\}\}")
+
+        result = engine.validate("SELECT id FROM {{table}}")
+
+        assert result.sql == "SELECT id FROM {{table}} LIMIT 5"
+        assert result.status == QueryStatus.DRAFT
+        assert [p["token"] for p in engine.placeholders("SELECT id FROM {{table}}")] == ["{{table}}"]
+
+    def test_settings_are_part_of_the_cache_key(self):
+        cache = PolicyGateCache()
+        small = ValidationEngine(engine_with(max_row_limit=5).settings, cache)
+        large = ValidationEngine(engine_with(max_row_limit=500).settings, cache)
+
+        assert small.validate("SELECT 1").sql == "SELECT 1 LIMIT 5"
+        assert large.validate("SELECT 1").sql == "SELECT 1 LIMIT 500"
+        assert cache.stats().misses == 2
+
+    def test_schema_check(self, sample_schema_json):
+        result = get_validation_engine().validate(
+            "SELECT nme FROM customers LIMIT 5", parse_schema(sample_schema_json)
+        )
+
+        assert result.status == QueryStatus.DRAFT
+        assert result.warnings[0].endswith("did you mean 'name'?")
+
+    def test_placeholders_outside_comments(self):
+        placeholders = get_validation_engine().placeholders(
+            "SELECT * FROM <ORDERS_TABLE> -- <NOT_THIS>\nWHERE state = '<STATE_VALUE>'"
+        )
+
+        assert [p["token"] for p in placeholders] == ["<ORDERS_TABLE>", "<STATE_VALUE>"]
+
+    def test_run_policy_gate_uses_the_engine(self):
+        sql = "DELETE FROM users WHERE id = 1"
+
+        assert run_policy_gate(sql) == get_validation_engine().validate(sql)
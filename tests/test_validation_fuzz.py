@@ -0,0 +1,90 @@
+"""
+Fuzz and scaling tests for the policy gate on adversarial input.
+"""
+
+import random
+import time
+
+import pytest
+
+from api.models import QueryStatus
+from benchmarks.bench_adversarial import ADVERSARIAL_INPUTS
+from benchmarks.common import make_schema
+from config.settings import get_settings
+from validation.engine import get_validation_engine
+from validation.gate_cache import get_policy_gate_cache
+from validation.policy_gate import run_policy_gate
+
+FRAGMENTS = (
+    "SELECT", "FROM", "WHERE", "WITH", "AS", "JOIN", "ON", "LIMIT", "UNION", "INSERT", "INTO",
+    "VALUES", "DELETE", "CASE", "WHEN", "END", "table_1", "t", "id", "column_3", "t.id", "*",
+    "(", ")", ",", ".", ";", "'", "''", '"', "`", "--", "/*", "*/", "$$", "$a$", "E'\\'",
+    "<TABLE>", "<", ">", "::", "?", ":name", "$1", "1", "1.5e3", "\n", "\t", "ü", "\x00",
+)
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return make_schema(n_tables=20)
+
+
+@pytest.fixture
+def fresh_engine():
+    """Rebuild the validation engine, so it picks up patched settings."""
+    get_validation_engine.cache_clear()
+    yield
+    get_validation_engine.cache_clear()
+
+
+def best_time(sql: str, schema, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        get_policy_gate_cache().clear()
+        start = time.perf_counter()
+        run_policy_gate(sql, schema)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.usefixtures("fresh_engine")
+class TestSizeLimit:
+    """Tests for max_sql_length."""
+
+    def test_oversized_sql_rejected(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "max_sql_length", 100)
+
+        result = run_policy_gate("SELECT " + "a" * 993)
+
+        assert not result.passed
+        assert result.status == QueryStatus.ERROR
+        assert result.policy_errors == [
+            "SQL is 1,000 characters long, over the limit of 100. Please submit a shorter query."
+        ]
+
+    def test_zero_disables_the_limit(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "max_sql_length", 0)
+
+        assert run_policy_gate("SELECT 1" + " " * 200_000).passed
+
+
+class TestAdversarialInputs:
+    """Pathological inputs finish, in time linear in their size."""
+
+    @pytest.mark.parametrize("family", list(ADVERSARIAL_INPUTS))
+    def test_linear_time(self, family, schema):
+        build = ADVERSARIAL_INPUTS[family]
+        small = best_time(build(5_000), schema)
+        large = best_time(build(20_000), schema)
+
+        # 4x the input; quadratic behaviour would take ~16x
+        assert large < 8 * small + 0.02, f"{family}: {small * 1000:.1f} ms -> {large * 1000:.1f} ms"
+
+    def test_random_token_soup(self, schema):
+        rng = random.Random(0)
+        for _ in range(300):
+            sql = " ".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 60)))
+
+            result = run_policy_gate(sql, schema)
+
+            assert result.passed == (result.status != QueryStatus.ERROR), sql
+            assert result.passed or result.policy_errors, sql
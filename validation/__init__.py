@@ -1,5 +1,8 @@
 """Validation module for SQL policy enforcement."""
 
+from validation.engine import EngineSettings, ValidationEngine, get_validation_engine
+from validation.gate_cache import PolicyGateCache, get_policy_gate_cache
+from validation.lexer import Token, TokenKind, tokenize
 from validation.policy_gate import (
     PolicyGateOutput,
     StatementType,
@@ -7,14 +10,29 @@ from validation.policy_gate import (
     detect_placeholders,
     run_policy_gate,
 )
-from validation.schema_checker import check_identifiers, extract_identifiers
+from validation.schema_checker import check_identifiers, check_references, extract_identifiers
+from validation.scope import Scope, parse_scopes
+from validation.suggestions import IdentifierIndex, get_identifier_index
 
 __all__ = [
     "run_policy_gate",
+    "ValidationEngine",
+    "EngineSettings",
+    "get_validation_engine",
     "classify_statement",
     "detect_placeholders",
     "StatementType",
     "PolicyGateOutput",
+    "PolicyGateCache",
+    "get_policy_gate_cache",
     "extract_identifiers",
     "check_identifiers",
+    "check_references",
+    "parse_scopes",
+    "Scope",
+    "IdentifierIndex",
+    "get_identifier_index",
+    "tokenize",
+    "Token",
+    "TokenKind",
 ]
@@ -0,0 +1,141 @@
+"""
+Batch validation across a process pool.
+
+The policy gate is pure Python and CPU-bound, so a batch of thousands of
+statements is split into chunks that are validated in worker processes, in
+parallel. The schema travels to the workers as a binary snapshot (see
+schema.snapshot) rather than a pickled SchemaContext: it is compact, loads
+without re-parsing, and carries the fingerprint, so each worker loads a
+schema once and reuses it for every later chunk.
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from api.models import PolicyGateOutput
+from config.settings import get_settings
+from schema.models import SchemaContext
+from schema.snapshot import dump_snapshot, loads_snapshot
+from validation.policy_gate import run_policy_gate
+
+logger = logging.getLogger(__name__)
+
+# Chunks per worker, so a slow chunk doesn't leave the other workers idle
+CHUNKS_PER_WORKER = 4
+# Smaller batches are validated in-process; shipping them is not worth it
+MIN_CHUNK_SIZE = 64
+# Schemas each worker keeps loaded, by fingerprint
+WORKER_SCHEMA_CACHE_SIZE = 8
+
+_worker_schemas: OrderedDict[str, SchemaContext] = OrderedDict()
+
+
+def validation_workers() -> int:
+    """Number of worker processes for batch validation (1 means in-process)."""
+    return get_settings().validation_workers or os.cpu_count() or 1
+
+
+@lru_cache
+def get_validation_pool() -> ProcessPoolExecutor | None:
+    """Get the process-wide validation pool, or None if validation_workers is 1."""
+    workers = validation_workers()
+    if workers <= 1:
+        return None
+    logger.info(f"Starting validation pool with {workers} worker(s)")
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def shutdown_validation_pool() -> None:
+    """Stop the validation pool's workers, if it was started."""
+    if get_validation_pool.cache_info().currsize:
+        pool = get_validation_pool()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    get_validation_pool.cache_clear()
+
+
+def validate_statements(
+    statements: list[str],
+    schema: SchemaContext | None = None,
+    dialect: str | None = None,
+) -> list[PolicyGateOutput]:
+    """Run the policy gate on each statement, in order."""
+    return [run_policy_gate(sql, schema, dialect=dialect) for sql in statements]
+
+
+def _chunk(statements: list[str], workers: int) -> list[list[str]]:
+    size = max(MIN_CHUNK_SIZE, -(-len(statements) // (workers * CHUNKS_PER_WORKER)))
+    return [statements[i:i + size] for i in range(0, len(statements), size)]
+
+
+def _worker_schema(fingerprint: str, snapshot: bytes) -> SchemaContext:
+    schema = _worker_schemas.get(fingerprint)
+    if schema is None:
+        schema = _worker_schemas[fingerprint] = loads_snapshot(snapshot)
+        while len(_worker_schemas) > WORKER_SCHEMA_CACHE_SIZE:
+            _worker_schemas.popitem(last=False)
+    else:
+        _worker_schemas.move_to_end(fingerprint)
+    return schema
+
+
+def _validate_chunk(
+    statements: list[str],
+    schema_snapshot: tuple[str, bytes] | None,
+    dialect: str | None,
+) -> list[PolicyGateOutput]:
+    # Runs in a worker process
+    schema = _worker_schema(*schema_snapshot) if schema_snapshot is not None else None
+    return validate_statements(statements, schema, dialect)
+
+
+async def validate_batch(
+    statements: list[str],
+    schema: SchemaContext | None = None,
+    dialect: str | None = None,
+) -> AsyncIterator[PolicyGateOutput]:
+    """
+    Run the policy gate on many statements, yielding results in order.
+
+    Large batches are spread across the validation pool and each chunk's
+    results are yielded as soon as it and every chunk before it are done.
+    Small batches, or any batch when validation_workers is 1, are validated
+    in a thread so the event loop stays responsive.
+
+    Args:
+        statements: SQL statements to validate
+        schema: Optional schema context for consistency checks
+        dialect: SQL dialect of the statements
+
+    Yields:
+        One PolicyGateOutput per statement, in input order
+    """
+    pool = get_validation_pool()
+    if pool is None or len(statements) < 2 * MIN_CHUNK_SIZE:
+        for chunk in _chunk(statements, 1):
+            for output in await asyncio.to_thread(validate_statements, chunk, schema, dialect):
+                yield output
+        return
+
+    schema_snapshot = None
+    if schema is not None and not schema.is_empty:
+        schema_snapshot = (schema.fingerprint, dump_snapshot(schema))
+
+    loop = asyncio.get_running_loop()
+    futures = [
+        loop.run_in_executor(pool, _validate_chunk, chunk, schema_snapshot, dialect)
+        for chunk in _chunk(statements, validation_workers())
+    ]
+    try:
+        for future in futures:
+            for output in await future:
+                yield output
+    finally:
+        # The client went away, or a chunk failed; don't finish the rest
+        for future in futures:
+            future.cancel()
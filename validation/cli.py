@@ -0,0 +1,272 @@
+"""
+Bulk SQL linting from the command line.
+
+Walks files and directories of .sql files, runs every statement through the
+policy gate (including the schema check) and prints findings as JSON lines,
+one per file with its timing, or as a SARIF log for code-scanning tools:
+
+    python -m validation.cli queries/ --schema catalog.json --format sarif -o lint.sarif
+
+Files are linted in parallel, one worker process per CPU by default. The
+schema is sent to each worker once, as a binary snapshot.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from schema.ddl import DIALECTS, DdlParseError, parse_ddl
+from schema.models import SchemaContext
+from schema.parser import SchemaParseError
+from schema.snapshot import SNAPSHOT_SUFFIX, dump_snapshot, load_snapshot, loads_snapshot
+from schema.streaming import parse_schema_file
+from validation.cost import COST_RULES
+from validation.lexer import split_statements
+from validation.perf_rules import DEFAULT_RULES
+from validation.policy_gate import run_policy_gate
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Rule id -> description, for the SARIF log
+RULES = {
+    "policy-error": "Statement violates a hard policy and would be rejected",
+    "policy-warning": "Statement needs attention: unknown tables or columns, enforced LIMIT, "
+                      "placeholders or a modifying statement",
+    "read-error": "File could not be read as UTF-8 text",
+    **{f"perf-{rule.name}": rule.description for rule in DEFAULT_RULES},
+    **{f"perf-{name}": description for name, description in COST_RULES.items()},
+}
+
+# Schema and dialect used by lint_file in this process, set by _init_worker
+_schema: SchemaContext | None = None
+_dialect: str | None = None
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A problem in one statement of a file."""
+
+    rule: str
+    level: str  # SARIF level: "error" or "warning"
+    message: str
+    line: int
+    column: int
+
+
+@dataclass(frozen=True)
+class FileReport:
+    """Findings and timing for one file."""
+
+    path: str
+    statements: int
+    elapsed_ms: float
+    findings: tuple[Finding, ...]
+
+
+def load_schema(path: str | Path) -> SchemaContext:
+    """
+    Load a schema from a JSON document, a binary snapshot or a CREATE TABLE dump.
+
+    Raises:
+        SchemaParseError: If the file can't be read or parsed
+    """
+    path = Path(path)
+    try:
+        if path.suffix == SNAPSHOT_SUFFIX:
+            return load_snapshot(path)
+        if path.suffix == ".sql":
+            return parse_ddl(path.read_text(encoding="utf-8"))
+        return parse_schema_file(path)
+    except (OSError, UnicodeDecodeError, DdlParseError) as e:
+        raise SchemaParseError(f"{path}: {e}") from e
+
+
+def find_sql_files(paths: Iterable[str | Path]) -> list[Path]:
+    """Expand directories to the .sql files below them, in a stable order."""
+    files: list[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.rglob("*.sql")) if path.is_dir() else [path])
+    return files
+
+
+def _position(text: str, offset: int) -> tuple[int, int]:
+    line_start = text.rfind("\n", 0, offset) + 1
+    return text.count("\n", 0, offset) + 1, offset - line_start + 1
+
+
+def lint_file(path: str | Path) -> FileReport:
+    """
+    Run the policy gate on every statement of a .sql file.
+
+    Uses the schema and dialect set up for this process by lint_paths().
+    """
+    start = time.perf_counter()
+    findings: list[Finding] = []
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        findings.append(Finding("read-error", "error", str(e), 1, 1))
+        statements = []
+    else:
+        statements = split_statements(text, _dialect)
+
+    for offset, sql in statements:
+        output = run_policy_gate(sql, _schema, dialect=_dialect)
+        line, column = _position(text, offset)
+        for message in output.policy_errors:
+            findings.append(Finding("policy-error", "error", message, line, column))
+        for message in output.warnings:
+            findings.append(Finding("policy-warning", "warning", message, line, column))
+        for warning in output.perf_warnings:
+            findings.append(Finding(
+                f"perf-{warning.rule}", "warning", warning.message,
+                *_position(text, offset + warning.position),
+            ))
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return FileReport(str(path), len(statements), round(elapsed_ms, 3), tuple(findings))
+
+
+def _init_worker(snapshot: bytes | None, dialect: str | None) -> None:
+    global _schema, _dialect
+    _schema = loads_snapshot(snapshot) if snapshot is not None else None
+    _dialect = dialect
+
+
+def lint_paths(
+    files: list[Path],
+    schema: SchemaContext | None = None,
+    jobs: int | None = None,
+    dialect: str | None = None,
+) -> Iterator[FileReport]:
+    """
+    Lint files in parallel, yielding reports in the order of files.
+
+    Args:
+        files: .sql files to lint
+        schema: Schema to check references against
+        jobs: Worker processes; None for one per CPU, 1 to lint in-process
+        dialect: SQL dialect of the files
+
+    Yields:
+        One FileReport per file
+    """
+    global _schema, _dialect
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(files) <= 1:
+        _schema, _dialect = schema, dialect
+        yield from map(lint_file, files)
+        return
+
+    snapshot = dump_snapshot(schema) if schema is not None and not schema.is_empty else None
+    chunksize = max(1, len(files) // (jobs * 8))
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(snapshot, dialect)) as pool:
+        yield from pool.map(lint_file, files, chunksize=chunksize)
+
+
+def _relative_uri(path: str) -> str:
+    resolved = Path(path).resolve()
+    try:
+        return resolved.relative_to(Path.cwd()).as_posix()
+    except ValueError:
+        return resolved.as_uri()
+
+
+def to_sarif(reports: list[FileReport]) -> dict[str, Any]:
+    """Build a SARIF 2.1.0 log; per-file timing goes in each artifact's properties."""
+    artifacts = []
+    results = []
+    for index, report in enumerate(reports):
+        uri = _relative_uri(report.path)
+        artifacts.append({
+            "location": {"uri": uri},
+            "properties": {"statements": report.statements, "elapsedMs": report.elapsed_ms},
+        })
+        for finding in report.findings:
+            results.append({
+                "ruleId": finding.rule,
+                "level": finding.level,
+                "message": {"text": finding.message},
+                "locations": [{
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": uri, "index": index},
+                        "region": {"startLine": finding.line, "startColumn": finding.column},
+                    }
+                }],
+            })
+
+    rules = [{"id": rule, "shortDescription": {"text": text}} for rule, text in RULES.items()]
+    return {
+        "$schema": SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "text-ql", "version": "0.1.0", "rules": rules}},
+            "artifacts": artifacts,
+            "results": results,
+        }],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Lint .sql files: python -m validation.cli PATH... [--schema FILE] [--format jsonl|sarif]"""
+    arg_parser = argparse.ArgumentParser(
+        description="Run the policy gate and schema checks on .sql files."
+    )
+    arg_parser.add_argument("paths", nargs="+", type=Path, help=".sql files or directories")
+    arg_parser.add_argument(
+        "-s", "--schema", type=Path,
+        help=f"Schema to check against: JSON, {SNAPSHOT_SUFFIX} snapshot or CREATE TABLE dump (.sql)",
+    )
+    arg_parser.add_argument(
+        "-d", "--dialect", choices=DIALECTS, help="SQL dialect of the files (default: generic)"
+    )
+    arg_parser.add_argument("-f", "--format", choices=("jsonl", "sarif"), default="jsonl")
+    arg_parser.add_argument("-o", "--output", type=Path, help="Output file (default: stdout)")
+    arg_parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Worker processes (default: one per CPU)"
+    )
+    args = arg_parser.parse_args(argv)
+
+    schema = None
+    if args.schema is not None:
+        try:
+            schema = load_schema(args.schema)
+        except SchemaParseError as e:
+            arg_parser.error(f"invalid schema: {e}")
+
+    files = find_sql_files(args.paths)
+    start = time.perf_counter()
+    out: TextIO = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        reports = []
+        for report in lint_paths(files, schema, args.jobs, args.dialect):
+            reports.append(report)
+            if args.format == "jsonl":
+                out.write(json.dumps(asdict(report)) + "\n")
+        if args.format == "sarif":
+            json.dump(to_sarif(reports), out, indent=2)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    findings = [finding for report in reports for finding in report.findings]
+    errors = sum(finding.level == "error" for finding in findings)
+    print(
+        f"Linted {len(reports)} file(s), {sum(r.statements for r in reports)} statement(s) "
+        f"in {time.perf_counter() - start:.2f}s: {errors} error(s), "
+        f"{len(findings) - errors} warning(s)",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
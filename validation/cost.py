@@ -0,0 +1,153 @@
+"""
+Cost checks that use the schema's table statistics.
+
+When tables in the schema carry statistics (row_count, indexes and
+partition_keys, see schema.models.Table), the policy gate can estimate how
+much of a table a query reads:
+
+- full-scan: a table of at least large_table_rows rows is read without a
+  filter on its primary key or on the first column of one of its indexes
+- missing-partition-filter: a partitioned table is read without a filter
+  on any of its partition keys
+
+Filters are the column references in WHERE and ON conditions of the query
+the table is read in (see Scope.filters). Both checks run on the scopes the
+schema check parses anyway, so they add no pass over the SQL.
+
+wide_row_limit lowers the enforced LIMIT for SELECT * over wide tables.
+"""
+
+from api.models import PerfWarning
+from schema.models import SchemaContext, Table
+from validation.scope import ColumnRef, Scope
+from validation.suggestions import listed
+
+# Rule id -> description, as for validation.perf_rules.DEFAULT_RULES
+COST_RULES: dict[str, str] = {
+    "full-scan": "Large table read without a filter on an indexed column",
+    "missing-partition-filter": "Partitioned table read without a filter on its partition keys",
+}
+
+
+def _approximate(rows: int) -> str:
+    """Row count in a short form: 2.1B, 350M, 12K."""
+    for size, suffix in ((10**9, "B"), (10**6, "M"), (10**3, "K")):
+        if rows >= size:
+            return f"{rows / size:.1f}".removesuffix(".0") + suffix
+    return str(rows)
+
+
+def scope_tables(scope: Scope, schema: SchemaContext) -> dict[str, Table]:
+    """The schema tables a scope reads, by alias."""
+    tables: dict[str, Table] = {}
+    for alias, source in scope.sources.items():
+        if source.is_table and (table := schema.get_table(source.name)) is not None:
+            tables[alias] = table
+    return tables
+
+
+def columns_by_table(refs: list[ColumnRef], tables: dict[str, Table]) -> dict[str, list[str]]:
+    """
+    Lowercase names of the columns each table contributes to refs, by alias.
+
+    Names are listed once, in order of first reference. An unqualified name
+    counts for every table with that column (the database rejects it if it
+    is ambiguous).
+    """
+    columns: dict[str, dict[str, None]] = {alias: {} for alias in tables}
+    for ref in refs:
+        name = ref.name.lower()
+        if ref.qualifier is not None:
+            found = columns.get(ref.qualifier.lower())
+            if found is not None and tables[ref.qualifier.lower()].has_column(name):
+                found[name] = None
+            continue
+        for alias, table in tables.items():
+            if table.has_column(name):
+                columns[alias][name] = None
+    return {alias: list(names) for alias, names in columns.items()}
+
+
+def check_scan_cost(
+    scopes: list[Scope],
+    schema: SchemaContext,
+    large_table_rows: int,
+) -> list[PerfWarning]:
+    """
+    Flag large tables read without an index and partitioned tables read whole.
+
+    Args:
+        scopes: Scopes of the query (see validation.scope.parse_scopes)
+        schema: Schema with table statistics
+        large_table_rows: Row count from which an unfiltered read is flagged;
+            0 disables the full-scan check
+
+    Returns:
+        Warnings in order of the tables in the query
+    """
+    warnings = []
+    for scope in scopes:
+        tables = scope_tables(scope, schema)
+        if not tables:
+            continue
+
+        filtered = columns_by_table(scope.filters, tables)
+        for alias, table in tables.items():
+            columns = filtered[alias]
+            position = scope.sources[alias].position
+            if table.partition_keys:
+                if not any(table.is_partition_key(column) for column in columns):
+                    s = "s" if len(table.partition_keys) > 1 else ""
+                    warnings.append(PerfWarning(
+                        rule="missing-partition-filter",
+                        message=f"'{table.name}' is read without a filter on its partition "
+                                f"key{s} {listed(list(table.partition_keys), 'or')}, so every "
+                                "partition is scanned",
+                        position=position,
+                    ))
+            elif (
+                large_table_rows
+                and table.row_count is not None
+                and table.row_count >= large_table_rows
+                and not any(table.is_seekable(column) for column in columns)
+            ):
+                seekable = [c.name for c in table.columns if table.is_seekable(c.name)]
+                hint = f"filter on {listed(seekable, 'or')}" if seekable else "add an index"
+                warnings.append(PerfWarning(
+                    rule="full-scan",
+                    message=f"'{table.name}' has about {_approximate(table.row_count)} rows "
+                            "and is read without a filter on an indexed column, so the "
+                            f"whole table is scanned; {hint}",
+                    position=position,
+                ))
+    return warnings
+
+
+def wide_row_limit(
+    scope: Scope,
+    schema: SchemaContext,
+    max_row_limit: int,
+    wide_table_columns: int,
+) -> int:
+    """
+    Row limit for a query, lowered when it selects * over many columns.
+
+    The result then holds about as many values as max_row_limit rows of
+    wide_table_columns columns. For t.*, every table in FROM is counted.
+
+    Args:
+        scope: Outermost scope of the query
+        schema: Schema the tables are looked up in
+        max_row_limit: Configured row limit
+        wide_table_columns: Column count above which the limit is lowered;
+            0 disables
+
+    Returns:
+        The row limit to enforce, at least 1
+    """
+    if not wide_table_columns or not scope.star:
+        return max_row_limit
+    columns = sum(len(table.columns) for table in scope_tables(scope, schema).values())
+    if columns <= wide_table_columns:
+        return max_row_limit
+    return max(1, max_row_limit * wide_table_columns // columns)
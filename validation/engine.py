@@ -0,0 +1,276 @@
+"""
+The one validation engine every pipeline shares.
+
+The basic pipeline, both ADK pipelines, /validate, batch validation and the
+linting CLI all validate SQL through a ValidationEngine. It is built once,
+from a frozen snapshot of the settings the checks read, with the placeholder
+and token patterns compiled up front, so a call does no setup of its own.
+
+Settings changed after the engine is built don't reach it; tests that
+change them call get_validation_engine.cache_clear().
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from api.models import PolicyGateOutput, QueryStatus
+from config.settings import Settings, get_settings
+from schema.models import SchemaContext
+from validation.cost import check_scan_cost, wide_row_limit
+from validation.gate_cache import PolicyGateCache, get_policy_gate_cache, sql_key
+from validation.lexer import Token, tokenize
+from validation.perf_rules import DEFAULT_RULES, lint_performance
+from validation.policy_gate import (
+    StatementType,
+    check_multiple_statements,
+    check_result_window,
+    check_schema_consistency,
+    classify_statement,
+    detect_placeholders,
+    determine_status,
+    enforce_limit,
+    find_row_limit,
+    is_read_only_statement,
+)
+from validation.scope import Scope, parse_scopes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    """The settings validation depends on, fixed when the engine is built."""
+
+    max_row_limit: int
+    placeholder_pattern: str
+    max_sql_length: int
+    max_result_window: int
+    perf_rules_enabled: bool
+    cartesian_join_review: bool
+    large_table_rows: int
+    wide_table_columns: int
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "EngineSettings":
+        return cls(
+            max_row_limit=settings.max_row_limit,
+            placeholder_pattern=settings.placeholder_pattern,
+            max_sql_length=settings.max_sql_length,
+            max_result_window=settings.max_result_window,
+            perf_rules_enabled=settings.perf_rules_enabled,
+            cartesian_join_review=settings.cartesian_join_review,
+            large_table_rows=settings.large_table_rows,
+            wide_table_columns=settings.wide_table_columns,
+        )
+
+
+class ValidationEngine:
+    """
+    Deterministic SQL validation with precompiled patterns.
+
+    Results are memoized in a PolicyGateCache under a digest of the SQL, the
+    schema fingerprint, the writer's placeholder flag, the dialect and the
+    engine's settings; a cache with max_entries or max_bytes of 0 turns this
+    off.
+    """
+
+    def __init__(
+        self,
+        settings: EngineSettings | None = None,
+        cache: PolicyGateCache | None = None,
+    ):
+        app_settings = get_settings()
+        self.settings = settings or EngineSettings.from_settings(app_settings)
+        self.cache = cache if cache is not None else PolicyGateCache(max_entries=0)
+        self.placeholder_re = re.compile(self.settings.placeholder_pattern)
+        self.perf_rules = DEFAULT_RULES if self.settings.perf_rules_enabled else ()
+        self._statement_warnings = dict(app_settings.modifying_keywords)
+        # Compile the lexer's pattern now rather than on the first call
+        tokenize("", placeholder_pattern=self.settings.placeholder_pattern)
+
+    def validate(
+        self,
+        sql: str,
+        schema: SchemaContext | None = None,
+        has_placeholders_from_writer: bool = False,
+        dialect: str | None = None,
+    ) -> PolicyGateOutput:
+        """
+        Run all deterministic policy checks on the SQL.
+
+        SQL longer than max_sql_length is rejected outright; every check is
+        linear in the length of the SQL, so this bounds the time a single
+        call can take.
+
+        Args:
+            sql: The SQL to validate
+            schema: Optional schema context for consistency checks
+            has_placeholders_from_writer: Whether the writer reported placeholders
+            dialect: SQL dialect ("postgres", "mysql", "sqlite" or None); decides
+                how strings are lexed and how a row limit is written
+
+        Returns:
+            PolicyGateOutput with results of all checks
+        """
+        max_length = self.settings.max_sql_length
+        if max_length and len(sql) > max_length:
+            return PolicyGateOutput(
+                passed=False,
+                sql=sql,
+                status=QueryStatus.ERROR,
+                policy_errors=[
+                    f"SQL is {len(sql):,} characters long, over the limit of "
+                    f"{max_length:,}. Please submit a shorter query."
+                ],
+            )
+
+        if not self.cache.enabled:
+            return self._validate(sql, schema, has_placeholders_from_writer, dialect)
+
+        key = (
+            sql_key(sql),
+            schema.fingerprint if schema is not None else None,
+            has_placeholders_from_writer,
+            dialect,
+            self.settings,
+        )
+        return self.cache.get_or_run(
+            key, lambda: self._validate(sql, schema, has_placeholders_from_writer, dialect)
+        )
+
+    def placeholders(self, sql: str, dialect: str | None = None) -> list[dict[str, str]]:
+        """Placeholders in the SQL, as dicts with 'token' and 'meaning' keys."""
+        if not self.placeholder_re.search(sql):
+            return []
+        return detect_placeholders(sql, self._tokenize(sql, dialect), self.placeholder_re)
+
+    def _tokenize(self, sql: str, dialect: str | None) -> list[Token]:
+        return tokenize(sql, dialect, placeholder_pattern=self.settings.placeholder_pattern)
+
+    def _validate(
+        self,
+        sql: str,
+        schema: SchemaContext | None,
+        has_placeholders_from_writer: bool,
+        dialect: str | None,
+    ) -> PolicyGateOutput:
+        max_row_limit = self.settings.max_row_limit
+        warnings: list[str] = []
+        policy_errors: list[str] = []
+        modified_sql = sql
+
+        # Lex once; every check below shares the token stream
+        tokens = self._tokenize(sql, dialect)
+
+        # 1. Classify statement type
+        statement_type = classify_statement(sql, tokens)
+
+        if statement_type == StatementType.UNKNOWN:
+            policy_errors.append(
+                "Unable to determine SQL statement type. Query must start with a valid SQL keyword."
+            )
+            return PolicyGateOutput(
+                passed=False,
+                sql=sql,
+                status=QueryStatus.ERROR,
+                warnings=warnings,
+                policy_errors=policy_errors,
+            )
+
+        # 2. Check for multiple statements (always rejected)
+        if check_multiple_statements(sql, tokens):
+            policy_errors.append(
+                "Multiple SQL statements detected. Please submit one query at a time."
+            )
+            return PolicyGateOutput(
+                passed=False,
+                sql=sql,
+                status=QueryStatus.ERROR,
+                warnings=warnings,
+                policy_errors=policy_errors,
+            )
+
+        # 3. Add warning for non-SELECT statements
+        statement_warning = self._statement_warnings.get(statement_type.value)
+        if statement_warning:
+            warnings.append(f"⚠️ {statement_warning}")
+
+        # Scopes for the schema-aware checks, parsed once
+        scopes: list[Scope] | None = None
+        if schema and not schema.is_empty and is_read_only_statement(statement_type):
+            scopes = parse_scopes(sql, tokens)
+            max_row_limit = wide_row_limit(
+                scopes[0], schema, max_row_limit, self.settings.wide_table_columns
+            )
+
+        # 4. Enforce LIMIT for SELECT statements, on the outermost query
+        if is_read_only_statement(statement_type):
+            row_limit = find_row_limit(tokens)
+            window_error = check_result_window(
+                row_limit, max_row_limit, self.settings.max_result_window
+            )
+            if window_error:
+                policy_errors.append(window_error)
+                return PolicyGateOutput(
+                    passed=False,
+                    sql=sql,
+                    status=QueryStatus.ERROR,
+                    warnings=warnings,
+                    policy_errors=policy_errors,
+                )
+            modified_sql, limit_modified = enforce_limit(
+                sql, max_row_limit, statement_type, tokens, dialect, row_limit
+            )
+            if limit_modified:
+                reason = ""
+                if max_row_limit < self.settings.max_row_limit:
+                    reason = " (lower than usual, as SELECT * returns many columns)"
+                warnings.append(f"LIMIT {max_row_limit} was enforced on the query{reason}")
+
+        # 5. Detect placeholders (an added LIMIT doesn't change them)
+        placeholders = detect_placeholders(sql, tokens, self.placeholder_re)
+        has_placeholders = len(placeholders) > 0 or has_placeholders_from_writer
+
+        if has_placeholders and not any("placeholder" in w.lower() for w in warnings):
+            warnings.append("SQL contains placeholders that need to be replaced with actual values")
+
+        # 6. Schema consistency check (if schema provided and SELECT)
+        schema_issues = []
+        if scopes is not None:
+            schema_issues = check_schema_consistency(sql, schema, tokens, scopes)
+            warnings.extend(schema_issues)
+
+        # 7. Performance lint, and scan cost from the schema's statistics
+        perf_warnings = lint_performance(tokens, self.perf_rules)
+        if scopes is not None and self.perf_rules:
+            perf_warnings += check_scan_cost(scopes, schema, self.settings.large_table_rows)
+        needs_review = self.settings.cartesian_join_review and any(
+            warning.rule == "cartesian-join" for warning in perf_warnings
+        )
+
+        # 8. Determine final status
+        status = determine_status(
+            statement_type=statement_type,
+            has_placeholders=has_placeholders,
+            has_schema_issues=len(schema_issues) > 0,
+            needs_review=needs_review,
+        )
+
+        return PolicyGateOutput(
+            passed=True,  # We passed if we got here without policy_errors
+            sql=modified_sql,
+            status=status,
+            warnings=warnings,
+            policy_errors=policy_errors,
+            perf_warnings=perf_warnings,
+        )
+
+
+@lru_cache
+def get_validation_engine() -> ValidationEngine:
+    """Get the process-wide validation engine, built on first use."""
+    engine = ValidationEngine(cache=get_policy_gate_cache())
+    logger.debug(f"Built validation engine with {engine.settings}")
+    return engine
@@ -0,0 +1,168 @@
+"""
+Process-wide cache of policy gate results.
+
+The same generated SQL reaches the gate again and again, from repeated
+questions and from clients that retry. The gate is a pure function of the
+SQL, the schema and a few settings, so its output is memoized under all of
+them: the SQL text, the schema fingerprint, the writer's placeholder flag
+and the validation engine's settings (see validation.engine).
+
+The SQL is keyed by its length and a 128-bit digest (see sql_key) rather
+than normalized: the output echoes the SQL (with any enforced LIMIT), so two
+spellings of a query need their own entries. Keys stay small however long
+the SQL is, and the cache is bounded by the estimated size of the outputs
+it holds as well as by entry count.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from config.settings import get_settings
+
+if TYPE_CHECKING:
+    # api.models imports the routes, which import this module
+    from api.models import PolicyGateOutput
+
+# Rough size of a cached output besides its strings: key, model and lists
+ENTRY_OVERHEAD_BYTES = 1024
+
+
+def sql_key(sql: str) -> tuple[int, bytes]:
+    """Cache key part for SQL text: its length and a 16-byte BLAKE2b digest."""
+    return len(sql), hashlib.blake2b(sql.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def estimate_output_bytes(output: "PolicyGateOutput") -> int:
+    """Rough resident size of a cached policy gate output."""
+    messages = output.warnings + output.policy_errors
+    return (
+        ENTRY_OVERHEAD_BYTES
+        + len(output.sql)
+        + sum(len(message) for message in messages)
+        + sum(len(warning.message) + len(warning.rule) for warning in output.perf_warnings)
+    )
+
+
+@dataclass(frozen=True)
+class GateCacheStats:
+    """Snapshot of the gate cache's counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    max_entries: int
+    current_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache (0.0 before any lookup)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PolicyGateCache:
+    """
+    LRU cache of PolicyGateOutput bounded by entry count and estimated size.
+
+    An output larger than the whole byte budget is returned but not stored.
+    Callers get their own copy of a cached output, so mutating its warnings
+    cannot leak into later hits. Safe to share between request handlers; the
+    gate itself runs outside the lock.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[PolicyGateOutput, int]] = OrderedDict()
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether outputs are stored at all."""
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get_or_run(
+        self,
+        key: Hashable,
+        run: Callable[[], "PolicyGateOutput"],
+    ) -> "PolicyGateOutput":
+        """Return the cached output for key, calling run() on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _copy(entry[0])
+            self._misses += 1
+
+        output = run()
+        size = estimate_output_bytes(output)
+        if size > self.max_bytes:
+            return _copy(output)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                # Run concurrently by another request
+                self._current_bytes -= previous[1]
+            self._entries[key] = (output, size)
+            self._current_bytes += size
+            while len(self._entries) > self.max_entries or self._current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._current_bytes -= evicted_size
+                self._evictions += 1
+        return _copy(output)
+
+    def stats(self) -> GateCacheStats:
+        """Current counters and size."""
+        with self._lock:
+            return GateCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                current_bytes=self._current_bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _copy(output: "PolicyGateOutput") -> "PolicyGateOutput":
+    # PerfWarning is frozen, so copying the lists is enough
+    return output.model_copy(
+        update={
+            "warnings": list(output.warnings),
+            "policy_errors": list(output.policy_errors),
+            "perf_warnings": list(output.perf_warnings),
+        }
+    )
+
+
+@lru_cache
+def get_policy_gate_cache() -> PolicyGateCache:
+    """Get the process-wide policy gate cache."""
+    settings = get_settings()
+    return PolicyGateCache(
+        max_entries=settings.policy_gate_cache_max_entries,
+        max_bytes=settings.policy_gate_cache_max_bytes,
+    )
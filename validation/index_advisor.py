@@ -0,0 +1,179 @@
+"""
+Index advisor for generated SQL.
+
+Runs after the policy gate, on the SQL it passed. For each table the query
+reads, the columns it compares with =, IN or IS (equalities), sorts on
+(ORDER BY, for single-table queries) and compares in other ways (ranges)
+are matched against the table's primary key and declared indexes:
+
+- when no existing index leads with any of those columns, a note says that
+  the query can't use an index on the table
+- a composite index is suggested unless an existing one already serves the
+  same columns, or an equality already picks out one row through a unique
+  key. Its columns are the equalities, then the sort columns, then one
+  range column: each of them still narrows the index scan or saves a sort.
+  Conditions joined by OR get no suggestion, as one index can't serve them.
+
+Only tables whose schema declares indexes or a row count are advised on;
+for the others nothing is known about what exists, and every query would
+be flagged.
+"""
+
+import re
+
+from api.models import IndexAdvisorOutput, IndexSuggestion
+from schema.models import SchemaContext, Table
+from validation.cost import columns_by_table, scope_tables
+from validation.lexer import tokenize
+from validation.scope import is_name, parse_scopes
+from validation.suggestions import listed
+
+# Longer suggestions rarely pay for their write cost
+_MAX_INDEX_COLUMNS = 4
+
+# PostgreSQL truncates longer identifiers, MySQL rejects them
+_MAX_INDEX_NAME_LENGTH = 63
+
+_PLAIN_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _existing_indexes(table: Table) -> list[tuple[tuple[str, ...], bool]]:
+    """(lowercase columns, unique) of the table's primary key and indexes."""
+    existing = [(tuple(c.lower() for c in index.columns), index.unique) for index in table.indexes]
+    primary_key = tuple(c.name.lower() for c in table.columns if c.primary_key)
+    if primary_key:
+        existing.insert(0, (primary_key, True))
+    return existing
+
+
+def _quote(name: str, dialect: str | None) -> str:
+    """Quote an identifier unless it is a plain name that is not a keyword."""
+    if _PLAIN_IDENTIFIER.fullmatch(name) and is_name(tokenize(name)[0]):
+        return name
+    if dialect == "mysql":
+        return "`" + name.replace("`", "``") + "`"
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _index_name(table: Table, columns: list[str]) -> str:
+    """idx_<table>_<columns>, reduced to lowercase letters, digits and underscores."""
+    name = re.sub(r"[^a-z0-9_]+", "_", "_".join(["idx", table.name, *columns]).lower())
+    return name[:_MAX_INDEX_NAME_LENGTH].rstrip("_")
+
+
+def _covers(index: tuple[str, ...], equalities: list[str], columns: list[str]) -> bool:
+    """Whether an index starts with the suggested columns (equalities in any order)."""
+    n = len(equalities)
+    return (
+        len(index) >= len(columns)
+        and set(index[:n]) == set(equalities)
+        and list(index[n:len(columns)]) == columns[n:]
+    )
+
+
+def _advise_table(
+    table: Table,
+    equalities: list[str],
+    ranges: list[str],
+    sort_keys: list[str],
+    disjunctive: bool,
+    dialect: str | None,
+    suggestions: dict[tuple[str, tuple[str, ...]], IndexSuggestion],
+    notes: dict[str, None],
+) -> None:
+    """Add the note and the suggestion, if any, for one table a query reads."""
+    used = list(dict.fromkeys(equalities + ranges + sort_keys))
+    if not used:
+        return
+
+    if not any(table.is_seekable(c) for c in equalities + ranges + sort_keys[:1]):
+        notes[
+            f"No existing index on '{table.name}' serves the conditions or sort on "
+            f"{listed([table.get_column(c).name for c in used])}; the query scans the table"
+        ] = None
+
+    if disjunctive:
+        return
+    existing = _existing_indexes(table)
+    if any(unique and set(index) <= set(equalities) for index, unique in existing):
+        return  # A unique key lookup; nothing to add
+
+    equalities = equalities[:_MAX_INDEX_COLUMNS]
+    sort_keys = sort_keys[:_MAX_INDEX_COLUMNS - len(equalities)]
+    ranges = ranges[:1] if len(equalities) + len(sort_keys) < _MAX_INDEX_COLUMNS else []
+    columns = equalities + sort_keys + ranges
+    if any(_covers(index, equalities, columns) for index, _ in existing):
+        return
+
+    names = [table.get_column(c).name for c in columns]
+    key = (table.name.lower(), tuple(columns))
+    if key in suggestions:
+        return
+    parts = []
+    if equalities:
+        parts.append(f"equality on {listed(names[:len(equalities)])}")
+    if sort_keys:
+        parts.append(f"ORDER BY {listed(names[len(equalities):len(equalities) + len(sort_keys)])}")
+    if ranges:
+        parts.append(f"range on {listed(names[-1:])}")
+    quoted = ", ".join(_quote(name, dialect) for name in names)
+    suggestions[key] = IndexSuggestion(
+        table=table.name,
+        columns=names,
+        statement=(
+            f"CREATE INDEX {_index_name(table, names)} ON {_quote(table.name, dialect)} ({quoted});"
+        ),
+        reason="Serves the " + ", then ".join(parts),
+    )
+
+
+def advise_indexes(
+    sql: str,
+    schema: SchemaContext | None,
+    dialect: str | None = None,
+) -> IndexAdvisorOutput:
+    """
+    Suggest indexes for a query and note tables it can't read through one.
+
+    Args:
+        sql: SQL that passed the policy gate
+        schema: Schema with the tables' primary keys and indexes
+        dialect: SQL dialect, for lexing strings
+
+    Returns:
+        IndexAdvisorOutput with suggestions and notes, each listed once
+    """
+    if schema is None or schema.is_empty:
+        return IndexAdvisorOutput()
+
+    suggestions: dict[tuple[str, tuple[str, ...]], IndexSuggestion] = {}
+    notes: dict[str, None] = {}
+    for scope in parse_scopes(sql, tokenize(sql, dialect)):
+        tables = {
+            alias: table
+            for alias, table in scope_tables(scope, schema).items()
+            if table.indexes or table.row_count is not None
+        }
+        if not tables:
+            continue
+
+        equalities = columns_by_table(scope.equalities, tables)
+        filters = columns_by_table(scope.filters, tables)
+        # An index can only save the sort when the query reads one table
+        sort_keys = columns_by_table(scope.sort_keys, tables) if len(scope.sources) == 1 else {}
+        for alias, table in tables.items():
+            table_equalities = equalities[alias]
+            table_sort_keys = [c for c in sort_keys.get(alias, []) if c not in table_equalities]
+            # A range on a sort column is served by that column's place in the index
+            _advise_table(
+                table,
+                table_equalities,
+                [c for c in filters[alias] if c not in table_equalities + table_sort_keys],
+                table_sort_keys,
+                scope.disjunctive,
+                dialect,
+                suggestions,
+                notes,
+            )
+
+    return IndexAdvisorOutput(suggestions=list(suggestions.values()), notes=list(notes))
@@ -0,0 +1,167 @@
+"""
+Single-pass SQL lexer.
+
+Splits SQL into tokens with one regex scan, so the policy checks can share a
+token stream instead of each re-scanning (and re-stripping) the text. String
+literals, quoted identifiers and comments are recognized as whole tokens:
+nothing inside them is mistaken for a keyword, semicolon or identifier.
+
+Strings use SQL quote doubling ('it''s'); E'...' strings, and every string in
+MySQL, also accept backslash escapes. Unterminated strings, quoted
+identifiers and block comments extend to the end of the input.
+
+Every alternative matches in time and memory linear in the token's length:
+repetitions are possessive where backtracking could not change the match,
+and the leading whitespace is consumed once per token.
+"""
+
+import re
+from enum import StrEnum
+from functools import lru_cache
+from typing import NamedTuple
+
+from config.settings import get_settings
+
+
+class TokenKind(StrEnum):
+    """Kinds of SQL tokens."""
+
+    WORD = "word"  # Keyword or unquoted identifier
+    QUOTED_IDENTIFIER = "quoted_identifier"
+    STRING = "string"
+    NUMBER = "number"
+    PLACEHOLDER = "placeholder"  # e.g. <CUSTOMERS_TABLE>
+    PARAMETER = "parameter"  # $1, :name, ?, @var
+    OPERATOR = "operator"
+    PUNCTUATION = "punctuation"  # ( ) , . [ ]
+    SEMICOLON = "semicolon"
+    COMMENT = "comment"
+    OTHER = "other"
+
+
+class Token(NamedTuple):
+    """A token and its position in the SQL text."""
+
+    kind: TokenKind
+    text: str
+    start: int
+    end: int
+
+    @property
+    def upper(self) -> str:
+        """Uppercased text, for keyword comparisons."""
+        return self.text.upper()
+
+    def is_keyword(self, *keywords: str) -> bool:
+        """Whether this is an unquoted word matching one of the (uppercase) keywords."""
+        return self.kind is TokenKind.WORD and self.text.upper() in keywords
+
+    def is_punctuation(self, value: str) -> bool:
+        return self.kind is TokenKind.PUNCTUATION and self.text == value
+
+    @property
+    def identifier(self) -> str | None:
+        """The name this token refers to if it is an identifier, unquoted."""
+        if self.kind is TokenKind.WORD:
+            return self.text
+        if self.kind is TokenKind.QUOTED_IDENTIFIER:
+            quote = self.text[0]
+            body = self.text[1:-1] if self.text.endswith(quote) and len(self.text) > 1 else self.text[1:]
+            return body.replace(quote * 2, quote)
+        return None
+
+
+_KINDS = {kind.name.lower(): kind for kind in TokenKind}
+
+
+@lru_cache(maxsize=8)
+def _token_pattern(placeholder_pattern: str, dialect: str | None) -> re.Pattern[str]:
+    if dialect == "mysql":
+        prefix = "NnBbXx"
+        string = r"[NnBbXx]?'(?:[^'\\]++|\\.|'')*+(?:'|\Z)"
+        hash_comment = r"|\#[^\n]*"
+    else:
+        prefix = "EeNnBbXxUu"
+        string = r"[Ee]'(?:[^'\\]++|\\.|'')*+(?:'|\Z)|[NnBbXxUu]?'(?:[^']++|'')*+(?:'|\Z)"
+        hash_comment = ""
+    return re.compile(
+        rf"""
+        \s*+
+        (?:
+          (?P<word>(?![{prefix}]')[^\W\d][\w$]*+)  # Not a string prefix (E'...', N'...')
+        | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)
+        | (?P<punctuation>[(),.\[\]])
+        | (?P<semicolon>;)
+        | (?P<string>{string}|\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?(?:\$(?P=tag)\$|\Z))
+        | (?P<quoted_identifier>"(?:[^"]++|"")*+(?:"|\Z)|`(?:[^`]++|``)*+(?:`|\Z))
+        | (?P<comment>--[^\n]*|/\*.*?(?:\*/|\Z){hash_comment})
+        | (?P<placeholder>(?:{placeholder_pattern}))
+        | (?P<parameter>\$\d+|[:@][A-Za-z_]\w*|\?)
+        | (?P<operator>(?:[+*%<>=!~^&|\#@:]|-(?!-)|/(?!\*))+)
+        | (?P<other>.)
+        )?
+        """,
+        re.VERBOSE | re.DOTALL,
+    )
+
+
+def tokenize(
+    sql: str,
+    dialect: str | None = None,
+    include_comments: bool = False,
+    placeholder_pattern: str | None = None,
+) -> list[Token]:
+    """
+    Split SQL into tokens in a single pass.
+
+    Args:
+        sql: SQL text
+        dialect: SQL dialect; "mysql" enables backslash escapes in all strings
+            and '#' comments
+        include_comments: Whether to return COMMENT tokens
+        placeholder_pattern: Regex for placeholders; defaults to the setting
+
+    Returns:
+        Tokens in source order, without whitespace
+    """
+    if placeholder_pattern is None:
+        placeholder_pattern = get_settings().placeholder_pattern
+    pattern = _token_pattern(placeholder_pattern, dialect)
+    kinds = _KINDS
+    tokens = []
+    append = tokens.append
+    for match in pattern.finditer(sql):
+        name = match.lastgroup
+        if name is None or (name == "comment" and not include_comments):
+            continue  # Trailing whitespace, or a skipped comment
+        start, end = match.span(name)
+        append(Token(kinds[name], sql[start:end], start, end))
+    return tokens
+
+
+def split_statements(sql: str, dialect: str | None = None) -> list[tuple[int, str]]:
+    """
+    Split a script into statements at semicolons outside strings and comments.
+
+    Args:
+        sql: SQL text, e.g. the contents of a .sql file
+        dialect: SQL dialect, as for tokenize()
+
+    Returns:
+        (offset, text) of each non-empty statement, without its semicolon
+        and the comments before it
+    """
+    statements = []
+    first: Token | None = None
+    last: Token | None = None
+    for token in tokenize(sql, dialect):
+        if token.kind is TokenKind.SEMICOLON:
+            if first is not None and last is not None:
+                statements.append((first.start, sql[first.start:last.end]))
+            first = last = None
+        else:
+            first = first or token
+            last = token
+    if first is not None and last is not None:
+        statements.append((first.start, sql[first.start:last.end]))
+    return statements
@@ -0,0 +1,469 @@
+"""
+Performance lint rules for SQL.
+
+The policy gate checks that a query is safe to run; these rules flag queries
+that are likely to be slow:
+
+- leading-wildcard: LIKE '%foo', which no B-tree index can serve
+- wrapped-column: a function or cast around a filtered column, as in
+  LOWER(email) = '...' or created_at::date = '...'
+- or-across-columns: OR between conditions on different columns
+- cartesian-join: tables in FROM with no join condition between them (a
+  LATERAL item, or a derived table whose filters reference an earlier
+  item, counts as joined to it)
+
+One pass over the tokens collects the facts the rules need (filter clauses,
+FROM items, join conditions) into QueryFacts; each rule only reads those.
+Rules are plain PerfRule values, so callers can run their own set.
+"""
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+
+from api.models import PerfWarning
+from validation.lexer import Token, TokenKind
+from validation.scope import is_name
+from validation.suggestions import listed
+
+_FILTER_CLAUSES = frozenset({"WHERE", "ON"})
+
+# Keywords that start a clause of the query they appear in
+_CLAUSES = frozenset({
+    "SELECT", "WHERE", "GROUP", "HAVING", "ORDER", "LIMIT", "OFFSET", "FETCH",
+    "WINDOW", "QUALIFY", "RETURNING", "SET", "VALUES", "USING",
+})
+
+_SET_OPERATORS = frozenset({"UNION", "INTERSECT", "EXCEPT"})
+
+_COMPARISON_OPERATORS = frozenset({"=", "<", ">", "<=", ">=", "<>", "!=", "<=>"})
+_COMPARISON_WORDS = frozenset({"LIKE", "ILIKE", "IN", "BETWEEN", "SIMILAR", "NOT"})
+
+# Keywords that are also functions; other keywords before "(" aren't calls
+_CALL_KEYWORDS = frozenset({"CAST", "LEFT", "RIGHT"})
+
+_NAME_KINDS = (TokenKind.WORD, TokenKind.QUOTED_IDENTIFIER)
+
+
+@dataclass
+class QueryFacts:
+    """What the rules look at, collected in one pass over the tokens."""
+
+    # LIKE patterns starting with a wildcard, with the column they filter
+    wildcard_patterns: list[tuple[Token, str | None]] = field(default_factory=list)
+    # (position, function or "::", column) for wrapped columns compared in a filter
+    wrapped_columns: list[tuple[int, str, str]] = field(default_factory=list)
+    # (position, columns) for OR chains over more than one column
+    or_chains: list[tuple[int, list[str]]] = field(default_factory=list)
+    # (position, groups of aliases) for FROM clauses with unjoined groups
+    cartesian_joins: list[tuple[int, list[list[str]]]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class PerfRule:
+    """A performance lint rule: an id, what it flags and its check."""
+
+    name: str
+    description: str
+    check: Callable[[QueryFacts], Iterator[PerfWarning]]
+
+
+@dataclass
+class _Disjuncts:
+    """The OR-separated conditions of a filter, or of a parenthesized part of one."""
+
+    position: int
+    columns: list[str | None] = field(default_factory=lambda: [None])  # First column of each
+
+    def note(self, column: str) -> None:
+        if self.columns[-1] is None:
+            self.columns[-1] = column
+
+
+@dataclass
+class _Query:
+    """Facts about one SELECT while its tokens are being read."""
+
+    position: int
+    clause: str | None = None
+    filter: _Disjuncts | None = None
+    # FROM items as groups of aliases; explicit joins with a condition share a group
+    groups: list[list[str]] = field(default_factory=list)
+    from_position: int = 0
+    expect_item: bool = False
+    expect_alias: bool = False  # After a subquery in FROM
+    cross_join: bool = False  # CROSS or NATURAL seen before JOIN
+    join_pending: bool = False  # JOIN without ON or USING yet
+    edges: list[tuple[str, str]] = field(default_factory=list)
+    assumed_joined: bool = False  # An unqualified equality might join any two items
+    left_qualifier: str | None = None  # Qualifier of a column right before "="
+    left_end: int = -1
+    last_column: str | None = None
+    # Qualifiers of filtered columns here or in subqueries, not resolved to a subquery's own items
+    qualifiers: set[str] = field(default_factory=set)
+    # Outer qualifiers referenced by the derived table just read, joined to it once it has an alias
+    derived_refs: set[str] = field(default_factory=set)
+
+
+@dataclass
+class _Frame:
+    """An open parenthesis: a subquery, a function call or a group."""
+
+    kind: str  # "query", "call" or "group"
+    query: _Query
+    disjuncts: _Disjuncts | None = None  # For a call, the one around it
+    name: str = ""  # Function name of a call
+    position: int = 0
+    before: Token | None = None  # Token before the function name
+    column: str | None = None  # First column inside the call
+
+
+def _is_comparison(token: Token | None) -> bool:
+    if token is None:
+        return False
+    if token.kind is TokenKind.OPERATOR:
+        return token.text in _COMPARISON_OPERATORS
+    return token.is_keyword(*_COMPARISON_WORDS)
+
+
+def _is_call(token: Token | None) -> bool:
+    return token is not None and token.kind is TokenKind.WORD and (
+        is_name(token) or token.upper in _CALL_KEYWORDS
+    )
+
+
+def _is_wildcard(pattern: Token) -> bool:
+    quote = pattern.text.find("'")
+    return quote >= 0 and pattern.text[quote + 1:quote + 2] in ("%", "_")
+
+
+class _FactCollector:
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.facts = QueryFacts()
+        self.frames = [_Frame("query", _Query(0))]
+
+    def _disjuncts(self) -> _Disjuncts | None:
+        """The innermost OR chain being read, if inside a filter."""
+        frame = self.frames[-1]
+        if frame.kind != "query":
+            return frame.disjuncts  # A call's is the one around it
+        return frame.query.filter if frame.query.clause in _FILTER_CLAUSES else None
+
+    def _finish_disjuncts(self, disjuncts: _Disjuncts) -> None:
+        columns = list(dict.fromkeys(c for c in disjuncts.columns if c is not None))
+        if len(disjuncts.columns) > 1 and len(columns) > 1:
+            self.facts.or_chains.append((disjuncts.position, columns))
+
+    def _set_clause(self, query: _Query, clause: str | None, position: int) -> None:
+        if query.filter is not None:
+            self._finish_disjuncts(query.filter)
+            query.filter = None
+        query.clause = clause
+        query.expect_item = query.expect_alias = False
+        query.left_qualifier = None
+        if clause in _FILTER_CLAUSES:
+            query.filter = _Disjuncts(position)
+
+    def _finish_query(self, query: _Query) -> None:
+        self._set_clause(query, None, 0)
+        groups = [group for group in query.groups if group]
+        if len(groups) < 2 or query.assumed_joined:
+            return
+        # Union the groups joined by a condition
+        root = list(range(len(groups)))
+        group_of = {alias: index for index, group in enumerate(groups) for alias in group}
+
+        def find(index: int) -> int:
+            while root[index] != index:
+                root[index] = index = root[root[index]]
+            return index
+
+        for left, right in query.edges:
+            if left in group_of and right in group_of:
+                root[find(group_of[left])] = find(group_of[right])
+        components: dict[int, list[str]] = {}
+        for index, group in enumerate(groups):
+            components.setdefault(find(index), []).extend(group)
+        if len(components) > 1:
+            self.facts.cartesian_joins.append((query.from_position, list(components.values())))
+
+    def _close(self, index: int) -> None:
+        frame = self.frames.pop()
+        if frame.kind == "query":
+            self._finish_query(frame.query)
+            own = {alias for group in frame.query.groups for alias in group}
+            outer_refs = frame.query.qualifiers - own
+            parent = self.frames[-1].query
+            parent.qualifiers |= outer_refs
+            if parent.expect_alias:
+                parent.derived_refs = outer_refs
+        elif frame.kind == "group":
+            if frame.disjuncts is not None:
+                self._finish_disjuncts(frame.disjuncts)
+                first = next((c for c in frame.disjuncts.columns if c is not None), None)
+                outer = self._disjuncts()
+                if first is not None and outer is not None:
+                    outer.note(first)
+        elif frame.column is not None:
+            parent = self.frames[-1]
+            if parent.kind == "call":
+                parent.column = parent.column or frame.column
+            else:
+                following = self.tokens[index + 1] if index + 1 < len(self.tokens) else None
+                if _is_comparison(following) or _is_comparison(frame.before):
+                    self.facts.wrapped_columns.append((frame.position, frame.name, frame.column))
+
+    def _table_item(self, query: _Query, i: int) -> int:
+        """Record a FROM item's alias; returns the index after it."""
+        tokens, n = self.tokens, len(self.tokens)
+        j = i
+        while j + 2 < n and tokens[j + 1].is_punctuation(".") and tokens[j + 2].kind in _NAME_KINDS:
+            j += 2
+        name = tokens[j].identifier or tokens[j].text
+        k = j + 1
+        if k < n and tokens[k].is_keyword("AS"):
+            k += 1
+        if k < n and tokens[k].kind in _NAME_KINDS and is_name(tokens[k]):
+            name = tokens[k].identifier
+            k += 1
+        if not query.groups:
+            query.groups.append([])
+        query.groups[-1].append(name.lower())
+        query.expect_item = False
+        return k
+
+    def _column(self, query: _Query, frame: _Frame, i: int) -> int:
+        """Record a column reference in a filter; returns the index after it."""
+        tokens, n = self.tokens, len(self.tokens)
+        j = i
+        while j + 2 < n and tokens[j + 1].is_punctuation(".") and tokens[j + 2].kind in _NAME_KINDS:
+            j += 2
+        following = tokens[j + 1] if j + 1 < n else None
+        if following is not None and following.is_punctuation("("):
+            return j + 1  # A function name; the call is read at "("
+        qualifier = tokens[j - 2].identifier.lower() if j > i else None
+        column = tokens[j].identifier.lower()
+        ref = f"{qualifier}.{column}" if qualifier else column
+        if qualifier:
+            query.qualifiers.add(qualifier)
+
+        disjuncts = self._disjuncts()
+        if disjuncts is not None:
+            disjuncts.note(ref)
+        if frame.kind == "call" and frame.column is None:
+            frame.column = ref
+        query.last_column = ref
+
+        # Join conditions: column = column
+        before = tokens[i - 1] if i else None
+        if query.left_end == i - 1 and before is not None and before.text == "=":
+            if query.left_qualifier and qualifier:
+                query.edges.append((query.left_qualifier, qualifier))
+            else:
+                query.assumed_joined = True
+        query.left_end = -1
+        if following is not None and following.kind is TokenKind.OPERATOR:
+            if following.text == "=":
+                query.left_qualifier, query.left_end = qualifier, j + 1
+            elif following.text == "::" and (
+                _is_comparison(before) or _is_comparison(tokens[j + 3] if j + 3 < n else None)
+            ):
+                self.facts.wrapped_columns.append((tokens[i].start, "::", ref))
+        return j + 1
+
+    def collect(self) -> QueryFacts:
+        tokens, n = self.tokens, len(self.tokens)
+        frames = self.frames
+        prev: Token | None = None
+        i = 0
+        while i < n:
+            token = tokens[i]
+            frame = frames[-1]
+            query = frame.query
+            kind = token.kind
+            at_query_level = frame.kind == "query"
+            filtering = query.clause in _FILTER_CLAUSES
+
+            if kind is TokenKind.PUNCTUATION:
+                if token.text == "(":
+                    following = tokens[i + 1] if i + 1 < n else None
+                    if following is not None and following.is_keyword("SELECT", "WITH", "VALUES"):
+                        if at_query_level and query.expect_item:
+                            query.expect_item, query.expect_alias = False, True
+                        frames.append(_Frame("query", _Query(token.start)))
+                    elif filtering and _is_call(prev):
+                        frames.append(_Frame(
+                            "call", query, self._disjuncts(), name=prev.text, position=prev.start,
+                            before=tokens[i - 2] if i >= 2 else None,
+                        ))
+                    else:
+                        disjuncts = _Disjuncts(token.start) if filtering else None
+                        frames.append(_Frame("group", query, disjuncts))
+                elif token.text == ")":
+                    if len(frames) > 1:
+                        self._close(i)
+                elif token.text == "," and at_query_level and query.clause in ("FROM", "ON", "USING"):
+                    self._set_clause(query, "FROM", token.start)
+                    query.groups.append([])
+                    query.expect_item, query.join_pending = True, False
+                prev = token
+                i += 1
+                continue
+
+            if kind is TokenKind.WORD and not is_name(token):
+                upper = token.upper
+                if at_query_level:
+                    if upper in _SET_OPERATORS:
+                        self._finish_query(query)
+                        frame.query = _Query(token.start)
+                    elif upper == "FROM" and query.clause in (None, "SELECT"):
+                        self._set_clause(query, "FROM", token.start)
+                        query.from_position = token.start
+                        query.groups.append([])
+                        query.expect_item = True
+                    elif upper in ("CROSS", "NATURAL"):
+                        query.cross_join = True
+                    elif upper == "LATERAL" and query.expect_item:
+                        # Correlated with the items before it: join it to the last group
+                        if len(query.groups) > 1 and not query.groups[-1]:
+                            query.groups.pop()
+                        query.join_pending = False
+                    elif upper == "JOIN":
+                        self._set_clause(query, "FROM", token.start)
+                        if not query.cross_join:
+                            query.groups.append([])
+                        query.join_pending = not query.cross_join
+                        query.cross_join = False
+                        query.expect_item = True
+                    elif upper in ("ON", "USING") and query.clause in ("FROM", "ON"):
+                        if query.join_pending and len(query.groups) > 1:
+                            query.groups[-2].extend(query.groups.pop())
+                        query.join_pending = False
+                        self._set_clause(query, upper, token.start)
+                    elif upper in _CLAUSES:
+                        self._set_clause(query, upper, token.start)
+                elif upper == "FROM" and frame.kind == "call" and frame.name.upper() == "EXTRACT":
+                    frame.column = None  # EXTRACT(YEAR FROM col): YEAR isn't a column
+                if filtering:
+                    if upper in ("LIKE", "ILIKE") and i + 1 < n:
+                        pattern = tokens[i + 1]
+                        if pattern.kind is TokenKind.STRING and _is_wildcard(pattern):
+                            self.facts.wildcard_patterns.append((pattern, query.last_column))
+                    elif upper == "OR":
+                        disjuncts = self._disjuncts()
+                        if disjuncts is not None:
+                            disjuncts.columns.append(None)
+                prev = token
+                i += 1
+                continue
+
+            if kind in _NAME_KINDS:
+                if at_query_level and (query.expect_item or query.expect_alias):
+                    if query.expect_alias:
+                        if not query.groups:
+                            query.groups.append([])
+                        alias = (token.identifier or token.text).lower()
+                        query.groups[-1].append(alias)
+                        query.edges += [(alias, ref) for ref in query.derived_refs]
+                        query.derived_refs = set()
+                        query.expect_alias = False
+                        i += 1
+                    else:
+                        i = self._table_item(query, i)
+                    prev = tokens[i - 1]
+                    continue
+                if filtering:
+                    i = self._column(query, frame, i)
+                    prev = tokens[i - 1]
+                    continue
+
+            prev = token
+            i += 1
+
+        while len(frames) > 1:
+            self._close(n)
+        self._finish_query(frames[0].query)
+        return self.facts
+
+
+def collect_facts(tokens: list[Token]) -> QueryFacts:
+    """Collect what the performance rules need in one pass over the tokens."""
+    return _FactCollector(tokens).collect()
+
+
+def _leading_wildcard(facts: QueryFacts) -> Iterator[PerfWarning]:
+    for pattern, column in facts.wildcard_patterns:
+        target = f" on '{column}'" if column else ""
+        yield PerfWarning(
+            rule="leading-wildcard",
+            message=f"LIKE {pattern.text}{target} starts with a wildcard, so no index can "
+                    "be used for it; anchor the pattern at the start or use a trigram or "
+                    "full-text index",
+            position=pattern.start,
+        )
+
+
+def _wrapped_column(facts: QueryFacts) -> Iterator[PerfWarning]:
+    for position, function, column in facts.wrapped_columns:
+        wrapper = f"cast with {function}" if function == "::" else f"wrapped in {function}()"
+        yield PerfWarning(
+            rule="wrapped-column",
+            message=f"Column '{column}' is {wrapper} in a filter, so an index on it can't "
+                    "be used; compare the bare column (with a range for dates) or index "
+                    "the expression",
+            position=position,
+        )
+
+
+def _or_across_columns(facts: QueryFacts) -> Iterator[PerfWarning]:
+    for position, columns in facts.or_chains:
+        yield PerfWarning(
+            rule="or-across-columns",
+            message=f"OR across columns {listed(columns)} can't be served by one index; consider a "
+                    "UNION ALL of queries that each filter one column",
+            position=position,
+        )
+
+
+def _cartesian_join(facts: QueryFacts) -> Iterator[PerfWarning]:
+    for position, groups in facts.cartesian_joins:
+        # A group of joined tables is shown as ('a' and 'b')
+        names = listed(
+            [listed(group) if len(group) == 1 else f"({listed(group)})" for group in groups],
+            quote=False,
+        )
+        yield PerfWarning(
+            rule="cartesian-join",
+            message=f"No join condition between {names}: every row is paired with every "
+                    "other (a cartesian product); add a join condition, or CROSS JOIN if "
+                    "that is intended",
+            position=position,
+        )
+
+
+DEFAULT_RULES: tuple[PerfRule, ...] = (
+    PerfRule("leading-wildcard", "LIKE pattern starting with a wildcard", _leading_wildcard),
+    PerfRule("wrapped-column", "Function or cast around a filtered column", _wrapped_column),
+    PerfRule("or-across-columns", "OR between conditions on different columns", _or_across_columns),
+    PerfRule("cartesian-join", "Tables in FROM without a join condition", _cartesian_join),
+)
+
+
+def lint_performance(
+    tokens: list[Token],
+    rules: tuple[PerfRule, ...] = DEFAULT_RULES,
+) -> list[PerfWarning]:
+    """
+    Run performance rules on a statement's tokens.
+
+    Args:
+        tokens: Tokens of the SQL
+        rules: Rules to run
+
+    Returns:
+        Warnings in rule order
+    """
+    if not rules:
+        return []
+    facts = collect_facts(tokens)
+    return [warning for rule in rules for warning in rule.check(facts)]
@@ -6,11 +6,14 @@ It checks for forbidden patterns, enforces LIMIT, detects placeholders, etc.
 """
 
 import re
+from dataclasses import dataclass
 from enum import Enum
 
 from api.models import PolicyGateOutput, QueryStatus
 from config.settings import get_settings
 from schema.models import SchemaContext
+from validation.lexer import Token, TokenKind, tokenize
+from validation.scope import Scope
 
 
 class StatementType(str, Enum):
@@ -30,43 +33,28 @@ class StatementType(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
-def classify_statement(sql: str) -> StatementType:
+def classify_statement(sql: str, tokens: list[Token] | None = None) -> StatementType:
     """
     Classify the SQL statement type based on its first keyword.
-    
+
+    Leading comments and opening parentheses are skipped.
+
     Args:
         sql: The SQL string to classify
-        
+        tokens: Tokens of sql, if already lexed
+
     Returns:
         StatementType enum value
     """
-    normalized = sql.strip().upper()
-
-    # Check each statement type
-    if normalized.startswith("SELECT"):
-        return StatementType.SELECT
-    elif normalized.startswith("WITH"):
-        return StatementType.WITH
-    elif normalized.startswith("INSERT"):
-        return StatementType.INSERT
-    elif normalized.startswith("UPDATE"):
-        return StatementType.UPDATE
-    elif normalized.startswith("DELETE"):
-        return StatementType.DELETE
-    elif normalized.startswith("DROP"):
-        return StatementType.DROP
-    elif normalized.startswith("TRUNCATE"):
-        return StatementType.TRUNCATE
-    elif normalized.startswith("ALTER"):
-        return StatementType.ALTER
-    elif normalized.startswith("CREATE"):
-        return StatementType.CREATE
-    elif normalized.startswith("GRANT"):
-        return StatementType.GRANT
-    elif normalized.startswith("REVOKE"):
-        return StatementType.REVOKE
-    else:
-        return StatementType.UNKNOWN
+    if tokens is None:
+        tokens = tokenize(sql)
+
+    for token in tokens:
+        if not token.is_punctuation("("):
+            if token.kind is TokenKind.WORD and token.upper in StatementType.__members__:
+                return StatementType[token.upper]
+            break
+    return StatementType.UNKNOWN
 
 
 def is_read_only_statement(statement_type: StatementType) -> bool:
@@ -74,39 +62,60 @@ def is_read_only_statement(statement_type: StatementType) -> bool:
     return statement_type in (StatementType.SELECT, StatementType.WITH)
 
 
-def check_multiple_statements(sql: str) -> bool:
+def check_multiple_statements(sql: str, tokens: list[Token] | None = None) -> bool:
     """
     Check if the SQL contains multiple statements.
-    
-    This is a simple check for semicolons followed by non-whitespace.
-    We reject multiple statements to avoid ambiguity.
-    
+
+    Semicolons inside strings, quoted identifiers and comments don't count,
+    nor does a trailing semicolon. We reject multiple statements to avoid
+    ambiguity.
+
     Returns:
         True if multiple statements detected, False otherwise
     """
-    # Remove string literals to avoid false positives
-    # Simple approach: replace quoted strings with placeholders
-    cleaned = re.sub(r"'[^']*'", "''", sql)
-    cleaned = re.sub(r'"[^"]*"', '""', cleaned)
+    if tokens is None:
+        tokens = tokenize(sql)
 
-    # Split by semicolon and check for multiple non-empty statements
-    parts = [p.strip() for p in cleaned.split(";") if p.strip()]
+    # Statements are the non-empty runs of tokens between semicolons
+    bounds = [-1, *(i for i, token in enumerate(tokens) if token.kind is TokenKind.SEMICOLON), len(tokens)]
+    statements = sum(1 for a, b in zip(bounds, bounds[1:]) if b - a > 1)
 
-    return len(parts) > 1
+    return statements > 1
 
 
-def detect_placeholders(sql: str) -> list[dict[str, str]]:
+def detect_placeholders(
+    sql: str,
+    tokens: list[Token] | None = None,
+    pattern: re.Pattern[str] | None = None,
+) -> list[dict[str, str]]:
     """
     Detect placeholder tokens in the SQL.
-    
-    Placeholders are in the format <UPPER_SNAKE_CASE>.
-    
+
+    Placeholders are in the format <UPPER_SNAKE_CASE>. They are found where an
+    identifier or value may appear and inside string literals ('<STATE_VALUE>'),
+    but not in comments.
+
+    Args:
+        sql: The SQL string
+        tokens: Tokens of sql, if already lexed
+        pattern: Compiled placeholder regex; defaults to the setting
+
     Returns:
         List of dicts with 'token' and 'meaning' keys
     """
-    settings = get_settings()
-    pattern = settings.placeholder_pattern
-    matches = re.findall(pattern, sql)
+    if pattern is None:
+        pattern = re.compile(get_settings().placeholder_pattern)
+    if not pattern.search(sql):
+        return []  # None anywhere, no need to look at tokens
+    if tokens is None:
+        tokens = tokenize(sql)
+
+    matches: list[str] = []
+    for token in tokens:
+        if token.kind is TokenKind.PLACEHOLDER:
+            matches.append(token.text)
+        elif token.kind is TokenKind.STRING:
+            matches.extend(m.group() for m in pattern.finditer(token.text))
 
     # Generate meanings based on common patterns
     placeholders = []
@@ -133,15 +142,138 @@ def detect_placeholders(sql: str) -> list[dict[str, str]]:
     return placeholders
 
 
-def enforce_limit(sql: str, max_limit: int, statement_type: StatementType) -> tuple[str, bool]:
+# Each starts a new query whose row-limiting clauses apply to the whole result
+_SET_OPERATORS = frozenset({"UNION", "INTERSECT", "EXCEPT"})
+
+# Dialects without FETCH FIRST ... ROWS ONLY; a LIMIT is added instead
+_LIMIT_ONLY_DIALECTS = frozenset({"mysql", "sqlite"})
+
+
+@dataclass
+class RowLimit:
     """
-    Ensure SELECT/WITH statements have a LIMIT clause.
-    
+    The row-limiting clauses of the outermost query.
+
+    count and offset are the tokens of the LIMIT (or FETCH FIRST) and OFFSET
+    expressions, None when the clause is absent. Clauses in subqueries and
+    CTEs are not included: they don't bound the rows the query returns.
+    """
+
+    count: list[Token] | None = None
+    offset: list[Token] | None = None
+    fetch: bool = False  # count is from FETCH FIRST/NEXT ... ROWS
+    with_ties: bool = False  # FETCH ... WITH TIES or PERCENT, unbounded either way
+    offset_keyword: Token | None = None  # None for MySQL's LIMIT offset, count
+    offset_rows: bool = False  # OFFSET n ROWS, the standard form
+    end: int = 0  # Where a new clause goes: after the query, before FOR UPDATE
+
+    @property
+    def count_value(self) -> int | None:
+        """The row count if it is a literal, else None."""
+        if self.fetch and self.count == []:
+            return 1  # FETCH FIRST ROW ONLY
+        return _literal(self.count)
+
+    @property
+    def offset_value(self) -> int | None:
+        """The offset if it is a literal, else None."""
+        return _literal(self.offset)
+
+
+def _literal(tokens: list[Token] | None) -> int | None:
+    if tokens and len(tokens) == 1 and tokens[0].kind is TokenKind.NUMBER and tokens[0].text.isdigit():
+        return int(tokens[0].text)
+    return None
+
+
+def find_row_limit(tokens: list[Token]) -> RowLimit:
+    """
+    Find the LIMIT, OFFSET and FETCH clauses of the outermost query, in one pass.
+
+    Understands LIMIT n [OFFSET m], MySQL's LIMIT m, n, and the standard
+    OFFSET m ROWS FETCH FIRST n ROWS ONLY. Clauses inside parentheses belong
+    to subqueries and CTEs; a set operator (UNION, ...) starts a new query, so
+    only the last branch's clauses, which apply to the whole result, count.
+    """
+    row_limit = RowLimit()
+    collecting: list[Token] | None = None
+    locked = False
+    depth = 0
+    for token in tokens:
+        if token.kind is TokenKind.SEMICOLON and depth == 0:
+            break
+        keyword = False  # Part of a clause's syntax rather than its expression
+        if depth == 0 and token.kind is TokenKind.WORD:
+            word = token.upper
+            keyword = True
+            if word in _SET_OPERATORS:
+                row_limit, collecting, locked = RowLimit(), None, False
+            elif word == "LIMIT":
+                row_limit.count, row_limit.fetch, row_limit.with_ties = [], False, False
+                collecting = row_limit.count
+            elif word == "OFFSET":
+                row_limit.offset, row_limit.offset_keyword = [], token
+                collecting = row_limit.offset
+            elif word == "FETCH":
+                row_limit.count, row_limit.fetch = [], True
+                collecting = row_limit.count
+            elif word in ("FIRST", "NEXT") and row_limit.fetch and collecting == []:
+                pass
+            elif word in ("ROW", "ROWS") and collecting is not None:
+                row_limit.offset_rows |= collecting is row_limit.offset
+                collecting = None
+            elif word in ("PERCENT", "TIES"):
+                row_limit.with_ties = True
+                collecting = None
+            elif word == "FOR":
+                # FOR UPDATE/SHARE comes after any row-limiting clause
+                collecting, locked = None, True
+            else:
+                keyword = False
+        elif token.is_punctuation(",") and depth == 0 and collecting is not None:
+            if collecting is row_limit.count and not row_limit.fetch:
+                # LIMIT offset, count
+                row_limit.offset, row_limit.offset_keyword = row_limit.count, None
+                row_limit.count = collecting = []
+                keyword = True
+        elif token.is_punctuation("("):
+            depth += 1
+        elif token.is_punctuation(")"):
+            depth = max(depth - 1, 0)
+
+        if collecting is not None and not keyword:
+            collecting.append(token)
+        if not locked:
+            row_limit.end = token.end
+    return row_limit
+
+
+def enforce_limit(
+    sql: str,
+    max_limit: int,
+    statement_type: StatementType,
+    tokens: list[Token] | None = None,
+    dialect: str | None = None,
+    row_limit: RowLimit | None = None,
+) -> tuple[str, bool]:
+    """
+    Ensure SELECT/WITH statements return at most max_limit rows.
+
+    Only the outermost query's clauses count: a LIMIT in a subquery or CTE
+    doesn't bound the result. A literal row count above max_limit is lowered,
+    and a missing one added (as FETCH FIRST after a standard OFFSET ... ROWS,
+    otherwise as LIMIT; MySQL and SQLite have no FETCH or OFFSET ... ROWS, so
+    there OFFSET m ROWS becomes LIMIT n OFFSET m). A count that can't be checked, such as LIMIT $1 or
+    FETCH FIRST 10 PERCENT, is kept and the query wrapped in a limited one.
+
     Args:
         sql: The SQL string
         max_limit: Maximum allowed LIMIT value
         statement_type: The classified statement type
-        
+        tokens: Tokens of sql, if already lexed
+        dialect: SQL dialect ("postgres", "mysql", "sqlite" or None)
+        row_limit: The outermost query's clauses, if already found
+
     Returns:
         Tuple of (modified_sql, was_modified)
     """
@@ -149,33 +281,67 @@ def enforce_limit(sql: str, max_limit: int, statement_type: StatementType) -> tu
     if not is_read_only_statement(statement_type):
         return sql, False
 
-    # Check if LIMIT already exists (case-insensitive)
-    limit_pattern = r"\bLIMIT\s+(\d+)\b"
-    match = re.search(limit_pattern, sql, re.IGNORECASE)
-
-    if match:
-        # LIMIT exists, check if it's within bounds
-        current_limit = int(match.group(1))
-        if current_limit > max_limit:
-            # Replace with max_limit
-            modified = re.sub(
-                limit_pattern,
-                f"LIMIT {max_limit}",
-                sql,
-                flags=re.IGNORECASE
-            )
-            return modified, True
+    if row_limit is None:
+        if tokens is None:
+            tokens = tokenize(sql, dialect)
+        row_limit = find_row_limit(tokens)
+    if row_limit.end == 0:
         return sql, False
+    end = row_limit.end
+    count = row_limit.count
+
+    if count is None:
+        # No row count: add one after the query, before any locking clause,
+        # trailing semicolon or comment
+        offset_keyword = row_limit.offset_keyword
+        if row_limit.offset_rows and dialect not in _LIMIT_ONLY_DIALECTS:
+            modified = f"{sql[:end]} FETCH FIRST {max_limit} ROWS ONLY{sql[end:]}"
+        elif row_limit.offset_rows and offset_keyword is not None and row_limit.offset:
+            # OFFSET m ROWS is the last clause here, so it runs up to end
+            offset = sql[row_limit.offset[0].start:row_limit.offset[-1].end]
+            modified = f"{sql[:offset_keyword.start]}LIMIT {max_limit} OFFSET {offset}{sql[end:]}"
+        elif offset_keyword is not None:
+            modified = f"{sql[:offset_keyword.start]}LIMIT {max_limit} {sql[offset_keyword.start:]}"
+        else:
+            modified = f"{sql[:end]} LIMIT {max_limit}{sql[end:]}"
+        return modified.rstrip(), True
+
+    value = row_limit.count_value
+    if value is not None and not row_limit.with_ties:
+        if value <= max_limit:
+            return sql, False
+        # Lower the outermost count only; inner ones are bounded by it
+        return f"{sql[:count[0].start]}{max_limit}{sql[count[0].end:]}", True
+
+    if len(count) == 1 and count[0].is_keyword("ALL", "NULL"):
+        # LIMIT ALL and LIMIT NULL mean no limit
+        return f"{sql[:count[0].start]}{max_limit}{sql[count[0].end:]}", True
+
+    # The count is a parameter or an expression: bound the result around it
+    return f"SELECT * FROM ({sql[:end]}) AS limited_rows LIMIT {max_limit}{sql[end:]}", True
 
-    # No LIMIT found, add one
-    # Handle trailing semicolon
-    sql_stripped = sql.rstrip()
-    if sql_stripped.endswith(";"):
-        modified = sql_stripped[:-1] + f" LIMIT {max_limit};"
-    else:
-        modified = sql_stripped + f" LIMIT {max_limit}"
 
-    return modified, True
+def check_result_window(row_limit: RowLimit, max_limit: int, max_window: int) -> str | None:
+    """
+    Check that OFFSET + LIMIT stays within max_window rows.
+
+    The LIMIT is taken after enforcement, so at most max_limit. Offsets that
+    aren't literals can't be checked and pass.
+
+    Returns:
+        A policy error message, or None if the window is allowed
+    """
+    offset = row_limit.offset_value
+    if not max_window or offset is None:
+        return None
+    count = row_limit.count_value
+    count = max_limit if count is None or row_limit.with_ties else min(count, max_limit)
+    if offset + count <= max_window:
+        return None
+    return (
+        f"OFFSET {offset:,} with {count:,} rows reads up to row {offset + count:,}, past the "
+        f"limit of {max_window:,}. Page with a WHERE condition on the sort key instead."
+    )
 
 
 def get_statement_warning(statement_type: StatementType) -> str | None:
@@ -188,109 +354,47 @@ def run_policy_gate(
     sql: str,
     schema: SchemaContext | None = None,
     has_placeholders_from_writer: bool = False,
+    dialect: str | None = None,
 ) -> PolicyGateOutput:
     """
     Run all deterministic policy checks on the SQL.
     
-    This is the main entry point for the policy gate.
+    This is the main entry point for the policy gate, and a shortcut for
+    get_validation_engine().validate(); see validation.engine.
     
     Args:
         sql: The generated SQL to validate
         schema: Optional schema context for consistency checks
         has_placeholders_from_writer: Whether the writer reported placeholders
+        dialect: SQL dialect ("postgres", "mysql", "sqlite" or None)
         
     Returns:
         PolicyGateOutput with results of all checks
     """
-    settings = get_settings()
-    warnings: list[str] = []
-    policy_errors: list[str] = []
-    modified_sql = sql
-
-    # 1. Classify statement type
-    statement_type = classify_statement(sql)
-
-    if statement_type == StatementType.UNKNOWN:
-        policy_errors.append(
-            "Unable to determine SQL statement type. Query must start with a valid SQL keyword."
-        )
-        return PolicyGateOutput(
-            passed=False,
-            sql=sql,
-            status=QueryStatus.ERROR,
-            warnings=warnings,
-            policy_errors=policy_errors,
-        )
-
-    # 2. Check for multiple statements (always rejected)
-    if check_multiple_statements(sql):
-        policy_errors.append(
-            "Multiple SQL statements detected. Please submit one query at a time."
-        )
-        return PolicyGateOutput(
-            passed=False,
-            sql=sql,
-            status=QueryStatus.ERROR,
-            warnings=warnings,
-            policy_errors=policy_errors,
-        )
-
-    # 3. Add warning for non-SELECT statements
-    statement_warning = get_statement_warning(statement_type)
-    if statement_warning:
-        warnings.append(f"⚠️ {statement_warning}")
-
-    # 4. Enforce LIMIT for SELECT statements
-    if is_read_only_statement(statement_type):
-        modified_sql, limit_modified = enforce_limit(sql, settings.max_row_limit, statement_type)
-        if limit_modified:
-            warnings.append(f"LIMIT {settings.max_row_limit} was enforced on the query")
-
-    # 5. Detect placeholders
-    placeholders = detect_placeholders(modified_sql)
-    has_placeholders = len(placeholders) > 0 or has_placeholders_from_writer
-
-    if has_placeholders and not any("placeholder" in w.lower() for w in warnings):
-        warnings.append("SQL contains placeholders that need to be replaced with actual values")
-
-    # 6. Schema consistency check (if schema provided and SELECT)
-    schema_issues = []
-    if schema and not schema.is_empty and is_read_only_statement(statement_type):
-        schema_issues = check_schema_consistency(modified_sql, schema)
-        warnings.extend(schema_issues)
-
-    # 7. Determine final status
-    status = determine_status(
-        statement_type=statement_type,
-        has_placeholders=has_placeholders,
-        has_schema_issues=len(schema_issues) > 0,
-    )
+    # The engine module imports the checks below
+    from validation.engine import get_validation_engine
 
-    return PolicyGateOutput(
-        passed=True,  # We passed if we got here without policy_errors
-        sql=modified_sql,
-        status=status,
-        warnings=warnings,
-        policy_errors=policy_errors,
-    )
+    return get_validation_engine().validate(sql, schema, has_placeholders_from_writer, dialect)
 
 
 def determine_status(
     statement_type: StatementType,
     has_placeholders: bool,
     has_schema_issues: bool,
+    needs_review: bool = False,
 ) -> QueryStatus:
     """
     Determine the appropriate status based on various factors.
     
     Logic:
     - Non-SELECT statements → review_required
+    - Flagged for review (e.g. a cartesian join) → review_required
     - Has placeholders → draft
     - Has schema issues → draft
     - Otherwise → validated
     """
     # Non-read-only statements always need review
-    if not is_read_only_statement(statement_type):
+    if not is_read_only_statement(statement_type) or needs_review:
         return QueryStatus.REVIEW_REQUIRED
 
     # Placeholders mean draft status
@@ -305,17 +409,22 @@ def determine_status(
     return QueryStatus.VALIDATED
 
 
-def check_schema_consistency(sql: str, schema: SchemaContext) -> list[str]:
+def check_schema_consistency(
+    sql: str,
+    schema: SchemaContext,
+    tokens: list[Token] | None = None,
+    scopes: list[Scope] | None = None,
+) -> list[str]:
     """
     Check if the SQL references tables/columns that exist in the schema.
-    
-    This is a best-effort check using regex patterns.
-    It may have false positives/negatives but provides useful warnings.
-    
+
+    Columns are resolved against the tables, CTEs and subqueries in scope
+    where they appear. This is best-effort: constructs it cannot follow are
+    given the benefit of the doubt.
+
     Returns:
         List of warning messages for potential issues
     """
-    from validation.schema_checker import extract_identifiers, check_identifiers
+    from validation.schema_checker import check_references
 
-    identifiers = extract_identifiers(sql)
-    return check_identifiers(identifiers, schema)
+    return check_references(sql, schema, tokens, scopes)
@@ -5,113 +5,35 @@ Extracts table and column references from SQL and validates them
 against the provided schema.
 """
 
-import re
-
 from schema.models import SchemaContext
+from validation.lexer import Token
+from validation.scope import ColumnRef, Scope, Source, parse_scopes
+from validation.suggestions import closest, did_you_mean, get_identifier_index, myers_distance
 
 
-def extract_identifiers(sql: str) -> dict[str, list[str]]:
+def extract_identifiers(sql: str, tokens: list[Token] | None = None) -> dict[str, list[str]]:
     """
     Extract table and column identifiers from SQL.
-    
-    This is a best-effort extraction using regex patterns.
-    It handles common SQL patterns but may miss edge cases.
-    
+
+    Tables are those read in FROM, JOIN, INSERT INTO and UPDATE, excluding
+    CTEs, subqueries and table functions. Columns are the names of all
+    column references. Strings, comments and placeholders are never reported.
+
+    Args:
+        sql: SQL text
+        tokens: Tokens of sql, if already lexed
+
     Returns:
-        Dict with 'tables' and 'columns' lists
+        Dict with 'tables' and 'columns' lists (lowercase, in order of appearance)
     """
-    # Remove string literals to avoid false matches
-    cleaned = re.sub(r"'[^']*'", "''", sql)
-    cleaned = re.sub(r'"[^"]*"', '""', cleaned)
-
-    # Remove placeholders to avoid matching them
-    cleaned = re.sub(r"<[A-Z][A-Z0-9_]*>", "PLACEHOLDER", cleaned)
-
-    tables: set[str] = set()
-    columns: set[str] = set()
-
-    # Extract table names from FROM clause
-    from_pattern = r"\bFROM\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    for match in re.finditer(from_pattern, cleaned, re.IGNORECASE):
-        tables.add(match.group(1).lower())
-
-    # Extract table names from JOIN clauses
-    join_pattern = r"\bJOIN\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    for match in re.finditer(join_pattern, cleaned, re.IGNORECASE):
-        tables.add(match.group(1).lower())
-
-    # Extract table names from INSERT INTO
-    insert_pattern = r"\bINSERT\s+INTO\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    for match in re.finditer(insert_pattern, cleaned, re.IGNORECASE):
-        tables.add(match.group(1).lower())
-
-    # Extract table names from UPDATE
-    update_pattern = r"\bUPDATE\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    for match in re.finditer(update_pattern, cleaned, re.IGNORECASE):
-        tables.add(match.group(1).lower())
-
-    # Extract table names from DELETE FROM
-    delete_pattern = r"\bDELETE\s+FROM\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    for match in re.finditer(delete_pattern, cleaned, re.IGNORECASE):
-        tables.add(match.group(1).lower())
-
-    # Extract columns from SELECT clause (simple cases)
-    # This catches "SELECT col1, col2" but not complex expressions
-    select_pattern = r"\bSELECT\s+(.+?)\s+FROM\b"
-    select_match = re.search(select_pattern, cleaned, re.IGNORECASE | re.DOTALL)
-    if select_match:
-        select_clause = select_match.group(1)
-        # Split by comma and extract identifiers
-        for part in select_clause.split(","):
-            part = part.strip()
-            # Handle "table.column" or just "column"
-            col_match = re.match(r"([a-zA-Z_][a-zA-Z0-9_]*)(?:\.([a-zA-Z_][a-zA-Z0-9_]*))?", part)
-            if col_match:
-                if col_match.group(2):
-                    # table.column format
-                    columns.add(col_match.group(2).lower())
-                elif part != "*" and part.upper() not in ("DISTINCT", "ALL"):
-                    columns.add(col_match.group(1).lower())
-
-    # Extract columns from WHERE clause
-    where_pattern = r"\bWHERE\s+(.+?)(?:\bORDER\b|\bGROUP\b|\bLIMIT\b|\bHAVING\b|$)"
-    where_match = re.search(where_pattern, cleaned, re.IGNORECASE | re.DOTALL)
-    if where_match:
-        where_clause = where_match.group(1)
-        # Find identifiers before comparison operators
-        col_patterns = [
-            r"([a-zA-Z_][a-zA-Z0-9_]*)\s*[=<>!]",
-            r"([a-zA-Z_][a-zA-Z0-9_]*)\s+(?:IN|LIKE|BETWEEN|IS)",
-        ]
-        for pattern in col_patterns:
-            for match in re.finditer(pattern, where_clause, re.IGNORECASE):
-                col = match.group(1).lower()
-                # Filter out SQL keywords
-                if col.upper() not in ("AND", "OR", "NOT", "NULL", "TRUE", "FALSE"):
-                    columns.add(col)
-
-    # Extract columns from ORDER BY
-    order_pattern = r"\bORDER\s+BY\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    for match in re.finditer(order_pattern, cleaned, re.IGNORECASE):
-        columns.add(match.group(1).lower())
-
-    # Extract columns from GROUP BY
-    group_pattern = r"\bGROUP\s+BY\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-    for match in re.finditer(group_pattern, cleaned, re.IGNORECASE):
-        columns.add(match.group(1).lower())
-
-    # Remove common SQL keywords that might have been captured
-    sql_keywords = {
-        "select", "from", "where", "and", "or", "not", "in", "like",
-        "between", "is", "null", "true", "false", "as", "on", "join",
-        "left", "right", "inner", "outer", "full", "cross", "order",
-        "by", "group", "having", "limit", "offset", "distinct", "all",
-        "asc", "desc", "case", "when", "then", "else", "end", "count",
-        "sum", "avg", "min", "max", "placeholder"
-    }
-
-    tables = {t for t in tables if t not in sql_keywords}
-    columns = {c for c in columns if c not in sql_keywords}
+    tables: dict[str, None] = {}
+    columns: dict[str, None] = {}
+    for scope in parse_scopes(sql, tokens):
+        for source in scope.sources.values():
+            if source.is_table:
+                tables[source.name.lower()] = None
+        for ref in scope.references:
+            columns[ref.name.lower()] = None
 
     return {
         "tables": list(tables),
@@ -119,6 +41,139 @@ def extract_identifiers(sql: str) -> dict[str, list[str]]:
     }
 
 
+def _describe_sources(scope: Scope) -> str:
+    names = [f"'{source.name or source.alias}'" for source in scope.sources.values()]
+    return f"table {names[0]}" if len(names) == 1 else f"tables {', '.join(names)}"
+
+
+class _Resolver:
+    """Resolves column references against a schema, scope by scope."""
+
+    def __init__(self, schema: SchemaContext):
+        self.schema = schema
+        self.index = get_identifier_index(schema)
+        # Per scope: (lowercased schema tables, CTE/derived sources, whether any name is valid)
+        self._summaries: dict[int, tuple[set[str], list[Source], bool]] = {}
+
+    def _summary(self, scope: Scope) -> tuple[set[str], list[Source], bool]:
+        summary = self._summaries.get(id(scope))
+        if summary is None:
+            tables: set[str] = set()
+            derived: list[Source] = []
+            is_open = scope.star and not scope.sources  # e.g. SELECT * in a VALUES list
+            for source in scope.sources.values():
+                if source.is_opaque:
+                    is_open = True
+                elif source.is_table and source.column_aliases is None:
+                    table = self.schema.get_table(source.name)
+                    if table is None:
+                        is_open = True  # Already reported; its columns are unknown
+                    else:
+                        tables.add(table.name.lower())
+                else:
+                    derived.append(source)
+            summary = self._summaries[id(scope)] = (tables, derived, is_open)
+        return summary
+
+    def check(self, ref: ColumnRef, scope: Scope) -> str | None:
+        """
+        Resolve one column reference.
+
+        Returns:
+            A warning message, or None if the column resolves
+        """
+        name = ref.name.lower()
+        if ref.qualifier is not None:
+            return self._check_qualified(ref, name, scope)
+
+        innermost: Scope | None = None
+        current: Scope | None = scope
+        while current is not None:
+            tables, derived, is_open = self._summary(current)
+            if is_open or name in current.aliases:
+                return None
+            if any(source.output_has(name) for source in derived):
+                return None
+            if any(t.lower() in tables for t in self.schema.get_tables_with_column(name)):
+                return None
+            if innermost is None and current.sources:
+                innermost = current
+            current = current.parent
+
+        if innermost is None or not self.schema.has_any_column(name):
+            hint = did_you_mean(self.index.columns.suggest(name))
+            return f"Column '{ref}' not found in provided schema{hint}"
+        tables, _, _ = self._summary(innermost)
+        hint = did_you_mean(closest(name, self._columns_of(tables)))
+        return f"Column '{ref}' not found in {_describe_sources(innermost)}{hint}"
+
+    def _columns_of(self, tables: set[str]) -> list[str]:
+        return [
+            column.name
+            for table in map(self.schema.get_table, sorted(tables))
+            for column in table.columns
+        ]
+
+    def _check_qualified(self, ref: ColumnRef, name: str, scope: Scope) -> str | None:
+        source = scope.find_source(ref.qualifier)
+        if source is None:
+            # Not an alias in scope (e.g. a schema-qualified name); fall back to any table
+            if self.schema.has_any_column(name):
+                return None
+            hint = did_you_mean(self.index.columns.suggest(name))
+            return f"Column '{ref}' not found in provided schema{hint}"
+        if source.is_opaque:
+            return None
+        if source.is_table and source.column_aliases is None:
+            table = self.schema.get_table(source.name)
+            if table is None or table.has_column(name):
+                return None
+            hint = did_you_mean(closest(name, [c.name for c in table.columns]))
+            return f"Column '{ref}' not found in table '{table.name}'{hint}"
+        if source.output_has(name):
+            return None
+        kind = "CTE" if source.cte is not None else "subquery"
+        return f"Column '{ref}' not found in {kind} '{source.name or source.alias}'"
+
+
+def check_references(
+    sql: str,
+    schema: SchemaContext,
+    tokens: list[Token] | None = None,
+    scopes: list[Scope] | None = None,
+) -> list[str]:
+    """
+    Check tables and columns against the schema, scope by scope.
+
+    Each column is resolved against the tables, CTEs and subqueries in scope
+    where it appears (then the enclosing scopes, for correlated subqueries),
+    so a column that exists in some other table is still reported, and
+    aliases and CTE columns are not. Warnings for unknown names suggest the
+    closest valid ones.
+
+    Args:
+        sql: SQL text
+        schema: Schema to check against
+        tokens: Tokens of sql, if already lexed
+        scopes: Scopes of sql, if already parsed
+
+    Returns:
+        List of warning messages for missing identifiers
+    """
+    warnings: dict[str, None] = {}
+    resolver = _Resolver(schema)
+    for scope in scopes if scopes is not None else parse_scopes(sql, tokens):
+        for source in scope.sources.values():
+            if source.is_table and not schema.has_table(source.name):
+                hint = did_you_mean(resolver.index.tables.suggest(source.name))
+                warnings[f"Table '{source.name}' not found in provided schema{hint}"] = None
+        for ref in dict.fromkeys(scope.references):  # Each distinct reference once
+            warning = resolver.check(ref, scope)
+            if warning is not None:
+                warnings[warning] = None
+    return list(warnings)
+
+
 def check_identifiers(
     identifiers: dict[str, list[str]],
     schema: SchemaContext
@@ -130,22 +185,19 @@ def check_identifiers(
         List of warning messages for missing identifiers
     """
     warnings: list[str] = []
+    index = get_identifier_index(schema)
 
     # Check tables
-    schema_tables = {t.name.lower() for t in schema.tables}
     for table in identifiers["tables"]:
-        if table not in schema_tables:
-            warnings.append(f"Table '{table}' not found in provided schema")
+        if not schema.has_table(table):
+            hint = did_you_mean(index.tables.suggest(table))
+            warnings.append(f"Table '{table}' not found in provided schema{hint}")
 
     # Check columns (against all tables since we don't always know the source)
-    all_columns = set()
-    for table in schema.tables:
-        for col in table.columns:
-            all_columns.add(col.name.lower())
-
     for column in identifiers["columns"]:
-        if column not in all_columns:
-            warnings.append(f"Column '{column}' not found in provided schema")
+        if not schema.has_any_column(column):
+            hint = did_you_mean(index.columns.suggest(column))
+            warnings.append(f"Column '{column}' not found in provided schema{hint}")
 
     return warnings
 
@@ -171,7 +223,7 @@ def find_similar_identifiers(
     similar = []
 
     for candidate in candidates:
-        distance = levenshtein_distance(name.lower(), candidate.lower())
+        distance = myers_distance(name.lower(), candidate.lower())
         if distance <= max_distance and distance > 0:
             similar.append(candidate)
 
@@ -180,21 +232,4 @@ def find_similar_identifiers(
 
 def levenshtein_distance(s1: str, s2: str) -> int:
     """Calculate the Levenshtein distance between two strings."""
-    if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
-
-    if len(s2) == 0:
-        return len(s1)
-
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            # j+1 instead of j since previous_row and current_row are one character longer
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-
-    return previous_row[-1]
+    return myers_distance(s1, s2)
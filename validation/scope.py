@@ -0,0 +1,530 @@
+"""
+Query scopes for SQL identifier resolution.
+
+Turns the lexer's tokens into a flat list of scopes, one per SELECT: the top
+level query, each CTE body, each subquery and each branch of a UNION,
+INTERSECT or EXCEPT. A scope records the table-like sources of its FROM
+clause under their aliases, the CTEs it defines, the column references that
+appear in it and the names of its output columns. Parsing is a single pass
+over the tokens.
+
+Nothing here consults a schema; validation.schema_checker resolves the
+references against one.
+"""
+
+from dataclasses import dataclass, field
+
+from validation.lexer import Token, TokenKind, tokenize
+
+# Words that are never column references, aliases or table names
+_KEYWORDS = frozenset({
+    "ALL", "AND", "ANY", "ARRAY", "AS", "ASC", "AT", "BETWEEN", "BY", "CASE",
+    "CAST", "COLLATE", "CROSS", "CURRENT", "CURRENT_DATE", "CURRENT_TIME",
+    "CURRENT_TIMESTAMP", "CURRENT_USER", "DELETE", "DESC", "DISTINCT", "DO",
+    "ELSE", "END", "ESCAPE", "EXCEPT", "EXCLUDE", "EXISTS", "FALSE", "FETCH",
+    "FILTER", "FIRST", "FOLLOWING", "FOR", "FROM", "FULL", "GROUP", "GROUPS",
+    "HAVING", "ILIKE", "IN", "INNER", "INSERT", "INTERSECT", "INTERVAL", "INTO",
+    "IS", "JOIN", "LAST", "LATERAL", "LEFT", "LIKE", "LIMIT", "LOCALTIME",
+    "LOCALTIMESTAMP", "MATERIALIZED", "NATURAL", "NEXT", "NOT", "NULL", "NULLS",
+    "OFFSET", "ON", "ONLY", "OR", "ORDER", "OUTER", "OVER", "PARTITION",
+    "PRECEDING", "QUALIFY", "RANGE", "RECURSIVE", "RETURNING", "RIGHT", "ROWS",
+    "SELECT", "SESSION_USER", "SET", "SIMILAR", "SOME", "TABLESAMPLE", "THEN",
+    "TIES", "TRUE", "UNBOUNDED", "UNION", "UNKNOWN", "UPDATE", "USING", "VALUES",
+    "WHEN", "WHERE", "WINDOW", "WITH", "WITHIN", "ZONE",
+})
+
+# Keywords that end a value, so a following name is an alias (CASE ... END total)
+_VALUE_KEYWORDS = frozenset({
+    "END", "NULL", "TRUE", "FALSE", "CURRENT_DATE", "CURRENT_TIME",
+    "CURRENT_TIMESTAMP", "CURRENT_USER", "LOCALTIME", "LOCALTIMESTAMP", "SESSION_USER",
+})
+
+# Keywords that start a clause in which no table is named
+_CLAUSE_KEYWORDS = frozenset({
+    "WHERE", "GROUP", "HAVING", "ORDER", "LIMIT", "OFFSET", "FETCH", "WINDOW",
+    "QUALIFY", "SET", "ON", "USING", "RETURNING", "VALUES",
+})
+
+_SET_OPERATORS = frozenset({"UNION", "INTERSECT", "EXCEPT"})
+
+# Subqueries nested deeper than this are read as parenthesized expressions
+_MAX_DEPTH = 64
+
+_NAME_KINDS = (TokenKind.WORD, TokenKind.QUOTED_IDENTIFIER)
+
+_VALUE_KINDS = (
+    TokenKind.QUOTED_IDENTIFIER,
+    TokenKind.STRING,
+    TokenKind.NUMBER,
+    TokenKind.PLACEHOLDER,
+    TokenKind.PARAMETER,
+)
+
+
+def is_name(token: Token) -> bool:
+    """Whether a token can be an identifier (not a keyword)."""
+    if token.kind is TokenKind.WORD:
+        return token.text.upper() not in _KEYWORDS
+    return token.kind is TokenKind.QUOTED_IDENTIFIER
+
+
+def _ends_value(token: Token) -> bool:
+    """Whether a name right after this token would be an alias."""
+    if token.kind is TokenKind.WORD:
+        upper = token.text.upper()
+        return upper not in _KEYWORDS or upper in _VALUE_KEYWORDS
+    return token.kind in _VALUE_KINDS or token.is_punctuation(")")
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnRef:
+    """A column reference, optionally qualified (alias.column)."""
+
+    name: str
+    qualifier: str | None = None
+
+    def __str__(self) -> str:
+        return f"{self.qualifier}.{self.name}" if self.qualifier else self.name
+
+
+@dataclass(eq=False, slots=True)
+class Source:
+    """
+    A table-like item of a FROM clause, or a CTE definition.
+
+    A table from the schema has only a name; a derived table has a query; a
+    reference to a CTE links to the definition (whose query is the CTE body).
+    Sources with none of these, such as table functions and placeholders,
+    are opaque: their columns are unknown.
+    """
+
+    alias: str
+    name: str | None = None
+    query: "Scope | None" = None
+    cte: "Source | None" = None
+    column_aliases: tuple[str, ...] | None = None  # AS t(a, b)
+    position: int = 0  # Offset of the item in the SQL
+
+    @property
+    def is_table(self) -> bool:
+        return self.name is not None and self.query is None and self.cte is None
+
+    @property
+    def is_opaque(self) -> bool:
+        """Whether any column name may be valid for this source."""
+        if self.column_aliases is not None:
+            return False
+        if self.cte is not None:
+            return self.cte.is_opaque
+        if self.query is not None:
+            return self.query.star
+        return self.name is None
+
+    def output_has(self, column: str) -> bool:
+        """Whether a CTE, derived table or aliased source outputs a column (lowercase name)."""
+        if self.column_aliases is not None:
+            return column in self.column_aliases
+        if self.cte is not None:
+            return self.cte.output_has(column)
+        return self.query is not None and column in self.query.outputs
+
+
+@dataclass(eq=False)
+class Scope:
+    """The names visible to one SELECT (or DML statement)."""
+
+    parent: "Scope | None" = None
+    # Sources by lowercased alias (the table name when there is no alias)
+    sources: dict[str, Source] = field(default_factory=dict)
+    # CTEs defined by a WITH clause at this level, by lowercased name
+    ctes: dict[str, Source] = field(default_factory=dict)
+    references: list[ColumnRef] = field(default_factory=list)
+    # The references in WHERE and ON conditions, and those of them compared
+    # with =, IN or IS
+    filters: list[ColumnRef] = field(default_factory=list)
+    equalities: list[ColumnRef] = field(default_factory=list)
+    disjunctive: bool = False  # Whether those conditions use OR
+    # The references in ORDER BY
+    sort_keys: list[ColumnRef] = field(default_factory=list)
+    # Lowercased output column names; star is set by SELECT *
+    outputs: set[str] = field(default_factory=set)
+    star: bool = False
+    # Lowercased select-list aliases, which ORDER BY and GROUP BY may use
+    aliases: set[str] = field(default_factory=set)
+
+    def find_source(self, alias: str) -> Source | None:
+        """Find a source by alias (or unaliased table name) here or in an enclosing scope."""
+        key = alias.lower()
+        scope: Scope | None = self
+        while scope is not None:
+            source = scope.sources.get(key)
+            if source is not None:
+                return source
+            scope = scope.parent
+        return None
+
+    def find_cte(self, name: str) -> Source | None:
+        """Find a CTE visible from this scope."""
+        key = name.lower()
+        scope: Scope | None = self
+        while scope is not None:
+            cte = scope.ctes.get(key)
+            if cte is not None:
+                return cte
+            scope = scope.parent
+        return None
+
+
+class _ScopeParser:
+    """Single pass over the tokens, recursing into parenthesized queries."""
+
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.pos = 0
+        self.depth = 0
+        self.scopes: list[Scope] = []
+
+    def _new_scope(self, parent: Scope | None, ctes: dict[str, Source] | None = None) -> Scope:
+        scope = Scope(parent=parent)
+        if ctes is not None:
+            scope.ctes = ctes  # UNION branches share the WITH clause
+        self.scopes.append(scope)
+        return scope
+
+    def _peek(self, offset: int = 0) -> Token | None:
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else None
+
+    def _starts_query(self, token: Token | None) -> bool:
+        return (
+            token is not None
+            and self.depth < _MAX_DEPTH
+            and token.is_keyword("SELECT", "WITH", "VALUES")
+        )
+
+    def _name_chain(self) -> tuple[list[Token], bool]:
+        """
+        Read a dotted name (a.b.c or a.*) at the current position.
+
+        Returns:
+            Tuple of (name parts, whether it ends in .*)
+        """
+        parts = [self.tokens[self.pos]]
+        self.pos += 1
+        while (dot := self._peek()) is not None and dot.is_punctuation("."):
+            part = self._peek(1)
+            if part is None:
+                break
+            if part.kind is TokenKind.OPERATOR and part.text == "*":
+                self.pos += 2
+                return parts, True
+            if part.kind not in _NAME_KINDS:
+                break
+            parts.append(part)
+            self.pos += 2
+        return parts, False
+
+    def _alias(self) -> str | None:
+        """Read an optional [AS] alias."""
+        token = self._peek()
+        if token is not None and token.is_keyword("AS"):
+            self.pos += 1
+            token = self._peek()
+        if token is not None and is_name(token):
+            self.pos += 1
+            return token.identifier
+        return None
+
+    def _name_list(self) -> list[str]:
+        """Read a parenthesized list of names, e.g. column aliases."""
+        names = []
+        if (token := self._peek()) is not None and token.is_punctuation("("):
+            self.pos += 1
+            while (token := self._peek()) is not None and not token.is_punctuation(")"):
+                if token.kind in _NAME_KINDS:
+                    names.append(token.identifier)
+                self.pos += 1
+            self.pos += 1
+        return names
+
+    def _subquery(self, parent: Scope) -> Scope:
+        """Parse a query after its opening parenthesis, consuming the closing one."""
+        self.depth += 1
+        scope = self._query(parent)
+        self.depth -= 1
+        if (token := self._peek()) is not None and token.is_punctuation(")"):
+            self.pos += 1
+        return scope
+
+    def _ctes(self, scope: Scope) -> None:
+        """Parse WITH [RECURSIVE] name [(cols)] AS [[NOT] MATERIALIZED] (query), ..."""
+        if (token := self._peek()) is not None and token.is_keyword("RECURSIVE"):
+            self.pos += 1
+        while (token := self._peek()) is not None and token.kind in _NAME_KINDS:
+            self.pos += 1
+            cte = Source(alias=token.identifier.lower(), name=token.identifier)
+            columns = self._name_list()
+            if columns:
+                cte.column_aliases = tuple(c.lower() for c in columns)
+            # Visible in its own body, for recursive CTEs
+            scope.ctes[cte.alias] = cte
+            while (token := self._peek()) is not None and token.is_keyword("AS", "NOT", "MATERIALIZED"):
+                self.pos += 1
+            if token is None or not token.is_punctuation("("):
+                return
+            self.pos += 1
+            cte.query = self._subquery(scope)
+            if (token := self._peek()) is None or not token.is_punctuation(","):
+                return
+            self.pos += 1
+
+    def _table_reference(self, scope: Scope, target: bool) -> Source | None:
+        """
+        Read one FROM item at the current position.
+
+        Args:
+            scope: Scope the source belongs to
+            target: Whether this is an INSERT target, whose parenthesized
+                list names its columns rather than aliasing them
+
+        Returns:
+            The source, or None if the position holds no table reference
+        """
+        token = self._peek()
+        if token is None:
+            return None
+        position = token.start
+
+        if token.is_punctuation("(") and self._starts_query(self._peek(1)):
+            self.pos += 1
+            source = Source(alias="", query=self._subquery(scope))
+        elif token.kind is TokenKind.PLACEHOLDER:
+            self.pos += 1
+            source = Source(alias=token.text.lower())
+        elif token.kind in _NAME_KINDS and is_name(token):
+            parts, _ = self._name_chain()
+            name = parts[-1].identifier
+            if not target and (token := self._peek()) is not None and token.is_punctuation("("):
+                # Table function; its arguments are read as expressions
+                return self._add_source(scope, Source(alias=name.lower()))
+            cte = scope.find_cte(name) if len(parts) == 1 else None
+            source = Source(alias=name.lower(), name=name, cte=cte)
+        else:
+            return None
+
+        source.position = position
+        alias = self._alias()
+        if alias is not None:
+            source.alias = alias.lower()
+        columns = self._name_list()
+        if target:
+            scope.references.extend(ColumnRef(c, source.alias) for c in columns)
+        elif columns:
+            source.column_aliases = tuple(c.lower() for c in columns)
+        return self._add_source(scope, source)
+
+    def _add_source(self, scope: Scope, source: Source) -> Source:
+        scope.sources.setdefault(source.alias, source)
+        return source
+
+    def _select_output(self, scope: Scope, start: int, end: int) -> None:
+        """Record the output name of the select item tokens[start:end]."""
+        item = self.tokens[start:end]
+        if item and item[0].is_keyword("DISTINCT", "ALL"):
+            item = item[1:]
+        if not item:
+            return
+        last = item[-1]
+        if last.kind is TokenKind.OPERATOR and last.text == "*":
+            scope.star = True  # * or t.*
+        elif len(item) > 1 and is_name(last) and (item[-2].is_keyword("AS") or _ends_value(item[-2])):
+            scope.outputs.add(last.identifier.lower())  # Alias
+            scope.aliases.add(last.identifier.lower())
+        elif all(t.kind in _NAME_KINDS or t.is_punctuation(".") for t in item):
+            scope.outputs.add(last.identifier.lower())  # column or t.column
+        elif item[0].kind in _NAME_KINDS and len(item) > 1 and item[1].is_punctuation("("):
+            scope.outputs.add(item[0].text.lower())  # Function result, e.g. count
+
+    def _query(self, parent: Scope | None) -> Scope:
+        """Parse one query up to an unmatched ")" or the end of the tokens."""
+        tokens = self.tokens
+        n = len(tokens)
+        scope = self._new_scope(parent)
+        first = scope
+        clause = None
+        clause_refs: list[ColumnRef] | None = None  # scope.filters or scope.sort_keys
+        expect_table = False
+        target = False  # The next table is an INSERT target
+        # Open parentheses: True for a parenthesized join in FROM
+        parens: list[bool] = []
+        nested = 0  # Open parentheses that aren't joins
+        prev: Token | None = None
+        item_start = 0
+
+        if (token := self._peek()) is not None and token.is_keyword("WITH"):
+            self.pos += 1
+            self._ctes(scope)
+
+        while self.pos < n:
+            token = tokens[self.pos]
+            kind = token.kind
+
+            if kind is TokenKind.PUNCTUATION:
+                text = token.text
+                if text == "(":
+                    if self._starts_query(self._peek(1)):
+                        if expect_table:
+                            self._table_reference(scope, target)
+                            expect_table = target = False
+                        else:
+                            self.pos += 1
+                            self._subquery(scope)
+                        prev = tokens[self.pos - 1]
+                        continue
+                    parens.append(expect_table)
+                    if not expect_table:
+                        nested += 1
+                elif text == ")":
+                    if not parens:
+                        break  # Closes the enclosing subquery
+                    if not parens.pop():
+                        nested -= 1
+                elif text == "," and not nested:
+                    if clause == "SELECT":
+                        self._select_output(scope, item_start, self.pos)
+                        item_start = self.pos + 1
+                    elif clause == "FROM":
+                        expect_table = True
+                prev = token
+                self.pos += 1
+                continue
+
+            if kind is TokenKind.SEMICOLON:
+                if clause == "SELECT":
+                    self._select_output(scope, item_start, self.pos)
+                if parent is not None:
+                    break
+                clause = None
+                # Empty statements don't get a scope
+                while (token := self._peek()) is not None and token.kind is TokenKind.SEMICOLON:
+                    self.pos += 1
+                if token is None:
+                    break
+                scope = first = self._new_scope(None)
+                expect_table, target, parens, nested, prev = False, False, [], 0, None
+                clause_refs = None
+                if token.is_keyword("WITH"):
+                    self.pos += 1
+                    self._ctes(scope)
+                continue
+
+            if expect_table and (kind is TokenKind.PLACEHOLDER or is_name(token)):
+                self._table_reference(scope, target)
+                expect_table = target = False
+                prev = tokens[self.pos - 1]
+                continue
+
+            if kind is TokenKind.WORD:
+                upper = token.text.upper()
+                if upper in _KEYWORDS:
+                    if upper == "OR" and clause_refs is scope.filters:
+                        scope.disjunctive = True
+                    if not nested:
+                        if upper == "SELECT":
+                            clause = "SELECT"
+                            item_start = self.pos + 1
+                            clause_refs = None
+                        elif upper == "FROM" and not (prev is not None and prev.is_keyword("DISTINCT")):
+                            if clause == "SELECT":
+                                self._select_output(scope, item_start, self.pos)
+                            clause = "FROM"
+                            expect_table, clause_refs = True, None
+                        elif upper == "JOIN":
+                            clause = "FROM"
+                            expect_table, clause_refs = True, None
+                        elif upper == "INTO" and prev is not None and prev.is_keyword("INSERT"):
+                            clause = "INTO"
+                            expect_table = target = True
+                        elif upper == "UPDATE" and prev is None:
+                            clause = "UPDATE"
+                            expect_table = True
+                        elif upper in ("ON", "USING") and clause == "FROM":
+                            expect_table = False
+                            clause_refs = scope.filters if upper == "ON" else None
+                        elif upper in _CLAUSE_KEYWORDS or upper in _SET_OPERATORS:
+                            if clause == "SELECT":
+                                self._select_output(scope, item_start, self.pos)
+                            clause = None
+                            expect_table = False
+                            if upper in _SET_OPERATORS:
+                                scope = self._new_scope(parent, ctes=first.ctes)
+                            clause_refs = (
+                                scope.filters if upper == "WHERE"
+                                else scope.sort_keys if upper == "ORDER"
+                                else None
+                            )
+                    prev = token
+                    self.pos += 1
+                    continue
+            elif kind is not TokenKind.QUOTED_IDENTIFIER:
+                prev = token
+                self.pos += 1
+                continue
+
+            # A name: column reference unless context says otherwise
+            if prev is not None and (
+                prev.is_keyword("AS", "AT", "OVER", "WINDOW")  # Alias, AT TIME ZONE, window name
+                or (prev.kind is TokenKind.OPERATOR and prev.text == "::")  # Type name
+                or _ends_value(prev)  # Alias, or a unit as in '1' DAY
+            ):
+                prev = token
+                self.pos += 1
+                continue
+            before = prev
+            parts, star = self._name_chain()
+            following = self._peek()
+            prev = tokens[self.pos - 1]
+            if star or following is not None and (
+                following.is_punctuation("(")  # Function call
+                or following.kind is TokenKind.STRING  # Typed literal, e.g. DATE '2024-01-01'
+                or (nested and following.is_keyword("FROM"))  # EXTRACT(YEAR FROM ...)
+            ):
+                continue
+            qualifier = parts[-2].identifier if len(parts) > 1 else None
+            ref = ColumnRef(parts[-1].identifier, qualifier)
+            scope.references.append(ref)
+            if clause_refs is not None:
+                clause_refs.append(ref)
+                if clause_refs is scope.filters and (
+                    before is not None and before.kind is TokenKind.OPERATOR and before.text == "="
+                    or following is not None and (
+                        following.kind is TokenKind.OPERATOR and following.text == "="
+                        or following.is_keyword("IN", "IS")
+                    )
+                ):
+                    scope.equalities.append(ref)
+
+        if clause == "SELECT":
+            self._select_output(scope, item_start, self.pos)
+        return first
+
+
+def parse_scopes(sql: str, tokens: list[Token] | None = None) -> list[Scope]:
+    """
+    Split a query into scopes.
+
+    Args:
+        sql: SQL text
+        tokens: Tokens of sql, if already lexed
+
+    Returns:
+        Every scope, outermost first; Scope.parent links each to the scope
+        it is nested in
+    """
+    if tokens is None:
+        tokens = tokenize(sql)
+    parser = _ScopeParser(tokens)
+    while parser.pos < len(tokens):
+        parser._query(None)
+        parser.pos += 1  # Skip an unbalanced ")"
+    return parser.scopes or [Scope()]
@@ -0,0 +1,224 @@
+"""
+"Did you mean" suggestions for unknown table and column names.
+
+Candidates come from a bigram index over the schema's names, built once per
+schema and cached on it. A name within edit distance k of the query has a
+length within k of it and shares all but at most 2k of the query's distinct
+bigrams, since each edit touches at most two. Only names passing both
+filters are verified with a bit-parallel edit distance.
+"""
+
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import chain
+
+from schema.models import SchemaContext
+
+# Suggestions returned per unknown name
+MAX_SUGGESTIONS = 3
+
+# Names shown by listed before the rest are counted
+MAX_LISTED = 5
+
+
+def myers_distance(a: str, b: str) -> int:
+    """
+    Levenshtein distance using Myers' bit-parallel algorithm.
+
+    Each column of the dynamic-programming matrix is encoded in the bits of
+    a Python int, so the cost is one pass over the longer string.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(b)
+    if m == 0:
+        return len(a)
+
+    peq: dict[str, int] = {}
+    for i, c in enumerate(b):
+        peq[c] = peq.get(c, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for c in a:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+def _bigrams(name: str) -> set[str]:
+    padded = f"^{name}$"
+    return set(map(str.__add__, padded[:-1], padded[1:]))
+
+
+def default_max_distance(name: str) -> int:
+    """Edit distance allowed for suggestions: 1 for short names, else 2."""
+    return 1 if len(name) <= 4 else 2
+
+
+class IdentifierIndex:
+    """Fuzzy, case-insensitive lookup over a set of identifiers."""
+
+    def __init__(self, names: Iterable[str]):
+        distinct: dict[str, str] = {}
+        for name in names:
+            distinct.setdefault(name.lower(), name)
+
+        # Ids are assigned in length order, so every posting list is sorted
+        # by length and a length range is a slice of it
+        self._lower = sorted(distinct, key=len)
+        self._names = [distinct[lower] for lower in self._lower]
+        self._lengths = [len(lower) for lower in self._lower]
+        self._postings: defaultdict[str, list[int]] = defaultdict(list)
+        for i, lower in enumerate(self._lower):
+            for gram in _bigrams(lower):
+                self._postings[gram].append(i)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _candidates(self, query: str, max_distance: int) -> Iterable[int]:
+        lo = bisect_left(self._lengths, len(query) - max_distance)
+        hi = bisect_left(self._lengths, len(query) + max_distance + 1)
+        grams = _bigrams(query)
+        # Shared bigrams needed by any name within max_distance
+        needed = len(grams) - 2 * max_distance
+        if needed <= 0:
+            return range(lo, hi)  # Too short to filter on
+
+        slices = []
+        for gram in grams:
+            ids = self._postings.get(gram)
+            if ids:
+                start = bisect_left(ids, lo)
+                end = bisect_left(ids, hi, start)
+                if end > start:
+                    slices.append(ids[start:end])
+        counts = Counter(chain.from_iterable(slices))
+        return [i for i, count in counts.items() if count >= needed]
+
+    def suggest(
+        self,
+        name: str,
+        limit: int = MAX_SUGGESTIONS,
+        max_distance: int | None = None,
+    ) -> list[str]:
+        """
+        Find the names closest to an unknown one.
+
+        Args:
+            name: The unknown identifier
+            limit: Maximum number of suggestions
+            max_distance: Maximum edit distance; default_max_distance() if None
+
+        Returns:
+            Up to limit names at distance 1..max_distance, closest first
+        """
+        query = name.lower()
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+        lower = self._lower
+        return _rank(
+            query,
+            ((self._names[i], lower[i]) for i in self._candidates(query, max_distance)),
+            limit,
+            max_distance,
+        )
+
+
+def _rank(
+    query: str,
+    candidates: Iterable[tuple[str, str]],
+    limit: int,
+    max_distance: int,
+) -> list[str]:
+    matches = []
+    for name, lower in candidates:
+        distance = myers_distance(query, lower)
+        if 0 < distance <= max_distance:
+            matches.append((distance, lower, name))
+    matches.sort()
+    return [name for _, _, name in matches[:limit]]
+
+
+def closest(
+    name: str,
+    candidates: Iterable[str],
+    limit: int = MAX_SUGGESTIONS,
+    max_distance: int | None = None,
+) -> list[str]:
+    """
+    Find the closest names by scanning a short candidate list (e.g. one table's columns).
+
+    Args:
+        name: The unknown identifier
+        candidates: Valid identifiers
+        limit: Maximum number of suggestions
+        max_distance: Maximum edit distance; default_max_distance() if None
+
+    Returns:
+        Up to limit candidates at distance 1..max_distance, closest first
+    """
+    query = name.lower()
+    if max_distance is None:
+        max_distance = default_max_distance(query)
+    return _rank(query, ((c, c.lower()) for c in candidates), limit, max_distance)
+
+
+@dataclass(frozen=True)
+class SchemaIdentifierIndex:
+    """Fuzzy indexes over a schema's table names and column names."""
+
+    tables: IdentifierIndex
+    columns: IdentifierIndex
+
+    @classmethod
+    def build(cls, schema: SchemaContext) -> "SchemaIdentifierIndex":
+        return cls(
+            tables=IdentifierIndex(t.name for t in schema.tables),
+            columns=IdentifierIndex(c.name for t in schema.tables for c in t.columns),
+        )
+
+
+def get_identifier_index(schema: SchemaContext) -> SchemaIdentifierIndex:
+    """Get the identifier index for a schema, building it on first use."""
+    return schema.cached("identifier_index", lambda: SchemaIdentifierIndex.build(schema))
+
+
+def listed(
+    names: list[str],
+    conjunction: str = "and",
+    limit: int = MAX_LISTED,
+    quote: bool = True,
+) -> str:
+    """
+    Names for a message, as 'a', 'b' and 'c'.
+
+    Past limit names the rest are counted ('a', 'b' and 3 more). With quote
+    False the items are used as they are, e.g. when already formatted.
+    """
+    items = [f"'{name}'" for name in names[:limit]] if quote else names[:limit]
+    if len(names) > limit:
+        items.append(f"{len(names) - limit} more")
+    return items[0] if len(items) == 1 else f"{', '.join(items[:-1])} {conjunction} {items[-1]}"
+
+
+def did_you_mean(suggestions: list[str]) -> str:
+    """Format suggestions as a clause to append to a warning, or ''."""
+    if not suggestions:
+        return ""
+    return f"; did you mean {listed(suggestions, 'or')}?"